@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+⏱️ BENCHMARK - Envelope de volume da fala (RMS por janela)
+
+Compara o laço antigo de AudioVisualDynamic.analyze_audio_volume (uma
+fatia + np.mean por janela de 100 ms) com o envelope vetorizado
+compartilhado, em lote e em modo streaming (pedaços de 20 ms, como chega
+o PCM do TTS durante a reprodução).
+
+Uso:
+    python scripts/benchmarks/bench_audio_envelope.py [--repeat 20]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Adicionar paths
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from t031a5.connectors.audio_envelope import EnvelopeFollower
+
+
+def synthetic_speech(seconds: float, sample_rate: int, seed: int = 0) -> np.ndarray:
+    """PCM int16 sintético: ruído modulado por sílabas de ~4 Hz."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    syllables = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+    return (rng.standard_normal(len(t)) * 6000 * syllables).clip(-32768, 32767).astype(np.int16)
+
+
+def legacy_volumes(sound_data: np.ndarray, sample_rate: int) -> list:
+    """Laço antigo (uma janela por iteração Python)."""
+    window_size = int(sample_rate * 0.1)
+    volumes = []
+    for i in range(0, len(sound_data), window_size):
+        window = sound_data[i:i + window_size]
+        if len(window) > 0:
+            rms = np.sqrt(np.mean(window.astype(float) ** 2))
+            volumes.append(min(1.0, rms / 5000.0))
+    return volumes
+
+
+def batch_volumes(pcm: bytes, sample_rate: int) -> np.ndarray:
+    follower = EnvelopeFollower(sample_rate)
+    return np.concatenate([follower.feed(pcm), follower.flush()])
+
+
+def streamed_volumes(pcm: bytes, sample_rate: int, chunk_s: float = 0.02) -> np.ndarray:
+    follower = EnvelopeFollower(sample_rate)
+    chunk = int(sample_rate * chunk_s) * 2
+    levels = [follower.feed(pcm[i:i + chunk]) for i in range(0, len(pcm), chunk)]
+    levels.append(follower.flush())
+    return np.concatenate(levels)
+
+
+def timed(func, repeat: int):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do envelope de volume")
+    parser.add_argument("--repeat", type=int, default=20, help="Iterações por medição")
+    args = parser.parse_args()
+
+    print("⏱️ BENCHMARK ENVELOPE DE VOLUME")
+    print("=" * 60)
+    print(f"{'áudio':>10} {'janelas':>8} {'laço (ms)':>10} {'lote (ms)':>10} {'stream (ms)':>12} "
+          f"{'ganho':>7} {'erro máx':>9}")
+
+    for sample_rate in (16000, 44100):
+        for seconds in (5.0, 30.0):
+            sound_data = synthetic_speech(seconds, sample_rate)
+            pcm = sound_data.tobytes()
+
+            legacy_ms, legacy = timed(lambda: legacy_volumes(sound_data, sample_rate), args.repeat)
+            batch_ms, batch = timed(lambda: batch_volumes(pcm, sample_rate), args.repeat)
+            stream_ms, streamed = timed(lambda: streamed_volumes(pcm, sample_rate), args.repeat)
+
+            error = max(np.max(np.abs(np.asarray(legacy) - batch)), np.max(np.abs(batch - streamed)))
+            label = f"{seconds:.0f}s@{sample_rate // 1000}k"
+            print(f"{label:>10} {len(legacy):>8} {legacy_ms:>10.2f} {batch_ms:>10.2f} {stream_ms:>12.2f} "
+                  f"{legacy_ms / batch_ms:>6.1f}x {error:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+⏱️ BENCHMARK - Histogramas de latência do MetricsCollector
+
+Compara o histórico antigo (um dict com datetime por amostra numa
+deque(maxlen=8640) por operação, filtrado linearmente por timestamp) com os
+histogramas de memória fixa: custo por registro, custo da consulta de
+percentis, memória retida e erro dos percentis contra ``np.percentile``.
+
+Uso:
+    python scripts/benchmarks/bench_latency_histogram.py [--repeat 8640] [--operations 20]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Adicionar paths
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from t031a5.logging.metrics_collector import MetricsCollector
+
+
+class LegacyHistory:
+    """Histórico por amostra do MetricsCollector antigo."""
+
+    def __init__(self):
+        self.performance = defaultdict(lambda: {"count": 0, "total_time": 0.0, "avg_time": 0.0,
+                                                "min_time": float("inf"), "max_time": 0.0})
+        self.components = defaultdict(lambda: deque(maxlen=8640))
+
+    def record(self, operation: str, duration: float):
+        perf = self.performance[operation]
+        perf["count"] += 1
+        perf["total_time"] += duration
+        perf["avg_time"] = perf["total_time"] / perf["count"]
+        perf["min_time"] = min(perf["min_time"], duration)
+        perf["max_time"] = max(perf["max_time"], duration)
+        self.components[operation].append({"timestamp": datetime.now(), "duration": duration,
+                                           "avg_time": perf["avg_time"]})
+
+    def percentiles(self, operation: str, hours: int = 1):
+        cutoff = datetime.now() - timedelta(hours=hours)
+        durations = [item["duration"] for item in self.components[operation] if item["timestamp"] > cutoff]
+        return np.percentile(durations, (50, 95, 99)).tolist()
+
+
+def retained_kib(build) -> float:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return (after - before) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos histogramas de latência")
+    parser.add_argument("--repeat", type=int, default=8640, help="Amostras por operação")
+    parser.add_argument("--operations", type=int, default=20, help="Operações distintas")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    samples = {f"op{i}": rng.lognormal(np.log(0.05), 0.8, args.repeat).tolist() for i in range(args.operations)}
+    total = args.repeat * args.operations
+
+    def fill_legacy():
+        legacy = LegacyHistory()
+        for operation, values in samples.items():
+            for value in values:
+                legacy.record(operation, value)
+        return legacy
+
+    def fill_collector():
+        collector = MetricsCollector()
+        for operation, values in samples.items():
+            for value in values:
+                collector.record_performance(operation, value)
+        return collector
+
+    print("⏱️ BENCHMARK HISTOGRAMAS DE LATÊNCIA")
+    print("=" * 64)
+    print(f"{args.operations} operações × {args.repeat} amostras")
+    print(f"\n{'':>12} {'registro (µs)':>14} {'percentis (ms)':>15} {'memória (KiB)':>14}")
+
+    for label, fill, query in (
+        ("antigo", fill_legacy, lambda obj: [obj.percentiles(op) for op in samples]),
+        ("histograma", fill_collector,
+         lambda obj: [obj.get_latency_percentiles(op, window_seconds=3600) for op in samples]),
+    ):
+        start = time.perf_counter()
+        obj = fill()
+        record_us = (time.perf_counter() - start) / total * 1e6
+        start = time.perf_counter()
+        query(obj)
+        query_ms = (time.perf_counter() - start) * 1000
+        memory = retained_kib(fill)
+        print(f"{label:>12} {record_us:>14.2f} {query_ms:>15.2f} {memory:>14.0f}")
+
+    collector = obj
+    errors = []
+    for operation, values in samples.items():
+        exact = np.percentile(values, (50, 95, 99))
+        summary = collector.get_latency_percentiles(operation)
+        measured = np.array([summary["p50"], summary["p95"], summary["p99"]])
+        errors.append(np.abs(measured - exact) / exact * 100)
+    worst = np.max(errors, axis=0)
+    snapshot = collector.get_latency_snapshot("op0")
+    print(f"\nerro relativo máx. p50/p95/p99: {worst[0]:.2f}% / {worst[1]:.2f}% / {worst[2]:.2f}%")
+    print(f"snapshot binário de uma operação: {len(snapshot)} bytes")
+    print(f"memória fixa por operação: {collector.latency['op0'].memory_bytes / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
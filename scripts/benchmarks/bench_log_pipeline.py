@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+📝 BENCHMARK - Pipeline assíncrono de logs
+
+Compara o custo na thread de quem loga entre o FileHandler síncrono
+(formata e escreve a cada registro) e o LogPipeline (só resolve a mensagem
+e enfileira; a thread escritora formata e grava em lotes), com o disco rápido e com travadas
+simuladas de escrita (cartão SD/eMMC ocupado), o custo de um debug
+desligado no StructuredLogger e os descartes contados numa rajada maior que
+a fila.
+
+Uso:
+    python scripts/benchmarks/bench_log_pipeline.py [--repeat 20000] [--stall-ms 20] [--stall-every 500]
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Adicionar paths
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from t031a5.logging.log_pipeline import LogPipeline
+from t031a5.logging.structured_logger import StructuredLogger, LogLevel, LogContext
+
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class StallingStream:
+    """Arquivo cuja escrita trava ``stall`` segundos a cada ``every`` chamadas."""
+
+    def __init__(self, stream, stall: float, every: int):
+        self._stream = stream
+        self.stall = stall
+        self.every = every
+        self.calls = 0
+
+    def write(self, text):
+        self.calls += 1
+        if self.stall and self.calls % self.every == 0:
+            time.sleep(self.stall)
+        return self._stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def fresh_logger(name: str) -> logging.Logger:
+    log = logging.getLogger(name)
+    log.handlers.clear()
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    return log
+
+
+def emit(log: logging.Logger, repeat: int) -> np.ndarray:
+    """Latência (µs) de cada chamada na thread de quem loga."""
+    payload = {"inputs": 3, "emotion": "happy", "confidence": 0.87}
+    durations = np.empty(repeat)
+    clock = time.perf_counter
+    for i in range(repeat):
+        start = clock()
+        log.info("turno %d: dados %s", i, payload)
+        durations[i] = clock() - start
+    return durations * 1e6
+
+
+def bench_sync(directory: Path, repeat: int, stall: float, every: int) -> np.ndarray:
+    log = fresh_logger("bench.sync")
+    handler = logging.FileHandler(directory / "sync.log")
+    handler.setFormatter(logging.Formatter(FORMAT))
+    handler.stream = StallingStream(handler.stream, stall, every)
+    log.addHandler(handler)
+    durations = emit(log, repeat)
+    handler.close()
+    return durations
+
+
+def bench_pipeline(directory: Path, repeat: int, queue_size: int, stall: float = 0.0, every: int = 1):
+    log = fresh_logger("bench.pipeline")
+    pipeline = LogPipeline({"file": directory / "pipeline.log", "queue_size": queue_size,
+                            "format": FORMAT, "max_bytes": 1024 * 1024})
+    # Mesma taxa de travadas por registro: a escritora grava um lote por write
+    pipeline.file._stream = StallingStream(pipeline.file._stream, stall, max(1, every // pipeline.batch_size))
+    pipeline.install(log)
+    pipeline.start()
+    durations = emit(log, repeat)
+    start = time.perf_counter()
+    pipeline.stop(timeout=30.0)
+    drain_ms = (time.perf_counter() - start) * 1000
+    return durations, drain_ms, pipeline.get_stats()
+
+
+def row(label: str, durations: np.ndarray) -> str:
+    p99, worst = np.percentile(durations, 99), durations.max()
+    return f"{label:>28} {durations.mean():>10.2f} {p99:>10.2f} {worst / 1000:>10.2f}"
+
+
+def bench_disabled(repeat: int) -> float:
+    structured = StructuredLogger("bench.structured", console_output=False, json_output=True,
+                                  level=LogLevel.INFO)
+    context = LogContext(component="engine", operation="turn")
+    start = time.perf_counter()
+    for i in range(repeat):
+        structured.debug("turno", context, index=i)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline de logs")
+    parser.add_argument("--repeat", type=int, default=20000, help="Registros por cenário")
+    parser.add_argument("--stall-ms", type=float, default=20.0, help="Duração de cada travada do disco")
+    parser.add_argument("--stall-every", type=int, default=500, help="Registros entre travadas")
+    args = parser.parse_args()
+    stall = args.stall_ms / 1000
+
+    print("📝 BENCHMARK PIPELINE DE LOGS")
+    print("=" * 64)
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        print(f"\n{'':>28} {'média (µs)':>10} {'p99 (µs)':>10} {'máx (ms)':>10}")
+        print(row("FileHandler", bench_sync(directory, args.repeat, 0.0, 1)))
+        async_us, drain_ms, stats = bench_pipeline(directory, args.repeat, queue_size=args.repeat)
+        print(row("LogPipeline", async_us))
+        label = f"travada {args.stall_ms:g}ms/{args.stall_every}"
+        print(row(f"FileHandler {label}", bench_sync(directory, args.repeat, stall, args.stall_every)))
+        stalled_us, _, _ = bench_pipeline(directory, args.repeat, args.repeat, stall, args.stall_every)
+        print(row(f"LogPipeline {label}", stalled_us))
+        print(f"\nescritora: {stats['written']} registros em {stats['batches']} lotes "
+              f"(média {stats['avg_batch']}, {stats['avg_batch_ms']} ms/lote), "
+              f"esvaziou em {drain_ms:.0f} ms, {stats['rotations']} rotações")
+
+        _, _, burst = bench_pipeline(directory, args.repeat, queue_size=max(1, args.repeat // 20))
+        print(f"rajada com fila de {max(1, args.repeat // 20)}: {burst['dropped']} descartados "
+              f"{burst['dropped_by_level']}, {burst['written']} escritos")
+
+    print(f"\ndebug desligado no StructuredLogger: {bench_disabled(args.repeat):.2f} µs/chamada")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+⏱️ BENCHMARK - Navegação local (grade de ocupação + A*)
+
+Mede o custo de integrar um frame de profundidade 640x480 na grade e o
+tempo de planejamento A* em grades de tamanhos diferentes, com campos de
+obstáculos aleatórios. Rodar no Jetson para obter os números de referência
+do robô.
+
+Uso:
+    python scripts/benchmarks/bench_navigation.py [--repeat 50] [--seed 0]
+"""
+
+import argparse
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Adicionar paths
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from t031a5.navigation import CameraModel, GridPlanner, OccupancyGrid
+
+
+def synthetic_depth(camera: CameraModel, wall_distance: float = 2.0, wall_half_width: float = 0.6,
+                    width: int = 640, height: int = 480) -> np.ndarray:
+    """Frame z16 sintético: chão plano com uma parede à frente."""
+    v, u = np.mgrid[0:height, 0:width]
+    a = (u - camera.cx) / camera.fx
+    b = (v - camera.cy) / camera.fy
+    sin_p, cos_p = math.sin(camera.pitch), math.cos(camera.pitch)
+
+    floor_den = sin_p + b * cos_p
+    z_floor = np.where(floor_den > 1e-6, camera.height / np.maximum(floor_den, 1e-6), np.inf)
+    wall_den = cos_p - b * sin_p
+    z_wall = np.where(wall_den > 1e-6, (wall_distance - camera.forward_offset) / np.maximum(wall_den, 1e-6), np.inf)
+    wall_height = camera.height - (z_wall * sin_p + b * z_wall * cos_p)
+    on_wall = (np.abs(a * z_wall) < wall_half_width) & (wall_height > 0) & (wall_height < 1.5)
+
+    z = np.where(on_wall, np.minimum(z_wall, z_floor), z_floor)
+    z = np.where(np.isfinite(z) & (z < 10), z, 0)
+    return (z * 1000).astype(np.uint16)
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return statistics.median(ordered), ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+def bench_integration(repeat: int):
+    print("\n📷 Integração de profundidade (640x480)")
+    print(f"{'stride':>8} {'pontos':>8} {'mediana (ms)':>14} {'p95 (ms)':>10}")
+    for stride in (2, 4, 8):
+        grid = OccupancyGrid(pixel_stride=stride)
+        depth = synthetic_depth(grid.camera)
+        samples = []
+        points = 0
+        for i in range(repeat):
+            start = time.perf_counter()
+            points = grid.integrate_depth(depth, (0.0, 0.0, 0.0))
+            samples.append((time.perf_counter() - start) * 1000)
+        median, p95 = percentiles(samples)
+        print(f"{stride:>8} {points:>8} {median:>14.2f} {p95:>10.2f}")
+
+
+def bench_planning(repeat: int, seed: int):
+    print("\n🧭 Planejamento A* (obstáculos aleatórios, centro → canto)")
+    print(f"{'grade':>10} {'densidade':>10} {'inflar (ms)':>12} {'mediana (ms)':>14} {'p95 (ms)':>10} "
+          f"{'nós':>8} {'sucesso':>8}")
+    rng = np.random.default_rng(seed)
+    planner = GridPlanner()
+
+    for size_m in (4.0, 8.0, 12.0):
+        for density in (0.0, 0.001, 0.003):  # obstáculos pontuais antes da inflação de 0.3m
+            grid = OccupancyGrid(size_m=size_m)
+            inflate_samples, plan_samples = [], []
+            expanded = 0
+            successes = 0
+            for _ in range(repeat):
+                grid.clear()
+                cells = grid.cells
+                obstacles = rng.random((cells, cells)) < density
+                grid.log_odds[obstacles] = grid.clamp
+
+                start = time.perf_counter()
+                blocked = grid.inflated(0.3)
+                inflate_samples.append((time.perf_counter() - start) * 1000)
+
+                start_cell = (cells // 2, cells // 2)
+                goal_cell = (cells - 2, cells - 2)
+                blocked[goal_cell] = False
+                result = planner.plan(blocked, start_cell, goal_cell)
+                plan_samples.append(result.plan_time_ms)
+                expanded = max(expanded, result.expanded)
+                successes += result.success
+
+            inflate_median, _ = percentiles(inflate_samples)
+            median, p95 = percentiles(plan_samples)
+            label = f"{grid.cells}x{grid.cells}"
+            print(f"{label:>10} {density:>10.1%} {inflate_median:>12.2f} {median:>14.2f} {p95:>10.2f} "
+                  f"{expanded:>8} {successes / repeat:>8.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da navegação local")
+    parser.add_argument("--repeat", type=int, default=50, help="Iterações por medição")
+    parser.add_argument("--seed", type=int, default=0, help="Semente dos obstáculos")
+    args = parser.parse_args()
+
+    print("⏱️ BENCHMARK NAVEGAÇÃO LOCAL")
+    print("=" * 60)
+    bench_integration(args.repeat)
+    bench_planning(args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
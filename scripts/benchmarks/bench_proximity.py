@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+⏱️ BENCHMARK - Proximidade e estatísticas de profundidade (D435i)
+
+Compara o antigo _calculate_depth_stats (máscara + cópia + np.median na
+imagem inteira) com a versão decimada em buffer reutilizado, e mede o custo
+por frame do ProximityMonitor (ROIs frontais, percentil robusto) em várias
+resoluções e decimações.
+
+Uso:
+    python scripts/benchmarks/bench_proximity.py [--repeat 200]
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Adicionar paths
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from t031a5.security.proximity import DepthRegion, ProximityMonitor
+
+
+def synthetic_depth(height: int, width: int, seed: int = 0) -> np.ndarray:
+    """Frame z16: chão inclinado, um obstáculo à frente e ~15% de buracos."""
+    rng = np.random.default_rng(seed)
+    rows = np.linspace(4000, 800, height, dtype=np.float32)[:, None]
+    depth = np.broadcast_to(rows, (height, width)) + rng.normal(0, 30, (height, width))
+    depth[height // 3:height * 3 // 4, width * 2 // 5:width * 3 // 5] = 650
+    depth[rng.random((height, width)) < 0.15] = 0
+    return depth.clip(0, 65535).astype(np.uint16)
+
+
+def legacy_stats(depth_image: np.ndarray) -> dict:
+    valid_depths = depth_image[depth_image > 0] * 0.001
+    return {
+        "min_distance": float(np.min(valid_depths)),
+        "max_distance": float(np.max(valid_depths)),
+        "mean_distance": float(np.mean(valid_depths)),
+        "median_distance": float(np.median(valid_depths)),
+    }
+
+
+def region_stats(region: DepthRegion, depth_image: np.ndarray) -> dict:
+    valid = region.sample(depth_image)
+    low, median, high = region.quantiles(valid, (0.0, 0.5, 1.0)).tolist()
+    return {
+        "min_distance": low * 0.001,
+        "max_distance": high * 0.001,
+        "mean_distance": region.valid_sum(valid) / valid * 0.001,
+        "median_distance": median * 0.001,
+    }
+
+
+def timed_us(func, repeat: int):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de proximidade por profundidade")
+    parser.add_argument("--repeat", type=int, default=200, help="Frames por medição")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)  # transições de alerta do obstáculo sintético
+
+    print("⏱️ BENCHMARK PROXIMIDADE (D435i)")
+    print("=" * 72)
+    print(f"{'resolução':>10} {'passo':>5} {'stats antigo (µs)':>18} {'stats novo (µs)':>16} "
+          f"{'Δmediana (m)':>13} {'ROIs (µs)':>10}")
+
+    for height, width in ((480, 640), (480, 848), (720, 1280)):
+        depth = synthetic_depth(height, width)
+        legacy_us, legacy = timed_us(lambda: legacy_stats(depth), args.repeat)
+        for stride in (1, 2, 4):
+            region = DepthRegion("frame", stride=stride)
+            new_us, stats = timed_us(lambda: region_stats(region, depth), args.repeat)
+            monitor = ProximityMonitor({"stride": stride})
+            # Frames distintos para não cair no atalho de frame repetido
+            frames = [depth, depth.copy()]
+            counter = iter(range(10 ** 9))
+            roi_us, _ = timed_us(lambda: monitor.update(frames[next(counter) % 2]), args.repeat)
+            error = abs(stats["median_distance"] - legacy["median_distance"])
+            print(f"{width}x{height:>4} {stride:>5} {legacy_us:>18.0f} {new_us:>16.0f} "
+                  f"{error:>13.3f} {roi_us:>10.0f}")
+
+    reading = monitor.reading.to_dict()
+    print(f"\nleitura (720p, passo 4): mais próximo {reading['nearest']}m em {reading['nearest_region']}; "
+          f"veto de avanço: {monitor.vetoes_forward()}")
+
+
+if __name__ == "__main__":
+    main()
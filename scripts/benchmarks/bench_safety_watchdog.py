@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+⏱️ BENCHMARK - Tempo de reação do watchdog de segurança (injeção de falhas)
+
+Roda o LocomotionStreamController com o SDK simulado, coloca o robô em
+movimento e trava o event loop com ``time.sleep`` (como uma chamada
+bloqueante de STT/visão/LLM). Mede o tempo da última batida do streaming
+até o StopMove enviado pela thread do watchdog, e confere que o loop, ao
+voltar, não retoma a velocidade antiga.
+
+Uso:
+    python scripts/benchmarks/bench_safety_watchdog.py [--repeat 20] [--deadline 0.2]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Adicionar paths
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from t031a5.connectors.g1_fake_sdk import FakeLocoClient, FakeRobot
+from t031a5.connectors.locomotion_stream import LocomotionStreamController
+from t031a5.security import proximity as proximity_module
+from t031a5.security import watchdog as watchdog_module
+from t031a5.security.proximity import ProximityMonitor
+from t031a5.security.watchdog import SafetyWatchdog
+
+
+async def inject_stall(robot: FakeRobot, watchdog: SafetyWatchdog, deadline: float, stall: float):
+    """Um ciclo: anda, trava o loop, mede a reação e verifica a retomada."""
+    stream_client = FakeLocoClient(robot)
+
+    async def publish(vx, vy, vyaw):
+        stream_client.Move(vx, vy, vyaw)
+
+    stream = LocomotionStreamController({"rate_hz": 50, "watchdog_deadline": deadline}, publish)
+    await stream.start()
+    stream.set_target(0.4, 0.0, 0.0)
+    await asyncio.sleep(0.5)
+    assert robot.velocity[0] > 0, "robô deveria estar andando antes da falha"
+
+    jitter = watchdog.get_status()["sources"]["locomotion"].get("p99_jitter_ms", 0.0)
+    stops_before = robot.count("StopMove")
+    trips_before = watchdog.trips
+    time.sleep(stall)  # falha injetada: event loop bloqueado
+
+    trip = watchdog.last_trip if watchdog.trips > trips_before else None
+    stopped = robot.count("StopMove") > stops_before
+
+    # Após a falha o streaming deve zerar o setpoint em vez de retomar o alvo
+    await asyncio.sleep(0.1)
+    resumed = robot.velocity[0] > 0
+    await stream.stop()
+    return trip, stopped, resumed, jitter
+
+
+async def run(repeat: int, deadline: float, stall: float, check_interval: float):
+    robot = FakeRobot()
+    watchdog = SafetyWatchdog({"check_interval": check_interval}, client_factory=lambda: FakeLocoClient(robot))
+    watchdog_module._safety_watchdog = watchdog
+    # Sem câmera no benchmark: o monitor do processo falha fechado e vetaria todo avanço
+    proximity_module._proximity_monitor = ProximityMonitor({"enabled": False})
+    watchdog.start()
+
+    reactions, detections, jitters = [], [], []
+    failures = resumed_count = 0
+    for _ in range(repeat):
+        trip, stopped, resumed, jitter = await inject_stall(robot, watchdog, deadline, stall)
+        jitters.append(jitter)
+        if trip is None or not stopped or trip.reaction_ms is None:
+            failures += 1
+            continue
+        reactions.append(trip.reaction_ms)
+        detections.append((trip.detected_at - trip.last_beat) * 1000)
+        resumed_count += resumed
+
+    status = watchdog.get_status()
+    watchdog.stop()
+    return reactions, detections, jitters, failures, resumed_count, status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Injeção de falhas no watchdog de segurança")
+    parser.add_argument("--repeat", type=int, default=20, help="Falhas injetadas")
+    parser.add_argument("--deadline", type=float, default=0.2, help="Prazo do heartbeat da locomoção (s)")
+    parser.add_argument("--stall", type=float, default=0.5, help="Duração do travamento do loop (s)")
+    parser.add_argument("--check-interval", type=float, default=0.01, help="Período de verificação (s)")
+    args = parser.parse_args()
+
+    print("⏱️ BENCHMARK WATCHDOG DE SEGURANÇA")
+    print("=" * 60)
+    print(f"prazo {args.deadline * 1000:.0f}ms, verificação {args.check_interval * 1000:.0f}ms, "
+          f"travamento {args.stall * 1000:.0f}ms, {args.repeat} falhas injetadas")
+
+    logging.disable(logging.CRITICAL)  # só a tabela; os disparos são esperados
+    reactions, detections, jitters, failures, resumed, status = asyncio.run(
+        run(args.repeat, args.deadline, args.stall, args.check_interval)
+    )
+
+    print(f"\n{'':>22} {'mediana':>9} {'p95':>9} {'máx':>9}")
+    for label, values in (("detecção (ms)", detections), ("reação StopMove (ms)", reactions)):
+        if values:
+            ordered = sorted(values)
+            p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+            print(f"{label:>22} {statistics.median(values):>9.1f} {p95:>9.1f} {max(values):>9.1f}")
+
+    print(f"\nfalhas sem parada: {failures}   retomadas indevidas: {resumed}   "
+          f"atraso máx. da thread: {status['max_check_lag_ms']:.1f}ms")
+    print(f"limite teórico: prazo + verificação = {(args.deadline + args.check_interval) * 1000:.0f}ms")
+    print(f"jitter p99 do streaming antes das falhas: {statistics.median(jitters):.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+🔬 BENCHMARK - Profiler por amostragem e detector de travadas
+
+Mede quanto o profiler custa para uma carga no event loop (callbacks curtos
+de CPU + threads paradas em filas, como os executores do SDK): vazão sem
+profiler, só vigiando travadas, e amostrando a 100 Hz e 1000 Hz. Depois
+injeta travadas (``time.sleep`` dentro de uma task) e confere se cada uma é
+detectada e atribuída à task certa.
+
+Uso:
+    python scripts/benchmarks/bench_sampling_profiler.py [--repeat 3] [--seconds 2]
+"""
+
+import argparse
+import asyncio
+import logging
+import queue
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Adicionar paths
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from t031a5.logging.profiler import SamplingProfiler
+
+
+def busy(n: int) -> int:
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+
+async def workload(seconds: float) -> float:
+    """Callbacks de ~0,2 ms intercalados com o loop; retorna callbacks/s."""
+    done = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        busy(2000)
+        done += 1
+        await asyncio.sleep(0)
+    return done / seconds
+
+
+async def run_scenario(config, profile: bool, seconds: float) -> tuple:
+    profiler = None
+    if config is not None:
+        profiler = SamplingProfiler(config)
+        profiler.start()
+        profiler.attach_loop()
+        if profile:
+            profiler.start_profiling()
+    rate = await workload(seconds)
+    status = None
+    if profiler:
+        profiler.stop_profiling(export=False)
+        status = profiler.get_status()
+        profiler.detach_loop()
+        profiler.stop()
+    return rate, status
+
+
+async def stall_detection(durations_ms) -> list:
+    profiler = SamplingProfiler({"stall_threshold_ms": 100, "signal": None})
+    profiler.start()
+    profiler.attach_loop()
+
+    async def blocking_handler(ms: float):
+        time.sleep(ms / 1000)
+
+    for ms in durations_ms:
+        await asyncio.sleep(0.3)
+        await asyncio.create_task(blocking_handler(ms), name=f"handler-{ms:g}ms")
+    await asyncio.sleep(0.3)
+    profiler.detach_loop()
+    profiler.stop()
+    return list(profiler.stalls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do profiler por amostragem")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições por cenário")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Duração de cada repetição")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    # Threads ociosas como as do executor de comandos e do watchdog
+    idle_queues = [queue.Queue() for _ in range(8)]
+    idle_threads = [threading.Thread(target=q.get, name=f"sdk-worker_{i}", daemon=True)
+                    for i, q in enumerate(idle_queues)]
+    for thread in idle_threads:
+        thread.start()
+
+    scenarios = [
+        ("sem profiler", None, False),
+        ("só travadas", {"signal": None}, False),
+        ("100 Hz", {"interval": 0.01, "signal": None}, True),
+        ("1000 Hz", {"interval": 0.001, "signal": None}, True),
+    ]
+
+    print("🔬 BENCHMARK PROFILER POR AMOSTRAGEM")
+    print("=" * 72)
+    print(f"\n{'':>14} {'callbacks/s':>12} {'custo (%)':>10} {'amostra (µs)':>13} {'overhead (%)':>13}")
+    # Aquecimento, depois cenários intercalados para o ruído da máquina afetar todos igual
+    asyncio.run(workload(args.seconds / 2))
+    results = {label: ([], []) for label, _, _ in scenarios}
+    for _ in range(args.repeat):
+        for label, config, profile in scenarios:
+            rate, status = asyncio.run(run_scenario(config, profile, args.seconds))
+            results[label][0].append(rate)
+            results[label][1].append(status)
+    baseline = statistics.median(results["sem profiler"][0])
+    for label, _, _ in scenarios:
+        rates, statuses = results[label]
+        rate = statistics.median(rates)
+        sample_us = statuses[-1]["avg_sample_us"] if statuses[-1] else 0.0
+        overhead = statuses[-1]["overhead_pct"] if statuses[-1] else 0.0
+        print(f"{label:>14} {rate:>12.0f} {(1 - rate / baseline) * 100:>10.2f} {sample_us:>13.1f} {overhead:>13.3f}")
+
+    print(f"\n{'travada injetada':>18} {'detectada (ms)':>15}  culpado")
+    injected = [150, 300, 800]
+    stalls = asyncio.run(stall_detection(injected))
+    for ms, stall in zip(injected, stalls):
+        print(f"{ms:>16}ms {stall.duration_ms:>15.0f}  {stall.culprit} @ {stall.location}")
+    if len(stalls) != len(injected):
+        print(f"⚠️ {len(stalls)} travadas detectadas de {len(injected)} injetadas")
+
+    for q in idle_queues:
+        q.put(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+⏱️ BENCHMARK - Verificação de saúde do sistema (PerformanceMonitor)
+
+Compara a leitura antiga (``psutil.cpu_percent(interval=0.1)`` a cada
+verificação, bloqueando 100ms) com a última amostra em cache do
+SystemSampler, e mede o custo de cada amostra em background (CPU do
+sistema e por núcleo, threads, filhos, disco, GPU/temperatura da Jetson).
+
+Uso:
+    python scripts/benchmarks/bench_system_sampler.py [--repeat 20]
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import psutil
+
+# Adicionar paths
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from t031a5.logging.system_sampler import SystemSampler
+
+
+def legacy_check() -> dict:
+    return {
+        "cpu_usage": psutil.cpu_percent(interval=0.1),
+        "memory_usage": psutil.virtual_memory().percent,
+        "disk_usage": psutil.disk_usage('/').percent
+    }
+
+
+def cached_check(sampler: SystemSampler) -> dict:
+    sample = sampler.latest or sampler.sample_now()
+    return {
+        "cpu_usage": sample.cpu_percent,
+        "memory_usage": sample.memory_percent,
+        "disk_usage": sample.disk_percent
+    }
+
+
+def timed_ms(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da verificação de saúde do sistema")
+    parser.add_argument("--repeat", type=int, default=20, help="Verificações por medição")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print("⏱️ BENCHMARK AMOSTRAGEM DO SISTEMA")
+    print("=" * 60)
+
+    sampler = SystemSampler({"interval": 0.1})
+    sample_ms = timed_ms(sampler.sample_now, args.repeat)
+    sampler.start()
+    time.sleep(0.3)
+
+    print(f"{'verificação antiga (cpu_percent interval=0.1)':>48}: {timed_ms(legacy_check, args.repeat):>8.2f} ms")
+    print(f"{'verificação com amostra em cache':>48}: {timed_ms(lambda: cached_check(sampler), args.repeat):>8.3f} ms")
+    print(f"{'custo de uma amostra (thread de fundo)':>48}: {sample_ms:>8.2f} ms")
+    print(f"{'baseline antigo na inicialização':>48}: {'~20 s (10 × 2 s)':>11}")
+
+    sampler.stop()
+    latest = sampler.latest.to_dict()
+    print(f"\nCPU {latest['cpu_percent']}% ({len(latest['cpu_per_core'])} núcleos), "
+          f"processo {latest['process']['cpu_percent']}%, RSS {latest['process']['rss_mb']} MB")
+    print(f"GPU: {latest['gpu_percent']}   temperaturas: {latest['temperatures'] or '-'}")
+    for thread in latest["process"]["threads"]:
+        print(f"  thread {thread['name']:<20} {thread['cpu_percent']:>6.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+⏱️ BENCHMARK - Análise de texto (emoção / gestos / sinais de áudio)
+
+Compara as varreduras antigas por palavra-chave (uma por chamador) com o
+TextAnalyzer compartilhado (índice de tokens: interseção de conjuntos para
+palavras, regex só para frases cuja primeira palavra aparece no texto).
+
+Uso:
+    python scripts/benchmarks/bench_text_analysis.py [--repeat 200]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+# Adicionar paths
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from t031a5.conversation.text_analysis import (
+    AUDIO_CUE_KEYWORDS, EMOTION_KEYWORDS, GESTURE_KEYWORDS, TextAnalyzer
+)
+
+PARAGRAPH = (
+    "Olá! Que ótimo te ver por aqui. Hmm... deixe-me pensar um pouco sobre isso. "
+    "Eu vejo que você está interessado em robótica, o que é incrível! "
+    "Posso explicar como meus braços funcionam e mostrar alguns gestos. "
+    "Se algo não funcionou da última vez, não se preocupe, vamos com calma e cuidado. "
+)
+
+LED_EMOTIONS = ("happy", "excited", "calm", "thinking", "concerned", "sad", "neutral")
+
+
+def legacy_led_scan(text: str) -> str:
+    """Varredura antiga de AudioVisualDynamic / EmotionSpeechIntegration."""
+    text_lower = text.lower()
+    scores = {}
+    for emotion in LED_EMOTIONS:
+        scores[emotion] = sum(1 for keyword in EMOTION_KEYWORDS[emotion] if keyword in text_lower)
+    if "!" in text:
+        scores["excited"] += 2
+    if "?" in text:
+        scores["thinking"] += 1
+    if "..." in text:
+        scores["thinking"] += 1
+    best = max(scores, key=scores.get)
+    return best if scores[best] else "neutral"
+
+
+def legacy_engine_scan(text: str):
+    """Varreduras antigas do ConversationEngine (emoção, gestos, áudio)."""
+    text_lower = text.lower()
+    emotion = next((e for e, kws in EMOTION_KEYWORDS.items()
+                    if any(k in text_lower for k in kws)), "neutral")
+    gesture = next((g for g, kws in GESTURE_KEYWORDS.items()
+                    if any(k in text_lower for k in kws)), None)
+    cues = [c for c, kws in AUDIO_CUE_KEYWORDS.items() if any(k in text_lower for k in kws)]
+    return emotion, gesture, cues
+
+
+def legacy_turn(text: str):
+    """Um turno antigo: engine + dois conectores de LED, cada um varrendo o texto."""
+    legacy_engine_scan(text)
+    legacy_led_scan(text)
+    legacy_led_scan(text)
+
+
+def shared_turn(analyzer: TextAnalyzer, text: str):
+    """Um turno novo: uma análise compartilhada por todos os chamadores."""
+    analysis = analyzer.analyze(text)
+    analysis.best_emotion()
+    analysis.best_gesture()
+    analysis.audio_cues()
+    analysis.best_emotion(LED_EMOTIONS)
+    analysis.best_emotion(LED_EMOTIONS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da análise de texto")
+    parser.add_argument("--repeat", type=int, default=200, help="Iterações por medição")
+    args = parser.parse_args()
+
+    analyzer = TextAnalyzer()
+
+    print("⏱️ BENCHMARK ANÁLISE DE TEXTO")
+    print("=" * 60)
+    print(f"{'tamanho':>10} {'antigo (µs)':>14} {'compartilhado (µs)':>20} {'ganho':>8}")
+
+    for paragraphs in (1, 10, 50, 200):
+        text = PARAGRAPH * paragraphs
+        legacy = min(timeit.repeat(lambda: legacy_turn(text), number=args.repeat, repeat=3))
+        shared = min(timeit.repeat(lambda: shared_turn(analyzer, text), number=args.repeat, repeat=3))
+        legacy_us = legacy / args.repeat * 1e6
+        shared_us = shared / args.repeat * 1e6
+        print(f"{len(text):>10} {legacy_us:>14.1f} {shared_us:>20.1f} {legacy_us / shared_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+⏱️ BENCHMARK - Custo do tracing por turno
+
+Mede o custo de abrir/fechar um span e de um marco (ligado e desligado),
+simula turnos com a mesma árvore de spans do runtime (captura, fusão,
+prompt, LLM com primeiro token, fala com TTS/reprodução) e imprime os
+percentis por estágio do ``get_status``. Com ``--export`` grava o buffer em
+Chrome trace e OTLP/JSON.
+
+Uso:
+    python scripts/benchmarks/bench_tracing.py [--repeat 100000] [--turns 50] [--export /tmp/traces]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Adicionar paths
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from t031a5.logging.tracing import Tracer
+
+
+def cost_ns(func, repeat: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter_ns() - start) / repeat
+
+
+def span_cost(tracer: Tracer, repeat: int) -> float:
+    def once():
+        with tracer.span("stage"):
+            pass
+    return cost_ns(once, repeat)
+
+
+def mark_cost(tracer: Tracer, repeat: int) -> float:
+    with tracer.span("parent"):
+        return cost_ns(lambda: tracer.mark("event"), repeat)
+
+
+async def simulated_turn(tracer: Tracer, rng: random.Random):
+    """Mesma árvore de spans do CortexRuntime + ConversationEngine (tempos sintéticos)."""
+    turn = tracer.start_span("turn", parent=None)
+    capture = tracer.start_span("input.capture", parent=turn)
+    await asyncio.sleep(rng.uniform(0.001, 0.004))
+    capture.end()
+
+    with tracer.activate(turn):
+        with tracer.span("fusion"):
+            await asyncio.sleep(rng.uniform(0.0005, 0.002))
+        with tracer.span("prompt.build"):
+            pass
+        with tracer.span("llm"):
+            await asyncio.sleep(rng.uniform(0.005, 0.02))
+            tracer.mark("llm.first_token")
+            await asyncio.sleep(rng.uniform(0.005, 0.02))
+        with tracer.span("response.execute"):
+            async def speak():
+                with tracer.span("action.G1Speech"):
+                    await asyncio.sleep(rng.uniform(0.005, 0.015))
+                    tracer.mark("tts.first_byte")
+                    tracer.mark("playback.start")
+                    await asyncio.sleep(rng.uniform(0.01, 0.03))
+
+            async def arms():
+                with tracer.span("action.G1Arms"):
+                    await asyncio.sleep(rng.uniform(0.005, 0.02))
+
+            await asyncio.gather(speak(), arms())
+    turn.end()
+
+
+async def run_turns(tracer: Tracer, turns: int):
+    rng = random.Random(0)
+    for _ in range(turns):
+        await simulated_turn(tracer, rng)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do tracing por turno")
+    parser.add_argument("--repeat", type=int, default=100000, help="Spans por medição de custo")
+    parser.add_argument("--turns", type=int, default=50, help="Turnos simulados")
+    parser.add_argument("--export", type=str, default=None, help="Diretório para exportar os traces")
+    args = parser.parse_args()
+
+    print("⏱️ BENCHMARK TRACING")
+    print("=" * 60)
+    print(f"{'':>20} {'ligado (ns)':>12} {'desligado (ns)':>15}")
+    enabled, disabled = Tracer({"capacity": 4096}), Tracer({"enabled": False})
+    print(f"{'span (abrir+fechar)':>20} {span_cost(enabled, args.repeat):>12.0f} "
+          f"{span_cost(disabled, args.repeat):>15.0f}")
+    print(f"{'marco':>20} {mark_cost(enabled, args.repeat):>12.0f} {mark_cost(disabled, args.repeat):>15.0f}")
+
+    tracer = Tracer({"capacity": 4096})
+    asyncio.run(run_turns(tracer, args.turns))
+    status = tracer.get_status()
+    print(f"\n{args.turns} turnos simulados: {status['spans']} spans, {status['buffered']} no buffer")
+    print(f"{'estágio':>20} {'n':>5} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+    for name, stats in status["stages"].items():
+        print(f"{name:>20} {stats['count']:>5} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+              f"{stats['p99_ms']:>9.2f}")
+
+    if args.export:
+        for path in tracer.export(args.export):
+            print(f"exportado: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,9 @@ from .g1_emotion import G1EmotionAction
 from .g1_movement import G1MovementAction
 from .g1_arms import G1ArmsAction
 from .g1_audio import G1AudioAction
+from .g1_sequence_compiler import (
+    G1SequenceCompiler, MovementPlan, PlanStep, SequenceCompilationError, get_sequence_compiler
+)
 
 __all__ = [
     "BaseAction",
@@ -23,4 +26,9 @@ __all__ = [
     "G1MovementAction",
     "G1ArmsAction",
     "G1AudioAction",
+    "G1SequenceCompiler",
+    "MovementPlan",
+    "PlanStep",
+    "SequenceCompilationError",
+    "get_sequence_compiler",
 ]
@@ -20,6 +20,7 @@ from enum import Enum
 
 from .base import BaseAction, ActionRequest, ActionResult
 from .g1_movement_mapping import G1MovementLibrary, G1MovementType
+from .g1_sequence_compiler import SequenceCompilationError, get_sequence_compiler
 from ..connectors.g1_arms_real import G1ArmsRealConnector
 
 
@@ -66,13 +67,15 @@ class ArmPosition:
 class ArmCommand:
     """Comando para o braço."""
     arm_type: ArmType
-    action: str  # "move", "grip", "release", "gesture", "point", "wave"
+    action: str  # "move", "grip", "release", "gesture", "point", "wave", "sequence"
     target_position: Optional[ArmPosition] = None
     target_pose: Optional[Tuple[float, float, float]] = None  # (x, y, z) em metros
     gesture_name: Optional[str] = None
     duration: Optional[float] = None  # segundos
     speed: Optional[float] = None     # rad/s
     force_limit: Optional[float] = None  # N
+    sequence: Optional[Tuple[Any, ...]] = None  # IDs/nomes de gestos da biblioteca
+    pattern: Optional[str] = None               # nome em MOVEMENT_PATTERNS
 
 
 @dataclass
@@ -126,9 +129,10 @@ class G1ArmsAction(BaseAction):
         
         # G1ArmsRealConnector - MÉTODO VALIDADO (Teste 8)
         self.g1_arms_real = G1ArmsRealConnector({
-            "enabled": not self.mock_mode,
+            "enabled": not config.get("mock_mode", False),
             "network_interface": config.get("network_interface", "eth0"),
-            "timeout": config.get("timeout", 10.0)
+            "timeout": config.get("timeout", 10.0),
+            "fake_sdk": config.get("fake_sdk", False)  # SDK simulado para testes fora do robô
         })
         
         # Estado dos braços
@@ -279,10 +283,11 @@ class G1ArmsAction(BaseAction):
         self.logger.info("Braços mock inicializados")
     
     async def _initialize_real_arms(self):
-        """Inicializa braços reais do robô."""
-        # Aqui seria a inicialização do hardware real dos braços
-        # Por exemplo: motores, encoders, sensores de força, etc.
-        self.logger.info("Braços reais inicializados (simulado)")
+        """Inicializa braços reais do robô (G1ArmActionClient pela sessão compartilhada)."""
+        if await self.g1_arms_real.initialize():
+            self.logger.info("Braços reais inicializados (G1ArmActionClient)")
+        else:
+            self.logger.warning("G1ArmActionClient indisponível - gestos usarão o fallback local")
     
     async def _initialize_force_control(self):
         """Inicializa controle de força."""
@@ -379,6 +384,18 @@ class G1ArmsAction(BaseAction):
                     duration=content.get("duration", 3.0)
                 )
             
+            # Gestos da biblioteca: ID único, sequência avulsa ou padrão
+            if "movement_id" in content or "sequence" in content or "pattern" in content:
+                sequence = content.get("sequence")
+                if sequence is None and "movement_id" in content:
+                    sequence = [content["movement_id"]]
+                return ArmCommand(
+                    arm_type=ArmType.BOTH,
+                    action="sequence",
+                    sequence=tuple(sequence) if sequence is not None else None,
+                    pattern=content.get("pattern")
+                )
+            
             action = content.get("action", "").lower()
             arm_type_str = content.get("arm", "both").lower()
             
@@ -510,6 +527,9 @@ class G1ArmsAction(BaseAction):
             elif command.action == "wave":
                 return await self._execute_wave(command)
             
+            elif command.action == "sequence":
+                return await self._execute_sequence(command)
+            
             else:
                 self.logger.error(f"Ação dos braços não suportada: {command.action}")
                 return False
@@ -608,6 +628,26 @@ class G1ArmsAction(BaseAction):
             self.logger.error(f"Erro na execução de gesto: {e}")
             return False
     
+    async def _execute_sequence(self, command: ArmCommand) -> bool:
+        """Executa gesto(s) da biblioteca a partir do plano compilado."""
+        try:
+            compiler = get_sequence_compiler()
+            if command.pattern:
+                plan = compiler.compile_pattern(command.pattern)
+            else:
+                plan = compiler.compile(command.sequence or ())
+        except SequenceCompilationError as e:
+            self.logger.error(f"Sequência inválida: {e}")
+            return False
+        
+        if not self.mock_mode and self.g1_arms_real.is_initialized:
+            return await self.g1_arms_real.execute_plan(plan)
+        
+        # Modo mock: respeita o tempo do plano
+        await asyncio.sleep(plan.total_duration)
+        self.logger.info(f"Sequência simulada: {list(plan.action_ids)}")
+        return True
+    
     async def _execute_point(self, command: ArmCommand) -> bool:
         """Executa movimento de apontar."""
         try:
@@ -854,7 +894,8 @@ class G1ArmsAction(BaseAction):
             "arm_commands_executed": self.arm_commands_executed,
             "arm_errors": self.arm_errors,
             "objects_manipulated": self.objects_manipulated,
-            "mock_mode": self.mock_mode
+            "mock_mode": self.mock_mode,
+            "sequence_compiler": get_sequence_compiler().get_stats()
         })
         
         return status
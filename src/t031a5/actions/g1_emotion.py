@@ -5,6 +5,8 @@ from typing import Any, Dict, Optional
 from datetime import datetime
 
 from .base import BaseAction, ActionRequest, ActionResult
+from ..connectors.g1_emotion_real import EmotionType
+from ..connectors.led_writer import LedLayer, get_led_writer
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,8 @@ class G1EmotionAction(BaseAction):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.led_brightness = config.get("led_brightness", 0.7)
+        self.emotion_hold = config.get("emotion_hold", 5.0)  # segundos na camada de emoção
+        self.led_writer = get_led_writer()
         logger.debug(f"G1EmotionAction configurado")
     
     async def _initialize(self) -> bool:
@@ -34,6 +38,18 @@ class G1EmotionAction(BaseAction):
             emotion = request.data.get("emotion", "neutral")
             logger.info(f"G1 expressando emoção: {emotion}")
             
+            # Cor na camada de emoção; expira e devolve os LEDs à fala/repouso
+            colors = EmotionType[emotion.upper()].value if emotion.upper() in EmotionType.__members__ \
+                else EmotionType.NEUTRAL.value
+            self.led_writer.set_color(
+                int(colors["r"] * self.led_brightness),
+                int(colors["g"] * self.led_brightness),
+                int(colors["b"] * self.led_brightness),
+                layer=LedLayer.EMOTION,
+                ttl=self.emotion_hold,
+                source=f"action:{emotion}"
+            )
+            
             return ActionResult(
                 action_type="emotion",
                 action_name=request.action_name,
@@ -21,6 +21,7 @@ from enum import Enum
 from .base import BaseAction, ActionRequest, ActionResult
 from .g1_movement_mapping import G1MovementLibrary, G1MovementType
 from ..connectors.g1_movement_real import G1MovementRealConnector
+from ..navigation import LocalNavigator
 
 
 class MovementType(Enum):
@@ -116,6 +117,11 @@ class G1MovementAction(BaseAction):
         self.path_planning = config.get("path_planning", True)
         self.waypoint_tolerance = config.get("waypoint_tolerance", 0.1)  # metros
         
+        # Navegação local: grade de ocupação da D435i + A*
+        navigation_config = config.get("navigation", {})
+        self.navigator = LocalNavigator(navigation_config)
+        self.max_replans = navigation_config.get("max_replans", 5)
+        
         # Biblioteca de movimentos G1
         self.movement_library = G1MovementLibrary
         
@@ -147,6 +153,17 @@ class G1MovementAction(BaseAction):
         self.mock_mode = config.get("mock_mode", False)  # FORÇAR HARDWARE REAL
         self.simulation_speed = config.get("simulation_speed", 1.0)  # multiplicador de velocidade
         
+        # G1MovementRealConnector - locomoção por streaming de velocidade (50 Hz)
+        self.g1_movement_real = G1MovementRealConnector({
+            "enabled": not self.mock_mode,
+            "network_interface": config.get("network_interface", "eth0"),
+            "timeout": config.get("timeout", 10.0),
+            "max_velocity": self.max_speed,
+            "fake_sdk": config.get("fake_sdk", False),
+            "streaming_enabled": config.get("streaming_enabled", True),
+            "streaming": config.get("streaming", {})
+        })
+        
         # Gestos predefinidos
         self.predefined_gestures = {
             "wave": {"duration": 2.0, "description": "Acenar com a mão"},
@@ -204,9 +221,11 @@ class G1MovementAction(BaseAction):
     
     async def _initialize_real_movement(self):
         """Inicializa movimento real do robô."""
-        # Aqui seria a inicialização do hardware real do G1
-        # Por exemplo: motores, sensores, controladores, etc.
-        self.logger.info("Movimento real inicializado (simulado)")
+        if await self.g1_movement_real.initialize():
+            await self.g1_movement_real.stream.start()
+            self.logger.info("Movimento real inicializado (LocoClient + streaming)")
+        else:
+            self.logger.warning("LocoClient indisponível: locomoção real desativada")
     
     async def _initialize_posture_control(self):
         """Inicializa controle de postura."""
@@ -387,6 +406,12 @@ class G1MovementAction(BaseAction):
                         self.logger.warning(f"Obstáculo muito próximo: {distance:.2f}m")
                         return False
             
+            # Profundidade da D435i: avanço vetado abaixo da distância mínima
+            if self.obstacle_detection and self._moves_forward(command) \
+                    and not self.g1_movement_real.stream.proximity.check(command.speed or self.default_speed):
+                self.logger.warning("Avanço vetado: obstáculo à frente (profundidade)")
+                return False
+            
             # Verifica se o movimento é seguro para a postura atual
             if command.type in [MovementType.WALK, MovementType.RUN, MovementType.JUMP]:
                 if self.movement_state.current_posture != PostureType.STANDING:
@@ -522,6 +547,7 @@ class G1MovementAction(BaseAction):
             
             # Atualiza orientação
             self.movement_state.current_orientation = (self.movement_state.current_orientation + angle) % 360
+            self._sync_navigator_pose()
             self.movement_status = MovementStatus.COMPLETED
             
             self.logger.info(f"Rotação executada: {angle}°, {speed}°/s")
@@ -559,6 +585,10 @@ class G1MovementAction(BaseAction):
     async def _execute_stop(self, command: MovementCommand) -> bool:
         """Para o movimento atual."""
         try:
+            # Para movimento real (descarta comandos em fila e zera a velocidade)
+            if not self.mock_mode and self.g1_movement_real.is_initialized:
+                await self.g1_movement_real.stop_movement()
+            
             # Para movimento
             self.movement_state.is_moving = False
             self.movement_state.current_speed = 0.0
@@ -656,6 +686,8 @@ class G1MovementAction(BaseAction):
             # Atualiza posição
             self.movement_state.current_position = target_position
             self.movement_state.target_position = None
+            self.navigator.clear_goal()
+            self._sync_navigator_pose()
             self.movement_status = MovementStatus.COMPLETED
             
             self.logger.info(f"Navegação executada para: {target_position}")
@@ -695,19 +727,39 @@ class G1MovementAction(BaseAction):
     
     # Métodos para implementação real (placeholders)
     async def _execute_real_walk(self, direction: str, distance: float, speed: float):
-        """Executa caminhada real."""
-        # Implementação real aqui
-        pass
+        """Executa caminhada real (alvo de velocidade até percorrer a distância)."""
+        if not self.g1_movement_real.is_initialized:
+            raise RuntimeError("LocoClient não inicializado")
+        
+        vx, vy = {
+            "forward": (speed, 0.0),
+            "backward": (-speed, 0.0),
+            "left": (0.0, speed),
+            "right": (0.0, -speed),
+        }.get(direction, (speed, 0.0))
+        
+        if not await self.g1_movement_real.stream_move(vx, vy, 0.0, distance=distance, source=f"walk_{direction}"):
+            # Sem odometria: quem chamou não pode contar a distância como percorrida
+            raise RuntimeError(f"Caminhada não concluída ({self._move_outcome()})")
     
     async def _execute_real_run(self, direction: str, distance: float, speed: float):
         """Executa corrida real."""
-        # Implementação real aqui
-        pass
+        # Mesmo perfil da caminhada; o limite de velocidade do streaming se aplica
+        await self._execute_real_walk(direction, distance, speed)
     
     async def _execute_real_turn(self, angle: float, speed: float):
-        """Executa rotação real."""
-        # Implementação real aqui
-        pass
+        """Executa rotação real (alvo de velocidade angular até girar o ângulo)."""
+        if not self.g1_movement_real.is_initialized:
+            raise RuntimeError("LocoClient não inicializado")
+        
+        vyaw = math.copysign(math.radians(speed), angle)
+        if not await self.g1_movement_real.stream_move(0.0, 0.0, vyaw, angle=math.radians(abs(angle)),
+                                                       source="turn"):
+            raise RuntimeError(f"Rotação não concluída ({self._move_outcome()})")
+    
+    def _move_outcome(self) -> str:
+        outcome = self.g1_movement_real.last_move_outcome
+        return outcome.value if outcome else "falha no streaming"
     
     async def _execute_real_jump(self, direction: str, distance: float):
         """Executa pulo real."""
@@ -725,9 +777,55 @@ class G1MovementAction(BaseAction):
         pass
     
     async def _execute_real_navigation(self, path: List[Tuple[float, float]], speed: float):
-        """Executa navegação real."""
-        # Implementação real aqui
-        pass
+        """
+        Executa navegação real seguindo os waypoints da rota.
+        
+        Para cada waypoint: gira para o rumo do ponto e caminha a distância
+        até ele pelo streaming de locomoção. Replaneja quando um frame de
+        profundidade mostra obstáculo na rota ou quando o alvo estava fora da
+        grade e o robô chegou à borda projetada.
+        """
+        if not self.g1_movement_real.is_initialized:
+            raise RuntimeError("LocoClient não inicializado")
+        
+        goal = self.navigator.goal or path[-1]
+        waypoints = list(path[1:])
+        replans = 0
+        
+        while True:
+            position = self.movement_state.current_position
+            if self.navigator.needs_replan:
+                if replans >= self.max_replans:
+                    raise RuntimeError(f"Limite de {self.max_replans} replanejamentos atingido")
+                replans += 1
+                self.logger.info(f"🧭 Replanejando rota ({replans}/{self.max_replans})")
+                waypoints = await self.navigator.plan_async(goal, start=position)
+                if not waypoints:
+                    raise RuntimeError("Sem rota após replanejamento")
+            elif not waypoints:
+                if self._calculate_distance(position, goal) <= self.waypoint_tolerance:
+                    return
+                # Alvo além da grade: nova etapa a partir da posição atual
+                waypoints = await self.navigator.plan_async(goal, start=position)
+                if not waypoints or self._calculate_distance(position, waypoints[-1]) <= self.waypoint_tolerance:
+                    raise RuntimeError("Sem rota até o alvo")
+            
+            waypoint = waypoints.pop(0)
+            dx, dy = waypoint[0] - position[0], waypoint[1] - position[1]
+            distance = math.hypot(dx, dy)
+            if distance < self.waypoint_tolerance:
+                continue
+            
+            heading = math.degrees(math.atan2(dy, dx))
+            turn = (heading - self.movement_state.current_orientation + 180.0) % 360.0 - 180.0
+            if abs(turn) > 1.0:
+                await self._execute_real_turn(turn, self.default_turn_speed)
+                self.movement_state.current_orientation = heading % 360
+            
+            await self._execute_real_walk("forward", distance, speed)
+            self.movement_state.current_position = waypoint
+            self.total_distance_traveled += distance
+            self._sync_navigator_pose()
     
     # Métodos auxiliares
     def _update_movement_state(self, direction: str, distance: float, speed: float):
@@ -751,6 +849,7 @@ class G1MovementAction(BaseAction):
         self.movement_state.current_position = (x, y)
         self.movement_state.current_speed = speed
         self.total_distance_traveled += distance
+        self._sync_navigator_pose()
         
         # Atualiza velocidade média
         if self.movement_commands_executed > 0:
@@ -769,6 +868,11 @@ class G1MovementAction(BaseAction):
         if len(self.movement_state.movement_history) > 100:
             self.movement_state.movement_history.pop(0)
     
+    @staticmethod
+    def _moves_forward(command: MovementCommand) -> bool:
+        return (command.type in (MovementType.WALK, MovementType.RUN, MovementType.JUMP)
+                and (command.direction or "forward") == "forward")
+    
     def _calculate_distance_to_obstacle(self, obstacle: Dict[str, Any]) -> float:
         """Calcula distância até obstáculo."""
         # Implementação simplificada
@@ -789,11 +893,33 @@ class G1MovementAction(BaseAction):
         
         return new_posture in valid_transitions.get(current, [])
     
+    def _sync_navigator_pose(self):
+        """Repassa a pose estimada (odometria) ao navegador."""
+        x, y = self.movement_state.current_position
+        self.navigator.update_pose(x, y, math.radians(self.movement_state.current_orientation))
+    
+    def on_depth_frame(self, depth_image):
+        """Integra um frame de profundidade da D435i na grade de ocupação."""
+        try:
+            self.navigator.on_depth_frame(depth_image)
+        except Exception as e:
+            self.logger.error(f"Erro ao integrar profundidade: {e}")
+    
     async def _calculate_path_to_target(self, target: Tuple[float, float]) -> List[Tuple[float, float]]:
-        """Calcula rota para o alvo."""
-        # Implementação simplificada - linha reta
+        """
+        Calcula rota para o alvo.
+        
+        Com path_planning ativo, planeja com A* na grade de ocupação (em
+        thread); caso contrário, linha reta.
+        """
         start = self.movement_state.current_position
-        return [start, target]
+        if not self.path_planning:
+            return [start, target]
+        
+        waypoints = await self.navigator.plan_async(target, start=start)
+        if not waypoints:
+            return []
+        return [start] + waypoints
     
     def _calculate_distance(self, point1: Tuple[float, float], point2: Tuple[float, float]) -> float:
         """Calcula distância entre dois pontos."""
@@ -806,6 +932,7 @@ class G1MovementAction(BaseAction):
             
             # Para movimento atual
             await self._execute_stop(MovementCommand(type=MovementType.STOP))
+            await self.g1_movement_real.cleanup()
             
             self.logger.info("G1Movement parado com sucesso")
             return True
@@ -831,7 +958,9 @@ class G1MovementAction(BaseAction):
             "movement_errors": self.movement_errors,
             "average_speed": self.average_speed,
             "obstacles_detected": len(self.obstacles_detected),
-            "mock_mode": self.mock_mode
+            "mock_mode": self.mock_mode,
+            "locomotion_stream": self.g1_movement_real.stream.get_status(),
+            "navigation": self.navigator.get_status()
         })
         
         return status
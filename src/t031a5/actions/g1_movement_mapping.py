@@ -608,24 +608,25 @@ class G1MovementLibrary:
             return cls.FSM_STATES[movement_id]
         return None
     
+    @classmethod
+    def _name_index(cls) -> Dict[str, G1Movement]:
+        """Índice nome → movimento (construído uma vez por classe)."""
+        index = cls.__dict__.get("_NAME_INDEX")
+        if index is None:
+            index = {}
+            # Mesma precedência da busca original: braços, FSM, locomoção
+            for source in (cls.LOCOMOTION_COMMANDS, cls.FSM_STATES, cls.ARM_MOVEMENTS):
+                for movement in source.values():
+                    index[movement.name] = movement
+            for command_name, movement in cls.LOCOMOTION_COMMANDS.items():
+                index.setdefault(command_name, movement)
+            cls._NAME_INDEX = index
+        return index
+    
     @classmethod
     def get_movement_by_name(cls, name: str) -> Optional[G1Movement]:
-        """Retorna movimento por nome."""
-        # Busca em movimentos de braços
-        for movement in cls.ARM_MOVEMENTS.values():
-            if movement.name == name:
-                return movement
-        
-        # Busca em estados FSM
-        for movement in cls.FSM_STATES.values():
-            if movement.name == name:
-                return movement
-        
-        # Busca em locomoção
-        if name in cls.LOCOMOTION_COMMANDS:
-            return cls.LOCOMOTION_COMMANDS[name]
-        
-        return None
+        """Retorna movimento por nome (O(1) pelo índice)."""
+        return cls._name_index().get(name)
     
     @classmethod
     def get_pattern(cls, pattern_name: str) -> Optional[Dict[str, Any]]:
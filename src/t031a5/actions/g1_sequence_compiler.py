@@ -0,0 +1,192 @@
+"""
+Compilador de sequências de movimentos do G1.
+
+Transforma um padrão (``MOVEMENT_PATTERNS``) ou uma sequência avulsa de
+IDs/nomes em um plano imutável e já validado: IDs de ação do SDK
+resolvidos, passos de relaxamento (release arm) inseridos onde a
+biblioteca exige e duração total calculada. Os planos ficam em cache pela
+chave da sequência, então padrões repetidos não são revalidados.
+"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+from .g1_movement_mapping import G1Movement, G1MovementLibrary, G1MovementType
+
+logger = logging.getLogger(__name__)
+
+RELAX_ACTION_ID = 99
+
+MovementRef = Union[int, str]
+
+
+class SequenceCompilationError(ValueError):
+    """Sequência inválida (ID indisponível, desconhecido ou de tipo não suportado)."""
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    """Passo de um plano: uma chamada ExecuteAction."""
+    action_id: int
+    name: str
+    duration: float
+    is_relax: bool = False
+
+
+@dataclass(frozen=True)
+class MovementPlan:
+    """Plano compilado e imutável de uma sequência de gestos."""
+    key: Tuple[int, ...]
+    steps: Tuple[PlanStep, ...]
+    total_duration: float
+
+    @property
+    def action_ids(self) -> Tuple[int, ...]:
+        return tuple(step.action_id for step in self.steps)
+
+    @property
+    def relax_steps(self) -> int:
+        return sum(1 for step in self.steps if step.is_relax)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "key": list(self.key),
+            "action_ids": list(self.action_ids),
+            "steps": [step.name for step in self.steps],
+            "relax_steps": self.relax_steps,
+            "total_duration": self.total_duration
+        }
+
+
+class G1SequenceCompiler:
+    """Compila e mantém em cache planos de sequências de gestos."""
+
+    def __init__(self, library=G1MovementLibrary, max_cache_size: int = 128):
+        self.library = library
+        self.max_cache_size = max_cache_size
+        self._cache: "OrderedDict[Tuple[Tuple[int, ...], bool], MovementPlan]" = OrderedDict()
+
+        # Métricas
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.compile_errors = 0
+
+    def compile(self, movements: Sequence[MovementRef], final_relax: bool = True) -> MovementPlan:
+        """
+        Compila uma sequência de IDs ou nomes de gestos.
+
+        Args:
+            movements: IDs (26) ou nomes ("wave_above_head") de gestos de braço
+            final_relax: Termina com release arm se algum gesto exigir
+
+        Raises:
+            SequenceCompilationError: se algum item for inválido
+        """
+        key = tuple(self._resolve_id(ref) for ref in movements)
+        cache_key = (key, final_relax)
+
+        plan = self._cache.get(cache_key)
+        if plan is not None:
+            self.cache_hits += 1
+            self._cache.move_to_end(cache_key)
+            return plan
+
+        self.cache_misses += 1
+        plan = self._build(key, final_relax)
+        self._cache[cache_key] = plan
+        if len(self._cache) > self.max_cache_size:
+            self._cache.popitem(last=False)
+        return plan
+
+    def compile_pattern(self, pattern_name: str, final_relax: bool = True) -> MovementPlan:
+        """Compila um padrão de ``MOVEMENT_PATTERNS`` (ex.: "greeting")."""
+        pattern = self.library.get_pattern(pattern_name)
+        if not pattern:
+            self.compile_errors += 1
+            raise SequenceCompilationError(f"Padrão desconhecido: {pattern_name}")
+        return self.compile(pattern["movements"], final_relax)
+
+    def _resolve_id(self, ref: MovementRef) -> int:
+        if isinstance(ref, bool) or not isinstance(ref, (int, str)):
+            self.compile_errors += 1
+            raise SequenceCompilationError(f"Referência de movimento inválida: {ref!r}")
+        if isinstance(ref, str):
+            if ref.isdigit():
+                return int(ref)
+            movement = self.library.get_movement_by_name(ref)
+            if movement is None:
+                self.compile_errors += 1
+                raise SequenceCompilationError(f"Movimento desconhecido: {ref}")
+            return movement.id
+        return ref
+
+    def _validated(self, movement_id: int) -> G1Movement:
+        if not self.library.is_available(movement_id):
+            self.compile_errors += 1
+            raise SequenceCompilationError(f"Movimento {movement_id} indisponível (erro 7402)")
+        movement = self.library.get_movement_by_id(movement_id)
+        if movement is None:
+            self.compile_errors += 1
+            raise SequenceCompilationError(f"Movimento {movement_id} não reconhecido")
+        if movement.movement_type != G1MovementType.ARM_GESTURE:
+            self.compile_errors += 1
+            raise SequenceCompilationError(
+                f"Movimento {movement_id} ({movement.name}) não é gesto de braço"
+            )
+        return movement
+
+    def _build(self, key: Tuple[int, ...], final_relax: bool) -> MovementPlan:
+        if not key:
+            self.compile_errors += 1
+            raise SequenceCompilationError("Sequência vazia")
+
+        relax = self._validated(RELAX_ACTION_ID)
+        relax_step = PlanStep(relax.id, relax.name, relax.duration, is_relax=True)
+
+        steps = []
+        needs_relax = False
+        for movement_id in key:
+            movement = self._validated(movement_id)
+            if movement.is_relax:
+                if not steps or not steps[-1].is_relax:
+                    steps.append(relax_step)
+                needs_relax = False
+                continue
+            # Braços precisam voltar ao repouso antes de um gesto que exige relax
+            if movement.requires_relax and steps and not steps[-1].is_relax:
+                steps.append(relax_step)
+            steps.append(PlanStep(movement.id, movement.name, movement.duration))
+            needs_relax = needs_relax or movement.requires_relax
+
+        if final_relax and needs_relax and steps and not steps[-1].is_relax:
+            steps.append(relax_step)
+
+        total = round(sum(step.duration for step in steps), 3)
+        logger.debug(f"🎭 Plano compilado {list(key)}: {len(steps)} passos, {total:.1f}s")
+        return MovementPlan(key, tuple(steps), total)
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "cached_plans": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / lookups, 3) if lookups else 0.0,
+            "compile_errors": self.compile_errors
+        }
+
+
+_compiler: Optional[G1SequenceCompiler] = None
+
+
+def get_sequence_compiler() -> G1SequenceCompiler:
+    """Retorna o compilador compartilhado do processo."""
+    global _compiler
+    if _compiler is None:
+        _compiler = G1SequenceCompiler()
+    return _compiler
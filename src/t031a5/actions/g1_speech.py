@@ -2,15 +2,21 @@
 
 import logging
 import asyncio
-from typing import Any, Dict, Optional
+import re
+import time
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 from .base import BaseAction, ActionRequest, ActionResult
 from ..connectors.elevenlabs_tts import ElevenLabsTTSConnector, ElevenLabsTTSRequest
 from ..connectors.audio_player import AudioPlayerConnector
+from ..logging.tracing import get_tracer
 
 logger = logging.getLogger(__name__)
 
+# Fim de frase: pontuação final seguida de espaço
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?…])\s+")
+
 
 class G1SpeechAction(BaseAction):
     """Action de fala do G1 - IMPLEMENTAÇÃO REAL COM MÉTODO TESTADO."""
@@ -21,6 +27,13 @@ class G1SpeechAction(BaseAction):
         self.voice_id = config.get("voice_id", "Alice")
         self.audio_output = config.get("audio_output", "anker_bluetooth")
         self.language = config.get("language", "pt")
+        self.sentence_queue = config.get("sentence_queue", True)
+        self.min_sentence_chars = config.get("min_sentence_chars", 24)
+        
+        # Estado de interrupção (barge-in)
+        self._cancel_requested = False
+        self._prefetch_task: Optional[asyncio.Task] = None
+        self.speeches_interrupted = 0
         
         # Inicializar conectores
         self.elevenlabs = None
@@ -60,33 +73,53 @@ class G1SpeechAction(BaseAction):
     async def _execute(self, request: ActionRequest) -> ActionResult:
         """Executa fala usando ElevenLabs + Anker - MÉTODO TESTADO."""
         start_time = datetime.now()
+        self._cancel_requested = False
         
         try:
             text = request.data.get("text", "Olá! Sou o G1 Tobias.")
             logger.info(f"G1 falando: {text}")
             
-            # 1. Gerar áudio com ElevenLabs (TESTADO)
             if self.elevenlabs:
-                tts_request = ElevenLabsTTSRequest(
-                    text=text,
-                    voice_id=self.voice_id,
-                    model_id="eleven_multilingual_v2",
-                    output_format="mp3"
-                )
-                
-                tts_response = await self.elevenlabs.synthesize_speech(tts_request)
+                # Fila de frases: a próxima é sintetizada enquanto a atual toca,
+                # e a fila pode ser descartada a qualquer momento (barge-in)
+                sentences = self._split_sentences(text) if self.sentence_queue else [text]
+                sentences_played = 0
+                audio_file = None
                 
-                if not tts_response.success:
-                    raise Exception(f"Erro no TTS: {tts_response.error_message}")
+                # Timeline da resposta é avisada quando cada frase começa a tocar
+                on_sentence_start = request.metadata.get("on_sentence_start")
                 
-                # 2. Reproduzir no Anker (MÉTODO TESTADO E FUNCIONANDO)
-                if self.audio_output == "anker_bluetooth" and self.audio_player:
-                    audio_success = await self.audio_player.play_audio_anker(tts_response.audio_file_path)
+                tracer = get_tracer()
+                next_tts = self._start_synthesis(sentences[0])
+                for index in range(len(sentences)):
+                    tts_response = await next_tts
+                    if index == 0:
+                        # Síntese não é em streaming: o primeiro áudio é a primeira frase pronta
+                        tracer.mark("tts.first_byte", success=tts_response.success)
+                    
+                    if self._cancel_requested:
+                        break
+                    
+                    if not tts_response.success:
+                        raise Exception(f"Erro no TTS: {tts_response.error_message}")
+                    
+                    if index + 1 < len(sentences):
+                        next_tts = self._start_synthesis(sentences[index + 1])
                     
-                    if not audio_success:
-                        # Fallback para saída padrão
-                        await self.audio_player.play_audio_default(tts_response.audio_file_path)
+                    if on_sentence_start:
+                        on_sentence_start(index, sentences[index])
+                    if index == 0:
+                        tracer.mark("playback.start")
+                    await self._play(tts_response.audio_file_path)
+                    
+                    if self._cancel_requested:
+                        break
+                    
+                    audio_file = tts_response.audio_file_path
+                    sentences_played += 1
                 
+                interrupted = self._cancel_requested
+                await self._cancel_prefetch()
                 execution_time = (datetime.now() - start_time).total_seconds()
                 
                 return ActionResult(
@@ -97,7 +130,10 @@ class G1SpeechAction(BaseAction):
                     data={
                         "text": text, 
                         "tts_provider": self.tts_provider,
-                        "audio_file": tts_response.audio_file_path,
+                        "audio_file": audio_file,
+                        "sentences_total": len(sentences),
+                        "sentences_played": sentences_played,
+                        "interrupted": interrupted,
                         "method": "elevenlabs_mp3_wav_paplay_anker_TESTADO"
                     },
                     execution_time=execution_time
@@ -114,8 +150,12 @@ class G1SpeechAction(BaseAction):
                     data={"text": text, "tts_provider": "mock"},
                     execution_time=0.1
                 )
-                
+        
+        except asyncio.CancelledError:
+            await self._cancel_prefetch()
+            raise
         except Exception as e:
+            await self._cancel_prefetch()
             logger.error(f"Erro ao executar fala: {e}")
             return ActionResult(
                 action_type="speech",
@@ -127,5 +167,80 @@ class G1SpeechAction(BaseAction):
                 execution_time=(datetime.now() - start_time).total_seconds()
             )
     
+    async def cancel_speech(self) -> float:
+        """
+        Interrompe a fala atual e descarta as frases pendentes (barge-in).
+        
+        Returns:
+            Latência do cancelamento em milissegundos
+        """
+        start_time = time.perf_counter()
+        self._cancel_requested = True
+        
+        await self._cancel_prefetch()
+        if self.audio_player:
+            await self.audio_player.stop_playback()
+        
+        self.speeches_interrupted += 1
+        cancel_time = (time.perf_counter() - start_time) * 1000
+        logger.info(f"🔇 Fala interrompida em {cancel_time:.1f}ms")
+        return cancel_time
+    
+    def _split_sentences(self, text: str) -> List[str]:
+        """Divide o texto em frases para a fila de síntese (frases curtas são agrupadas)."""
+        sentences: List[str] = []
+        pending = ""
+        for sentence in _SENTENCE_SPLIT.split(text):
+            pending = f"{pending} {sentence.strip()}".strip()
+            if len(pending) >= self.min_sentence_chars:
+                sentences.append(pending)
+                pending = ""
+        
+        if pending:
+            if sentences:
+                sentences[-1] = f"{sentences[-1]} {pending}"
+            else:
+                sentences.append(pending)
+        
+        return sentences or [text]
+    
+    def _start_synthesis(self, sentence: str) -> asyncio.Task:
+        """Dispara a síntese de uma frase em background."""
+        tts_request = ElevenLabsTTSRequest(
+            text=sentence,
+            voice_id=self.voice_id,
+            model_id="eleven_multilingual_v2",
+            output_format="mp3"
+        )
+        self._prefetch_task = asyncio.ensure_future(self.elevenlabs.synthesize_speech(tts_request))
+        return self._prefetch_task
+    
+    async def _cancel_prefetch(self):
+        """Cancela síntese pendente da próxima frase."""
+        task = self._prefetch_task
+        self._prefetch_task = None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+    
+    async def _play(self, audio_file_path: str) -> bool:
+        """Reproduz um arquivo de áudio no Anker (com fallback para saída padrão)."""
+        if self.audio_output != "anker_bluetooth" or not self.audio_player:
+            return False
+        
+        # 2. Reproduzir no Anker (MÉTODO TESTADO E FUNCIONANDO)
+        if await self.audio_player.play_audio_anker(audio_file_path):
+            return True
+        
+        # Reprodução encerrada por barge-in não deve cair no fallback
+        if self._cancel_requested:
+            return False
+        
+        # Fallback para saída padrão
+        return await self.audio_player.play_audio_default(audio_file_path)
+    
     async def _health_check(self) -> bool:
         return self.elevenlabs is not None and self.audio_player is not None
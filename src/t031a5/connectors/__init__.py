@@ -17,6 +17,12 @@ from .vision_capture import VisionCaptureConnector
 from .g1_network import G1NetworkConnector
 from .g1_arms_real import G1ArmsRealConnector
 from .g1_movement_real import G1MovementRealConnector
+from .command_executor import RobotCommandExecutor, CommandDeadlineExceeded, get_command_executor
+from .g1_session import G1Session, SessionState, get_g1_session
+from .locomotion_stream import LocomotionStreamController, LocomotionLimits, MoveOutcome
+from .led_writer import LedWriter, LedLayer, get_led_writer
+from .audio_envelope import EnvelopeFollower, wav_envelope
+from .g1_lowstate import LowStateSubscriber, LowStateRecording, LowStateWindow
 
 __all__ = [
     # Conectores nativos G1
@@ -43,5 +49,24 @@ __all__ = [
     "VisionCaptureConnector",
     "G1NetworkConnector",
     "G1ArmsRealConnector",
-    "G1MovementRealConnector"
+    "G1MovementRealConnector",
+    
+    # Execução de comandos do SDK
+    "RobotCommandExecutor",
+    "CommandDeadlineExceeded",
+    "get_command_executor",
+    "G1Session",
+    "SessionState",
+    "get_g1_session",
+    "LocomotionStreamController",
+    "LocomotionLimits",
+    "MoveOutcome",
+    "LedWriter",
+    "LedLayer",
+    "get_led_writer",
+    "EnvelopeFollower",
+    "wav_envelope",
+    "LowStateSubscriber",
+    "LowStateRecording",
+    "LowStateWindow"
 ]
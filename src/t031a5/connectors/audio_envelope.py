@@ -0,0 +1,175 @@
+"""
+Envelope de volume (RMS ou pico) para os recursos reativos à fala.
+
+Uma única implementação vetorizada, compartilhada por AudioVisualDynamic e
+EmotionSpeechIntegration: o PCM intercalado é visto como uma matriz
+``(janelas, amostras_por_janela)`` e o nível de todas as janelas sai de uma
+só redução NumPy, sem laço Python por janela.
+
+``EnvelopeFollower`` aceita pedaços de PCM de qualquer tamanho (ex.: o
+stream do TTS durante a reprodução) e devolve o nível de cada janela assim
+que ela se completa; ``wav_envelope`` usa o mesmo follower para ler um WAV
+em blocos, sem carregar o arquivo inteiro na memória.
+"""
+
+import logging
+import wave
+from typing import Any, Dict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Equivalente ao antigo ``rms / 5000`` sobre amostras int16
+DEFAULT_REFERENCE = 5000 / 32768
+ENVELOPE_MODES = ("rms", "peak")
+
+_PCM_DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+_NO_LEVELS = np.empty(0, dtype=np.float32)
+_NO_LEVELS.flags.writeable = False
+
+
+def decode_pcm(data, sample_width: int) -> np.ndarray:
+    """
+    Converte PCM linear em float32 na escala [-1, 1].
+
+    Args:
+        data: Bytes (ou buffer) do PCM intercalado
+        sample_width: Bytes por amostra (1, 2 ou 4)
+
+    Raises:
+        ValueError: se o formato não for suportado
+    """
+    dtype = _PCM_DTYPES.get(sample_width)
+    if dtype is None:
+        raise ValueError(f"Formato de áudio não suportado: {sample_width} bytes")
+    samples = np.frombuffer(data, dtype=dtype).astype(np.float32)
+    if sample_width == 1:
+        # PCM de 8 bits é sem sinal, centrado em 128
+        samples -= 128.0
+    samples *= 1.0 / (1 << (8 * sample_width - 1))
+    return samples
+
+
+def window_levels(samples: np.ndarray, window: int, mode: str = "rms") -> np.ndarray:
+    """
+    Nível de cada janela completa de ``window`` amostras.
+
+    Janelas incompletas no fim são ignoradas; quem precisa delas passa o
+    resto separadamente (ver ``EnvelopeFollower.flush``).
+    """
+    count = len(samples) // window
+    if count == 0:
+        return _NO_LEVELS
+    blocks = samples[:count * window].reshape(count, window)
+    if mode == "peak":
+        return np.abs(blocks).max(axis=1)
+    return np.sqrt(np.einsum("ij,ij->i", blocks, blocks) / window)
+
+
+class EnvelopeFollower:
+    """
+    Envelope incremental de um stream PCM.
+
+    Guarda só o resto da janela em aberto entre chamadas de ``feed``; os
+    níveis saem normalizados por ``reference`` e limitados a 1.0.
+    """
+
+    def __init__(self, sample_rate: int, sample_width: int = 2, channels: int = 1,
+                 window_s: float = 0.1, mode: str = "rms", reference: float = DEFAULT_REFERENCE):
+        if sample_width not in _PCM_DTYPES:
+            raise ValueError(f"Formato de áudio não suportado: {sample_width} bytes")
+        if mode not in ENVELOPE_MODES:
+            raise ValueError(f"Modo de envelope desconhecido: {mode}")
+
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.channels = channels
+        self.mode = mode
+        self.reference = reference
+
+        # Janela em amostras intercaladas (todos os canais entram no nível)
+        self.window_frames = max(1, int(sample_rate * window_s))
+        self.window = self.window_frames * channels
+        self.window_s = self.window_frames / sample_rate
+        self._window_bytes = self.window * sample_width
+        self._buffer = bytearray()
+
+        # Métricas
+        self.bytes_fed = 0
+        self.windows_emitted = 0
+
+    def feed(self, chunk) -> np.ndarray:
+        """
+        Consome um pedaço de PCM.
+
+        Returns:
+            Níveis (0-1) das janelas completadas neste pedaço
+        """
+        self.bytes_fed += len(chunk)
+        self._buffer.extend(chunk)
+        complete = len(self._buffer) // self._window_bytes * self._window_bytes
+        if complete == 0:
+            return _NO_LEVELS
+
+        samples = decode_pcm(memoryview(self._buffer)[:complete], self.sample_width)
+        del self._buffer[:complete]
+        return self._normalize(window_levels(samples, self.window, self.mode))
+
+    def flush(self) -> np.ndarray:
+        """Nível da janela parcial restante (fim do stream)."""
+        usable = len(self._buffer) // self.sample_width * self.sample_width
+        if usable == 0:
+            self._buffer.clear()
+            return _NO_LEVELS
+        samples = decode_pcm(bytes(self._buffer[:usable]), self.sample_width)
+        self._buffer.clear()
+        return self._normalize(window_levels(samples, len(samples), self.mode))
+
+    def reset(self):
+        """Descarta a janela em aberto (ex.: nova fala)."""
+        self._buffer.clear()
+
+    def _normalize(self, levels: np.ndarray) -> np.ndarray:
+        self.windows_emitted += len(levels)
+        return np.minimum(levels / self.reference, 1.0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "window_s": self.window_s,
+            "bytes_fed": self.bytes_fed,
+            "windows_emitted": self.windows_emitted,
+            "pending_bytes": len(self._buffer)
+        }
+
+
+def wav_envelope(path: str, window_s: float = 0.1, mode: str = "rms",
+                 reference: float = DEFAULT_REFERENCE, block_s: float = 1.0) -> np.ndarray:
+    """
+    Envelope de um arquivo WAV, lido em blocos de ``block_s`` segundos.
+
+    Raises:
+        ValueError / wave.Error: se o arquivo não for PCM suportado
+    """
+    with wave.open(path, "rb") as wav_file:
+        params = wav_file.getparams()
+        follower = EnvelopeFollower(params.framerate, params.sampwidth, params.nchannels,
+                                    window_s, mode, reference)
+        block_frames = max(follower.window_frames, int(params.framerate * block_s))
+        levels = []
+        while True:
+            data = wav_file.readframes(block_frames)
+            if not data:
+                break
+            levels.append(follower.feed(data))
+        levels.append(follower.flush())
+    return np.concatenate(levels) if levels else np.empty(0, dtype=np.float32)
+
+
+def levels_to_frames(levels: np.ndarray, rgb, base_intensity: float,
+                     min_intensity: float = 0.2, max_intensity: float = 1.0):
+    """Quadros RGB de LED a partir dos níveis do envelope."""
+    intensity = base_intensity * np.clip(np.asarray(levels, dtype=np.float32), min_intensity, max_intensity)
+    colors = (np.outer(intensity, np.asarray(rgb, dtype=np.float32))).astype(np.int32)
+    return [tuple(color) for color in colors.tolist()]
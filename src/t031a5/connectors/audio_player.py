@@ -4,8 +4,10 @@ MÉTODO TESTADO E FUNCIONANDO: MP3 → WAV → paplay → Anker
 """
 
 import os
+import asyncio
 import subprocess
 import logging
+import time
 from typing import Optional
 from pathlib import Path
 
@@ -19,6 +21,10 @@ class AudioPlayerConnector:
         self.anker_device = "bluez_sink.F4_2B_7D_2B_D1_B6.a2dp_sink"
         self.enabled = config.get("enabled", True)
         
+        # Processo de reprodução atual (para interrupção / barge-in)
+        self._current_process: Optional[asyncio.subprocess.Process] = None
+        self.playbacks_interrupted = 0
+        
         logger.info(f"AudioPlayerConnector inicializado: enabled={self.enabled}")
     
     async def play_audio_anker(self, audio_file_path: str) -> bool:
@@ -42,15 +48,10 @@ class AudioPlayerConnector:
             # Converter usando ffmpeg (testado e funcionando)
             logger.info(f"🔄 Convertendo {audio_path.name} para WAV...")
             convert_cmd = ["ffmpeg", "-i", str(audio_path), wav_file, "-y"]
-            convert_result = subprocess.run(
-                convert_cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=10
-            )
+            returncode, stderr = await self._run_process(convert_cmd, timeout=10)
             
-            if convert_result.returncode != 0:
-                logger.error(f"Erro na conversão MP3→WAV: {convert_result.stderr}")
+            if returncode != 0:
+                logger.error(f"Erro na conversão MP3→WAV: {stderr}")
                 return False
             
             # MÉTODO TESTADO: Reproduzir WAV no Anker usando paplay
@@ -61,22 +62,18 @@ class AudioPlayerConnector:
                 wav_file
             ]
             
-            play_result = subprocess.run(
-                play_cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=30
-            )
-            
-            # Limpar arquivo WAV temporário
-            if os.path.exists(wav_file):
-                os.remove(wav_file)
+            try:
+                returncode, stderr = await self._run_process(play_cmd, timeout=30)
+            finally:
+                # Limpar arquivo WAV temporário
+                if os.path.exists(wav_file):
+                    os.remove(wav_file)
             
-            if play_result.returncode == 0:
+            if returncode == 0:
                 logger.info(f"✅ Áudio reproduzido com sucesso no Anker (método testado)")
                 return True
             else:
-                logger.error(f"❌ Erro ao reproduzir no Anker: {play_result.stderr}")
+                logger.error(f"❌ Erro ao reproduzir no Anker: {stderr}")
                 return False
                 
         except subprocess.TimeoutExpired:
@@ -90,15 +87,83 @@ class AudioPlayerConnector:
         """Reproduz áudio na saída padrão (fallback)."""
         try:
             cmd = ["paplay", audio_file_path]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            returncode, stderr = await self._run_process(cmd, timeout=30)
             
-            if result.returncode == 0:
+            if returncode == 0:
                 logger.info(f"✅ Áudio reproduzido na saída padrão")
                 return True
             else:
-                logger.error(f"❌ Erro na reprodução padrão: {result.stderr}")
+                logger.error(f"❌ Erro na reprodução padrão: {stderr}")
                 return False
                 
+        except subprocess.TimeoutExpired:
+            logger.error("Timeout na reprodução de áudio")
+            return False
         except Exception as e:
             logger.error(f"Erro na reprodução padrão: {e}")
             return False
+    
+    @property
+    def is_playing(self) -> bool:
+        """Indica se há áudio sendo reproduzido."""
+        return self._current_process is not None and self._current_process.returncode is None
+    
+    async def stop_playback(self) -> float:
+        """
+        Interrompe a reprodução atual (barge-in).
+        
+        Returns:
+            Tempo até o processo terminar, em milissegundos
+        """
+        process = self._current_process
+        if process is None or process.returncode is not None:
+            return 0.0
+        
+        start_time = time.perf_counter()
+        try:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=0.5)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        except ProcessLookupError:
+            pass
+        
+        self.playbacks_interrupted += 1
+        stop_time = (time.perf_counter() - start_time) * 1000
+        logger.info(f"⏹️ Reprodução interrompida em {stop_time:.1f}ms")
+        return stop_time
+    
+    async def _run_process(self, cmd: list, timeout: float):
+        """
+        Executa comando sem bloquear o event loop.
+        
+        O processo fica registrado em _current_process para que stop_playback()
+        (ou o cancelamento da task) possa encerrá-lo.
+        
+        Returns:
+            Tupla (returncode, stderr)
+        """
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        self._current_process = process
+        
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+            return process.returncode, stderr.decode(errors="ignore") if stderr else ""
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise subprocess.TimeoutExpired(cmd, timeout) from None
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        finally:
+            if self._current_process is process:
+                self._current_process = None
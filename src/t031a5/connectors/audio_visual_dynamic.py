@@ -5,15 +5,13 @@ Combina: ElevenLabs TTS + Anker + G1 LEDs + análise volume em tempo real
 """
 
 import logging
-import asyncio
-import threading
-import time
-import wave
-import struct
-import numpy as np
 from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
+from ..conversation.text_analysis import EMOTION_KEYWORDS, analyze_text
+from .audio_envelope import EnvelopeFollower, levels_to_frames, wav_envelope
+from .led_writer import LedAnimation, LedLayer, get_led_writer
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -26,20 +24,13 @@ class EmotionConfig:
 
 # Mapeamento completo de emoções
 EMOTION_CONFIGS = {
-    "happy": EmotionConfig("happy", (0, 255, 0), 0.8, 
-                          ["feliz", "alegre", "ótimo", "excelente", "maravilhoso", "perfeito", "sucesso", "bom"]),
-    "excited": EmotionConfig("excited", (255, 128, 0), 0.9,
-                            ["animado", "empolgado", "incrível", "fantástico", "wow", "uau", "impressionante"]),
-    "calm": EmotionConfig("calm", (0, 255, 255), 0.6,
-                         ["calmo", "tranquilo", "relaxado", "pacífico", "sereno", "suave"]),
-    "thinking": EmotionConfig("thinking", (128, 0, 128), 0.5,
-                             ["pensando", "analisando", "considerando", "avaliando", "hmm", "refletindo"]),
-    "concerned": EmotionConfig("concerned", (255, 255, 0), 0.7,
-                              ["preocupado", "cuidado", "atenção", "problema", "erro", "alerta"]),
-    "sad": EmotionConfig("sad", (0, 0, 255), 0.4,
-                        ["triste", "ruim", "falha", "erro", "problema", "não funcionou", "decepcionado"]),
-    "neutral": EmotionConfig("neutral", (128, 128, 128), 0.5,
-                            ["neutro", "ok", "normal", "padrão", "regular"])
+    "happy": EmotionConfig("happy", (0, 255, 0), 0.8, list(EMOTION_KEYWORDS["happy"])),
+    "excited": EmotionConfig("excited", (255, 128, 0), 0.9, list(EMOTION_KEYWORDS["excited"])),
+    "calm": EmotionConfig("calm", (0, 255, 255), 0.6, list(EMOTION_KEYWORDS["calm"])),
+    "thinking": EmotionConfig("thinking", (128, 0, 128), 0.5, list(EMOTION_KEYWORDS["thinking"])),
+    "concerned": EmotionConfig("concerned", (255, 255, 0), 0.7, list(EMOTION_KEYWORDS["concerned"])),
+    "sad": EmotionConfig("sad", (0, 0, 255), 0.4, list(EMOTION_KEYWORDS["sad"])),
+    "neutral": EmotionConfig("neutral", (128, 128, 128), 0.5, list(EMOTION_KEYWORDS["neutral"]))
 }
 
 class AudioVisualDynamic:
@@ -53,12 +44,15 @@ class AudioVisualDynamic:
         self.elevenlabs_connector = None
         self.audio_player_connector = None
         self.g1_emotion_connector = None
+        self.led_writer = get_led_writer()
         
         # Estado do sistema
         self.current_emotion = "neutral"
         self.is_playing = False
-        self.audio_analysis_thread = None
-        self.stop_analysis = False
+        self.led_animation: Optional[LedAnimation] = None
+        self.live_envelope: Optional[EnvelopeFollower] = None
+        self.live_emotion: Optional[EmotionConfig] = None
+        self.frame_period = config.get("frame_period", 0.1)  # janela de volume = quadro de LED
         
         # Configurações de análise de áudio
         self.volume_smoothing = 0.8  # Suavização do volume
@@ -110,128 +104,79 @@ class AudioVisualDynamic:
     
     def detect_emotion_from_text(self, text: str) -> str:
         """Detecta emoção a partir do texto"""
-        text_lower = text.lower()
-        
-        # Pontuação para cada emoção
-        emotion_scores = {}
-        
-        for emotion_name, config in EMOTION_CONFIGS.items():
-            score = 0
-            for keyword in config.keywords:
-                if keyword in text_lower:
-                    score += 1
-            emotion_scores[emotion_name] = score
-        
-        # Análise de pontuação
-        if "!" in text:
-            emotion_scores["excited"] += 2
-        if "?" in text:
-            emotion_scores["thinking"] += 1
-        if "..." in text:
-            emotion_scores["thinking"] += 1
-        
-        # Retorna emoção com maior pontuação
-        best_emotion = max(emotion_scores, key=emotion_scores.get)
-        
-        # Se nenhuma emoção específica, usar neutral
-        if emotion_scores[best_emotion] == 0:
-            best_emotion = "neutral"
+        # Análise compartilhada (índice de tokens compilado na inicialização)
+        best_emotion = analyze_text(text).best_emotion(EMOTION_CONFIGS)
         
         logger.info(f"🎭 Texto: '{text[:50]}...' → Emoção: {best_emotion}")
         return best_emotion
     
     def analyze_audio_volume(self, audio_file: str) -> list:
-        """Analisa volume do arquivo de áudio"""
+        """Analisa volume do arquivo de áudio (RMS em janelas de ``frame_period``)"""
         try:
-            with wave.open(audio_file, 'rb') as wav_file:
-                frames = wav_file.readframes(-1)
-                sound_info = wav_file.getparams()
-                
-                # Converter para numpy array
-                if sound_info.sampwidth == 1:
-                    sound_data = np.frombuffer(frames, dtype=np.uint8)
-                elif sound_info.sampwidth == 2:
-                    sound_data = np.frombuffer(frames, dtype=np.int16)
-                elif sound_info.sampwidth == 4:
-                    sound_data = np.frombuffer(frames, dtype=np.int32)
-                else:
-                    logger.warning(f"Formato de áudio não suportado: {sound_info.sampwidth} bytes")
-                    return []
-                
-                # Calcular RMS em janelas
-                window_size = int(sound_info.framerate * 0.1)  # 100ms windows
-                volumes = []
-                
-                for i in range(0, len(sound_data), window_size):
-                    window = sound_data[i:i + window_size]
-                    if len(window) > 0:
-                        rms = np.sqrt(np.mean(window.astype(float) ** 2))
-                        # Normalizar para 0-1
-                        normalized_volume = min(1.0, rms / 5000.0)
-                        volumes.append(normalized_volume)
-                
-                logger.info(f"📊 Áudio analisado: {len(volumes)} janelas, volume médio: {np.mean(volumes):.3f}")
-                return volumes
+            volumes = wav_envelope(audio_file, window_s=self.frame_period)
+            if len(volumes):
+                logger.info(f"📊 Áudio analisado: {len(volumes)} janelas, volume médio: {volumes.mean():.3f}")
+            return volumes.tolist()
                 
         except Exception as e:
             logger.error(f"❌ Erro ao analisar áudio: {e}")
             return []
     
-    def start_led_animation(self, emotion_config: EmotionConfig, volumes: list):
-        """Inicia animação dos LEDs baseada no volume"""
-        def animate_leds():
-            try:
-                logger.info(f"🎨 Iniciando animação LED para emoção: {emotion_config.name}")
-                
-                # Timing para sincronizar com áudio
-                window_duration = 0.1  # 100ms por janela
-                
-                for i, volume in enumerate(volumes):
-                    if self.stop_analysis:
-                        break
-                    
-                    # Calcular intensidade baseada no volume
-                    volume_intensity = max(self.min_intensity, min(self.max_intensity, volume))
-                    final_intensity = emotion_config.base_intensity * volume_intensity
-                    
-                    # Aplicar intensidade às cores RGB
-                    r = int(emotion_config.rgb[0] * final_intensity)
-                    g = int(emotion_config.rgb[1] * final_intensity)
-                    b = int(emotion_config.rgb[2] * final_intensity)
-                    
-                    # Atualizar LEDs
-                    if self.g1_emotion_connector and not self.stop_analysis:
-                        try:
-                            # Usar asyncio dentro da thread
-                            loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(loop)
-                            loop.run_until_complete(
-                                self.g1_emotion_connector.set_custom_color(r, g, b)
-                            )
-                            loop.close()
-                        except Exception as led_error:
-                            logger.warning(f"Erro ao atualizar LED: {led_error}")
-                    
-                    logger.debug(f"LED frame {i}: volume={volume:.3f}, intensity={final_intensity:.3f}, RGB({r},{g},{b})")
-                    time.sleep(window_duration)
-                
-                # Desligar LEDs ao final
-                if self.g1_emotion_connector and not self.stop_analysis:
-                    try:
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                        loop.run_until_complete(self.g1_emotion_connector.turn_off_leds())
-                        loop.close()
-                        logger.info("🔴 LEDs desligados após animação")
-                    except Exception as e:
-                        logger.warning(f"Erro ao desligar LEDs: {e}")
-                
-            except Exception as e:
-                logger.error(f"❌ Erro na animação LED: {e}")
+    def start_led_animation(self, emotion_config: EmotionConfig, volumes: list) -> LedAnimation:
+        """
+        Inicia animação dos LEDs baseada no volume
+        
+        Uma única task no loop principal (LED writer) toca um quadro por
+        janela de volume, com prazos no relógio monotônico.
+        """
+        frames = levels_to_frames(volumes, emotion_config.rgb, emotion_config.base_intensity,
+                                  self.min_intensity, self.max_intensity)
         
-        self.stop_analysis = False
-        self.audio_analysis_thread = threading.Thread(target=animate_leds)
-        self.audio_analysis_thread.start()
+        logger.info(f"🎨 Iniciando animação LED para emoção: {emotion_config.name} ({len(frames)} quadros)")
+        self.led_animation = self.led_writer.animate(
+            frames, self.frame_period, layer=LedLayer.SPEECH, source=f"speech:{emotion_config.name}"
+        )
+        return self.led_animation
+    
+    def start_live_envelope(self, sample_rate: int, sample_width: int = 2, channels: int = 1,
+                            emotion: Optional[str] = None) -> EnvelopeFollower:
+        """
+        Prepara os LEDs para seguir o PCM da fala enquanto ela toca
+        
+        Alternativa à análise do arquivo pré-renderizado: cada pedaço
+        passado a ``feed_live_audio`` atualiza a camada SPEECH assim que uma
+        janela de ``frame_period`` se completa.
+        """
+        self.live_emotion = EMOTION_CONFIGS.get(emotion or self.current_emotion, EMOTION_CONFIGS["neutral"])
+        self.live_envelope = EnvelopeFollower(sample_rate, sample_width, channels, window_s=self.frame_period)
+        return self.live_envelope
+    
+    def feed_live_audio(self, chunk: bytes) -> int:
+        """Consome um pedaço de PCM da fala ao vivo; retorna janelas completadas"""
+        if self.live_envelope is None:
+            return 0
+        levels = self.live_envelope.feed(chunk)
+        if len(levels):
+            # Só a janela mais recente importa; o LED writer limita a taxa de escrita
+            color = levels_to_frames(levels[-1:], self.live_emotion.rgb, self.live_emotion.base_intensity,
+                                     self.min_intensity, self.max_intensity)[0]
+            self.led_writer.set_color(*color, layer=LedLayer.SPEECH, ttl=self.frame_period * 3,
+                                      source=f"speech_live:{self.live_emotion.name}")
+        return len(levels)
+    
+    def stop_live_envelope(self):
+        """Encerra o modo ao vivo e libera a camada SPEECH"""
+        self.live_envelope = None
+        self.led_writer.clear(LedLayer.SPEECH)
+    
+    async def interrupt(self):
+        """Interrompe fala e animação (barge-in)."""
+        if self.audio_player_connector and hasattr(self.audio_player_connector, "stop_playback"):
+            await self.audio_player_connector.stop_playback()
+        if self.led_animation:
+            await self.led_animation.stop()
+        if self.live_envelope:
+            self.stop_live_envelope()
     
     async def speak_with_dynamic_leds(self, text: str, emotion: Optional[str] = None) -> bool:
         """
@@ -271,8 +216,9 @@ class AudioVisualDynamic:
                 volumes = [0.5] * 50  # Fallback com 5 segundos de intensidade média
             
             # 4. Iniciar animação LED em paralelo
+            await self.led_writer.start()
             self.is_playing = True
-            self.start_led_animation(emotion_config, volumes)
+            animation = self.start_led_animation(emotion_config, volumes)
             
             # 5. Reproduzir áudio no Anker
             if self.audio_player_connector:
@@ -281,13 +227,11 @@ class AudioVisualDynamic:
                     logger.info("✅ Áudio reproduzido no Anker com LEDs dinâmicos")
                     
                     # Aguardar conclusão da animação
-                    if self.audio_analysis_thread:
-                        self.audio_analysis_thread.join(timeout=30)
-                    
+                    await animation.wait()
+                    logger.info(f"🔴 Animação LED concluída: {animation.get_stats()}")
                     return True
                 else:
                     logger.error("❌ Falha na reprodução no Anker")
-                    self.stop_analysis = True
                     return False
             
             return False
@@ -296,8 +240,10 @@ class AudioVisualDynamic:
             logger.error(f"❌ Erro em speak_with_dynamic_leds: {e}")
             return False
         finally:
+            # Erro ou cancelamento (barge-in): a animação não sobrevive à fala
             self.is_playing = False
-            self.stop_analysis = True
+            if self.led_animation and not self.led_animation.done:
+                self.led_animation.cancel()
     
     def get_emotion_info(self) -> Dict[str, Any]:
         """Retorna informações das emoções disponíveis"""
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Executor de comandos do robô
+Executa chamadas bloqueantes do SDK Unitree (RPCs DDS) fora do loop asyncio
+
+Cada cliente (arms, loco, audio) tem uma única thread dona: comandos do
+mesmo cliente são serializados na ordem de envio e clientes diferentes não
+bloqueiam uns aos outros. Um RPC lento dos braços nunca congela fala ou
+percepção.
+
+Paradas e comandos de segurança (``urgent=True``) usam uma segunda thread do
+mesmo cliente: não esperam atrás de um RPC lento em execução, não expiram na
+fila e não são descartados por ``flush()``. Os clientes RPC do SDK casam
+requisição e resposta por id, então duas threads podem chamar o mesmo cliente.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Limites superiores dos buckets de latência (ms)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class CommandDeadlineExceeded(Exception):
+    """Comando não terminou (ou nem começou) dentro do prazo."""
+
+
+@dataclass
+class CommandStats:
+    """Histograma de latência de um comando (cliente.método)."""
+    count: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    expired: int = 0                # descartados na fila por prazo vencido
+    flushed: int = 0                # descartados na fila por flush()
+    max_ms: float = 0.0
+    total_ms: float = 0.0
+    queue_ms: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+    def record(self, latency_ms: float, queue_ms: float):
+        self.count += 1
+        self.total_ms += latency_ms
+        self.queue_ms += queue_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        for index, limit in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= limit:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Percentil aproximado (limite superior do bucket, no máximo o maior valor visto)."""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        cumulative = 0
+        for index, hits in enumerate(self.buckets):
+            cumulative += hits
+            if cumulative >= target:
+                return min(float(LATENCY_BUCKETS_MS[index]), self.max_ms) \
+                    if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "expired": self.expired,
+            "flushed": self.flushed,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "avg_queue_ms": round(self.queue_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 2),
+            "histogram": dict(zip([f"<={limit}ms" for limit in LATENCY_BUCKETS_MS] + ["inf"], self.buckets))
+        }
+
+
+class RobotCommandExecutor:
+    """
+    Executor de comandos do SDK com uma thread por cliente.
+
+    Uso:
+        result = await executor.call("arms", "ExecuteAction", arm_client.ExecuteAction, 26, deadline=5.0)
+    """
+
+    def __init__(self, default_deadline: float = 10.0):
+        """
+        Inicializa o executor.
+
+        Args:
+            default_deadline: Prazo padrão de cada comando (segundos, inclui tempo em fila)
+        """
+        self.default_deadline = default_deadline
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._pending: Dict[str, Set[Future]] = {}
+        self._generation: Dict[str, int] = {}  # incrementado por flush()
+        self._stats: Dict[str, CommandStats] = {}
+        self._lock = threading.Lock()
+        self._stopped = False
+
+    def _executor_for(self, lane: str) -> ThreadPoolExecutor:
+        executor = self._executors.get(lane)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"g1-{lane}")
+            self._executors[lane] = executor
+            self._pending[lane] = set()
+            self._generation[lane] = 0
+        return executor
+
+    def _stats_for(self, key: str) -> CommandStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = CommandStats()
+        return stats
+
+    async def call(self, client: str, command: str, func: Callable[..., Any], *args,
+                   deadline: Optional[float] = None, urgent: bool = False, **kwargs) -> Any:
+        """
+        Executa func(*args, **kwargs) na thread do cliente.
+
+        Args:
+            client: Nome do cliente SDK (arms, loco, audio)
+            command: Nome do comando (para métricas)
+            func: Chamada bloqueante do SDK
+            deadline: Prazo em segundos desde o envio (None = padrão)
+            urgent: Parada/segurança: thread própria, sem expirar na fila nem
+                    ser descartado por flush(); o prazo só limita a espera
+
+        Returns:
+            Retorno da chamada do SDK
+
+        Raises:
+            CommandDeadlineExceeded: prazo vencido na fila ou durante a execução
+        """
+        if self._stopped:
+            raise RuntimeError("RobotCommandExecutor parado")
+
+        deadline = self.default_deadline if deadline is None else deadline
+        lane = f"{client}-urgent" if urgent else client
+        key = f"{lane}.{command}"
+        submitted = time.monotonic()
+        expires = float("inf") if urgent else submitted + deadline
+        executor = self._executor_for(lane)
+        generation = self._generation[lane]
+
+        def run():
+            started = time.monotonic()
+            if self._generation[lane] != generation:
+                with self._lock:
+                    self._stats_for(key).flushed += 1
+                raise CommandDeadlineExceeded(f"{key} descartado da fila")
+            if started > expires:
+                # Ficou tempo demais na fila: executar agora seria um comando velho
+                with self._lock:
+                    self._stats_for(key).expired += 1
+                raise CommandDeadlineExceeded(f"{key} expirou na fila ({(started - submitted) * 1000:.0f}ms)")
+            try:
+                return func(*args, **kwargs)
+            finally:
+                finished = time.monotonic()
+                with self._lock:
+                    self._stats_for(key).record((finished - started) * 1000, (started - submitted) * 1000)
+
+        future = executor.submit(run)
+        pending = self._pending[lane]
+        pending.add(future)
+        future.add_done_callback(pending.discard)
+
+        waiter = asyncio.wrap_future(future)
+        if urgent:
+            # Cancelar a espera não pode cancelar o comando (wrap_future propaga o cancelamento)
+            waiter = asyncio.shield(waiter)
+        try:
+            return await asyncio.wait_for(waiter, timeout=deadline)
+        except asyncio.TimeoutError:
+            # A thread não pode ser interrompida: o RPC termina sozinho, mas não é mais aguardado.
+            # Uma parada urgente ainda na fila continua lá: chegar atrasada é melhor que não chegar.
+            if not urgent:
+                future.cancel()
+            with self._lock:
+                self._stats_for(key).timeouts += 1
+            raise CommandDeadlineExceeded(f"{key} excedeu o prazo de {deadline:.1f}s") from None
+        except asyncio.CancelledError:
+            # Quem aguardava desistiu (ex.: barge-in); não executar se ainda está na fila
+            if not urgent:
+                future.cancel()
+            raise
+        except CommandDeadlineExceeded:
+            raise
+        except Exception:
+            with self._lock:
+                self._stats_for(key).errors += 1
+            raise
+
+    def flush(self, client: str) -> int:
+        """
+        Descarta comandos ainda em fila do cliente (ex.: antes de um StopMove).
+
+        O comando em execução termina normalmente; os que estavam na fila
+        falham com CommandDeadlineExceeded sem chamar o SDK. Comandos
+        urgentes não são afetados.
+
+        Returns:
+            Número de comandos pendentes no momento do flush
+        """
+        if client not in self._generation:
+            return 0
+        self._generation[client] += 1
+        pending = len(self._pending[client])
+        if pending:
+            logger.info(f"⏹️ Fila {client} descartada ({pending} comandos pendentes)")
+        return pending
+
+    def queue_depth(self, client: str) -> int:
+        """Comandos enviados e ainda não concluídos do cliente (fila normal)."""
+        return len(self._pending.get(client, ()))
+
+    def shutdown(self):
+        """Descarta comandos em fila e encerra as threads."""
+        self._stopped = True
+        for lane, executor in self._executors.items():
+            self.flush(lane)
+            executor.shutdown(wait=False)
+        self._executors.clear()
+        self._pending.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna histogramas de latência por comando e profundidade das filas."""
+        with self._lock:
+            commands = {key: stats.to_dict() for key, stats in sorted(self._stats.items())}
+        return {
+            "clients": {client: {"queue_depth": len(pending)} for client, pending in self._pending.items()},
+            "commands": commands
+        }
+
+
+_default_executor: Optional[RobotCommandExecutor] = None
+
+
+def get_command_executor() -> RobotCommandExecutor:
+    """Retorna o executor compartilhado por todos os conectores do G1."""
+    global _default_executor
+    if _default_executor is None or _default_executor._stopped:
+        _default_executor = RobotCommandExecutor()
+    return _default_executor
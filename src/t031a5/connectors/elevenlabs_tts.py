@@ -150,8 +150,9 @@ class ElevenLabsTTSConnector:
             
             self.logger.info(f"🎤 Gerando TTS: '{request.text[:50]}...' com voz {request.voice_id}")
             
-            # Gerar áudio com método testado
-            audio = generate(
+            # Gerar áudio com método testado (em thread para não bloquear o event loop)
+            audio = await asyncio.to_thread(
+                generate,
                 text=request.text,
                 voice=request.voice_id,
                 api_key=self.api_key  # API key explícita necessária (testado)
@@ -163,7 +164,7 @@ class ElevenLabsTTSConnector:
             filepath = self.output_dir / filename
             
             # Usar função save da biblioteca (método testado)
-            save(audio, str(filepath))
+            await asyncio.to_thread(save, audio, str(filepath))
             
             # Verificar se arquivo foi gerado
             if not filepath.exists():
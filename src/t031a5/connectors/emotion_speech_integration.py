@@ -6,13 +6,15 @@ Combina: ElevenLabs TTS + Anker + G1 LEDs + análise de áudio em tempo real
 
 import logging
 import asyncio
-import threading
-import time
 import re
 import numpy as np
 from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
+from ..conversation.text_analysis import EMOTION_KEYWORDS, analyze_text
+from .audio_envelope import levels_to_frames, wav_envelope
+from .led_writer import LedAnimation, LedLayer, get_led_writer
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -33,20 +35,13 @@ class EmotionMapping:
 
 # Mapeamento de emoções para LEDs
 EMOTION_MAPPINGS = {
-    "happy": EmotionMapping("happy", (0, 255, 0), 0.8, 
-                           ["feliz", "alegre", "ótimo", "excelente", "maravilhoso", "perfeito", "sucesso"]),
-    "excited": EmotionMapping("excited", (255, 128, 0), 0.9,
-                             ["animado", "empolgado", "incrível", "fantástico", "wow", "uau"]),
-    "calm": EmotionMapping("calm", (0, 255, 255), 0.6,
-                          ["calmo", "tranquilo", "relaxado", "pacífico", "sereno"]),
-    "thinking": EmotionMapping("thinking", (128, 0, 128), 0.5,
-                              ["pensando", "analisando", "considerando", "avaliando", "hmm"]),
-    "concerned": EmotionMapping("concerned", (255, 255, 0), 0.7,
-                               ["preocupado", "cuidado", "atenção", "problema", "erro"]),
-    "sad": EmotionMapping("sad", (0, 0, 255), 0.4,
-                         ["triste", "ruim", "falha", "erro", "problema", "não funcionou"]),
-    "neutral": EmotionMapping("neutral", (128, 128, 128), 0.5,
-                             ["neutro", "ok", "normal", "padrão"])
+    "happy": EmotionMapping("happy", (0, 255, 0), 0.8, list(EMOTION_KEYWORDS["happy"])),
+    "excited": EmotionMapping("excited", (255, 128, 0), 0.9, list(EMOTION_KEYWORDS["excited"])),
+    "calm": EmotionMapping("calm", (0, 255, 255), 0.6, list(EMOTION_KEYWORDS["calm"])),
+    "thinking": EmotionMapping("thinking", (128, 0, 128), 0.5, list(EMOTION_KEYWORDS["thinking"])),
+    "concerned": EmotionMapping("concerned", (255, 255, 0), 0.7, list(EMOTION_KEYWORDS["concerned"])),
+    "sad": EmotionMapping("sad", (0, 0, 255), 0.4, list(EMOTION_KEYWORDS["sad"])),
+    "neutral": EmotionMapping("neutral", (128, 128, 128), 0.5, list(EMOTION_KEYWORDS["neutral"]))
 }
 
 class EmotionSpeechIntegration:
@@ -60,13 +55,13 @@ class EmotionSpeechIntegration:
         self.elevenlabs_connector = None
         self.audio_player_connector = None
         self.g1_emotion_connector = None
+        self.led_writer = get_led_writer()
         
         # Estado atual
         self.current_emotion = "neutral"
         self.current_intensity = 0.5
         self.is_speaking = False
-        self.audio_analysis_thread = None
-        self.stop_analysis = False
+        self.led_animation: Optional[LedAnimation] = None
         
         logger.info("EmotionSpeechIntegration inicializado")
     
@@ -109,32 +104,8 @@ class EmotionSpeechIntegration:
     
     def analyze_text_emotion(self, text: str) -> str:
         """Analisa texto e determina emoção apropriada"""
-        text_lower = text.lower()
-        
-        # Pontuação para diferentes emoções
-        emotion_scores = {}
-        
-        for emotion_name, mapping in EMOTION_MAPPINGS.items():
-            score = 0
-            for keyword in mapping.keywords:
-                if keyword in text_lower:
-                    score += 1
-            emotion_scores[emotion_name] = score
-        
-        # Análise de pontuação e caracteres especiais
-        if "!" in text:
-            emotion_scores["excited"] += 2
-        if "?" in text:
-            emotion_scores["thinking"] += 1
-        if "..." in text:
-            emotion_scores["thinking"] += 1
-        
-        # Retorna emoção com maior pontuação
-        best_emotion = max(emotion_scores, key=emotion_scores.get)
-        
-        # Se nenhuma emoção específica, usar neutral
-        if emotion_scores[best_emotion] == 0:
-            best_emotion = "neutral"
+        # Análise compartilhada (índice de tokens compilado na inicialização)
+        best_emotion = analyze_text(text).best_emotion(EMOTION_MAPPINGS)
         
         logger.info(f"🎭 Texto analisado: '{text[:50]}...' → Emoção: {best_emotion}")
         return best_emotion
@@ -167,7 +138,9 @@ class EmotionSpeechIntegration:
                 g = int(rgb[1] * intensity)
                 b = int(rgb[2] * intensity)
                 
-                await self.g1_emotion_connector.set_custom_color(r, g, b)
+                await self.g1_emotion_connector.set_custom_color(
+                    r, g, b, layer=LedLayer.SPEECH, source=f"speech:{emotion}"
+                )
                 logger.info(f"🎨 LEDs configurados: {emotion} RGB({r}, {g}, {b})")
             
             # 3. Gerar TTS via ElevenLabs
@@ -195,7 +168,7 @@ class EmotionSpeechIntegration:
                     
                     # 7. Desligar LEDs após fala
                     if self.g1_emotion_connector:
-                        await self.g1_emotion_connector.turn_off_leds()
+                        await self.g1_emotion_connector.turn_off_leds(LedLayer.SPEECH)
                     
                     return True
                 else:
@@ -208,53 +181,44 @@ class EmotionSpeechIntegration:
             logger.error(f"❌ Erro em speak_with_emotion: {e}")
             return False
         finally:
+            # Erro ou cancelamento (barge-in): a animação não sobrevive à fala
             self.is_speaking = False
-            self.stop_analysis = True
+            if self.led_animation and not self.led_animation.done:
+                self.led_animation.cancel()
     
-    def start_audio_analysis(self, audio_file: str, emotion_mapping: EmotionMapping):
+    def start_audio_analysis(self, audio_file: str, emotion_mapping: EmotionMapping) -> Optional[LedAnimation]:
         """Inicia análise de áudio em tempo real para controle de intensidade"""
-        if not AUDIO_ANALYSIS_AVAILABLE:
-            return
+        if not AUDIO_ANALYSIS_AVAILABLE or not self.g1_emotion_connector:
+            return None
         
-        def analyze_audio():
-            try:
-                # Simular análise de áudio (versão simplificada)
-                # Em implementação real, analisaria amplitude do áudio
-                duration = 3.0  # Duração estimada
-                steps = 30
-                step_time = duration / steps
-                
-                for i in range(steps):
-                    if self.stop_analysis:
-                        break
-                    
-                    # Simular variação de intensidade baseada no áudio
-                    # Valores sinusoidais para simular variação natural da fala
-                    intensity_variation = 0.3 * np.sin(i * 0.5) + 0.7
-                    
-                    # Aplicar variação aos LEDs
-                    rgb = emotion_mapping.rgb
-                    intensity = emotion_mapping.intensity_base * intensity_variation
-                    
-                    r = int(rgb[0] * intensity)
-                    g = int(rgb[1] * intensity)
-                    b = int(rgb[2] * intensity)
-                    
-                    # Atualizar LEDs (execução assíncrona)
-                    if self.g1_emotion_connector:
-                        asyncio.run_coroutine_threadsafe(
-                            self.g1_emotion_connector.set_custom_color(r, g, b),
-                            asyncio.get_event_loop()
-                        )
-                    
-                    time.sleep(step_time)
-                    
-            except Exception as e:
-                logger.error(f"Erro na análise de áudio: {e}")
+        frame_period = 0.1
+        try:
+            levels = wav_envelope(audio_file, window_s=frame_period)
+        except Exception as e:
+            logger.debug(f"Envelope indisponível para {audio_file}: {e}")
+            levels = []
         
-        self.stop_analysis = False
-        self.audio_analysis_thread = threading.Thread(target=analyze_audio)
-        self.audio_analysis_thread.start()
+        if len(levels):
+            frames = levels_to_frames(levels, emotion_mapping.rgb, emotion_mapping.intensity_base)
+        else:
+            # Sem PCM legível (ex.: MP3): valores sinusoidais simulam a variação da fala
+            steps = 30
+            frame_period = 3.0 / steps
+            intensities = emotion_mapping.intensity_base * (0.3 * np.sin(np.arange(steps) * 0.5) + 0.7)
+            frames = [tuple(int(channel * intensity) for channel in emotion_mapping.rgb) for intensity in intensities]
+        
+        # Uma task no loop principal toca os quadros com prazos monotônicos
+        self.led_animation = self.led_writer.animate(
+            frames, frame_period, layer=LedLayer.SPEECH, source=f"speech:{emotion_mapping.name}"
+        )
+        return self.led_animation
+    
+    async def interrupt(self):
+        """Interrompe fala e animação (barge-in)."""
+        if self.audio_player_connector and hasattr(self.audio_player_connector, "stop_playback"):
+            await self.audio_player_connector.stop_playback()
+        if self.led_animation:
+            await self.led_animation.stop()
     
     async def wait_for_speech_completion(self):
         """Aguarda conclusão da fala"""
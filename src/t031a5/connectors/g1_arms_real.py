@@ -7,9 +7,13 @@ TESTE 8: Conexão direta com hardware G1
 
 import asyncio
 import logging
-import sys
 from typing import Dict, Any, Optional, List
-from pathlib import Path
+
+from .command_executor import CommandDeadlineExceeded, get_command_executor
+from .g1_session import get_g1_session
+from ..actions.g1_sequence_compiler import (
+    MovementPlan, SequenceCompilationError, get_sequence_compiler
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +29,19 @@ class G1ArmsRealConnector:
         self.enabled = config.get("enabled", True)
         self.network_interface = config.get("network_interface", "eth0")
         self.timeout = config.get("timeout", 10.0)
+        self.command_deadline = config.get("command_deadline", self.timeout + 1.0)
         
         # Estado do connector
         self.is_initialized = False
         self.arm_client = None
+        self.action_map: Dict[str, int] = {}
+        
+        # Sessão DDS compartilhada com os demais conectores reais
+        self.session = get_g1_session({
+            "network_interface": self.network_interface,
+            "timeout": self.timeout,
+            "fake_sdk": config.get("fake_sdk", False)
+        })
         
         # Mapeamento de gestos para action_map
         self.gesture_map = {
@@ -60,33 +73,19 @@ class G1ArmsRealConnector:
         try:
             logger.info("Inicializando G1ArmActionClient...")
             
-            # Adicionar SDK ao path
-            sdk_path = Path(__file__).parent.parent.parent.parent / "unitree_sdk2_python"
-            if str(sdk_path) not in sys.path:
-                sys.path.insert(0, str(sdk_path))
-            
-            # Importar SDK G1
-            from unitree_sdk2py.core.channel import ChannelFactoryInitialize
-            from unitree_sdk2py.g1.arm.g1_arm_action_client import G1ArmActionClient, action_map
-            
-            # Inicializar canal de comunicação
-            ChannelFactoryInitialize(0, self.network_interface)
-            
-            # Criar e inicializar cliente G1
-            self.arm_client = G1ArmActionClient()
-            self.arm_client.SetTimeout(self.timeout)
-            self.arm_client.Init()
+            # Canal DDS e cliente vêm da sessão compartilhada (criados uma única vez)
+            self.arm_client = await self.session.get_arm_client()
+            if self.arm_client is None:
+                logger.error("G1ArmActionClient indisponível (SDK ou canal DDS)")
+                return False
             
             # Armazenar action_map para uso posterior
-            self.action_map = action_map
+            self.action_map = self.session.action_map
             
             self.is_initialized = True
             logger.info("✅ G1ArmActionClient inicializado com sucesso")
             return True
             
-        except ImportError as e:
-            logger.error(f"Erro ao importar SDK G1: {e}")
-            return False
         except Exception as e:
             logger.error(f"Erro na inicialização G1Arms: {e}")
             return False
@@ -118,26 +117,70 @@ class G1ArmsRealConnector:
             
             logger.info(f"Executando gesto G1: {gesture_name} -> {action_name}")
             
+            # Gestos da biblioteca seguem o plano compilado (durações e relax validados)
+            try:
+                plan = get_sequence_compiler().compile([self.action_map[action_name]])
+            except SequenceCompilationError as e:
+                logger.warning(f"Gesto {gesture_name} fora da biblioteca validada ({e}), envio direto")
+                plan = None
+            
+            if plan is not None:
+                return await self.execute_plan(plan)
+            
             # EXECUTAR COMANDO REAL NO HARDWARE G1
-            self.arm_client.ExecuteAction(self.action_map.get(action_name))
+            await self._execute_action(action_name)
             
             logger.info(f"✅ Comando G1 enviado: {action_name}")
             
             # Aguardar execução (sem bloquear async)
             await asyncio.sleep(duration)
             
-            # Comando release automático para alguns gestos
-            if gesture_name in ["shake_hand", "high_five", "hug", "heart", "hands_up"]:
-                logger.info("Enviando comando release automático...")
-                self.arm_client.ExecuteAction(self.action_map.get("release arm"))
-                await asyncio.sleep(1.0)
-            
             return True
             
+        except CommandDeadlineExceeded as e:
+            logger.error(f"⏱️ Gesto {gesture_name} excedeu o prazo: {e}")
+            return False
         except Exception as e:
             logger.error(f"Erro na execução do gesto {gesture_name}: {e}")
             return False
     
+    async def execute_plan(self, plan: MovementPlan) -> bool:
+        """
+        Executa um plano compilado passo a passo
+        
+        Args:
+            plan: Plano do G1SequenceCompiler (IDs validados e relax inseridos)
+            
+        Returns:
+            True se todos os passos foram executados
+        """
+        if not self.is_initialized or not self.arm_client:
+            logger.error("G1ArmsRealConnector não inicializado")
+            return False
+        
+        # O action_map do SDK é a palavra final sobre quais IDs existem
+        sdk_ids = set(self.action_map.values())
+        missing = [action_id for action_id in plan.action_ids if action_id not in sdk_ids]
+        if missing:
+            logger.error(f"IDs fora do action_map do SDK: {missing}")
+            return False
+        
+        try:
+            for step in plan.steps:
+                await self._execute_action_id(step.action_id)
+                logger.debug(f"🤚 Passo {step.name} ({step.action_id}) enviado")
+                await asyncio.sleep(step.duration)
+            
+            logger.info(f"✅ Sequência G1 executada: {list(plan.key)} ({plan.total_duration:.1f}s)")
+            return True
+            
+        except CommandDeadlineExceeded as e:
+            logger.error(f"⏱️ Sequência {list(plan.key)} excedeu o prazo: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Erro na execução da sequência {list(plan.key)}: {e}")
+            return False
+    
     async def release_arms(self) -> bool:
         """
         Libera os braços (posição relaxada)
@@ -151,7 +194,7 @@ class G1ArmsRealConnector:
         
         try:
             logger.info("Executando release arms...")
-            self.arm_client.ExecuteAction(self.action_map.get("release arm"))
+            await self._execute_action("release arm")
             logger.info("✅ Arms released")
             return True
             
@@ -159,6 +202,22 @@ class G1ArmsRealConnector:
             logger.error(f"Erro no release arms: {e}")
             return False
     
+    async def _execute_action(self, action_name: str):
+        """Envia ExecuteAction pelo nome do action_map."""
+        return await self._execute_action_id(self.action_map.get(action_name))
+    
+    async def _execute_action_id(self, action_id: int):
+        """Envia ExecuteAction pela thread do cliente arms (com prazo)."""
+        # Após reconexão da sessão o cliente em cache é outro
+        client = await self.session.get_arm_client()
+        if client is None:
+            raise RuntimeError("G1ArmActionClient indisponível")
+        self.arm_client = client
+        return await get_command_executor().call(
+            "arms", "ExecuteAction", client.ExecuteAction, action_id,
+            deadline=self.command_deadline
+        )
+    
     def get_available_gestures(self) -> List[str]:
         """
         Retorna lista de gestos disponíveis
@@ -175,9 +234,7 @@ class G1ArmsRealConnector:
         Returns:
             Lista de ações SDK disponíveis
         """
-        if hasattr(self, 'action_map'):
-            return list(self.action_map.keys())
-        return []
+        return list(self.action_map.keys())
     
     async def cleanup(self):
         """Limpeza do connector"""
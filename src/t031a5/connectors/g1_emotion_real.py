@@ -5,20 +5,14 @@ Baseado nos métodos descobertos em G1Controller e G1Interface
 """
 
 import logging
-import asyncio
 from typing import Dict, Any, Optional
 from enum import Enum
 
-logger = logging.getLogger(__name__)
+from .command_executor import get_command_executor
+from .g1_session import get_g1_session
+from .led_writer import LedLayer, get_led_writer
 
-try:
-    from unitree_sdk2_python.core.channel import ChannelFactoryInitialize
-    from unitree_sdk2_python.go2.audio.audio_client import AudioClient
-    SDK_AVAILABLE = True
-except ImportError:
-    logger.warning("SDK Unitree não disponível - modo simulado")
-    AudioClient = None
-    SDK_AVAILABLE = False
+logger = logging.getLogger(__name__)
 
 class EmotionType(Enum):
     """Emoções mapeadas para cores de LEDs"""
@@ -37,31 +31,43 @@ class G1EmotionRealConnector:
         self.enabled = config.get("enabled", True)
         self.network_interface = config.get("network_interface", "eth0")
         self.timeout = config.get("timeout", 10.0)
+        self.command_deadline = config.get("command_deadline", 1.0)  # cor atrasada já é cor errada
         
-        # Cliente SDK
-        self.audio_client: Optional[AudioClient] = None
+        # Cliente SDK (None = modo simulado)
+        self.audio_client: Optional[Any] = None
         self.is_initialized = False
         
+        # Sessão DDS compartilhada com os demais conectores reais
+        self.session = get_g1_session({
+            "network_interface": self.network_interface,
+            "timeout": self.timeout,
+            "fake_sdk": config.get("fake_sdk", False)
+        })
+        
+        # Etapa única de saída dos LEDs (taxa limitada, camadas de prioridade)
+        self.led_writer = get_led_writer(config.get("led_writer", {}))
+        
         logger.info(f"G1EmotionRealConnector configurado: enabled={self.enabled}")
     
     async def initialize(self) -> bool:
         """Inicializa conexão real com G1 para controle de LEDs"""
         try:
-            if not self.enabled or not SDK_AVAILABLE:
+            if not self.enabled:
                 logger.info("G1EmotionReal: usando modo simulado")
                 self.is_initialized = True
                 return True
             
             logger.info("Inicializando AudioClient para controle de LEDs...")
             
-            # Inicializar DDS
-            ChannelFactoryInitialize(0, self.network_interface)
-            
-            # Criar cliente de áudio (para LEDs)
-            self.audio_client = AudioClient()
+            # Canal DDS e cliente vêm da sessão compartilhada (criados uma única vez)
+            self.audio_client = await self.session.get_audio_client()
+            if self.audio_client is None:
+                logger.info("G1EmotionReal: SDK indisponível, usando modo simulado")
+                self.is_initialized = True
+                return True
             
-            # Testar conexão
-            await asyncio.sleep(0.5)  # Aguardar inicialização
+            self.led_writer.bind_publisher(self._led_control)
+            await self.led_writer.start()
             
             self.is_initialized = True
             logger.info("✅ G1EmotionReal: AudioClient inicializado com sucesso")
@@ -72,13 +78,16 @@ class G1EmotionRealConnector:
             self.is_initialized = False
             return False
     
-    async def set_emotion(self, emotion_name: str, brightness: float = 1.0) -> bool:
+    async def set_emotion(self, emotion_name: str, brightness: float = 1.0,
+                          layer: LedLayer = LedLayer.EMOTION, ttl: Optional[float] = None) -> bool:
         """
         Define emoção via LEDs
         
         Args:
             emotion_name: Nome da emoção (happy, sad, excited, calm, angry, neutral)
             brightness: Brilho (0.0-1.0)
+            layer: Camada de prioridade no LED writer
+            ttl: Segundos até a camada expirar (None = até ser limpa)
         """
         try:
             if not self.is_initialized:
@@ -101,30 +110,24 @@ class G1EmotionRealConnector:
             
             logger.info(f"🎨 Definindo emoção {emotion_name}: RGB({r}, {g}, {b})")
             
-            if not SDK_AVAILABLE or not self.audio_client:
-                logger.info("💭 Modo simulado: LEDs configurados")
-                return True
-            
-            # COMANDO REAL PARA LEDs
-            result = self.audio_client.LedControl(r, g, b)
-            
-            if result == 0:
-                logger.info(f"✅ LEDs configurados: {emotion_name} RGB({r}, {g}, {b})")
-                return True
-            else:
-                logger.error(f"❌ Erro ao configurar LEDs: código {result}")
-                return False
+            # O writer decide quando (e se) o LedControl sai
+            self.led_writer.set_color(r, g, b, layer=layer, ttl=ttl, source=f"emotion:{emotion_name}")
+            return True
                 
         except Exception as e:
             logger.error(f"❌ Erro ao definir emoção: {e}")
             return False
     
-    async def set_custom_color(self, r: int, g: int, b: int) -> bool:
+    async def set_custom_color(self, r: int, g: int, b: int, layer: LedLayer = LedLayer.EMOTION,
+                               ttl: Optional[float] = None, source: str = "custom") -> bool:
         """
         Define cor customizada para LEDs
         
         Args:
             r, g, b: Valores RGB (0-255)
+            layer: Camada de prioridade no LED writer
+            ttl: Segundos até a camada expirar (None = até ser limpa)
+            source: Quem pediu a cor
         """
         try:
             if not self.is_initialized:
@@ -136,29 +139,37 @@ class G1EmotionRealConnector:
             g = max(0, min(255, g))
             b = max(0, min(255, b))
             
-            logger.info(f"🎨 Definindo cor customizada: RGB({r}, {g}, {b})")
-            
-            if not SDK_AVAILABLE or not self.audio_client:
-                logger.info("💭 Modo simulado: LEDs configurados")
-                return True
-            
-            # COMANDO REAL PARA LEDs
-            result = self.audio_client.LedControl(r, g, b)
+            logger.debug(f"🎨 Definindo cor customizada: RGB({r}, {g}, {b}) [{layer.name.lower()}]")
             
-            if result == 0:
-                logger.info(f"✅ LEDs configurados: RGB({r}, {g}, {b})")
-                return True
-            else:
-                logger.error(f"❌ Erro ao configurar LEDs: código {result}")
-                return False
+            self.led_writer.set_color(r, g, b, layer=layer, ttl=ttl, source=source)
+            return True
                 
         except Exception as e:
             logger.error(f"❌ Erro ao definir cor customizada: {e}")
             return False
     
-    async def turn_off_leds(self) -> bool:
-        """Desliga LEDs (RGB 0,0,0)"""
-        return await self.set_custom_color(0, 0, 0)
+    async def _led_control(self, r: int, g: int, b: int) -> int:
+        """Envia LedControl pela thread do cliente audio (com prazo)."""
+        # Após reconexão da sessão o cliente em cache é outro
+        self.audio_client = await self.session.get_audio_client() or self.audio_client
+        return await get_command_executor().call(
+            "audio", "LedControl", self.audio_client.LedControl, r, g, b,
+            deadline=self.command_deadline
+        )
+    
+    async def turn_off_leds(self, layer: Optional[LedLayer] = None) -> bool:
+        """
+        Libera os LEDs
+        
+        Args:
+            layer: Camada a liberar (None = todas exceto emergência); sem
+                   camadas ativas os LEDs apagam
+        """
+        if layer is None:
+            self.led_writer.clear_all()
+        else:
+            self.led_writer.clear(layer)
+        return True
     
     async def get_available_emotions(self) -> Dict[str, Dict[str, int]]:
         """Retorna emoções disponíveis e suas cores"""
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+SDK Unitree simulado
+Substituto do unitree_sdk2py para rodar os conectores reais fora do robô
+
+Os clientes falsos têm a mesma interface usada pelos conectores
+(SetTimeout/Init, Move/StopMove, ExecuteAction, LedControl...), registram
+todas as chamadas e permitem simular latência e falhas de comunicação.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# action_map do G1ArmActionClient (mesmos IDs do SDK)
+FAKE_ACTION_MAP: Dict[str, int] = {
+    "release arm": 99,
+    "two-hand kiss": 11,
+    "left kiss": 12,
+    "right kiss": 13,
+    "hands up": 15,
+    "clap": 17,
+    "high five": 18,
+    "hug": 19,
+    "heart": 20,
+    "right heart": 21,
+    "reject": 22,
+    "right hand up": 23,
+    "x-ray": 24,
+    "face wave": 25,
+    "high wave": 26,
+    "shake hand": 27,
+}
+
+# Código de retorno de RPC sem resposta (timeout DDS)
+RPC_ERR_TIMEOUT = 3104
+
+
+class FakeRobot:
+    """Estado compartilhado pelos clientes falsos (um robô simulado)."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.online = True
+        self.fsm_id = 0
+        self.velocity: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+        self.led: Tuple[int, int, int] = (0, 0, 0)
+        self.volume = 80
+        self.last_action: Optional[int] = None
+        self.calls: List[Tuple[str, str, tuple]] = []
+        self.channel_initializations = 0
+        self._lock = threading.Lock()
+
+    def rpc(self, client: str, method: str, args: tuple) -> int:
+        """Registra a chamada e simula latência/falha."""
+        with self._lock:
+            self.calls.append((client, method, args))
+        if self.latency:
+            time.sleep(self.latency)
+        return 0 if self.online else RPC_ERR_TIMEOUT
+
+    def count(self, method: str) -> int:
+        return sum(1 for _, name, _ in self.calls if name == method)
+
+
+# Robô usado pelos clientes criados sem robô explícito
+fake_robot = FakeRobot()
+
+
+class _FakeClient:
+    _name = "client"
+
+    def __init__(self, robot: Optional[FakeRobot] = None):
+        self.robot = robot or fake_robot
+        self.timeout = 10.0
+        self.initialized = False
+
+    def SetTimeout(self, timeout: float):
+        self.timeout = timeout
+
+    def Init(self):
+        self.robot.rpc(self._name, "Init", ())
+        self.initialized = True
+
+
+class FakeLocoClient(_FakeClient):
+    """Substituto de unitree_sdk2py.g1.loco.g1_loco_client.LocoClient."""
+    _name = "loco"
+
+    def Start(self) -> int:
+        code = self.robot.rpc(self._name, "Start", ())
+        if code == 0:
+            self.robot.fsm_id = 200
+        return code
+
+    def Damp(self) -> int:
+        code = self.robot.rpc(self._name, "Damp", ())
+        if code == 0:
+            self.robot.fsm_id = 1
+            self.robot.velocity = (0.0, 0.0, 0.0)
+        return code
+
+    def Move(self, vx: float, vy: float, vyaw: float, continous_move: bool = False) -> int:
+        code = self.robot.rpc(self._name, "Move", (vx, vy, vyaw))
+        if code == 0:
+            self.robot.velocity = (vx, vy, vyaw)
+        return code
+
+    def StopMove(self) -> int:
+        code = self.robot.rpc(self._name, "StopMove", ())
+        if code == 0:
+            self.robot.velocity = (0.0, 0.0, 0.0)
+        return code
+
+    def GetFsmId(self) -> Tuple[int, Optional[int]]:
+        code = self.robot.rpc(self._name, "GetFsmId", ())
+        return code, (self.robot.fsm_id if code == 0 else None)
+
+
+class FakeArmActionClient(_FakeClient):
+    """Substituto de unitree_sdk2py.g1.arm.g1_arm_action_client.G1ArmActionClient."""
+    _name = "arms"
+
+    def ExecuteAction(self, action_id: int) -> int:
+        code = self.robot.rpc(self._name, "ExecuteAction", (action_id,))
+        if code == 0:
+            self.robot.last_action = action_id
+        return code
+
+
+class FakeAudioClient(_FakeClient):
+    """Substituto de unitree_sdk2py.g1.audio.g1_audio_client.AudioClient."""
+    _name = "audio"
+
+    def LedControl(self, r: int, g: int, b: int) -> int:
+        code = self.robot.rpc(self._name, "LedControl", (r, g, b))
+        if code == 0:
+            self.robot.led = (r, g, b)
+        return code
+
+    def SetVolume(self, volume: int) -> int:
+        code = self.robot.rpc(self._name, "SetVolume", (volume,))
+        if code == 0:
+            self.robot.volume = volume
+        return code
+
+    def GetVolume(self) -> Tuple[int, Optional[Dict[str, Any]]]:
+        code = self.robot.rpc(self._name, "GetVolume", ())
+        return code, ({"volume": self.robot.volume} if code == 0 else None)
+
+    def TtsMaker(self, text: str, speaker_id: int = 0) -> int:
+        return self.robot.rpc(self._name, "TtsMaker", (text, speaker_id))
+
+
+def FakeChannelFactoryInitialize(domain_id: int = 0, network_interface: Optional[str] = None):
+    """Substituto de unitree_sdk2py.core.channel.ChannelFactoryInitialize."""
+    fake_robot.channel_initializations += 1
@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+"""
+G1 LowState
+Assinante do rt/lowstate: estado das articulações em alta taxa (~500 Hz)
+
+O callback do SDK roda na thread do DDS e só copia posição, velocidade,
+torque e temperatura dos motores para arrays pré-alocados:
+
+- o snapshot mais recente fica em buffer duplo com contador de sequência,
+  então um leitor de outra thread nunca vê uma amostra pela metade;
+- em paralelo, mínimo, máximo e soma da janela corrente são acumulados e o
+  caminho conversacional (1 Hz) drena uma janela por ciclo, recebendo
+  média/mín/máx já agregados em vez de centenas de amostras.
+
+Fora do robô, ``source: "recorded"`` reproduz uma gravação (.npz) na mesma
+cadência e pelo mesmo caminho de ingestão; sem arquivo, uma gravação
+sintética é gerada.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..inputs.telemetry import G1_JOINT_NAMES, JOINT_FIELDS
+from .g1_session import SDK_PATH, get_g1_session
+
+logger = logging.getLogger(__name__)
+
+LOWSTATE_TOPIC = "rt/lowstate"
+
+
+def load_lowstate_types():
+    """
+    Importa o ChannelSubscriber e o tipo LowState_ (unitree_hg) do SDK.
+
+    Raises:
+        ImportError: SDK não disponível
+    """
+    if str(SDK_PATH) not in sys.path:
+        sys.path.insert(0, str(SDK_PATH))
+
+    from unitree_sdk2py.core.channel import ChannelSubscriber
+    from unitree_sdk2py.idl.unitree_hg.msg.dds_ import LowState_
+
+    return ChannelSubscriber, LowState_
+
+
+@dataclass(frozen=True)
+class LowStateWindow:
+    """Agregado de uma janela de amostras (matrizes ``(campos, articulações)``)."""
+    count: int
+    started_at: float
+    ended_at: float
+    mean: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+
+    @property
+    def duration(self) -> float:
+        return self.ended_at - self.started_at
+
+    @property
+    def rate_hz(self) -> float:
+        return (self.count - 1) / self.duration if self.duration > 0 else 0.0
+
+    def summary(self, fields: Sequence[str] = JOINT_FIELDS) -> Dict[str, Any]:
+        """Resumo compacto para o caminho conversacional (extremos entre articulações)."""
+        return {
+            "samples": self.count,
+            "rate_hz": round(self.rate_hz, 1),
+            "min": {field: round(float(row.min()), 3) for field, row in zip(fields, self.min)},
+            "max": {field: round(float(row.max()), 3) for field, row in zip(fields, self.max)}
+        }
+
+
+class _WindowAccumulator:
+    """Soma/mín/máx da janela corrente (pré-alocados)."""
+
+    def __init__(self, shape: Tuple[int, int]):
+        self.sum = np.zeros(shape)
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+        self.count = 0
+        self.started_at = 0.0
+        self.ended_at = 0.0
+
+    def add(self, values: np.ndarray, timestamp: float):
+        np.add(self.sum, values, out=self.sum)
+        np.minimum(self.min, values, out=self.min)
+        np.maximum(self.max, values, out=self.max)
+        if self.count == 0:
+            self.started_at = timestamp
+        self.ended_at = timestamp
+        self.count += 1
+
+    def to_window(self) -> LowStateWindow:
+        return LowStateWindow(self.count, self.started_at, self.ended_at,
+                              self.sum / self.count, self.min.copy(), self.max.copy())
+
+    def reset(self):
+        self.sum.fill(0.0)
+        self.min.fill(np.inf)
+        self.max.fill(-np.inf)
+        self.count = 0
+
+
+@dataclass
+class LowStateRecording:
+    """Gravação do rt/lowstate para testes fora do robô."""
+    timestamps: np.ndarray   # (amostras,)
+    values: np.ndarray       # (amostras, campos, articulações)
+    joint_names: Tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def save(self, path: str):
+        np.savez_compressed(path, timestamps=self.timestamps, values=self.values,
+                            joint_names=np.array(self.joint_names))
+
+    @classmethod
+    def load(cls, path: str) -> "LowStateRecording":
+        with np.load(path) as data:
+            return cls(data["timestamps"], data["values"], tuple(data["joint_names"].tolist()))
+
+    @classmethod
+    def synthetic(cls, seconds: float = 10.0, rate_hz: float = 500.0,
+                  joint_names: Sequence[str] = G1_JOINT_NAMES, seed: int = 0) -> "LowStateRecording":
+        """Movimento senoidal com ruído, no formato de uma gravação real."""
+        rng = np.random.default_rng(seed)
+        t = np.arange(int(seconds * rate_hz)) / rate_hz
+        phase = rng.uniform(0, 2 * np.pi, len(joint_names))
+        angle = t[:, None] + phase[None, :]
+        values = np.stack([
+            np.sin(angle) * 0.5,
+            np.cos(angle) * 0.5,
+            np.sin(angle * 2) * 20.0 + rng.normal(0, 1.0, angle.shape),
+            35.0 + 5.0 * np.abs(np.sin(angle * 0.05))
+        ], axis=1)
+        return cls(t, values.astype(np.float32), tuple(joint_names))
+
+
+class LowStateSubscriber:
+    """Assinante do estado de baixo nível com snapshot em buffer duplo e janelas agregadas."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 joint_names: Sequence[str] = G1_JOINT_NAMES):
+        """
+        Args:
+            config: source ("dds" | "recorded"), topic, queue_len, recording,
+                    speed, loop, session (config da G1Session)
+            joint_names: Articulações na ordem de ``motor_state``
+        """
+        config = config or {}
+        self.source = config.get("source", "dds")
+        self.topic = config.get("topic", LOWSTATE_TOPIC)
+        self.queue_len = config.get("queue_len", 10)
+        self.recording_path = config.get("recording")
+        self.speed = config.get("speed", 1.0)
+        self.loop = config.get("loop", True)
+        self.stale_after = config.get("stale_after", 0.5)
+        self.session_config = config.get("session", {})
+
+        self.joint_names = tuple(joint_names)
+        self.joint_count = len(self.joint_names)
+        shape = (len(JOINT_FIELDS), self.joint_count)
+
+        # Snapshot em buffer duplo: escreve no de trás, publica trocando o índice
+        self._buffers = (np.zeros(shape), np.zeros(shape))
+        self._front = 0
+        self._seq = 0
+        self._latest_time = 0.0
+        self._latest_tick = 0
+        self._decode = np.zeros(shape)
+
+        # Janelas: o callback acumula em uma, o leitor drena trocando pela outra
+        self._window_lock = threading.Lock()
+        self._active = _WindowAccumulator(shape)
+        self._spare = _WindowAccumulator(shape)
+
+        self._subscriber = None
+        self._replay_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._recording: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._recorded = 0
+        self.running = False
+
+        # Métricas
+        self.samples = 0
+        self.decode_errors = 0
+        self.windows = 0
+        self.callback_time = 0.0
+        self.started_at: Optional[float] = None
+
+    @property
+    def is_receiving(self) -> bool:
+        return self.running and self.samples > 0 and time.time() - self._latest_time < self.stale_after
+
+    async def start(self) -> bool:
+        """Assina o tópico (DDS) ou inicia a reprodução da gravação."""
+        if self.running:
+            return True
+
+        if self.source == "dds":
+            session = get_g1_session(self.session_config)
+            if not await session.connect():
+                logger.warning("⚠️ Sessão DDS indisponível, rt/lowstate não assinado")
+                return False
+            if session.sdk.fake:
+                logger.info("SDK simulado: rt/lowstate substituído por gravação sintética")
+                return self._start_replay()
+            try:
+                ChannelSubscriber, LowState_ = load_lowstate_types()
+                self._subscriber = ChannelSubscriber(self.topic, LowState_)
+                await asyncio.to_thread(self._subscriber.Init, self._on_lowstate, self.queue_len)
+            except Exception as e:
+                logger.error(f"❌ Erro ao assinar {self.topic}: {e}")
+                self._subscriber = None
+                return False
+            self.running = True
+            self.started_at = time.time()
+            logger.info(f"✅ Assinando {self.topic} ({self.joint_count} articulações)")
+            return True
+
+        if self.source == "recorded":
+            return self._start_replay()
+
+        logger.error(f"Fonte de lowstate desconhecida: {self.source}")
+        return False
+
+    def _start_replay(self) -> bool:
+        try:
+            if self.recording_path:
+                recording = LowStateRecording.load(self.recording_path)
+            else:
+                recording = LowStateRecording.synthetic(joint_names=self.joint_names)
+        except Exception as e:
+            logger.error(f"❌ Erro ao carregar gravação de lowstate: {e}")
+            return False
+        if recording.values.shape[2] < self.joint_count:
+            logger.error(f"Gravação com {recording.values.shape[2]} articulações, "
+                         f"esperado {self.joint_count}")
+            return False
+
+        self._stop_event.clear()
+        self.running = True
+        self.started_at = time.time()
+        self._replay_thread = threading.Thread(
+            target=self._replay, args=(recording,), name="g1-lowstate-replay", daemon=True
+        )
+        self._replay_thread.start()
+        logger.info(f"▶️ Reproduzindo lowstate gravado ({len(recording)} amostras, {self.speed}x)")
+        return True
+
+    def _replay(self, recording: LowStateRecording):
+        """Thread de reprodução: prazos a partir da origem, como o callback real."""
+        timestamps = recording.timestamps - recording.timestamps[0]
+        period = float(np.median(np.diff(timestamps))) if len(timestamps) > 1 else 0.002
+        values = recording.values[:, :, :self.joint_count]
+        origin = time.monotonic()
+        index = 0
+        while not self._stop_event.is_set():
+            delay = origin + timestamps[index] / self.speed - time.monotonic()
+            if delay > 0 and self._stop_event.wait(delay):
+                break
+            self._ingest(values[index], time.time(), index)
+            index += 1
+            if index == len(timestamps):
+                if not self.loop:
+                    break
+                origin += (timestamps[-1] + period) / self.speed
+                index = 0
+        self.running = False
+
+    def _on_lowstate(self, msg):
+        """Callback do SDK (thread do DDS)."""
+        try:
+            motors = msg.motor_state[:self.joint_count]
+            decode = self._decode
+            decode[0] = [motor.q for motor in motors]
+            decode[1] = [motor.dq for motor in motors]
+            decode[2] = [motor.tau_est for motor in motors]
+            # unitree_hg publica duas temperaturas por motor; vale a maior
+            decode[3] = [max(motor.temperature) if isinstance(motor.temperature, (list, tuple))
+                         else motor.temperature for motor in motors]
+        except Exception as e:
+            self.decode_errors += 1
+            if self.decode_errors == 1:
+                logger.error(f"❌ Erro ao decodificar {self.topic}: {e}")
+            return
+        self._ingest(decode, time.time(), getattr(msg, "tick", 0))
+
+    def _ingest(self, values: np.ndarray, timestamp: float, tick: int):
+        start = time.perf_counter()
+
+        back = 1 - self._front
+        self._buffers[back][...] = values
+        self._latest_time = timestamp
+        self._latest_tick = tick
+        self._front = back
+        self._seq += 1
+
+        with self._window_lock:
+            self._active.add(values, timestamp)
+
+        if self._recording is not None and self._recorded < len(self._recording[0]):
+            self._recording[0][self._recorded] = timestamp
+            self._recording[1][self._recorded] = values
+            self._recorded += 1
+
+        self.samples += 1
+        self.callback_time += time.perf_counter() - start
+
+    def latest(self) -> Tuple[np.ndarray, float]:
+        """Cópia consistente da amostra mais recente (campos, articulações) e seu instante."""
+        while True:
+            seq = self._seq
+            values = self._buffers[self._front].copy()
+            timestamp = self._latest_time
+            if seq == self._seq:
+                return values, timestamp
+
+    def drain_window(self) -> Optional[LowStateWindow]:
+        """
+        Fecha a janela corrente e devolve o agregado.
+
+        Returns:
+            Janela com média/mín/máx ou None se nenhuma amostra chegou
+        """
+        with self._window_lock:
+            closed, self._active = self._active, self._spare
+        self._spare = closed
+        if closed.count == 0:
+            return None
+        window = closed.to_window()
+        closed.reset()
+        self.windows += 1
+        return window
+
+    def start_recording(self, seconds: float, rate_hz: float = 500.0):
+        """Passa a gravar as amostras recebidas (buffers pré-alocados)."""
+        capacity = int(seconds * rate_hz)
+        self._recorded = 0
+        self._recording = (np.zeros(capacity),
+                           np.zeros((capacity, len(JOINT_FIELDS), self.joint_count), dtype=np.float32))
+
+    def stop_recording(self) -> Optional[LowStateRecording]:
+        if self._recording is None:
+            return None
+        timestamps, values = self._recording
+        self._recording = None
+        return LowStateRecording(timestamps[:self._recorded].copy(), values[:self._recorded].copy(),
+                                 self.joint_names)
+
+    async def stop(self):
+        """Cancela a assinatura ou a reprodução."""
+        self._stop_event.set()
+        if self._replay_thread:
+            await asyncio.to_thread(self._replay_thread.join, 1.0)
+            self._replay_thread = None
+        if self._subscriber is not None:
+            try:
+                self._subscriber.Close()
+            except Exception as e:
+                logger.debug(f"Erro ao fechar assinante lowstate: {e}")
+            self._subscriber = None
+        self.running = False
+
+    def get_status(self) -> Dict[str, Any]:
+        elapsed = time.time() - self.started_at if self.started_at else 0.0
+        return {
+            "source": self.source,
+            "topic": self.topic,
+            "running": self.running,
+            "receiving": self.is_receiving,
+            "samples": self.samples,
+            "rate_hz": round(self.samples / elapsed, 1) if elapsed > 0 else 0.0,
+            "last_tick": self._latest_tick,
+            "age_ms": round((time.time() - self._latest_time) * 1000, 1) if self.samples else None,
+            "windows": self.windows,
+            "decode_errors": self.decode_errors,
+            "avg_ingest_us": round(self.callback_time / self.samples * 1e6, 1) if self.samples else 0.0
+        }
@@ -7,35 +7,63 @@ TESTE 9: ✅ SUCESSO - Start() + Move() + StopMove()
 
 import asyncio
 import logging
-import sys
 from typing import Dict, Any, Optional
-from pathlib import Path
+
+from .command_executor import get_command_executor
+from .g1_session import get_g1_session
+from .locomotion_stream import LocomotionStreamController, MoveOutcome
+from ..security.watchdog import get_safety_watchdog
 
 logger = logging.getLogger(__name__)
 
+# Sempre pela fila urgente do executor: não expiram nem esperam um Move lento
+SAFETY_COMMANDS = ("StopMove", "Damp")
+
 class G1MovementRealConnector:
     """
     Connector real para movimentos de locomoção G1
     
     Usa SDK LocoClient para comandos físicos reais.
     SEQUÊNCIA VALIDADA: Start() → Move() → StopMove()
+    
+    Com streaming_enabled, Move() é publicado continuamente a 50 Hz pelo
+    LocomotionStreamController (rampas suaves e preempção imediata).
     """
     
     def __init__(self, config: Dict[str, Any]):
         self.enabled = config.get("enabled", True)
         self.network_interface = config.get("network_interface", "eth0")
         self.timeout = config.get("timeout", 10.0)
+        self.command_deadline = config.get("command_deadline", 2.0)  # Move/StopMove velhos não servem
+        # StopMove sem confirmação é repetido; esgotadas as tentativas, o watchdog assume
+        self.stop_attempts = config.get("stop_attempts", 3)
+        self.stop_deadline = config.get("stop_deadline", 0.5)
         
         # Configurações de movimento
         self.default_velocity = config.get("default_velocity", 0.5)  # Validado no teste
         self.max_velocity = config.get("max_velocity", 1.0)
         self.default_duration = config.get("default_duration", 2.0)
         
+        # Streaming de velocidade (substitui Move → sleep → StopMove)
+        self.streaming_enabled = config.get("streaming_enabled", True)
+        streaming_config = dict(config.get("streaming", {}))
+        streaming_config.setdefault("max_velocity", (self.max_velocity, self.max_velocity / 2, 1.0))
+        self.stream = LocomotionStreamController(streaming_config, self._publish_velocity, self._publish_stop)
+        self.stream_deadline = streaming_config.get("publish_deadline", 0.1)
+        self.last_move_outcome: Optional[MoveOutcome] = None
+        
         # Estado do connector
         self.is_initialized = False
         self.is_movement_active = False
         self.loco_client = None
         
+        # Sessão DDS compartilhada com os demais conectores reais
+        self.session = get_g1_session({
+            "network_interface": self.network_interface,
+            "timeout": self.timeout,
+            "fake_sdk": config.get("fake_sdk", False)
+        })
+        
         logger.info(f"G1MovementRealConnector inicializado: enabled={self.enabled}")
     
     async def initialize(self) -> bool:
@@ -52,30 +80,16 @@ class G1MovementRealConnector:
         try:
             logger.info("Inicializando LocoClient...")
             
-            # Adicionar SDK ao path
-            sdk_path = Path(__file__).parent.parent.parent.parent / "unitree_sdk2_python"
-            if str(sdk_path) not in sys.path:
-                sys.path.insert(0, str(sdk_path))
-            
-            # Importar SDK G1
-            from unitree_sdk2py.core.channel import ChannelFactoryInitialize
-            from unitree_sdk2py.g1.loco.g1_loco_client import LocoClient
-            
-            # Inicializar canal de comunicação
-            ChannelFactoryInitialize(0, self.network_interface)
-            
-            # Criar e inicializar cliente LocoClient
-            self.loco_client = LocoClient()
-            self.loco_client.SetTimeout(self.timeout)
-            self.loco_client.Init()
+            # Canal DDS e cliente vêm da sessão compartilhada (criados uma única vez)
+            self.loco_client = await self.session.get_loco_client()
+            if self.loco_client is None:
+                logger.error("LocoClient indisponível (SDK ou canal DDS)")
+                return False
             
             self.is_initialized = True
             logger.info("✅ LocoClient inicializado com sucesso")
             return True
             
-        except ImportError as e:
-            logger.error(f"Erro ao importar SDK G1: {e}")
-            return False
         except Exception as e:
             logger.error(f"Erro na inicialização G1Movement: {e}")
             return False
@@ -95,7 +109,7 @@ class G1MovementRealConnector:
             logger.info("Ativando modo movimento: Start()")
             
             # COMANDO VALIDADO NO TESTE 9
-            self.loco_client.Start()  # SetFsmId(200)
+            await self._rpc("Start", deadline=self.timeout)  # SetFsmId(200)
             
             self.is_movement_active = True
             logger.info("✅ Modo movimento ativado")
@@ -138,14 +152,17 @@ class G1MovementRealConnector:
             
             logger.info(f"Executando movimento: velocity={velocity}, duration={duration}")
             
+            if self.streaming_enabled:
+                return await self.stream_move(velocity, 0, 0, duration=duration, source="move_forward")
+            
             # COMANDO VALIDADO NO TESTE 9
-            self.loco_client.Move(velocity, 0, 0)  # Forward: x=velocity, y=0, rotation=0
+            await self._rpc("Move", velocity, 0, 0)  # Forward: x=velocity, y=0, rotation=0
             
             # Aguardar duração do movimento
             await asyncio.sleep(duration)
             
             # PARAR SEGURO (não Damp!)
-            self.loco_client.StopMove()  # SetVelocity(0,0,0)
+            await self._rpc("StopMove")  # SetVelocity(0,0,0)
             
             logger.info("✅ Movimento forward executado e parado com segurança")
             return True
@@ -181,9 +198,12 @@ class G1MovementRealConnector:
             
             logger.info(f"Executando movimento lateral: velocity={velocity}")
             
-            self.loco_client.Move(0, velocity, 0)  # Lateral: x=0, y=velocity, rotation=0
+            if self.streaming_enabled:
+                return await self.stream_move(0, velocity, 0, duration=duration, source="move_lateral")
+            
+            await self._rpc("Move", 0, velocity, 0)  # Lateral: x=0, y=velocity, rotation=0
             await asyncio.sleep(duration)
-            self.loco_client.StopMove()
+            await self._rpc("StopMove")
             
             logger.info("✅ Movimento lateral executado")
             return True
@@ -219,9 +239,12 @@ class G1MovementRealConnector:
             
             logger.info(f"Executando rotação: angular_velocity={angular_velocity}")
             
-            self.loco_client.Move(0, 0, angular_velocity)  # Rotation: x=0, y=0, rotation=angular_velocity
+            if self.streaming_enabled:
+                return await self.stream_move(0, 0, angular_velocity, duration=duration, source="rotate")
+            
+            await self._rpc("Move", 0, 0, angular_velocity)  # Rotation: x=0, y=0, rotation=angular_velocity
             await asyncio.sleep(duration)
-            self.loco_client.StopMove()
+            await self._rpc("StopMove")
             
             logger.info("✅ Rotação executada")
             return True
@@ -241,21 +264,94 @@ class G1MovementRealConnector:
             logger.error("G1MovementRealConnector não inicializado")
             return False
         
-        try:
-            logger.info("Parando movimento com StopMove()")
-            
-            # MÉTODO SEGURO VALIDADO (não Damp!)
-            self.loco_client.StopMove()  # SetVelocity(0,0,0)
-            
-            logger.info("✅ Movimento parado com segurança")
-            return True
+        logger.info("Parando movimento com StopMove()")
+        
+        # Comandos de movimento ainda em fila não devem rodar depois da parada
+        get_command_executor().flush("loco")
+        if self.stream.is_running:
+            await self.stream.emergency_stop(reason="stop_movement")
+        
+        # MÉTODO SEGURO VALIDADO (não Damp!)
+        for attempt in range(1, self.stop_attempts + 1):
+            try:
+                code = await self._rpc("StopMove", deadline=self.stop_deadline)  # SetVelocity(0,0,0)
+            except Exception as e:
+                code = e
+            if code == 0:
+                logger.info("✅ Movimento parado com segurança")
+                return True
+            logger.error(f"❌ StopMove falhou (tentativa {attempt}/{self.stop_attempts}): {code}")
+        
+        # Sem confirmação: a thread do watchdog insiste com o cliente exclusivo dela
+        get_safety_watchdog().request_stop("stop_movement", reason="StopMove sem confirmação")
+        return False
+    
+    async def stream_move(self, vx: float, vy: float, vyaw: float, duration: float = None,
+                          distance: float = None, angle: float = None, source: str = "connector") -> bool:
+        """
+        Movimento via streaming de velocidade.
+        
+        Args:
+            vx, vy: Velocidades lineares em m/s
+            vyaw: Velocidade angular em rad/s
+            duration: Duração em segundos
+            distance: Distância em metros (alternativa à duração)
+            angle: Ângulo em radianos (alternativa à duração)
+            source: Origem do comando (para status)
             
-        except Exception as e:
-            logger.error(f"Erro ao parar movimento: {e}")
+        Returns:
+            True só se o movimento completou; vetado, substituído ou parado
+            retorna False (o resultado fica em ``last_move_outcome``)
+        """
+        self.last_move_outcome = None
+        if not self.is_initialized:
+            logger.error("G1MovementRealConnector não inicializado")
             return False
+        
+        if not self.is_movement_active:
+            if not await self.activate_movement_mode():
+                return False
+        
+        outcome = await self.stream.move(vx, vy, vyaw, duration=duration, distance=distance,
+                                         angle=angle, source=source)
+        self.last_move_outcome = outcome
+        if outcome is MoveOutcome.COMPLETED:
+            logger.info(f"✅ Movimento {source} concluído")
+            return True
+        if outcome is MoveOutcome.VETOED:
+            logger.warning(f"🚧 Movimento {source} vetado: obstáculo à frente")
+        elif outcome is MoveOutcome.STOPPED:
+            logger.warning(f"🛑 Movimento {source} interrompido por parada imediata")
+        else:
+            logger.info(f"🔀 Movimento {source} substituído por outro comando")
+        return False
+    
+    async def _publish_velocity(self, vx: float, vy: float, vyaw: float):
+        """Publisher do streaming: um Move() por ciclo."""
+        return await self._rpc("Move", vx, vy, vyaw, deadline=self.stream_deadline)
+    
+    async def _publish_stop(self):
+        """Parada imediata do streaming: Move(0,0,0) urgente, depois de descartar os Move em fila."""
+        get_command_executor().flush("loco")
+        code = await self._rpc("Move", 0.0, 0.0, 0.0, deadline=self.stop_deadline, urgent=True)
+        if code != 0:
+            raise RuntimeError(f"Move(0,0,0) falhou ({code})")
+        return code
+    
+    async def _rpc(self, command: str, *args, deadline: float = None, urgent: bool = False):
+        """Executa um método do LocoClient pela thread do cliente loco (com prazo)."""
+        # Após reconexão da sessão o cliente em cache é outro
+        client = await self.session.get_loco_client()
+        if client is None:
+            raise RuntimeError("LocoClient indisponível")
+        self.loco_client = client
+        return await get_command_executor().call("loco", command, getattr(client, command), *args,
+                                                  deadline=deadline or self.command_deadline,
+                                                  urgent=urgent or command in SAFETY_COMMANDS)
     
     async def cleanup(self):
         """Limpeza do connector"""
+        await self.stream.stop()
         if self.loco_client:
             try:
                 # Parar movimento final
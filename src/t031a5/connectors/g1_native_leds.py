@@ -9,6 +9,8 @@ from typing import Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from .led_writer import LedLayer, get_led_writer
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,6 +57,10 @@ class G1NativeLEDConnector:
         self.default_brightness = config.get("default_brightness", 0.5)
         self.transition_time = config.get("transition_time", 0.2)
         self.emotion_colors = config.get("emotion_colors", {})
+        self.emotion_hold = config.get("emotion_hold")  # segundos na camada de emoção (None = até mudar)
+        
+        # Escritas passam pela etapa única de saída dos LEDs
+        self.led_writer = get_led_writer(config.get("led_writer", {}))
         
         self.logger.info(f"G1NativeLEDConnector inicializado: enabled={self.enabled}")
     
@@ -68,6 +74,7 @@ class G1NativeLEDConnector:
         
         # Verifica se o controle de LED nativo está disponível
         if hasattr(self.g1_controller, 'led_control'):
+            self.led_writer.bind_publisher(self._publish)
             self.logger.info("✅ LEDs nativos do G1 disponíveis")
             return True
         else:
@@ -90,18 +97,14 @@ class G1NativeLEDConnector:
             
             self.logger.debug(f"LED Nativo: RGB({r}, {g}, {b})")
             
-            # Usa controle nativo de LED do G1
-            code = self.g1_controller.led_control(r, g, b)
-            
-            if code == 0:
-                self.logger.info(f"✅ LED Nativo definido: RGB({r}, {g}, {b})")
-                return LEDResponse(success=True)
-            else:
-                self.logger.error(f"❌ Erro no LED Nativo: código {code}")
-                return LEDResponse(
-                    success=False,
-                    error_message=f"Erro no LED nativo: código {code}"
-                )
+            # O writer funde, limita a taxa e respeita as camadas de prioridade
+            self.led_writer.set_color(
+                r, g, b,
+                layer=LedLayer.EMOTION,
+                ttl=request.duration if request.duration is not None else self.emotion_hold,
+                source=f"native:{request.emotion or 'custom'}"
+            )
+            return LEDResponse(success=True)
                 
         except Exception as e:
             self.logger.error(f"❌ Exceção no LED Nativo: {e}")
@@ -110,6 +113,13 @@ class G1NativeLEDConnector:
                 error_message=f"Exceção: {str(e)}"
             )
     
+    async def _publish(self, r: int, g: int, b: int) -> int:
+        """Publisher do LED writer: controle nativo de LED do G1."""
+        code = self.g1_controller.led_control(r, g, b)
+        if code != 0:
+            self.logger.error(f"❌ Erro no LED Nativo: código {code}")
+        return code
+    
     async def set_emotion(self, emotion: str) -> LEDResponse:
         """Define cor baseada em emoção."""
         # Mapeia emoção para cor
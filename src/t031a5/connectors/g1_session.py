@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+G1 Session
+Sessão DDS única do processo, compartilhada por todos os conectores reais
+
+Inicializa o canal DDS (ChannelFactoryInitialize) uma única vez, cria os
+clientes Loco, Arm e Audio/LED sob demanda e os mantém em cache. Um probe de
+saúde periódico detecta perda de comunicação e recria os clientes.
+
+Fora do robô, "fake_sdk": true usa o SDK simulado de g1_fake_sdk.
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .command_executor import get_command_executor
+
+logger = logging.getLogger(__name__)
+
+SDK_PATH = Path(__file__).parent.parent.parent.parent / "unitree_sdk2_python"
+
+
+class SessionState(Enum):
+    """Estado da sessão DDS."""
+    DISCONNECTED = "disconnected"
+    CONNECTED = "connected"
+    UNHEALTHY = "unhealthy"        # probe falhando, aguardando reconexão
+    UNAVAILABLE = "unavailable"    # SDK não instalado
+
+
+@dataclass
+class G1SDK:
+    """Pontos de entrada do SDK usados pelos conectores."""
+    channel_initialize: Callable[..., Any]
+    loco_client_cls: type
+    arm_client_cls: type
+    audio_client_cls: type
+    action_map: Dict[str, int]
+    fake: bool = False
+
+
+def load_unitree_sdk() -> G1SDK:
+    """
+    Importa o unitree_sdk2py (adicionando o checkout local ao path uma vez).
+
+    Raises:
+        ImportError: SDK não disponível
+    """
+    if str(SDK_PATH) not in sys.path:
+        sys.path.insert(0, str(SDK_PATH))
+
+    from unitree_sdk2py.core.channel import ChannelFactoryInitialize
+    from unitree_sdk2py.g1.loco.g1_loco_client import LocoClient
+    from unitree_sdk2py.g1.arm.g1_arm_action_client import G1ArmActionClient, action_map
+    from unitree_sdk2py.g1.audio.g1_audio_client import AudioClient
+
+    return G1SDK(ChannelFactoryInitialize, LocoClient, G1ArmActionClient, AudioClient, action_map)
+
+
+def load_fake_sdk() -> G1SDK:
+    """Retorna o SDK simulado."""
+    from .g1_fake_sdk import (
+        FAKE_ACTION_MAP, FakeArmActionClient, FakeAudioClient, FakeChannelFactoryInitialize, FakeLocoClient
+    )
+    return G1SDK(FakeChannelFactoryInitialize, FakeLocoClient, FakeArmActionClient, FakeAudioClient,
+                 FAKE_ACTION_MAP, fake=True)
+
+
+class G1Session:
+    """Sessão DDS compartilhada com clientes SDK em cache."""
+
+    # nome do cliente -> atributo de G1SDK com a classe
+    CLIENTS = {
+        "loco": "loco_client_cls",
+        "arms": "arm_client_cls",
+        "audio": "audio_client_cls",
+    }
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Inicializa a sessão (sem conectar).
+
+        Args:
+            config: network_interface, domain_id, timeout, fake_sdk,
+                    probe_interval, probe_failures_to_reconnect
+        """
+        config = config or {}
+        self.network_interface = config.get("network_interface", "eth0")
+        self.domain_id = config.get("domain_id", 0)
+        self.timeout = config.get("timeout", 10.0)
+        self.fake_sdk = config.get("fake_sdk", False)
+        self.probe_interval = config.get("probe_interval", 5.0)
+        self.probe_failures_to_reconnect = config.get("probe_failures_to_reconnect", 3)
+
+        self.state = SessionState.DISCONNECTED
+        self.sdk: Optional[G1SDK] = None
+        self._clients: Dict[str, Any] = {}
+        self._lock_instance: Optional[asyncio.Lock] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+
+        # Métricas
+        self.connected_at: Optional[float] = None
+        self.channel_init_time = 0.0
+        self.client_init_times: Dict[str, float] = {}
+        self.probes = 0
+        self.probe_failures = 0
+        self.consecutive_probe_failures = 0
+        self.reconnects = 0
+        self.last_probe_latency_ms = 0.0
+
+    @property
+    def _lock(self) -> asyncio.Lock:
+        # Criado no primeiro uso para ficar no loop que de fato roda a sessão
+        if self._lock_instance is None:
+            self._lock_instance = asyncio.Lock()
+        return self._lock_instance
+
+    @property
+    def executor(self):
+        return get_command_executor()
+
+    @property
+    def is_connected(self) -> bool:
+        return self.state in (SessionState.CONNECTED, SessionState.UNHEALTHY)
+
+    @property
+    def action_map(self) -> Dict[str, int]:
+        return self.sdk.action_map if self.sdk else {}
+
+    async def connect(self) -> bool:
+        """
+        Carrega o SDK e inicializa o canal DDS (apenas na primeira chamada).
+
+        Returns:
+            True se a sessão está conectada
+        """
+        async with self._lock:
+            if self.is_connected:
+                return True
+            if self.state == SessionState.UNAVAILABLE:
+                return False
+
+            try:
+                self.sdk = load_fake_sdk() if self.fake_sdk else load_unitree_sdk()
+            except ImportError as e:
+                logger.warning(f"SDK Unitree não disponível: {e}")
+                self.state = SessionState.UNAVAILABLE
+                return False
+
+            try:
+                start = time.monotonic()
+                await self.executor.call(
+                    "session", "ChannelFactoryInitialize", self.sdk.channel_initialize,
+                    self.domain_id, self.network_interface, deadline=self.timeout
+                )
+                self.channel_init_time = time.monotonic() - start
+                self.state = SessionState.CONNECTED
+                self.connected_at = time.time()
+                modo = "simulado" if self.sdk.fake else self.network_interface
+                logger.info(f"✅ Sessão DDS G1 inicializada ({modo}) em {self.channel_init_time * 1000:.0f}ms")
+                if self.probe_interval > 0:
+                    self.start_health_monitor()
+                return True
+            except Exception as e:
+                logger.error(f"❌ Erro ao inicializar canal DDS: {e}")
+                self.state = SessionState.DISCONNECTED
+                return False
+
+    async def get_client(self, name: str) -> Optional[Any]:
+        """
+        Retorna o cliente SDK (loco, arms, audio), criando-o na primeira chamada.
+
+        Returns:
+            Cliente inicializado ou None se a sessão não conectar
+        """
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+
+        if name not in self.CLIENTS:
+            raise ValueError(f"Cliente SDK desconhecido: {name}")
+
+        if not await self.connect():
+            return None
+
+        async with self._lock:
+            client = self._clients.get(name)
+            if client is not None:
+                return client
+
+            try:
+                start = time.monotonic()
+                client = getattr(self.sdk, self.CLIENTS[name])()
+                client.SetTimeout(self.timeout)
+                await self.executor.call(name, "Init", client.Init, deadline=self.timeout)
+                self.client_init_times[name] = time.monotonic() - start
+                self._clients[name] = client
+                logger.info(f"✅ Cliente SDK {name} inicializado")
+                return client
+            except Exception as e:
+                logger.error(f"❌ Erro ao criar cliente SDK {name}: {e}")
+                return None
+
+    async def get_loco_client(self) -> Optional[Any]:
+        return await self.get_client("loco")
+
+    async def get_arm_client(self) -> Optional[Any]:
+        return await self.get_client("arms")
+
+    async def get_audio_client(self) -> Optional[Any]:
+        return await self.get_client("audio")
+
+    async def probe(self) -> bool:
+        """
+        Verifica a comunicação com o robô usando um cliente já criado
+        (GetFsmId no LocoClient ou GetVolume no AudioClient).
+
+        Falhas consecutivas acima do limite disparam reconnect().
+        """
+        if "loco" in self._clients:
+            name, method = "loco", "GetFsmId"
+        elif "audio" in self._clients:
+            name, method = "audio", "GetVolume"
+        else:
+            # Nenhum cliente com RPC de leitura criado: nada a verificar
+            return self.is_connected
+
+        client = self._clients[name]
+        self.probes += 1
+        start = time.monotonic()
+        try:
+            code, _ = await self.executor.call(name, method, getattr(client, method), deadline=self.timeout)
+            healthy = code == 0
+        except Exception as e:
+            logger.debug(f"Probe G1 falhou: {e}")
+            healthy = False
+        self.last_probe_latency_ms = (time.monotonic() - start) * 1000
+
+        if healthy:
+            if self.state == SessionState.UNHEALTHY:
+                logger.info("✅ Comunicação com G1 restabelecida")
+            self.consecutive_probe_failures = 0
+            self.state = SessionState.CONNECTED
+            return True
+
+        self.probe_failures += 1
+        self.consecutive_probe_failures += 1
+        self.state = SessionState.UNHEALTHY
+        logger.warning(f"⚠️ Probe G1 falhou ({self.consecutive_probe_failures}x)")
+
+        if self.consecutive_probe_failures >= self.probe_failures_to_reconnect:
+            await self.reconnect()
+        return False
+
+    async def reconnect(self):
+        """
+        Descarta os clientes em cache para serem recriados no próximo uso.
+
+        O canal DDS não é reinicializado: ChannelFactoryInitialize só pode
+        ser chamado uma vez por processo.
+        """
+        async with self._lock:
+            self._clients.clear()
+            self.consecutive_probe_failures = 0
+            self.reconnects += 1
+        logger.info(f"🔄 Clientes SDK serão recriados (reconexão #{self.reconnects})")
+
+    def start_health_monitor(self):
+        """Inicia o probe periódico em background."""
+        if self._monitor_task is None or self._monitor_task.done():
+            self._monitor_task = asyncio.create_task(self._health_loop(), name="g1-session-probe")
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            try:
+                await self.probe()
+            except Exception as e:
+                logger.error(f"Erro no probe de saúde G1: {e}")
+
+    async def close(self):
+        """Para o monitor e descarta os clientes."""
+        if self._monitor_task:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+        self._clients.clear()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Retorna o estado da sessão e dos clientes."""
+        return {
+            "state": self.state.value,
+            "fake_sdk": bool(self.sdk and self.sdk.fake),
+            "network_interface": self.network_interface,
+            "clients": sorted(self._clients),
+            "channel_init_ms": round(self.channel_init_time * 1000, 1),
+            "client_init_ms": {name: round(t * 1000, 1) for name, t in self.client_init_times.items()},
+            "probes": self.probes,
+            "probe_failures": self.probe_failures,
+            "last_probe_latency_ms": round(self.last_probe_latency_ms, 1),
+            "reconnects": self.reconnects
+        }
+
+
+_default_session: Optional[G1Session] = None
+
+
+def get_g1_session(config: Optional[Dict[str, Any]] = None) -> G1Session:
+    """
+    Retorna a sessão G1 do processo.
+
+    A configuração só é aplicada na primeira chamada; chamadas seguintes
+    com outra interface de rede são ignoradas com aviso.
+    """
+    global _default_session
+    if _default_session is None:
+        _default_session = G1Session(config)
+    elif config and config.get("network_interface", _default_session.network_interface) \
+            != _default_session.network_interface:
+        logger.warning(f"Sessão G1 já usa {_default_session.network_interface}; "
+                       f"ignorando {config.get('network_interface')}")
+    return _default_session
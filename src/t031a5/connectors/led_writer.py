@@ -0,0 +1,422 @@
+# -*- coding: utf-8 -*-
+"""
+LED Writer
+Etapa única de saída dos LEDs do G1
+
+Quem quer mudar os LEDs (ação de emoção, animação reativa à fala, parada
+de emergência) só declara a cor desejada em uma camada de prioridade. Um
+único writer resolve a cor efetiva (camada mais alta vence; dentro da
+camada, o último a escrever) e envia LedControl no máximo ``max_rate_hz``
+vezes por segundo. Atualizações intermediárias são fundidas e cores iguais
+ou quase iguais à última enviada não geram RPC.
+
+``set_color`` é thread-safe: animações em threads não precisam de event loop.
+Animações quadro a quadro rodam como uma task no loop principal
+(``animate``), com prazos no relógio monotônico.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Color = Tuple[int, int, int]
+
+
+class LedLayer(IntEnum):
+    """Camadas de prioridade dos LEDs (maior vence)."""
+    SPEECH = 10      # reativo à fala (volume)
+    EMOTION = 20     # emoção expressa por action
+    EMERGENCY = 30   # parada de emergência / alertas
+
+
+@dataclass
+class LedLayerState:
+    """Cor desejada de uma camada."""
+    color: Color
+    source: str
+    expires_at: Optional[float] = None
+
+
+class LedAnimation:
+    """
+    Animação quadro a quadro em uma task do loop principal.
+
+    Cada quadro tem prazo ``origin + i * frame_period`` no relógio monotônico,
+    então atrasos não se acumulam; se a task atrasar mais de um quadro, os
+    quadros vencidos são pulados. Cancelar (ex.: barge-in) libera a camada.
+    """
+
+    def __init__(self, writer: "LedWriter", frames: Sequence[Color], frame_period: float,
+                 layer: LedLayer, source: str):
+        self.writer = writer
+        self.frames = list(frames)
+        self.frame_period = frame_period
+        self.layer = layer
+        self.source = source
+        self._task: Optional[asyncio.Task] = None
+
+        # Métricas
+        self.frames_played = 0
+        self.frames_skipped = 0
+        self.max_lateness_ms = 0.0
+        self.cancelled = False
+
+    @property
+    def duration(self) -> float:
+        return len(self.frames) * self.frame_period
+
+    @property
+    def done(self) -> bool:
+        return self._task is None or self._task.done()
+
+    def start(self) -> "LedAnimation":
+        self._task = asyncio.create_task(self._run(), name=f"led-animation-{self.source}")
+        return self
+
+    def cancel(self):
+        """Interrompe a animação (a camada é liberada na própria task)."""
+        if self._task and not self._task.done():
+            self.cancelled = True
+            self._task.cancel()
+
+    async def stop(self):
+        """Interrompe e aguarda a animação terminar."""
+        self.cancel()
+        await self.wait()
+
+    async def wait(self):
+        """Aguarda o fim da animação (sem propagar o cancelamento dela)."""
+        if self._task:
+            await asyncio.wait([self._task])
+
+    async def _run(self):
+        origin = time.monotonic()
+        index = 0
+        total = len(self.frames)
+        try:
+            while index < total:
+                delay = origin + index * self.frame_period - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    # Atrasada: pula para o quadro do instante atual
+                    behind = int(-delay / self.frame_period)
+                    if behind:
+                        self.frames_skipped += min(behind, total - index)
+                        index += behind
+                        if index >= total:
+                            break
+                    self.max_lateness_ms = max(self.max_lateness_ms, -delay * 1000)
+
+                self.writer.set_color(*self.frames[index], layer=self.layer, source=self.source)
+                self.frames_played += 1
+                index += 1
+
+            # Último quadro dura o seu período inteiro
+            remaining = origin + total * self.frame_period - time.monotonic()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+        finally:
+            self.writer._animation_finished(self)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "frames": len(self.frames),
+            "frames_played": self.frames_played,
+            "frames_skipped": self.frames_skipped,
+            "max_lateness_ms": round(self.max_lateness_ms, 2),
+            "cancelled": self.cancelled
+        }
+
+
+class LedWriter:
+    """Escritor de LEDs com coalescência, limite de taxa e supressão de deltas."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 publisher: Optional[Callable[[int, int, int], Awaitable[Any]]] = None):
+        """
+        Inicializa o writer.
+
+        Args:
+            config: max_rate_hz, min_delta, idle_color
+            publisher: Corrotina que envia (r, g, b) ao robô e retorna o código do SDK
+                       (sem publisher os LEDs ficam em modo simulado)
+        """
+        config = config or {}
+        self.max_rate_hz = config.get("max_rate_hz", 10.0)
+        self.min_interval = 1.0 / self.max_rate_hz
+        # Diferença máxima por canal considerada "mesma cor"
+        self.min_delta = config.get("min_delta", 6)
+        self.idle_color: Color = tuple(config.get("idle_color", (0, 0, 0)))
+        self.publisher = publisher
+
+        # Estado desejado por camada (protegido por lock: escrito de threads)
+        self._layers: Dict[LedLayer, LedLayerState] = {}
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        # Estado enviado
+        self._last_written: Optional[Color] = None
+        self._last_write_time = 0.0
+        self._last_layer: Optional[LedLayer] = None
+
+        # Animação ativa por camada (uma nova substitui a anterior)
+        self._animations: Dict[LedLayer, LedAnimation] = {}
+        self.last_animation: Optional[Dict[str, Any]] = None
+
+        self.is_running = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Métricas
+        self.requests = 0
+        self.rpc_count = 0
+        self.rpc_errors = 0
+        self.coalesced = 0
+        self.suppressed = 0
+        self.simulated_writes = 0
+
+    def bind_publisher(self, publisher: Callable[[int, int, int], Awaitable[Any]]):
+        """Liga o writer ao hardware (o primeiro conector real vence)."""
+        if self.publisher is None:
+            self.publisher = publisher
+            logger.info("💡 LED writer ligado ao LedControl do robô")
+
+    async def start(self):
+        """Inicia o writer no event loop atual."""
+        if self.is_running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self.is_running = True
+        self._task = asyncio.create_task(self._run(), name="led-writer")
+        if self._pending:
+            self._wake.set()
+        logger.info(f"💡 LED writer iniciado (máx. {self.max_rate_hz:.0f} Hz)")
+
+    async def stop(self):
+        """Para o writer."""
+        if not self.is_running:
+            return
+        self.stop_animations()
+        self.is_running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def set_color(self, r: int, g: int, b: int, layer: LedLayer = LedLayer.EMOTION,
+                  ttl: Optional[float] = None, source: str = "unknown"):
+        """
+        Declara a cor desejada de uma camada (não bloqueia, pode ser chamado de threads).
+
+        Args:
+            r, g, b: Valores RGB (0-255)
+            layer: Camada de prioridade
+            ttl: Segundos até a camada expirar (None = até ``clear``)
+            source: Quem pediu (para status/log)
+        """
+        color = (max(0, min(255, int(r))), max(0, min(255, int(g))), max(0, min(255, int(b))))
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._layers[layer] = LedLayerState(color, source, expires_at)
+            self.requests += 1
+            self._pending += 1
+        self._notify()
+
+    def clear(self, layer: LedLayer):
+        """Libera uma camada (a cor passa para a próxima camada ativa)."""
+        with self._lock:
+            if self._layers.pop(layer, None) is None:
+                return
+            self._pending += 1
+        self._notify()
+
+    def clear_all(self, keep_emergency: bool = True):
+        """Libera todas as camadas (opcionalmente mantendo a de emergência)."""
+        with self._lock:
+            self._layers = {
+                layer: state for layer, state in self._layers.items()
+                if keep_emergency and layer == LedLayer.EMERGENCY
+            }
+            self._pending += 1
+        self._notify()
+
+    def animate(self, frames: Sequence[Color], frame_period: float = 0.1,
+                layer: LedLayer = LedLayer.SPEECH, source: str = "animation") -> LedAnimation:
+        """
+        Inicia uma animação na camada (deve ser chamado do event loop).
+
+        Args:
+            frames: Cores (r, g, b) de cada quadro
+            frame_period: Duração de cada quadro em segundos
+            layer: Camada de prioridade
+            source: Quem pediu (para status/log)
+
+        Returns:
+            A animação iniciada (``wait``/``stop`` para sincronizar)
+        """
+        previous = self._animations.get(layer)
+        if previous:
+            previous.cancel()
+        animation = LedAnimation(self, frames, frame_period, layer, source)
+        self._animations[layer] = animation
+        return animation.start()
+
+    def stop_animations(self, layer: Optional[LedLayer] = None) -> int:
+        """Interrompe animações (todas ou de uma camada). Retorna quantas foram paradas."""
+        stopped = 0
+        for animation_layer, animation in list(self._animations.items()):
+            if layer is None or animation_layer == layer:
+                if not animation.done:
+                    animation.cancel()
+                    stopped += 1
+        return stopped
+
+    def _animation_finished(self, animation: LedAnimation):
+        self.last_animation = animation.get_stats()
+        # Só libera a camada se nenhuma animação mais nova a assumiu
+        if self._animations.get(animation.layer) is animation:
+            del self._animations[animation.layer]
+            self.clear(animation.layer)
+
+    def desired(self) -> Tuple[Color, Optional[LedLayer]]:
+        """Cor efetiva: camada ativa de maior prioridade ou ``idle_color``."""
+        now = time.monotonic()
+        with self._lock:
+            for layer in sorted(self._layers, reverse=True):
+                state = self._layers[layer]
+                if state.expires_at is not None and state.expires_at <= now:
+                    del self._layers[layer]
+                    continue
+                return state.color, layer
+        return self.idle_color, None
+
+    def _notify(self):
+        loop = self._loop
+        if loop is not None and loop.is_closed():
+            # Loop anterior encerrado (ex.: novo asyncio.run): reinicia no próximo
+            self._loop, self._task, self.is_running = None, None, False
+            loop = None
+        if loop is None:
+            # Primeiro uso dentro de um event loop inicia o writer
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return  # thread sem loop antes do start: enviado quando o writer iniciar
+            asyncio.ensure_future(self.start())
+            return
+        loop.call_soon_threadsafe(self._wake.set)
+
+    def _next_expiry(self) -> Optional[float]:
+        with self._lock:
+            expiries = [s.expires_at for s in self._layers.values() if s.expires_at is not None]
+        if not expiries:
+            return None
+        return max(0.0, min(expiries) - time.monotonic())
+
+    async def _run(self):
+        """Escreve a cor efetiva quando ela muda, respeitando a taxa máxima."""
+        while self.is_running:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._next_expiry())
+            except asyncio.TimeoutError:
+                pass  # camada expirou
+            self._wake.clear()
+
+            color, layer = self.desired()
+            if layer != LedLayer.EMERGENCY:
+                # Emergência sai na hora; o resto espera o intervalo mínimo e funde o que chegar
+                wait = self._last_write_time + self.min_interval - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                    color, layer = self.desired()
+
+            with self._lock:
+                pending, self._pending = self._pending, 0
+            self.coalesced += max(0, pending - 1)
+
+            try:
+                await self._write(color, layer)
+            except Exception as e:
+                self.rpc_errors += 1
+                logger.error(f"Erro ao escrever LEDs: {e}")
+
+    def _is_redundant(self, color: Color) -> bool:
+        last = self._last_written
+        if last is None:
+            return False
+        if color == last:
+            return True
+        # Quase igual é suprimido, exceto chegar exatamente na cor de repouso (desligar)
+        return color != self.idle_color and max(abs(a - b) for a, b in zip(color, last)) <= self.min_delta
+
+    async def _write(self, color: Color, layer: Optional[LedLayer]):
+        if self._is_redundant(color):
+            self.suppressed += 1
+            return
+
+        if self.publisher is None:
+            self.simulated_writes += 1
+            logger.debug(f"💭 LEDs simulados: RGB{color}")
+        else:
+            self.rpc_count += 1
+            code = await self.publisher(*color)
+            if code not in (0, True, None):
+                self.rpc_errors += 1
+                logger.warning(f"LedControl retornou código {code}")
+                return
+
+        self._last_written = color
+        self._last_layer = layer
+        self._last_write_time = time.monotonic()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Retorna estado e métricas do writer."""
+        color, layer = self.desired()
+        with self._lock:
+            layers = {layer.name.lower(): {"color": state.color, "source": state.source}
+                      for layer, state in self._layers.items()}
+        return {
+            "running": self.is_running,
+            "hardware": self.publisher is not None,
+            "max_rate_hz": self.max_rate_hz,
+            "desired_color": color,
+            "active_layer": layer.name.lower() if layer else None,
+            "last_written": self._last_written,
+            "layers": layers,
+            "animations": [a.source for a in self._animations.values() if not a.done],
+            "last_animation": self.last_animation,
+            "requests": self.requests,
+            "rpc_count": self.rpc_count,
+            "rpc_errors": self.rpc_errors,
+            "coalesced": self.coalesced,
+            "suppressed": self.suppressed,
+            "simulated_writes": self.simulated_writes
+        }
+
+
+_led_writer: Optional[LedWriter] = None
+
+
+def get_led_writer(config: Optional[Dict[str, Any]] = None) -> LedWriter:
+    """
+    Retorna o writer de LEDs do processo.
+
+    A configuração só é aplicada na primeira chamada.
+    """
+    global _led_writer
+    if _led_writer is None:
+        _led_writer = LedWriter(config)
+    return _led_writer
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""
+Locomotion Stream Controller
+Publica setpoints de velocidade em taxa fixa (50 Hz) para o LocoClient
+
+Em vez de Move() → sleep(duração) → StopMove(), um loop dedicado envia a
+velocidade a cada ciclo. A velocidade segue o alvo com aceleração e jerk
+limitados, então comandos sucessivos se emendam sem trancos. Um novo alvo
+substitui o anterior imediatamente (preempção) e a parada de emergência
+zera a velocidade no mesmo ciclo.
+
+Cada Move() do SDK vale por ~1s: se o loop parar de publicar, o robô para
+sozinho. Cada ciclo também bate no SafetyWatchdog, que envia StopMove por
+conta própria bem antes disso se o event loop travar. Com obstáculo à
+frente abaixo da distância mínima (ProximityMonitor), o avanço é vetado no
+ciclo seguinte ao frame de profundidade.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from ..security.proximity import get_proximity_monitor
+from ..security.watchdog import get_safety_watchdog
+
+logger = logging.getLogger(__name__)
+
+AXES = ("vx", "vy", "vyaw")
+
+
+class MoveOutcome(Enum):
+    """Como um alvo de velocidade terminou."""
+    COMPLETED = "completed"    # critério de término atingido
+    PREEMPTED = "preempted"    # substituído por outro comando ou parada suave
+    VETOED = "vetoed"          # avanço vetado pelo ProximityMonitor
+    STOPPED = "stopped"        # parada imediata (emergência, watchdog, shutdown)
+
+
+@dataclass
+class LocomotionLimits:
+    """Limites de velocidade, aceleração e jerk por eixo (vx, vy em m/s; vyaw em rad/s)."""
+    max_velocity: Tuple[float, float, float] = (1.0, 0.5, 1.0)
+    max_acceleration: Tuple[float, float, float] = (0.8, 0.5, 1.5)
+    max_jerk: Tuple[float, float, float] = (4.0, 2.5, 8.0)
+
+
+@dataclass
+class LocomotionTarget:
+    """Alvo de velocidade com critério de término."""
+    velocity: Tuple[float, float, float]
+    duration: Optional[float] = None      # segundos
+    distance: Optional[float] = None      # metros percorridos (vx/vy)
+    angle: Optional[float] = None         # radianos girados (vyaw)
+    source: str = "unknown"
+    started_at: float = field(default_factory=time.monotonic)
+    done: Optional[asyncio.Future] = None
+
+
+class LocomotionStreamController:
+    """Loop de velocidade em taxa fixa com limitação de aceleração e jerk."""
+
+    def __init__(self, config: Dict[str, Any],
+                 publisher: Callable[[float, float, float], Awaitable[Any]],
+                 stop_publisher: Optional[Callable[[], Awaitable[Any]]] = None):
+        """
+        Inicializa o controlador.
+
+        Args:
+            config: rate_hz, max_velocity, max_acceleration, max_jerk, keepalive,
+                    watchdog_deadline
+            publisher: Corrotina que envia (vx, vy, vyaw) ao robô (ex.: LocoClient.Move)
+            stop_publisher: Corrotina da parada imediata, por um caminho que não
+                            espera atrás de um Move em voo (padrão: publisher(0, 0, 0))
+        """
+        self.rate_hz = config.get("rate_hz", 50.0)
+        self.dt = 1.0 / self.rate_hz
+        self.limits = LocomotionLimits(
+            max_velocity=tuple(config.get("max_velocity", LocomotionLimits.max_velocity)),
+            max_acceleration=tuple(config.get("max_acceleration", LocomotionLimits.max_acceleration)),
+            max_jerk=tuple(config.get("max_jerk", LocomotionLimits.max_jerk)),
+        )
+        # Com o robô parado, reenvia zero só neste intervalo (mantém o FSM acordado sem inundar o DDS)
+        self.keepalive = config.get("keepalive", 0.5)
+        self.publisher = publisher
+        self.stop_publisher = stop_publisher or (lambda: publisher(0.0, 0.0, 0.0))
+        # Sem heartbeat por este prazo o watchdog para o robô fora do event loop
+        self.watchdog_deadline = config.get("watchdog_deadline", 0.2)
+        self.watchdog = get_safety_watchdog()
+        self._watchdog_trips = 0
+        self.proximity = get_proximity_monitor()
+
+        # Estado do perfil
+        self.setpoint = [0.0, 0.0, 0.0]
+        self.acceleration = [0.0, 0.0, 0.0]
+        self.target: Optional[LocomotionTarget] = None
+        self._traveled = 0.0
+        self._turned = 0.0
+
+        self.is_running = False
+        self._task: Optional[asyncio.Task] = None
+        self._publish_task: Optional[asyncio.Task] = None
+        self._last_published: Optional[Tuple[float, float, float]] = None
+        self._last_publish_time = 0.0
+
+        # Métricas
+        self.ticks = 0
+        self.published = 0
+        self.publish_skipped = 0
+        self.publish_errors = 0
+        self.preemptions = 0
+        self.emergency_stops = 0
+        self.proximity_vetoes = 0
+        self.max_jitter_ms = 0.0
+
+    @property
+    def is_moving(self) -> bool:
+        return any(abs(v) > 1e-3 for v in self.setpoint) or self.target is not None
+
+    async def start(self):
+        """Inicia o loop de publicação."""
+        if self.is_running:
+            return
+        self.is_running = True
+        self.watchdog.register("locomotion", self.watchdog_deadline, self.dt)
+        self._watchdog_trips = self.watchdog.trips
+        self._task = asyncio.create_task(self._run(), name="locomotion-stream")
+        logger.info(f"🦿 Streaming de locomoção iniciado ({self.rate_hz:.0f} Hz)")
+
+    async def stop(self):
+        """Para o loop (zera a velocidade antes)."""
+        if not self.is_running:
+            return
+        await self.emergency_stop(reason="shutdown")
+        self.is_running = False
+        self.watchdog.unregister("locomotion")
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def set_target(self, vx: float, vy: float, vyaw: float, duration: Optional[float] = None,
+                   distance: Optional[float] = None, angle: Optional[float] = None,
+                   source: str = "unknown") -> asyncio.Future:
+        """
+        Define um novo alvo de velocidade, substituindo o atual.
+
+        A transição parte da velocidade atual respeitando os limites de
+        aceleração e jerk (blend). Sem critério de término o alvo vale até
+        o próximo comando.
+
+        Returns:
+            Future resolvido com o MoveOutcome do alvo
+        """
+        velocity = tuple(
+            max(-limit, min(limit, value))
+            for value, limit in zip((vx, vy, vyaw), self.limits.max_velocity)
+        )
+        self._finish_target(MoveOutcome.PREEMPTED)
+
+        done = asyncio.get_running_loop().create_future()
+        self.target = LocomotionTarget(velocity, duration, distance, angle, source, done=done)
+        self._traveled = 0.0
+        self._turned = 0.0
+        return done
+
+    async def move(self, vx: float, vy: float, vyaw: float, duration: Optional[float] = None,
+                   distance: Optional[float] = None, angle: Optional[float] = None,
+                   source: str = "unknown") -> MoveOutcome:
+        """
+        Executa um movimento e aguarda até a velocidade voltar a zero.
+
+        Returns:
+            MoveOutcome.COMPLETED se completou; senão como foi interrompido
+        """
+        if not self.is_running:
+            await self.start()
+        outcome = await self.set_target(vx, vy, vyaw, duration, distance, angle, source)
+        if outcome is MoveOutcome.COMPLETED:
+            # Aguarda a rampa de desaceleração (a não ser que outro alvo assuma)
+            while self.target is None and any(abs(v) > 1e-3 for v in self.setpoint):
+                await asyncio.sleep(self.dt)
+        return outcome
+
+    def stop_smooth(self):
+        """Desacelera até parar respeitando os limites."""
+        self._finish_target(MoveOutcome.PREEMPTED)
+
+    async def emergency_stop(self, reason: str = "emergency"):
+        """Zera a velocidade imediatamente, sem rampa."""
+        self._finish_target(MoveOutcome.STOPPED)
+        self.setpoint = [0.0, 0.0, 0.0]
+        self.acceleration = [0.0, 0.0, 0.0]
+        self.emergency_stops += 1
+        logger.warning(f"🛑 Parada imediata da locomoção ({reason})")
+        try:
+            # Um Move em voo que termine depois marca seu valor como publicado,
+            # e o ciclo seguinte reenvia zero
+            await self.stop_publisher()
+            self._mark_published((0.0, 0.0, 0.0))
+        except Exception as e:
+            self.publish_errors += 1
+            logger.error(f"Erro ao publicar parada: {e}")
+
+    def _finish_target(self, outcome: MoveOutcome):
+        target = self.target
+        if target is None:
+            return
+        self.target = None
+        if outcome is not MoveOutcome.COMPLETED:
+            self.preemptions += 1
+        if target.done and not target.done.done():
+            target.done.set_result(outcome)
+
+    async def _run(self):
+        """Loop em taxa fixa (ticks calculados a partir do início, sem deriva)."""
+        origin = time.monotonic()
+        tick = 0
+        while self.is_running:
+            tick += 1
+            deadline = origin + tick * self.dt
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Atrasou mais de um ciclo: pula ciclos perdidos em vez de acumular
+                missed = int(-delay / self.dt)
+                tick += missed
+            self.max_jitter_ms = max(self.max_jitter_ms, max(0.0, -delay) * 1000)
+            self.watchdog.beat("locomotion")
+
+            if self.watchdog.trips != self._watchdog_trips:
+                # O watchdog parou o robô enquanto o loop travava: não retoma o alvo antigo
+                self._watchdog_trips = self.watchdog.trips
+                await self.emergency_stop(reason="watchdog")
+
+            try:
+                self._apply_proximity_veto()
+                self._step(self.dt)
+                self._publish()
+            except Exception as e:
+                logger.error(f"Erro no loop de locomoção: {e}")
+            self.ticks += 1
+
+    def _apply_proximity_veto(self):
+        """Zera o avanço (vx > 0) sem rampa quando há obstáculo à frente; recuar e girar seguem livres."""
+        target_vx = self.target.velocity[0] if self.target else 0.0
+        forward = max(self.setpoint[0], target_vx)
+        if forward <= 0 or self.proximity.check(forward):
+            return
+        if target_vx > 0:
+            self._finish_target(MoveOutcome.VETOED)
+        self.setpoint[0] = min(self.setpoint[0], 0.0)
+        self.acceleration[0] = min(self.acceleration[0], 0.0)
+        self.proximity_vetoes += 1
+        logger.warning(f"🚧 Avanço vetado: obstáculo a menos de {self.proximity.min_distance}m")
+
+    def _step(self, dt: float):
+        """Avança o perfil de velocidade um ciclo."""
+        target = self.target
+        goal = target.velocity if target else (0.0, 0.0, 0.0)
+
+        for axis in range(3):
+            v = self.setpoint[axis]
+            a = self.acceleration[axis]
+            error = goal[axis] - v
+            max_a = self.limits.max_acceleration[axis]
+            max_j = self.limits.max_jerk[axis]
+
+            if abs(error) < 1e-6 and abs(a) < 1e-6:
+                self.setpoint[axis], self.acceleration[axis] = goal[axis], 0.0
+                continue
+
+            # Aceleração que ainda permite zerar a aceleração ao chegar no alvo
+            desired_a = math.copysign(min(max_a, math.sqrt(2.0 * max_j * abs(error))), error)
+            a += max(-max_j * dt, min(max_j * dt, desired_a - a))
+            v_next = v + a * dt
+
+            if (goal[axis] - v_next) * error <= 0:
+                # Cruzou o alvo: encaixa sem overshoot
+                v_next, a = goal[axis], 0.0
+            self.setpoint[axis], self.acceleration[axis] = v_next, a
+
+        # Odometria pelos setpoints para critérios de distância/ângulo
+        self._traveled += math.hypot(self.setpoint[0], self.setpoint[1]) * dt
+        self._turned += abs(self.setpoint[2]) * dt
+
+        if target:
+            self._check_target_done(target)
+
+    def _check_target_done(self, target: LocomotionTarget):
+        if target.duration is not None and time.monotonic() - target.started_at >= target.duration:
+            self._finish_target(MoveOutcome.COMPLETED)
+            return
+        if target.distance is not None:
+            speed = math.hypot(self.setpoint[0], self.setpoint[1])
+            if self._traveled + self._braking_distance(speed, 0) >= target.distance:
+                self._finish_target(MoveOutcome.COMPLETED)
+                return
+        if target.angle is not None:
+            if self._turned + self._braking_distance(abs(self.setpoint[2]), 2) >= target.angle:
+                self._finish_target(MoveOutcome.COMPLETED)
+
+    def _braking_distance(self, speed: float, axis: int) -> float:
+        """Distância até parar com aceleração e jerk limitados (v²/2a + v·a/2j)."""
+        max_a = max(self.limits.max_acceleration[axis], 1e-3)
+        max_j = max(self.limits.max_jerk[axis], 1e-3)
+        return speed * speed / (2.0 * max_a) + speed * max_a / (2.0 * max_j)
+
+    def _publish(self):
+        """Envia o setpoint atual sem bloquear o loop."""
+        command = tuple(round(v, 4) for v in self.setpoint)
+        now = time.monotonic()
+
+        idle = not any(command) and self._last_published is not None and not any(self._last_published)
+        if idle and now - self._last_publish_time < self.keepalive:
+            return
+
+        if self._publish_task and not self._publish_task.done():
+            # RPC anterior ainda em voo: descarta este ciclo, o próximo leva o valor mais novo
+            self.publish_skipped += 1
+            return
+
+        self._publish_task = asyncio.ensure_future(self._send(command))
+
+    async def _send(self, command: Tuple[float, float, float]):
+        try:
+            await self.publisher(*command)
+            self._mark_published(command)
+        except Exception as e:
+            self.publish_errors += 1
+            logger.debug(f"Falha ao publicar velocidade: {e}")
+
+    def _mark_published(self, command: Tuple[float, float, float]):
+        self._last_published = command
+        self._last_publish_time = time.monotonic()
+        self.published += 1
+
+    def get_status(self) -> Dict[str, Any]:
+        """Retorna estado e métricas do streaming."""
+        return {
+            "running": self.is_running,
+            "rate_hz": self.rate_hz,
+            "setpoint": dict(zip(AXES, (round(v, 3) for v in self.setpoint))),
+            "target": dict(zip(AXES, self.target.velocity)) if self.target else None,
+            "target_source": self.target.source if self.target else None,
+            "ticks": self.ticks,
+            "published": self.published,
+            "publish_skipped": self.publish_skipped,
+            "publish_errors": self.publish_errors,
+            "preemptions": self.preemptions,
+            "emergency_stops": self.emergency_stops,
+            "proximity_vetoes": self.proximity_vetoes,
+            "max_jitter_ms": round(self.max_jitter_ms, 2)
+        }
@@ -1,14 +1,21 @@
 """
 Conector para captura de visão RealSense D435i no sistema t031a5.
 MÉTODO TESTADO E FUNCIONANDO: pyrealsense2 640x480@30fps color+depth
+
+Com ``start_capture_loop`` uma thread própria espera os frames na taxa da
+câmera, guarda o último e entrega a profundidade aos ouvintes, sem depender
+de quem consulta o input de visão (nem do event loop estar livre).
+Ouvintes registrados com ``on_loop=True`` (ex.: grade de ocupação, que não
+é thread-safe) recebem só o frame mais novo, agendado no event loop.
 """
 
 import logging
 import asyncio
+import threading
 import numpy as np
 import cv2
 import os
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, Callable, List
 from datetime import datetime
 from pathlib import Path
 
@@ -40,6 +47,21 @@ class VisionCaptureConnector:
         self.config = None
         self.is_initialized = False
         
+        # Consumidores do frame de profundidade (ex.: proximidade, grade de ocupação)
+        self.depth_listeners: List[Callable[[np.ndarray], None]] = []
+        self.loop_depth_listeners: List[Callable[[np.ndarray], None]] = []
+        
+        # Thread de captura na taxa da câmera
+        self.frame_timeout = config.get("frame_timeout", 1.0)
+        self._capture_thread: Optional[threading.Thread] = None
+        self._capture_stop = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._latest: Optional[Tuple[np.ndarray, np.ndarray, datetime]] = None
+        self._loop_pending: Optional[np.ndarray] = None
+        self._pending_lock = threading.Lock()
+        self.frames_captured = 0
+        self.capture_errors = 0
+        
         logger.info(f"VisionCaptureConnector inicializado: {self.width}x{self.height}@{self.fps}fps")
     
     async def initialize_realsense(self) -> bool:
@@ -93,6 +115,99 @@ class VisionCaptureConnector:
             self.is_initialized = False
             return False
     
+    def add_depth_listener(self, callback: Callable[[np.ndarray], None], on_loop: bool = True):
+        """
+        Registra um consumidor chamado a cada frame de profundidade capturado.
+        
+        Args:
+            callback: Recebe a imagem z16
+            on_loop: Chamar no event loop (padrão). Com False o consumidor roda
+                     na thread de captura, a cada frame, e precisa ser thread-safe
+        """
+        listeners = self.loop_depth_listeners if on_loop else self.depth_listeners
+        if callback not in listeners:
+            listeners.append(callback)
+    
+    def _notify_depth_listeners(self, depth_image: np.ndarray, in_thread: bool = False):
+        for callback in self.depth_listeners:
+            try:
+                callback(depth_image)
+            except Exception as e:
+                logger.error(f"Erro no consumidor de profundidade: {e}")
+        if not self.loop_depth_listeners:
+            return
+        if not in_thread:
+            self._deliver_on_loop(depth_image)
+        elif self._loop is not None:
+            # Só o frame mais novo: com o loop ocupado os intermediários são descartados
+            with self._pending_lock:
+                pending, self._loop_pending = self._loop_pending, depth_image
+            if pending is None:
+                try:
+                    self._loop.call_soon_threadsafe(self._deliver_pending)
+                except RuntimeError:
+                    pass  # loop já fechado
+    
+    def _deliver_pending(self):
+        with self._pending_lock:
+            depth_image, self._loop_pending = self._loop_pending, None
+        if depth_image is not None:
+            self._deliver_on_loop(depth_image)
+    
+    def _deliver_on_loop(self, depth_image: np.ndarray):
+        for callback in self.loop_depth_listeners:
+            try:
+                callback(depth_image)
+            except Exception as e:
+                logger.error(f"Erro no consumidor de profundidade: {e}")
+    
+    @property
+    def is_capturing(self) -> bool:
+        return self._capture_thread is not None and self._capture_thread.is_alive()
+    
+    def start_capture_loop(self) -> bool:
+        """Inicia a thread de captura (chamar de dentro do event loop)."""
+        if not self.is_initialized or not self.pipeline:
+            return False
+        if self.is_capturing:
+            return True
+        self._loop = asyncio.get_running_loop()
+        self._capture_stop.clear()
+        self._capture_thread = threading.Thread(target=self._capture_loop, name="realsense-capture",
+                                                daemon=True)
+        self._capture_thread.start()
+        logger.info(f"📷 Captura contínua iniciada ({self.fps}fps)")
+        return True
+    
+    def stop_capture_loop(self, timeout: float = 2.0):
+        """Para a thread de captura (bloqueia até ``timeout``)."""
+        self._capture_stop.set()
+        if self._capture_thread:
+            self._capture_thread.join(timeout)
+            self._capture_thread = None
+    
+    def _capture_loop(self):
+        timeout_ms = int(self.frame_timeout * 1000)
+        while not self._capture_stop.is_set():
+            try:
+                # Bloqueia até o próximo frame: o ritmo é o fps configurado na câmera
+                frames = self.pipeline.wait_for_frames(timeout_ms)
+                color_frame = frames.get_color_frame()
+                depth_frame = frames.get_depth_frame()
+                if not color_frame or not depth_frame:
+                    continue
+                # Cópias: a memória dos frames volta ao pool da librealsense
+                color_image = np.array(color_frame.get_data(), copy=True)
+                depth_image = np.array(depth_frame.get_data(), copy=True)
+            except Exception as e:
+                self.capture_errors += 1
+                logger.warning(f"Falha na captura contínua: {e}")
+                self._capture_stop.wait(0.1)
+                continue
+            self._latest = (color_image, depth_image, datetime.now())
+            self.frames_captured += 1
+            self._notify_depth_listeners(depth_image, in_thread=True)
+    
     async def capture_frame_realsense(self, save_files: bool = False) -> Optional[Dict[str, Any]]:
         """
         Captura frame da RealSense D435i.
@@ -106,22 +221,29 @@ class VisionCaptureConnector:
             return None
         
         try:
-            # Capturar frames (método testado)
-            frames = self.pipeline.wait_for_frames()
-            
-            # Obter frames de color e depth
-            color_frame = frames.get_color_frame()
-            depth_frame = frames.get_depth_frame()
-            
-            if not color_frame or not depth_frame:
-                logger.warning("Frames não capturados")
-                return None
-            
-            # Converter para arrays numpy (método testado)
-            color_image = np.asanyarray(color_frame.get_data())
-            depth_image = np.asanyarray(depth_frame.get_data())
-            
-            timestamp = datetime.now()
+            if self.is_capturing:
+                # A thread de captura já entregou a profundidade aos ouvintes
+                if self._latest is None:
+                    return None
+                color_image, depth_image, timestamp = self._latest
+            else:
+                # Capturar frames (método testado)
+                frames = self.pipeline.wait_for_frames()
+                
+                # Obter frames de color e depth
+                color_frame = frames.get_color_frame()
+                depth_frame = frames.get_depth_frame()
+                
+                if not color_frame or not depth_frame:
+                    logger.warning("Frames não capturados")
+                    return None
+                
+                # Converter para arrays numpy (método testado)
+                color_image = np.asanyarray(color_frame.get_data())
+                depth_image = np.asanyarray(depth_frame.get_data())
+                
+                timestamp = datetime.now()
+                self._notify_depth_listeners(depth_image)
             
             # Dados de retorno
             capture_data = {
@@ -189,6 +311,7 @@ class VisionCaptureConnector:
     async def cleanup(self):
         """Limpar recursos da RealSense."""
         try:
+            await asyncio.to_thread(self.stop_capture_loop)
             if self.pipeline:
                 self.pipeline.stop()
                 logger.info("Pipeline RealSense finalizado")
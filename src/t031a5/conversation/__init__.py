@@ -5,11 +5,26 @@ Integra visão, áudio, fala e gestos de forma sincronizada.
 """
 
 from .engine import ConversationEngine, ConversationState, EmotionLevel, ConversationContext, ConversationResponse
+from .intent_router import IntentRouter, IntentRule, IntentMatch, normalize_transcript
+from .text_analysis import TextAnalyzer, TextAnalysis, analyze_text
+from .timeline import PlannedAction, ResponseTimeline, TimelineBuilder, TimelineScheduler, WordTiming
 
 __all__ = [
     "ConversationEngine",
     "ConversationState", 
     "EmotionLevel",
     "ConversationContext",
-    "ConversationResponse"
+    "ConversationResponse",
+    "IntentRouter",
+    "IntentRule",
+    "IntentMatch",
+    "normalize_transcript",
+    "TextAnalyzer",
+    "TextAnalysis",
+    "analyze_text",
+    "PlannedAction",
+    "ResponseTimeline",
+    "TimelineBuilder",
+    "TimelineScheduler",
+    "WordTiming"
 ]
@@ -9,6 +9,7 @@ import asyncio
 import logging
 import time
 import json
+from collections import deque
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
@@ -18,6 +19,24 @@ from ..inputs.base import InputData
 from ..actions.base import ActionRequest, ActionResult
 from ..llm.provider import LLMProvider, LLMRequest, LLMResponse
 from ..fuser.base import FusedData
+from .intent_router import IntentRouter, IntentMatch
+from .text_analysis import analyze_text, AUDIO_CUE_KEYWORDS, GESTURE_KEYWORDS
+from .timeline import PlannedAction, TimelineBuilder, TimelineScheduler
+from ..runtime.timer_wheel import TimerWheel
+from ..connectors.led_writer import LedLayer, get_led_writer
+from ..runtime.action_scheduler import get_action_scheduler
+from ..logging.tracing import get_tracer
+
+
+def has_user_speech(inputs: Dict[str, InputData], min_confidence: float = 0.0) -> bool:
+    """Fala do usuário no snapshot: VAD com transcrição e confiança mínima."""
+    voice_input = inputs.get("G1Voice")
+    if not voice_input:
+        return False
+    voice_data = voice_input.data
+    speech_detected = voice_data.get("speech_detected") or voice_data.get("is_speech", False)
+    transcript = voice_data.get("transcription") or voice_data.get("transcript") or voice_data.get("text", "")
+    return bool(speech_detected and transcript) and voice_data.get("confidence", 1.0) >= min_confidence
 
 
 class ConversationState(Enum):
@@ -42,6 +61,9 @@ class EmotionLevel(Enum):
     THINKING = "thinking"
 
 
+_EMOTION_LEVEL_VALUES = frozenset(level.value for level in EmotionLevel)
+
+
 @dataclass
 class ConversationContext:
     """Contexto da conversação."""
@@ -106,6 +128,23 @@ class ConversationEngine:
         self.enable_emotion_detection = config.get("enable_emotion_detection", True)
         self.conversation_timeout = config.get("conversation_timeout", 30.0)
         self.response_delay = config.get("response_delay", 0.5)
+        self.enable_intent_router = config.get("enable_intent_router", True)
+        self.enable_barge_in = config.get("enable_barge_in", True)
+        self.barge_in_min_confidence = config.get("barge_in_min_confidence", 0.6)
+        self.barge_in_timeout = config.get("barge_in_timeout", 0.5)
+        # Com o ConversationPipeline, quem decide a preempção é a política dele
+        self.preemption_managed_externally = False
+        self.enable_timeline_sync = config.get("enable_timeline_sync", True)
+        
+        # Timeline multimodal (gestos/sons ancorados nas palavras da fala)
+        timeline_config = config.get("timeline", {})
+        self.timeline_builder = TimelineBuilder(timeline_config)
+        self.timeline_scheduler = TimelineScheduler(
+            TimerWheel(tick=timeline_config.get("tick", 0.02)), timeline_config
+        )
+        
+        # Roteador de comandos diretos (antes do LLM)
+        self.intent_router = IntentRouter(config.get("intent_router", {}))
         
         # Sistema de gestos sincronizados integrado com biblioteca completa G1
         from ..actions.g1_movement_mapping import G1MovementLibrary, G1MovementType
@@ -156,6 +195,12 @@ class ConversationEngine:
             "balance": ["balance_mode_1"]
         }
         
+        # Palavras que ancoram cada gesto na fala (ex.: 26 → "olá", "oi")
+        self._gesture_keywords: Dict[Any, frozenset] = {}
+        for category, keywords in GESTURE_KEYWORDS.items():
+            for gesture in self.gesture_mapping.get(category, []):
+                self._gesture_keywords[gesture] = self._gesture_keywords.get(gesture, frozenset()) | frozenset(keywords)
+        
         # Contexto visual
         self.visual_keywords = {
             "person": ["pessoa", "você", "alguém"],
@@ -169,6 +214,13 @@ class ConversationEngine:
         self.total_response_time = 0.0
         self.emotion_changes = 0
         self.gestures_performed = 0
+        self.fast_path_commands = 0
+        
+        # Barge-in (usuário interrompe a fala do robô)
+        self._response_task: Optional[asyncio.Task] = None
+        self._relax_task: Optional[asyncio.Task] = None
+        self.barge_in_count = 0
+        self.barge_in_latencies = deque(maxlen=100)
         
     async def initialize(self, llm_provider: LLMProvider, input_plugins: Dict[str, Any], action_plugins: Dict[str, Any]) -> bool:
         """Inicializa o engine de conversação."""
@@ -226,21 +278,45 @@ class ConversationEngine:
         """
         try:
             start_time = time.time()
-            self.logger.debug(f"🎤 INÍCIO CONVERSAÇÃO: {len(inputs)} inputs recebidos")
+            self.logger.debug("🎤 INÍCIO CONVERSAÇÃO: %d inputs recebidos", len(inputs))
+            
+            # 0. Enquanto o robô responde, só a voz do usuário é processada;
+            #    com barge-in ela interrompe a resposta atual imediatamente
+            if self.is_responding:
+                if not self.detect_user_speech(inputs):
+                    return None
+                if self.enable_barge_in and not self.preemption_managed_externally:
+                    await self.handle_barge_in()
             
             # 1. Análise de inputs
             self.logger.debug("🔍 Analisando inputs...")
-            conversation_data = await self._analyze_inputs(inputs)
+            tracer = get_tracer()
+            with tracer.span("fusion", inputs=len(inputs)):
+                conversation_data = await self._analyze_inputs(inputs)
             
             if not conversation_data:
                 self.logger.debug("❌ Nenhum dado conversacional extraído")
                 return None
             
-            self.logger.debug(f"✅ Dados conversacionais: {conversation_data}")
+            self.logger.debug("✅ Dados conversacionais: %s", conversation_data)
+            
+            # 1.1 Comandos diretos não passam pelo LLM
+            if self.enable_intent_router and conversation_data.get("voice_input"):
+                intent_match = self.intent_router.match(conversation_data["voice_input"])
+                # Plugin fora de agent_actions: o comando não tem quem execute, vai ao LLM
+                if intent_match and intent_match.rule.plugin not in self.action_plugins:
+                    self.logger.debug("Intenção '%s' sem plugin '%s': segue para o LLM",
+                                      intent_match.intent, intent_match.rule.plugin)
+                    intent_match = None
+                if intent_match:
+                    await self._update_context(conversation_data, inputs)
+                    await self._dispatch_intent(intent_match)
+                    return None
             
             # 2. Atualização de contexto
             self.logger.debug("📝 Atualizando contexto...")
-            await self._update_context(conversation_data, inputs)
+            with tracer.span("context.update"):
+                await self._update_context(conversation_data, inputs)
             
             # 3. Verificar se precisa responder
             self.logger.debug("🤔 Verificando se deve responder...")
@@ -260,11 +336,12 @@ class ConversationEngine:
                 self.logger.debug("❌ LLM não retornou resposta")
                 return None
             
-            self.logger.debug(f"✅ LLM resposta: {llm_response.content[:50]}...")
+            self.logger.debug("✅ LLM resposta: %.50s...", llm_response.content)
             
             # 5. Planejar resposta multimodal
             self.logger.debug("🎭 Planejando resposta multimodal...")
-            response = await self._plan_multimodal_response(llm_response, conversation_data)
+            with tracer.span("response.plan"):
+                response = await self._plan_multimodal_response(llm_response, conversation_data)
             
             # 6. Atualizar métricas
             response_time = time.time() - start_time
@@ -392,7 +469,9 @@ class ConversationEngine:
     
     async def _generate_llm_response(self, conversation_data: Dict[str, Any]) -> Optional[LLMResponse]:
         """Gera resposta via LLM com contexto completo."""
+        tracer = get_tracer()
         try:
+            prompt_span = tracer.start_span("prompt.build")
             # Preparar contexto
             context_parts = [self.base_system_prompt]
             
@@ -411,12 +490,14 @@ class ConversationEngine:
             current_situation = self._format_current_situation(conversation_data)
             context_parts.append(f"Situação Atual: {current_situation}")
             
+            prompt = "\n\n".join(context_parts)
+            
             # Preparar dados fusionados
             fused_data = FusedData(
                 fusion_type="conversation",
                 timestamp=datetime.now(),
                 data={
-                    "content": "\n\n".join(context_parts),
+                    "content": prompt,
                     "conversation_context": self.context.__dict__,
                     "visual_context": conversation_data.get("visual_context", {}),
                     "interaction_type": conversation_data.get("interaction_type", "passive")
@@ -429,8 +510,24 @@ class ConversationEngine:
                 }
             )
             
-            # Gerar resposta usando interface correta do LLMProvider
-            return await self.llm_provider.process(fused_data, "\n\n".join(context_parts))
+            prompt_span.end(chars=len(prompt))
+            
+            # Gerar resposta em streaming (marca llm.first_token no tracing);
+            # o texto é juntado aqui, o planejamento multimodal precisa dele inteiro
+            with tracer.span("llm") as llm_span:
+                start = time.perf_counter()
+                chunks = [chunk async for chunk in self.llm_provider.stream(fused_data, prompt)]
+                content = "".join(chunks)
+                response = LLMResponse(
+                    content=content,
+                    model=self.llm_provider.config.get("model", self.llm_provider.provider_type),
+                    timestamp=datetime.now(),
+                    response_time=time.perf_counter() - start,
+                    metadata={"provider": self.llm_provider.provider_type, "streamed": True}
+                ) if content.strip() else None
+                llm_span.set("ok", response is not None)
+                llm_span.set("chunks", len(chunks))
+            return response
             
         except Exception as e:
             self.logger.error(f"Erro na geração de resposta LLM: {e}")
@@ -546,23 +643,10 @@ class ConversationEngine:
     
     def _detect_response_emotion(self, text: str, conversation_data: Dict[str, Any]) -> EmotionLevel:
         """Detecta emoção apropriada para a resposta."""
-        text_lower = text.lower()
-        
         # Palavras-chave emocionais
-        if any(word in text_lower for word in ["feliz", "ótimo", "excelente", "fantástico", "maravilhoso"]):
-            return EmotionLevel.HAPPY
-        
-        if any(word in text_lower for word in ["interessante", "incrível", "uau", "nossa"]):
-            return EmotionLevel.EXCITED
-        
-        if any(word in text_lower for word in ["hmm", "deixe-me pensar", "não tenho certeza"]):
-            return EmotionLevel.THINKING
-        
-        if any(word in text_lower for word in ["não entendi", "confuso", "perdão"]):
-            return EmotionLevel.CONFUSED
-        
-        if any(word in text_lower for word in ["observando", "vejo", "analisando"]):
-            return EmotionLevel.FOCUSED
+        emotion = analyze_text(text).best_emotion(_EMOTION_LEVEL_VALUES, default="")
+        if emotion:
+            return EmotionLevel(emotion)
         
         # Baseado no contexto
         urgency = conversation_data.get("urgency", 0.0)
@@ -577,26 +661,11 @@ class ConversationEngine:
             return []
         
         gestures = []
-        text_lower = text.lower()
         
         # Gestos baseados no conteúdo
-        if any(word in text_lower for word in ["olá", "oi", "saudações", "bem-vindo"]):
-            gestures.extend(self.gesture_mapping.get("greeting", []))
-        
-        elif any(word in text_lower for word in ["isso", "aquilo", "ali", "aqui"]):
-            gestures.extend(self.gesture_mapping.get("pointing", []))
-        
-        elif any(word in text_lower for word in ["explicar", "mostrar", "demonstrar"]):
-            gestures.extend(self.gesture_mapping.get("explanation", []))
-        
-        elif any(word in text_lower for word in ["pensar", "considerar", "analisar"]):
-            gestures.extend(self.gesture_mapping.get("thinking", []))
-        
-        elif any(word in text_lower for word in ["sim", "correto", "exato", "concordo"]):
-            gestures.extend(self.gesture_mapping.get("agreement", []))
-        
-        elif any(word in text_lower for word in ["não", "incorreto", "discordo"]):
-            gestures.extend(self.gesture_mapping.get("disagreement", []))
+        gesture_category = analyze_text(text).best_gesture()
+        if gesture_category:
+            gestures.extend(self.gesture_mapping.get(gesture_category, []))
         
         # Gestos baseados na emoção
         if emotion == EmotionLevel.HAPPY:
@@ -620,8 +689,7 @@ class ConversationEngine:
             audio_cues.append("notification")  # Som sutil de pensamento
         
         # Sons baseados no conteúdo
-        if "sucesso" in text.lower() or "consegui" in text.lower():
-            audio_cues.append("success")
+        audio_cues.extend(analyze_text(text).audio_cues())
         
         return audio_cues
     
@@ -646,135 +714,33 @@ class ConversationEngine:
     
     async def execute_response(self, response: ConversationResponse) -> bool:
         """Executa resposta multimodal de forma sincronizada."""
+        with get_tracer().span("response.execute") as span:
+            result = await self._execute_response(response)
+            span.set("success", result)
+            return result
+    
+    async def _execute_response(self, response: ConversationResponse) -> bool:
+        """Corpo de ``execute_response`` (dentro do span ``response.execute``)."""
         try:
             self.logger.info(f"Executando resposta: {response.text[:50]}...")
             
-            # Lista de tarefas a executar
-            tasks = []
+            # Ações a executar
+            actions = self._plan_response_actions(response)
             
-            # 1. Configurar emoção
-            if "emotion" in self.action_plugins:
-                emotion_request = ActionRequest(
-                    action_type="emotion",
-                    action_name="set_emotion",
-                    timestamp=datetime.now(),
-                    data={
-                        "emotion": response.emotion.value,
-                        "intensity": 0.8,
-                        "duration": len(response.text) * 0.1  # Duração baseada no texto
-                    }
-                )
-                tasks.append(self._execute_action("emotion", emotion_request))
-            
-            # 2. Executar gestos e movimentos
-            if response.gestures:
-                for gesture in response.gestures:
-                    # Verificar se é um ID numérico (APENAS movimentos de braços, NÃO estados FSM)
-                    if isinstance(gesture, int):
-                        if "gesture" in self.action_plugins:
-                            # Verificar se é um movimento de braços válido (não estado FSM)
-                            arm_movement = self.movement_library.get_movement_by_id(gesture)
-                            if (arm_movement and 
-                                arm_movement.movement_type == self.movement_type.ARM_GESTURE):
-                                
-                                gesture_request = ActionRequest(
-                                    action_type="arms",
-                                    action_name="execute_movement",
-                                    timestamp=datetime.now(),
-                                    data={
-                                        "movement_id": gesture,
-                                        "movement_name": arm_movement.name,
-                                        "duration": arm_movement.duration,
-                                        "requires_relax": arm_movement.requires_relax
-                                    }
-                                )
-                                tasks.append(self._execute_action("gesture", gesture_request))
-                            else:
-                                self.logger.warning(f"Ignorando estado FSM {gesture} em contexto conversacional")
-                    
-                    # Verificar se é um comando de locomoção (string) - APENAS locomoção, NÃO estados FSM
-                    elif isinstance(gesture, str):
-                        if "move" in self.action_plugins:
-                            locomotion = self.movement_library.get_movement_by_name(gesture)
-                            if (locomotion and 
-                                locomotion.movement_type == self.movement_type.LOCOMOTION):
-                                
-                                locomotion_request = ActionRequest(
-                                    action_type="movement",
-                                    action_name="execute_locomotion",
-                                    timestamp=datetime.now(),
-                                    data={
-                                        "command": gesture,
-                                        "movement_name": locomotion.name,
-                                        "duration": locomotion.duration
-                                    }
-                                )
-                                tasks.append(self._execute_action("move", locomotion_request))
-                        
-                        # Fallback para gestos legados
-                        elif "gesture" in self.action_plugins:
-                            gesture_request = ActionRequest(
-                                action_type="arms",
-                                action_name="gesture",
-                                timestamp=datetime.now(),
-                                data={
-                                    "gesture": gesture,
-                                    "speed": 0.8,
-                                    "hold_time": 2.0
-                                }
-                            )
-                            tasks.append(self._execute_action("gesture", gesture_request))
-            
-            # 3. Reproduzir áudio
-            if response.audio_cues and "G1Audio" in self.action_plugins:
-                for audio_cue in response.audio_cues:
-                    audio_request = ActionRequest(
-                        action_type="audio",
-                        action_name="play",
-                        timestamp=datetime.now(),
-                        data={
-                            "sound": audio_cue,
-                            "volume": 0.6
-                        }
-                    )
-                    tasks.append(self._execute_action("G1Audio", audio_request))
-            
-            # 4. Falar
-            if "speak" in self.action_plugins:
-                speech_request = ActionRequest(
-                    action_type="speech",
-                    action_name="speak",
-                    timestamp=datetime.now(),
-                    data={
-                        "text": response.text,
-                        "emotion": response.emotion.value,
-                        "speed": 0.9,
-                        "volume": 0.8
-                    }
-                )
-                tasks.append(self._execute_action("speak", speech_request))
-            
-            # 5. Ajustar olhar
-            if response.look_at and "move" in self.action_plugins:
-                look_request = ActionRequest(
-                    action_type="movement",
-                    action_name="look_at",
-                    timestamp=datetime.now(),
-                    data={
-                        "x": response.look_at[0],
-                        "y": response.look_at[1],
-                        "speed": 0.5
-                    }
-                )
-                tasks.append(self._execute_action("move", look_request))
-            
-            # Executar todas as ações
             self.state = ConversationState.SPEAKING
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            if self.enable_timeline_sync:
+                # Gestos e sons ancorados nas palavras da fala
+                timeline = self.timeline_builder.build(response.text, actions)
+                results = await self.timeline_scheduler.run(timeline, self._execute_action)
+                total_count = len(actions) - len(timeline.dropped)
+            else:
+                # Executar todas as ações
+                tasks = [self._execute_action(action.plugin, action.request) for action in actions]
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+                total_count = len(tasks)
             
             # Verificar resultados
             success_count = sum(1 for r in results if isinstance(r, ActionResult) and r.success)
-            total_count = len(tasks)
             
             self.logger.info(f"Resposta executada: {success_count}/{total_count} ações bem-sucedidas")
             
@@ -787,12 +753,259 @@ class ConversationEngine:
             self.state = ConversationState.IDLE
             return success_count > 0
             
+        except asyncio.CancelledError:
+            self.logger.debug("Execução da resposta cancelada")
+            raise
         except Exception as e:
             self.logger.error(f"Erro na execução da resposta: {e}")
             self.state = ConversationState.IDLE
             return False
     
+    def _plan_response_actions(self, response: ConversationResponse) -> List[PlannedAction]:
+        """Converte a resposta em ações para os plugins."""
+        actions = []
+        
+        # 1. Configurar emoção
+        if "emotion" in self.action_plugins:
+            emotion_request = ActionRequest(
+                action_type="emotion",
+                action_name="set_emotion",
+                timestamp=datetime.now(),
+                data={
+                    "emotion": response.emotion.value,
+                    "intensity": 0.8,
+                    "duration": len(response.text) * 0.1  # Duração baseada no texto
+                }
+            )
+            actions.append(PlannedAction("emotion", "emotion", emotion_request))
+        
+        # 2. Executar gestos e movimentos
+        for gesture in response.gestures or []:
+            # Verificar se é um ID numérico (APENAS movimentos de braços, NÃO estados FSM)
+            if isinstance(gesture, int):
+                if "gesture" in self.action_plugins:
+                    # Verificar se é um movimento de braços válido (não estado FSM)
+                    arm_movement = self.movement_library.get_movement_by_id(gesture)
+                    if (arm_movement and 
+                        arm_movement.movement_type == self.movement_type.ARM_GESTURE):
+                        
+                        gesture_request = ActionRequest(
+                            action_type="arms",
+                            action_name="execute_movement",
+                            timestamp=datetime.now(),
+                            data={
+                                "movement_id": gesture,
+                                "movement_name": arm_movement.name,
+                                "duration": arm_movement.duration,
+                                "requires_relax": arm_movement.requires_relax
+                            }
+                        )
+                        actions.append(PlannedAction(
+                            "gesture", "gesture", gesture_request,
+                            anchored=True,
+                            duration=arm_movement.duration,
+                            keywords=self._gesture_keywords.get(gesture, frozenset()),
+                            resource="arms",
+                            relax_time=1.0 if arm_movement.requires_relax else 0.0
+                        ))
+                    else:
+                        self.logger.warning(f"Ignorando estado FSM {gesture} em contexto conversacional")
+            
+            # Verificar se é um comando de locomoção (string) - APENAS locomoção, NÃO estados FSM
+            elif isinstance(gesture, str):
+                if "move" in self.action_plugins:
+                    locomotion = self.movement_library.get_movement_by_name(gesture)
+                    if (locomotion and 
+                        locomotion.movement_type == self.movement_type.LOCOMOTION):
+                        
+                        locomotion_request = ActionRequest(
+                            action_type="movement",
+                            action_name="execute_locomotion",
+                            timestamp=datetime.now(),
+                            data={
+                                "command": gesture,
+                                "movement_name": locomotion.name,
+                                "duration": locomotion.duration
+                            }
+                        )
+                        actions.append(PlannedAction(
+                            "locomotion", "move", locomotion_request,
+                            anchored=True, duration=locomotion.duration, resource="legs"
+                        ))
+                
+                # Fallback para gestos legados
+                elif "gesture" in self.action_plugins:
+                    gesture_request = ActionRequest(
+                        action_type="arms",
+                        action_name="gesture",
+                        timestamp=datetime.now(),
+                        data={
+                            "gesture": gesture,
+                            "speed": 0.8,
+                            "hold_time": 2.0
+                        }
+                    )
+                    actions.append(PlannedAction(
+                        "gesture", "gesture", gesture_request,
+                        anchored=True, duration=2.0, resource="arms"
+                    ))
+        
+        # 3. Reproduzir áudio
+        if response.audio_cues and "G1Audio" in self.action_plugins:
+            for audio_cue in response.audio_cues:
+                audio_request = ActionRequest(
+                    action_type="audio",
+                    action_name="play",
+                    timestamp=datetime.now(),
+                    data={
+                        "sound": audio_cue,
+                        "volume": 0.6
+                    }
+                )
+                # Sons de conteúdo ("success") seguem a palavra; sons de emoção abrem a resposta
+                cue_keywords = frozenset(AUDIO_CUE_KEYWORDS.get(audio_cue, ()))
+                actions.append(PlannedAction(
+                    "audio_cue", "G1Audio", audio_request,
+                    anchored=bool(cue_keywords), keywords=cue_keywords
+                ))
+        
+        # 4. Falar
+        if "speak" in self.action_plugins:
+            speech_request = ActionRequest(
+                action_type="speech",
+                action_name="speak",
+                timestamp=datetime.now(),
+                data={
+                    "text": response.text,
+                    "emotion": response.emotion.value,
+                    "speed": 0.9,
+                    "volume": 0.8
+                }
+            )
+            actions.append(PlannedAction("speech", "speak", speech_request))
+        
+        # 5. Ajustar olhar
+        if response.look_at and "move" in self.action_plugins:
+            look_request = ActionRequest(
+                action_type="movement",
+                action_name="look_at",
+                timestamp=datetime.now(),
+                data={
+                    "x": response.look_at[0],
+                    "y": response.look_at[1],
+                    "speed": 0.5
+                }
+            )
+            actions.append(PlannedAction("look_at", "move", look_request))
+        
+        return actions
+    
+    def start_response(self, response: ConversationResponse) -> asyncio.Task:
+        """Executa a resposta em background para que a voz do usuário possa interrompê-la."""
+        self._response_task = asyncio.create_task(self.execute_response(response))
+        return self._response_task
+    
+    @property
+    def is_responding(self) -> bool:
+        """Indica se há uma resposta em execução."""
+        return self._response_task is not None and not self._response_task.done()
+    
+    def detect_user_speech(self, inputs: Dict[str, InputData]) -> bool:
+        """Verifica se o usuário falou (mesmo critério do barge-in e do pipeline)."""
+        return has_user_speech(inputs, self.barge_in_min_confidence)
+    
+    async def handle_barge_in(self) -> Optional[float]:
+        """
+        Interrompe a resposta atual: para o TTS, descarta frases pendentes,
+        cancela gestos em andamento e relaxa os braços.
+        
+        Returns:
+            Latência do cancelamento em milissegundos ou None se não havia resposta
+        """
+        if not self.is_responding:
+            return None
+        
+        start_time = time.perf_counter()
+        self.logger.info("✋ Barge-in: usuário começou a falar, interrompendo resposta")
+        
+        try:
+            # 1. Silencia o áudio primeiro (é o que o usuário percebe)
+            speech_plugin = self.action_plugins.get("speak")
+            if speech_plugin and hasattr(speech_plugin, "cancel_speech"):
+                await speech_plugin.cancel_speech()
+            
+            # Animação reativa à fala para junto com o áudio
+            get_led_writer().stop_animations(LedLayer.SPEECH)
+            
+            # 2. Cancela demais ações da resposta (gestos, emoção, áudio)
+            self._response_task.cancel()
+            await asyncio.wait([self._response_task], timeout=self.barge_in_timeout)
+        except Exception as e:
+            self.logger.error(f"Erro no barge-in: {e}")
+        
+        self.state = ConversationState.LISTENING
+        
+        cancel_latency = (time.perf_counter() - start_time) * 1000
+        self.barge_in_count += 1
+        self.barge_in_latencies.append(cancel_latency)
+        self.logger.info(f"✋ Resposta interrompida em {cancel_latency:.1f}ms")
+        
+        # 3. Braços voltam a relaxar sem atrasar a escuta
+        if "gesture" in self.action_plugins:
+            relax_request = ActionRequest(
+                action_type="arms",
+                action_name="relax",
+                timestamp=datetime.now(),
+                data={"movement": "release", "duration": 0.5},
+                priority=5
+            )
+            self._relax_task = asyncio.create_task(self._execute_action("gesture", relax_request))
+        
+        return cancel_latency
+    
+    async def _dispatch_intent(self, intent_match: IntentMatch) -> bool:
+        """Despacha comando reconhecido pelo IntentRouter direto para o plugin."""
+        start_time = time.perf_counter()
+        rule = intent_match.rule
+        request = intent_match.to_action_request()
+        
+        # Volume relativo vira absoluto a partir do estado atual do plugin
+        if "volume_delta" in request.data:
+            plugin = self.action_plugins.get(rule.plugin)
+            audio_state = getattr(plugin, "audio_state", None)
+            current_volume = getattr(audio_state, "volume", 0.7)
+            request.data["volume"] = max(0.0, min(1.0, current_volume + request.data.pop("volume_delta")))
+        
+        self.logger.info(f"⚡ Comando direto '{intent_match.intent}' → {rule.plugin} "
+                         f"(match {intent_match.match_time_ms:.2f}ms)")
+        
+        if not rule.safety:
+            self.state = ConversationState.GESTURE
+        result = await self._execute_action(rule.plugin, request)
+        
+        self.context.conversation_history.append({
+            "timestamp": datetime.now(),
+            "type": "intent",
+            "content": intent_match.intent,
+            "slots": intent_match.slots
+        })
+        self.fast_path_commands += 1
+        self.state = ConversationState.IDLE
+        
+        dispatch_time = (time.perf_counter() - start_time) * 1000
+        self.logger.debug("Comando '%s' despachado em %.1fms", intent_match.intent, dispatch_time)
+        return result.success
+    
     async def _execute_action(self, plugin_name: str, request: ActionRequest) -> ActionResult:
+        """Executa uma ação pelo agendador de atuadores (fila, preempção, emergência)."""
+        tracer = get_tracer()
+        with tracer.span(f"action.{plugin_name}", action=request.action_name) as span:
+            # wrap: jobs da fila começam no callback de outro job, fora deste contexto
+            result = await get_action_scheduler().submit(plugin_name, request, tracer.wrap(self._run_action))
+            span.set("success", result.success)
+            return result
+    
+    async def _run_action(self, plugin_name: str, request: ActionRequest) -> ActionResult:
         """Executa uma ação específica."""
         try:
             plugin = self.action_plugins.get(plugin_name)
@@ -829,6 +1042,19 @@ class ConversationEngine:
             ),
             "emotion_changes": self.emotion_changes,
             "gestures_performed": self.gestures_performed,
+            "fast_path_commands": self.fast_path_commands,
+            "intent_router": self.intent_router.get_stats(),
+            "timeline": self.timeline_scheduler.get_stats(),
+            "barge_in": {
+                "enabled": self.enable_barge_in,
+                "count": self.barge_in_count,
+                "last_cancel_latency_ms": self.barge_in_latencies[-1] if self.barge_in_latencies else 0.0,
+                "avg_cancel_latency_ms": (
+                    sum(self.barge_in_latencies) / len(self.barge_in_latencies)
+                    if self.barge_in_latencies else 0.0
+                ),
+                "max_cancel_latency_ms": max(self.barge_in_latencies, default=0.0)
+            },
             "last_interaction": self.context.last_interaction.isoformat() if self.context.last_interaction else None,
             "conversation_history_length": len(self.context.conversation_history),
             "detected_objects": self.context.detected_objects,
@@ -848,6 +1074,9 @@ class ConversationEngine:
         """Para o engine de conversação."""
         try:
             self.logger.info("Parando Conversation Engine...")
+            if self.is_responding:
+                self._response_task.cancel()
+            await self.timeline_scheduler.wheel.stop()
             self.state = ConversationState.IDLE
             return True
         except Exception as e:
@@ -0,0 +1,521 @@
+"""
+Roteador de intenções determinístico para G1.
+
+Reconhece comandos diretos ("pare", "acena", "anda pra frente", "volume mais
+alto") na transcrição antes do LLM e os despacha direto para o plugin de ação
+correspondente. O LLM fica apenas com a conversa aberta.
+
+As frases de cada intenção são compiladas em uma trie de tokens no startup;
+o casamento percorre a transcrição uma única vez (leftmost-longest) e extrai
+slots numéricos como distância e ângulo.
+"""
+
+import logging
+import re
+import time
+import unicodedata
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
+
+from ..actions.base import ActionRequest
+from ..actions.g1_movement_mapping import G1MovementLibrary
+
+logger = logging.getLogger(__name__)
+
+
+# Normalização de tokens equivalentes no português falado
+TOKEN_ALIASES = {
+    "pra": "para",
+    "pro": "para",
+    "acene": "acena",
+    "acenar": "acena",
+    "ande": "anda",
+    "andar": "anda",
+    "vire": "vira",
+    "virar": "vira",
+    "gire": "vira",
+    "gira": "vira",
+    "girar": "vira",
+    "aplauda": "aplaude",
+    "aplaudir": "aplaude",
+    "sente": "senta",
+    "sentar": "senta",
+    "levante": "levanta",
+    "levantar": "levanta",
+    "relaxe": "relaxa",
+    "relaxar": "relaxa",
+    "aumente": "aumenta",
+    "aumentar": "aumenta",
+    "abaixe": "abaixa",
+    "abaixar": "abaixa",
+    "diminua": "diminui",
+    "diminuir": "diminui",
+    "graus": "grau",
+    "metros": "metro",
+}
+
+# Palavras que não descaracterizam um comando ("Tobias, por favor, acena")
+FILLER_TOKENS = {
+    "tobias", "robo", "ei", "oi", "ola", "ok", "por", "favor", "agora", "ai",
+    "voce", "pode", "poderia", "consegue", "o", "a", "os", "as", "um", "uma",
+    "de", "e", "ja", "rapido", "bem", "so", "me", "mais", "pouco", "vai",
+}
+
+NUMBER_WORDS = {
+    "meio": 0.5, "meia": 0.5, "um": 1.0, "uma": 1.0, "dois": 2.0, "duas": 2.0,
+    "tres": 3.0, "quatro": 4.0, "cinco": 5.0, "seis": 6.0, "sete": 7.0,
+    "oito": 8.0, "nove": 9.0, "dez": 10.0, "quinze": 15.0, "trinta": 30.0,
+    "quarenta": 40.0, "quarenta e cinco": 45.0, "noventa": 90.0,
+    "cento e oitenta": 180.0,
+}
+
+# Negação logo antes de um comando de segurança ("não pare de falar")
+NEGATION_TOKENS = {"nao", "nunca", "jamais", "sem"}
+_NEGATION_WINDOW = 2
+
+# Pontuação que separa orações ("não, pare!"); ponto e vírgula decimais ficam
+_CLAUSE_BREAK = re.compile(r"[!?;:]|(?<!\d)[.,]|[.,](?!\d)")
+
+_SLOT_PATTERN = re.compile(r"^\{(\w+):(\w+)\}$")
+_NUMBER_PATTERN = re.compile(r"^\d+(?:[.,]\d+)?$")
+
+
+@dataclass(frozen=True)
+class IntentRule:
+    """Regra de intenção: frases que disparam uma ação direta."""
+    intent: str
+    phrases: Tuple[str, ...]
+    plugin: str
+    action_type: str
+    action_name: str
+    data: Dict[str, Any] = field(default_factory=dict, hash=False, compare=False)
+    priority: int = 1
+    safety: bool = False
+    standalone: bool = False  # Só casa quando é o enunciado inteiro
+
+
+@dataclass
+class IntentMatch:
+    """Resultado de um casamento de intenção."""
+    rule: IntentRule
+    slots: Dict[str, float]
+    span: Tuple[int, int]
+    transcript: str
+    match_time_ms: float = 0.0
+
+    @property
+    def intent(self) -> str:
+        return self.rule.intent
+
+    @property
+    def is_safety(self) -> bool:
+        return self.rule.safety
+
+    def to_action_request(self) -> ActionRequest:
+        """Converte o casamento em requisição para o plugin de ação."""
+        data = dict(self.rule.data)
+        data.update(self.slots)
+        data["intent"] = self.rule.intent
+        data["transcript"] = self.transcript
+        return ActionRequest(
+            action_type=self.rule.action_type,
+            action_name=self.rule.action_name,
+            timestamp=datetime.now(),
+            data=data,
+            priority=self.rule.priority,
+            timeout=5.0 if self.rule.safety else 30.0,
+            metadata={"source": "intent_router", "safety": self.rule.safety}
+        )
+
+
+class _TrieNode:
+    """Nó da trie de tokens."""
+
+    __slots__ = ("children", "slots", "rules")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.slots: List[Tuple[str, str, "_TrieNode"]] = []
+        self.rules: List[IntentRule] = []
+
+
+def normalize_transcript(text: str) -> List[str]:
+    """Normaliza transcrição em tokens: minúsculas, sem acentos e pontuação."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = re.sub(r"[^\w\s.,]", " ", text)
+    text = re.sub(r"(?<!\d)[.,]|[.,](?!\d)", " ", text)
+    return [TOKEN_ALIASES.get(token, token) for token in text.split()]
+
+
+def tokenize_clauses(text: str) -> Tuple[List[str], set]:
+    """Tokens de ``normalize_transcript`` + índices dos tokens que abrem oração."""
+    tokens: List[str] = []
+    clause_starts = set()
+    for clause in _CLAUSE_BREAK.split(text):
+        clause_tokens = normalize_transcript(clause)
+        if clause_tokens:
+            clause_starts.add(len(tokens))
+            tokens.extend(clause_tokens)
+    return tokens, clause_starts
+
+
+def _gesture_rule(intent: str, movement_id: int, phrases: Tuple[str, ...],
+                  standalone: bool = False) -> IntentRule:
+    movement = G1MovementLibrary.get_movement_by_id(movement_id)
+    return IntentRule(
+        intent=intent,
+        phrases=phrases,
+        plugin="gesture",
+        action_type="arms",
+        action_name="execute_movement",
+        data={
+            "movement_id": movement.id,
+            "movement_name": movement.name,
+            "duration": movement.duration,
+            "requires_relax": movement.requires_relax
+        },
+        standalone=standalone
+    )
+
+
+def _locomotion_rule(intent: str, command: str, data: Dict[str, Any],
+                     phrases: Tuple[str, ...]) -> IntentRule:
+    locomotion = G1MovementLibrary.get_movement_by_name(command)
+    return IntentRule(
+        intent=intent,
+        phrases=phrases,
+        plugin="move",
+        action_type="movement",
+        action_name="execute_locomotion",
+        data={"command": command, "movement_name": locomotion.name, **data}
+    )
+
+
+def default_intent_rules() -> List[IntentRule]:
+    """Regras padrão mapeadas sobre a G1MovementLibrary."""
+    return [
+        # SEGURANÇA - nunca esperam pelo LLM
+        IntentRule(
+            intent="stop",
+            phrases=("pare", "parar", "para tudo", "para agora", "para de andar",
+                     "stop", "chega", "emergencia", "parada de emergencia", "fica parado"),
+            plugin="move",
+            action_type="movement",
+            action_name="execute_locomotion",
+            data={"type": "stop", "command": "stop_movement"},
+            priority=10,
+            safety=True
+        ),
+        IntentRule(
+            intent="stop",
+            phrases=("para",),
+            plugin="move",
+            action_type="movement",
+            action_name="execute_locomotion",
+            data={"type": "stop", "command": "stop_movement"},
+            priority=10,
+            safety=True,
+            standalone=True
+        ),
+
+        # GESTOS
+        _gesture_rule("wave", 26, ("acena", "da tchau", "tchau tchau", "manda um tchau")),
+        _gesture_rule("clap", 17, ("aplaude", "bate palmas", "bate palma")),
+        _gesture_rule("hug", 19, ("me abraca", "da um abraco")),
+        _gesture_rule("high_five", 18, ("toca aqui", "bate aqui")),
+        _gesture_rule("shake_hand", 27, ("aperta a mao", "aperta minha mao")),
+        # Substantivos soltos ("abraço!") só valem sozinhos: "odeio abraço" não é pedido
+        _gesture_rule("hug", 19, ("abraco",), standalone=True),
+        _gesture_rule("high_five", 18, ("high five",), standalone=True),
+        _gesture_rule("shake_hand", 27, ("aperto de mao",), standalone=True),
+        _gesture_rule("kiss", 13, ("manda um beijo", "manda beijo")),
+        _gesture_rule("heart", 33, ("mao no coracao",)),
+        _gesture_rule("hands_up", 15, ("maos para cima", "levanta as maos", "levanta os bracos")),
+        _gesture_rule("relax_arms", 99, ("relaxa os bracos", "abaixa os bracos", "solta os bracos")),
+
+        # LOCOMOÇÃO
+        _locomotion_rule("move_forward", "move_forward",
+                         {"type": "walk", "direction": "forward"},
+                         ("anda para frente", "anda {distance:num} metro para frente",
+                          "anda para frente {distance:num} metro", "vem para frente",
+                          "vem aqui", "segue em frente")),
+        _locomotion_rule("move_backward", "move_backward",
+                         {"type": "walk", "direction": "backward"},
+                         ("anda para tras", "anda {distance:num} metro para tras",
+                          "anda para tras {distance:num} metro", "da re", "volta para tras")),
+        _locomotion_rule("move_left", "move_left",
+                         {"type": "walk", "direction": "left"},
+                         ("anda para esquerda", "anda para a esquerda", "vai para esquerda",
+                          "vai para a esquerda", "passo para esquerda")),
+        _locomotion_rule("move_right", "move_right",
+                         {"type": "walk", "direction": "right"},
+                         ("anda para direita", "anda para a direita", "vai para direita",
+                          "vai para a direita", "passo para direita")),
+        _locomotion_rule("turn_left", "rotate_left_medium",
+                         {"type": "turn", "angle": 90.0},
+                         ("vira a esquerda", "vira para esquerda", "vira para a esquerda",
+                          "vira {angle:num} grau a esquerda",
+                          "vira {angle:num} grau para esquerda",
+                          "vira {angle:num} grau para a esquerda")),
+        _locomotion_rule("turn_right", "rotate_right_medium",
+                         {"type": "turn", "angle": -90.0},
+                         ("vira a direita", "vira para direita", "vira para a direita",
+                          "vira {angle_right:num} grau a direita",
+                          "vira {angle_right:num} grau para direita",
+                          "vira {angle_right:num} grau para a direita")),
+        IntentRule(
+            intent="sit",
+            phrases=("senta", "senta ai"),
+            plugin="move",
+            action_type="movement",
+            action_name="posture",
+            data={"type": "posture", "posture": "sitting"}
+        ),
+        IntentRule(
+            intent="stand_up",
+            phrases=("levanta", "fica de pe", "fica em pe"),
+            plugin="move",
+            action_type="movement",
+            action_name="posture",
+            data={"type": "posture", "posture": "standing"}
+        ),
+
+        # ÁUDIO
+        IntentRule(
+            intent="volume_up",
+            phrases=("volume mais alto", "aumenta o volume", "aumenta volume",
+                     "fala mais alto", "sobe o volume"),
+            plugin="G1Audio",
+            action_type="audio",
+            action_name="volume",
+            data={"action": "volume", "volume_delta": 0.1}
+        ),
+        IntentRule(
+            intent="volume_down",
+            phrases=("volume mais baixo", "abaixa o volume", "abaixa volume",
+                     "diminui o volume", "fala mais baixo", "fala baixo"),
+            plugin="G1Audio",
+            action_type="audio",
+            action_name="volume",
+            data={"action": "volume", "volume_delta": -0.1}
+        ),
+    ]
+
+
+class IntentRouter:
+    """
+    Roteador de intenções baseado em trie compilada.
+
+    Uso:
+        router = IntentRouter(config)
+        match = router.match("Tobias, anda 2 metros pra frente")
+        if match:
+            request = match.to_action_request()
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 rules: Optional[List[IntentRule]] = None):
+        config = config or {}
+        self.enabled = config.get("enabled", True)
+        # Tokens não-filler fora do comando tolerados antes de devolver ao LLM
+        self.max_extra_tokens = config.get("max_extra_tokens", 2)
+        self.rules = rules if rules is not None else default_intent_rules()
+
+        self._root = _TrieNode()
+        self._compile()
+
+        # Métricas
+        self.total_queries = 0
+        self.total_matches = 0
+        self.matches_by_intent: Dict[str, int] = {}
+        self.total_match_time_ms = 0.0
+        self.max_match_time_ms = 0.0
+
+    def _compile(self):
+        """Compila todas as frases em uma trie de tokens."""
+        phrase_count = 0
+        for rule in self.rules:
+            for phrase in rule.phrases:
+                node = self._root
+                for token in self._tokenize_pattern(phrase):
+                    slot = _SLOT_PATTERN.match(token)
+                    if slot:
+                        slot_name, slot_type = slot.groups()
+                        existing = next((s for s in node.slots if s[0] == slot_name and s[1] == slot_type), None)
+                        if existing:
+                            node = existing[2]
+                        else:
+                            child = _TrieNode()
+                            node.slots.append((slot_name, slot_type, child))
+                            node = child
+                    else:
+                        node = node.children.setdefault(token, _TrieNode())
+                node.rules.append(rule)
+                phrase_count += 1
+
+        logger.debug(f"IntentRouter compilado: {len(self.rules)} regras, {phrase_count} frases")
+
+    @staticmethod
+    def _tokenize_pattern(phrase: str) -> List[str]:
+        """Tokeniza padrão preservando os marcadores de slot."""
+        tokens = []
+        for part in phrase.split():
+            if _SLOT_PATTERN.match(part):
+                tokens.append(part)
+            else:
+                tokens.extend(normalize_transcript(part))
+        return tokens
+
+    @staticmethod
+    def _parse_number(tokens: List[str], index: int) -> Optional[Tuple[float, int]]:
+        """Lê número (dígitos ou por extenso) a partir de index; retorna (valor, tokens consumidos)."""
+        token = tokens[index]
+        if _NUMBER_PATTERN.match(token):
+            return float(token.replace(",", ".")), 1
+        # Números compostos por extenso ("quarenta e cinco")
+        for length in (3, 1):
+            words = " ".join(tokens[index:index + length])
+            if len(tokens[index:index + length]) == length and words in NUMBER_WORDS:
+                return NUMBER_WORDS[words], length
+        return None
+
+    def _walk(self, tokens: List[str], start: int) -> Optional[Tuple[IntentRule, Dict[str, float], int]]:
+        """Busca o casamento mais longo começando em start."""
+        best: Optional[Tuple[IntentRule, Dict[str, float], int]] = None
+        stack: List[Tuple[_TrieNode, int, Dict[str, float]]] = [(self._root, start, {})]
+
+        while stack:
+            node, position, slots = stack.pop()
+            if node.rules and position > start:
+                rule = max(node.rules, key=lambda r: r.priority)
+                if best is None or (position, rule.priority) > (best[2], best[0].priority):
+                    best = (rule, slots, position)
+            if position >= len(tokens):
+                continue
+
+            child = node.children.get(tokens[position])
+            if child:
+                stack.append((child, position + 1, slots))
+
+            for slot_name, slot_type, slot_node in node.slots:
+                if slot_type == "num":
+                    number = self._parse_number(tokens, position)
+                    if number:
+                        value, consumed = number
+                        stack.append((slot_node, position + consumed, {**slots, slot_name: value}))
+
+        return best
+
+    def match(self, transcript: str) -> Optional[IntentMatch]:
+        """
+        Procura um comando direto na transcrição.
+
+        Returns:
+            IntentMatch ou None se a transcrição é conversa aberta
+        """
+        if not self.enabled or not transcript:
+            return None
+
+        start_time = time.perf_counter()
+        self.total_queries += 1
+
+        tokens, clause_starts = tokenize_clauses(transcript)
+        matches: List[Tuple[IntentRule, Dict[str, float], Tuple[int, int]]] = []
+        position = 0
+        while position < len(tokens):
+            found = self._walk(tokens, position)
+            if found:
+                rule, slots, end = found
+                matches.append((rule, slots, (position, end)))
+                position = end
+            else:
+                position += 1
+
+        # Frases standalone ("para") só valem quando são o único comando
+        if len(matches) > 1:
+            matches = [m for m in matches if not m[0].standalone]
+
+        result = None
+        if matches:
+            covered = set()
+            for _, _, (span_start, span_end) in matches:
+                covered.update(range(span_start, span_end))
+            extra_tokens = [
+                token for i, token in enumerate(tokens)
+                if i not in covered and token not in FILLER_TOKENS
+            ]
+
+            candidates = [
+                m for m in matches
+                if (m[0].standalone and not extra_tokens)
+                or (m[0].safety and not m[0].standalone
+                    and self._safety_applies(tokens, clause_starts, m[2], len(extra_tokens)))
+                or (not m[0].safety and not m[0].standalone
+                    and len(extra_tokens) <= self.max_extra_tokens)
+            ]
+
+            if candidates:
+                # Segurança vence qualquer outro casamento
+                rule, slots, span = max(candidates, key=lambda m: m[0].priority)
+                result = IntentMatch(
+                    rule=rule,
+                    slots=self._resolve_slots(slots),
+                    span=span,
+                    transcript=transcript
+                )
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        self.total_match_time_ms += elapsed_ms
+        self.max_match_time_ms = max(self.max_match_time_ms, elapsed_ms)
+
+        if result:
+            result.match_time_ms = elapsed_ms
+            self.total_matches += 1
+            self.matches_by_intent[result.intent] = self.matches_by_intent.get(result.intent, 0) + 1
+            logger.debug(f"Intenção '{result.intent}' em {elapsed_ms:.2f}ms: {transcript}")
+
+        return result
+
+    def _safety_applies(self, tokens: List[str], clause_starts: set, span: Tuple[int, int],
+                        extra_count: int) -> bool:
+        """
+        Frase de segurança no meio de conversa só vale como comando.
+
+        Negada na mesma oração ("não pare de falar") nunca vale. Fora isso,
+        vale com poucos tokens extras ou abrindo uma oração ("pare, tem
+        gente na frente"), exceto como "parar de <verbo>" ("parar de fumar").
+        """
+        start, end = span
+        clause_start = max(i for i in clause_starts if i <= start) if clause_starts else 0
+        window = tokens[max(clause_start, start - _NEGATION_WINDOW):start]
+        if any(token in NEGATION_TOKENS for token in window):
+            return False
+        if extra_count <= self.max_extra_tokens:
+            return True
+        opens_clause = all(token in FILLER_TOKENS for token in tokens[clause_start:start])
+        return opens_clause and (end >= len(tokens) or tokens[end] != "de")
+
+    @staticmethod
+    def _resolve_slots(slots: Dict[str, float]) -> Dict[str, float]:
+        """Converte slots brutos nos campos esperados pelos plugins."""
+        resolved = dict(slots)
+        if "angle_right" in resolved:
+            resolved["angle"] = -resolved.pop("angle_right")
+        return resolved
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas do roteador."""
+        return {
+            "enabled": self.enabled,
+            "rules": len(self.rules),
+            "total_queries": self.total_queries,
+            "total_matches": self.total_matches,
+            "matches_by_intent": dict(self.matches_by_intent),
+            "avg_match_time_ms": (
+                self.total_match_time_ms / self.total_queries
+                if self.total_queries > 0 else 0.0
+            ),
+            "max_match_time_ms": self.max_match_time_ms
+        }
@@ -0,0 +1,226 @@
+"""
+Análise de texto compartilhada para o sistema t031a5.
+
+Todas as tabelas de palavras-chave (emoção, gestos e sinais de áudio) são
+compiladas em um único índice na inicialização. Cada resposta é percorrida
+uma única vez e devolve as pontuações das três categorias,
+garantindo resultados consistentes entre ConversationEngine,
+AudioVisualDynamic e EmotionSpeechIntegration.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Emoções (a ordem define o desempate)
+EMOTION_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "happy": ("feliz", "alegre", "ótimo", "excelente", "maravilhoso", "perfeito", "sucesso", "bom"),
+    "excited": ("animado", "empolgado", "incrível", "fantástico", "interessante", "impressionante",
+                "wow", "uau", "nossa"),
+    "confused": ("não entendi", "confuso", "perdão"),
+    "calm": ("calmo", "tranquilo", "relaxado", "pacífico", "sereno", "suave"),
+    "thinking": ("pensando", "analisando", "considerando", "avaliando", "refletindo", "hmm",
+                 "deixe-me pensar", "não tenho certeza"),
+    "concerned": ("preocupado", "cuidado", "atenção", "problema", "erro", "alerta"),
+    "sad": ("triste", "ruim", "falha", "erro", "problema", "não funcionou", "decepcionado"),
+    "focused": ("observando", "vejo", "analisando"),
+    "surprised": ("surpresa", "surpreso", "caramba"),
+    "neutral": ("neutro", "ok", "normal", "padrão", "regular"),
+}
+
+# Pontuação também indica emoção: (emoção, peso)
+PUNCTUATION_CUES: Dict[str, Tuple[str, int]] = {
+    "!": ("excited", 2),
+    "?": ("thinking", 1),
+    "...": ("thinking", 1),
+}
+
+# Gestos baseados no conteúdo (chaves de ConversationEngine.gesture_mapping)
+GESTURE_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "greeting": ("olá", "oi", "saudações", "bem-vindo", "bem-vinda"),
+    "pointing": ("isso", "aquilo", "ali", "aqui"),
+    "explanation": ("explicar", "mostrar", "demonstrar"),
+    "thinking": ("pensar", "considerar", "analisar"),
+    "agreement": ("sim", "correto", "exato", "concordo"),
+    "disagreement": ("não", "incorreto", "discordo"),
+}
+
+# Sinais de áudio baseados no conteúdo
+AUDIO_CUE_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "success": ("sucesso", "consegui"),
+}
+
+_EMOTION = "emotion"
+_GESTURE = "gesture"
+_AUDIO = "audio"
+
+# Pontuação removida das bordas de cada token
+_TOKEN_STRIP = ".,;:!?…\"'()[]{}«»“”‘’—–/*"
+
+
+@dataclass(frozen=True)
+class TextAnalysis:
+    """Resultado da análise de um texto (imutável, pode ser cacheado)."""
+    emotion_scores: Mapping[str, int]
+    gesture_scores: Mapping[str, int]
+    audio_cue_scores: Mapping[str, int]
+
+    def best_emotion(self, allowed: Optional[Iterable[str]] = None, default: str = "neutral") -> str:
+        """
+        Retorna a emoção com maior pontuação.
+
+        Args:
+            allowed: Emoções aceitas pelo chamador (None = todas)
+            default: Emoção retornada quando nenhuma pontua
+        """
+        allowed_set = set(allowed) if allowed is not None else None
+        best, best_score = default, 0
+        for emotion, score in self.emotion_scores.items():
+            if allowed_set is not None and emotion not in allowed_set:
+                continue
+            if score > best_score:
+                best, best_score = emotion, score
+        return best
+
+    def best_gesture(self) -> Optional[str]:
+        """Retorna a categoria de gesto com maior pontuação (ou None)."""
+        best, best_score = None, 0
+        for gesture, score in self.gesture_scores.items():
+            if score > best_score:
+                best, best_score = gesture, score
+        return best
+
+    def audio_cues(self) -> List[str]:
+        """Retorna os sinais de áudio ativados pelo texto."""
+        return [cue for cue, score in self.audio_cue_scores.items() if score > 0]
+
+
+class TextAnalyzer:
+    """
+    Analisador de texto com todas as tabelas compiladas em um único índice.
+
+    Palavras isoladas são resolvidas por interseção de conjuntos sobre os
+    tokens do texto; frases com mais de uma palavra (ex.: "não entendi") usam
+    regex com prefixo literal e só são buscadas quando a primeira palavra
+    aparece no texto.
+    """
+
+    def __init__(self,
+                 emotion_keywords: Optional[Dict[str, Iterable[str]]] = None,
+                 gesture_keywords: Optional[Dict[str, Iterable[str]]] = None,
+                 audio_cue_keywords: Optional[Dict[str, Iterable[str]]] = None,
+                 punctuation_cues: Optional[Dict[str, Tuple[str, int]]] = None):
+        self.emotion_keywords = emotion_keywords or EMOTION_KEYWORDS
+        self.gesture_keywords = gesture_keywords or GESTURE_KEYWORDS
+        self.audio_cue_keywords = audio_cue_keywords or AUDIO_CUE_KEYWORDS
+        self.punctuation_cues = punctuation_cues or PUNCTUATION_CUES
+
+        # palavra-chave -> ((categoria, rótulo, peso), ...)
+        self._hits: Dict[str, Tuple[Tuple[str, str, int], ...]] = {}
+        self._words: frozenset = frozenset()
+        self._phrases: List[Tuple[str, str, re.Pattern]] = []  # (frase, primeira palavra, regex)
+        self._marks: Dict[str, str] = {}  # sinal no texto -> sinal canônico
+        self._compile()
+
+    def _compile(self):
+        """Compila todas as tabelas em um único índice."""
+        entries: Dict[str, List[Tuple[str, str, int]]] = {}
+
+        tables = (
+            (_EMOTION, self.emotion_keywords),
+            (_GESTURE, self.gesture_keywords),
+            (_AUDIO, self.audio_cue_keywords),
+        )
+        for category, table in tables:
+            for label, keywords in table.items():
+                for keyword in keywords:
+                    entries.setdefault(keyword.lower(), []).append((category, label, 1))
+
+        for mark, (emotion, weight) in self.punctuation_cues.items():
+            entries.setdefault(mark, []).append((_EMOTION, emotion, weight))
+            self._marks[mark] = mark
+        if "..." in self.punctuation_cues:
+            self._marks["…"] = "..."
+
+        self._hits = {keyword: tuple(hits) for keyword, hits in entries.items()}
+
+        words = []
+        for keyword in entries:
+            if keyword in self._marks:
+                continue
+            if " " in keyword:
+                # Sem lookbehind no início para o regex usar a busca por prefixo literal
+                pattern = re.compile(re.escape(keyword) + r"(?!\w)")
+                self._phrases.append((keyword, keyword.split(" ", 1)[0], pattern))
+            else:
+                words.append(keyword)
+        self._words = frozenset(words)
+
+        logger.debug(f"TextAnalyzer compilado: {len(self._words)} palavras, "
+                     f"{len(self._phrases)} frases, {len(self._marks)} sinais de pontuação")
+
+    def analyze(self, text: str) -> TextAnalysis:
+        """
+        Analisa o texto em uma única varredura.
+
+        Cada palavra-chave conta uma vez por texto (presença), como nas
+        implementações anteriores.
+        """
+        text_lower = text.lower()
+        tokens = {token.strip(_TOKEN_STRIP) for token in set(text_lower.split())}
+
+        matched = set(self._words.intersection(tokens))
+        for phrase, first_word, pattern in self._phrases:
+            if first_word in tokens and _find_phrase(pattern, text_lower):
+                matched.add(phrase)
+        for mark, canonical in self._marks.items():
+            if mark in text:
+                matched.add(canonical)
+
+        emotion_scores = dict.fromkeys(self.emotion_keywords, 0)
+        gesture_scores = dict.fromkeys(self.gesture_keywords, 0)
+        audio_cue_scores = dict.fromkeys(self.audio_cue_keywords, 0)
+        scores = {_EMOTION: emotion_scores, _GESTURE: gesture_scores, _AUDIO: audio_cue_scores}
+
+        for keyword in matched:
+            for category, label, weight in self._hits[keyword]:
+                table = scores[category]
+                table[label] = table.get(label, 0) + weight
+
+        return TextAnalysis(
+            emotion_scores=MappingProxyType(emotion_scores),
+            gesture_scores=MappingProxyType(gesture_scores),
+            audio_cue_scores=MappingProxyType(audio_cue_scores),
+        )
+
+
+def _find_phrase(pattern: re.Pattern, text: str) -> bool:
+    """Busca a frase em fronteira de palavra."""
+    for match in pattern.finditer(text):
+        start = match.start()
+        if start == 0 or not (text[start - 1].isalnum() or text[start - 1] == "_"):
+            return True
+    return False
+
+
+_default_analyzer: Optional[TextAnalyzer] = None
+
+
+def get_text_analyzer() -> TextAnalyzer:
+    """Retorna o analisador compartilhado (compilado uma única vez)."""
+    global _default_analyzer
+    if _default_analyzer is None:
+        _default_analyzer = TextAnalyzer()
+    return _default_analyzer
+
+
+@lru_cache(maxsize=64)
+def analyze_text(text: str) -> TextAnalysis:
+    """Analisa texto com o analisador compartilhado (resultados cacheados por texto)."""
+    return get_text_analyzer().analyze(text)
@@ -0,0 +1,313 @@
+"""
+Timeline de resposta multimodal para o sistema t031a5.
+
+Converte uma resposta planejada em eventos com horário, ancorados nas
+palavras da fala: o gesto de saudação sai junto com "olá", o som de sucesso
+junto com "consegui". Os horários vêm do alinhamento do TTS (ElevenLabs)
+quando disponível, ou de uma estimativa pela duração das palavras.
+
+Na execução, a action de fala avisa o início de cada frase e os eventos
+daquela frase são reagendados no TimerWheel a partir do início real.
+"""
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional
+
+from ..actions.base import ActionRequest, ActionResult
+from ..runtime.timer_wheel import TimerWheel
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\S+")
+_STRIP = ".,;:!?…\"'()[]{}«»“”‘’—–"
+_SENTENCE_END = (".", "!", "?", "…")
+
+
+@dataclass
+class WordTiming:
+    """Horário de uma palavra na fala (segundos desde o início)."""
+    word: str
+    char_index: int
+    start: float
+    end: float
+
+    @property
+    def normalized(self) -> str:
+        return self.word.lower().strip(_STRIP)
+
+
+@dataclass
+class PlannedAction:
+    """Ação de uma resposta antes de entrar na timeline."""
+    kind: str                                      # emotion, speech, gesture, locomotion, audio_cue, look_at
+    plugin: str
+    request: ActionRequest
+    anchored: bool = False                         # False = dispara no início da resposta
+    duration: float = 0.0
+    keywords: FrozenSet[str] = frozenset()         # palavras que ancoram a ação
+    resource: Optional[str] = None                 # recurso exclusivo (ex.: "arms")
+    relax_time: float = 0.0                        # tempo extra antes do próximo uso do recurso
+
+
+@dataclass
+class TimelineEvent:
+    """Evento com horário estimado e palavra âncora."""
+    action: PlannedAction
+    at: float                                      # segundos desde o início da fala
+    char_index: Optional[int] = None               # posição da palavra âncora no texto
+
+
+@dataclass
+class ResponseTimeline:
+    """Timeline completa de uma resposta."""
+    text: str
+    immediate: List[PlannedAction]
+    events: List[TimelineEvent]
+    words: List[WordTiming]
+    speech_duration: float
+    dropped: List[PlannedAction] = field(default_factory=list)
+
+
+def estimate_word_timings(text: str, words_per_minute: float = 160.0,
+                          comma_pause: float = 0.15, sentence_pause: float = 0.35) -> List[WordTiming]:
+    """
+    Estima o horário de cada palavra pela quantidade de letras.
+
+    Args:
+        text: Texto falado
+        words_per_minute: Velocidade média da voz
+        comma_pause: Pausa após vírgula/ponto e vírgula
+        sentence_pause: Pausa após fim de frase
+    """
+    # Palavra média em português ~5 letras
+    seconds_per_char = 60.0 / (words_per_minute * 5.0)
+    timings = []
+    cursor = 0.0
+
+    for match in _WORD.finditer(text):
+        word = match.group()
+        letters = sum(1 for char in word if char.isalnum())
+        duration = max(0.12, letters * seconds_per_char)
+        timings.append(WordTiming(word, match.start(), cursor, cursor + duration))
+        cursor += duration
+
+        if word.endswith(_SENTENCE_END):
+            cursor += sentence_pause
+        elif word.endswith((",", ";", ":")):
+            cursor += comma_pause
+
+    return timings
+
+
+def word_timings_from_alignment(text: str, alignment: Dict[str, Any]) -> List[WordTiming]:
+    """
+    Converte alinhamento por caractere do ElevenLabs em horários por palavra.
+
+    Args:
+        text: Texto enviado ao TTS
+        alignment: {"characters": [...], "character_start_times_seconds": [...],
+                    "character_end_times_seconds": [...]}
+    """
+    starts = alignment.get("character_start_times_seconds") or []
+    ends = alignment.get("character_end_times_seconds") or []
+    if len(starts) < len(text) or len(ends) < len(text):
+        logger.debug("Alinhamento incompleto, usando estimativa")
+        return estimate_word_timings(text)
+
+    return [
+        WordTiming(match.group(), match.start(), starts[match.start()], ends[match.end() - 1])
+        for match in _WORD.finditer(text)
+    ]
+
+
+class TimelineBuilder:
+    """Monta a timeline de uma resposta a partir das ações planejadas."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.words_per_minute = config.get("words_per_minute", 160.0)
+        self.anchor_lead = config.get("anchor_lead", 0.2)  # gesto começa um pouco antes da palavra
+        self.end_grace = config.get("end_grace", 0.5)       # tolerância após o fim da fala
+
+    def build(self, text: str, actions: List[PlannedAction],
+              words: Optional[List[WordTiming]] = None) -> ResponseTimeline:
+        """
+        Monta a timeline.
+
+        Ações ancoradas vão para a palavra-chave correspondente ou, sem
+        palavra-chave, para o início da próxima frase livre. Ações que
+        disputam um recurso exclusivo não se sobrepõem; as que não cabem
+        na fala são descartadas.
+        """
+        words = words if words is not None else estimate_word_timings(text, self.words_per_minute)
+        speech_duration = words[-1].end if words else 0.0
+        has_speech = any(action.kind == "speech" for action in actions)
+
+        sentence_starts = [0] + [i + 1 for i, w in enumerate(words[:-1]) if w.word.endswith(_SENTENCE_END)]
+        free_sentences = iter(sentence_starts)
+
+        immediate = [action for action in actions if not action.anchored]
+        anchored = []
+        for action in actions:
+            if not action.anchored:
+                continue
+            word_index = self._find_keyword(words, action.keywords)
+            if word_index is None:
+                word_index = next(free_sentences, None)
+            anchored.append((word_index, action))
+
+        # Ordem de aparição na fala (sem âncora vai para o início)
+        anchored.sort(key=lambda item: item[0] if item[0] is not None else -1)
+
+        events = []
+        dropped = []
+        resource_free: Dict[str, float] = {}
+        for word_index, action in anchored:
+            at = words[word_index].start - self.anchor_lead if word_index is not None and words else 0.0
+            at = max(0.0, at)
+
+            if action.resource:
+                at = max(at, resource_free.get(action.resource, 0.0))
+
+            if has_speech and at > speech_duration + self.end_grace:
+                dropped.append(action)
+                continue
+
+            if action.resource:
+                resource_free[action.resource] = at + action.duration + action.relax_time
+
+            events.append(TimelineEvent(action, at, self._char_index_at(words, at)))
+
+        if dropped:
+            logger.debug(f"Timeline: {len(dropped)} ações não couberam na fala")
+
+        return ResponseTimeline(text, immediate, events, words, speech_duration, dropped)
+
+    @staticmethod
+    def _find_keyword(words: List[WordTiming], keywords: FrozenSet[str]) -> Optional[int]:
+        if not keywords:
+            return None
+        for index, word in enumerate(words):
+            if word.normalized in keywords:
+                return index
+        return None
+
+    @staticmethod
+    def _char_index_at(words: List[WordTiming], at: float) -> Optional[int]:
+        """Posição da palavra falada no instante at."""
+        anchor = None
+        for word in words:
+            if word.start > at:
+                break
+            anchor = word.char_index
+        return anchor if anchor is not None else (words[0].char_index if words else None)
+
+
+class TimelineScheduler:
+    """Executa timelines usando um TimerWheel compartilhado."""
+
+    def __init__(self, wheel: TimerWheel, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.wheel = wheel
+        self.speech_start_timeout = config.get("speech_start_timeout", 5.0)
+
+        # Métricas
+        self.timelines_executed = 0
+        self.events_dispatched = 0
+        self.events_skipped = 0
+        self.sentence_reanchors = 0
+
+    async def run(self, timeline: ResponseTimeline,
+                  execute: Callable[[str, ActionRequest], Awaitable[ActionResult]]) -> List[Any]:
+        """
+        Executa a timeline e retorna os resultados de todas as ações disparadas.
+
+        Cancelar esta corrotina (barge-in) cancela timers pendentes e ações em curso.
+        """
+        await self.wheel.start()
+
+        tasks: List[asyncio.Task] = []
+        handles = []
+        pending = sorted(timeline.events, key=lambda event: event.at)
+        speech_started = asyncio.Event()
+        state = {"cursor": 0}
+
+        def dispatch(action: PlannedAction):
+            self.events_dispatched += 1
+            tasks.append(asyncio.ensure_future(execute(action.plugin, action.request)))
+
+        def schedule(events: List[TimelineEvent], origin_estimate: float):
+            for event in events:
+                handles.append(self.wheel.schedule(max(0.0, event.at - origin_estimate), dispatch, event.action))
+                pending.remove(event)
+
+        def on_sentence_start(index: int, sentence: str):
+            """Chamado pela action de fala quando uma frase começa a tocar."""
+            start = timeline.text.find(sentence, state["cursor"])
+            if start < 0:
+                start = state["cursor"]
+            end = start + len(sentence)
+            state["cursor"] = end
+
+            words_in_sentence = [w for w in timeline.words if start <= w.char_index < end]
+            origin = words_in_sentence[0].start if words_in_sentence else 0.0
+            due = [e for e in pending if e.char_index is not None and e.char_index < end]
+            if index > 0:
+                self.sentence_reanchors += 1
+            schedule(due, origin)
+            speech_started.set()
+
+        speech_task = None
+        try:
+            for action in timeline.immediate:
+                if action.kind == "speech":
+                    action.request.metadata["on_sentence_start"] = on_sentence_start
+                    speech_task = asyncio.ensure_future(execute(action.plugin, action.request))
+                    tasks.append(speech_task)
+                    self.events_dispatched += 1
+                else:
+                    dispatch(action)
+
+            if speech_task:
+                # Aguarda a primeira frase tocar (ou a fala terminar sem avisar)
+                started = asyncio.ensure_future(speech_started.wait())
+                await asyncio.wait([started, speech_task], timeout=self.speech_start_timeout,
+                                   return_when=asyncio.FIRST_COMPLETED)
+                started.cancel()
+
+            if not speech_started.is_set():
+                # Sem aviso da action de fala: usa os horários estimados
+                schedule(list(pending), 0.0)
+
+            if speech_task:
+                await asyncio.wait([speech_task])
+                # Eventos de frases que nunca tocaram não fazem mais sentido
+                self.events_skipped += len(pending)
+                pending.clear()
+
+            # Aguarda timers restantes e ações disparadas
+            while any(not (h.fired or h.cancelled) for h in handles):
+                await asyncio.sleep(self.wheel.tick)
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+            self.timelines_executed += 1
+            return results
+
+        finally:
+            for handle in handles:
+                self.wheel.cancel(handle)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "timelines_executed": self.timelines_executed,
+            "events_dispatched": self.events_dispatched,
+            "events_skipped": self.events_skipped,
+            "sentence_reanchors": self.sentence_reanchors,
+            "wheel": self.wheel.get_stats()
+        }
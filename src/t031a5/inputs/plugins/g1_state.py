@@ -13,13 +13,21 @@ import asyncio
 import logging
 import time
 import json
+from collections import deque
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 import math
 
+import numpy as np
+
 from ..base import BaseInput, InputData
+from ..telemetry import (
+    G1_JOINT_NAMES, JOINT_FIELDS, MOTOR_FIELDS, STATUS_ERROR, STATUS_NAMES,
+    TelemetryStore, ThresholdRule
+)
+from ...security.alert_engine import AlertEngine, AlertGroup, AlertLevel, AlertRule
 
 
 class RobotMode(Enum):
@@ -51,6 +59,15 @@ class BatteryStatus(Enum):
     CHARGING = "charging"
 
 
+# Nível de alerta correspondente a cada status de segurança
+SAFETY_ALERT_LEVELS = {
+    SafetyStatus.SAFE: AlertLevel.NORMAL,
+    SafetyStatus.WARNING: AlertLevel.WARNING,
+    SafetyStatus.DANGER: AlertLevel.CRITICAL,
+    SafetyStatus.EMERGENCY: AlertLevel.CRITICAL,
+}
+
+
 @dataclass
 class JointState:
     """Estado de uma articulação."""
@@ -137,19 +154,47 @@ class G1StateInput(BaseInput):
         self.battery_critical = config.get("battery_critical", 0.1)  # 10%
         self.joint_effort_warning = config.get("joint_effort_warning", 50.0)  # Nm
         self.joint_effort_critical = config.get("joint_effort_critical", 80.0)  # Nm
+        self.temperature_hysteresis = config.get("temperature_hysteresis", 2.0)  # °C
+        self.joint_effort_hysteresis = config.get("joint_effort_hysteresis", 5.0)  # Nm
+        self.joint_rules = (
+            ThresholdRule("temperature", self.temperature_warning, self.temperature_critical,
+                          self.temperature_hysteresis),
+            ThresholdRule("effort", self.joint_effort_warning, self.joint_effort_critical,
+                          self.joint_effort_hysteresis),
+        )
+        self.motor_rules = (
+            ThresholdRule("temperature", self.temperature_warning, self.temperature_critical),
+        )
         
         # Estado interno
         self.current_mode = RobotMode.IDLE
         self.previous_mode = RobotMode.IDLE
-        self.joints = {}
-        self.motors = {}
+        self.joint_telemetry: Optional[TelemetryStore] = None
+        self.motor_telemetry: Optional[TelemetryStore] = None
+        self.telemetry_history_size = config.get("telemetry_history_size", 1000)
         self.battery = None
         self.thermal = None
         self.safety = None
         
+        # rt/lowstate (alta taxa, agregado em janelas por ciclo)
+        self.lowstate_config = config.get("lowstate", {})
+        self.lowstate = None
+        self.lowstate_window = None
+        self._joint_alert_values = None
+        
+        # Alertas: só transições de nível, com histerese e debounce
+        self.alert_debounce = config.get("alert_debounce", 2.0)
+        self.alert_engine = AlertEngine([
+            AlertRule("battery", warning=self.battery_warning, critical=self.battery_critical, below=True,
+                      hysteresis=0.02, message="Bateria: {value:.1%}"),
+            AlertRule("thermal", warning=self.temperature_warning, critical=self.temperature_critical,
+                      hysteresis=self.temperature_hysteresis, raise_after=self.alert_debounce,
+                      clear_after=self.alert_debounce, message="Temperatura: {value:.1f}°C"),
+        ], name=self.name, max_rate=config.get("alert_max_rate", 2.0), burst=config.get("alert_burst", 10))
+        
         # Histórico e métricas
-        self.state_history = []
-        self.alert_history = []
+        self.state_history = deque(maxlen=1000)
+        self.alert_history = self.alert_engine.history
         self.uptime = 0.0
         self.last_update = datetime.now()
         
@@ -157,17 +202,8 @@ class G1StateInput(BaseInput):
         self.mock_mode = config.get("mock_mode", False)  # FORÇAR HARDWARE REAL
         self.mock_data_file = config.get("mock_data_file", None)
         
-        # Configurações de articulações (baseado no G1 real)
-        self.joint_names = [
-            "hip_yaw_left", "hip_roll_left", "hip_pitch_left",
-            "knee_pitch_left", "ankle_pitch_left", "ankle_roll_left",
-            "hip_yaw_right", "hip_roll_right", "hip_pitch_right",
-            "knee_pitch_right", "ankle_pitch_right", "ankle_roll_right",
-            "shoulder_pitch_left", "shoulder_roll_left", "shoulder_yaw_left",
-            "elbow_pitch_left", "wrist_pitch_left", "wrist_roll_left",
-            "shoulder_pitch_right", "shoulder_roll_right", "shoulder_yaw_right",
-            "elbow_pitch_right", "wrist_pitch_right", "wrist_roll_right"
-        ]
+        # Configurações de articulações (G1 29 DoF, ordem do rt/lowstate)
+        self.joint_names = list(config.get("joint_names", G1_JOINT_NAMES))
         
         # Configurações de motores
         self.motor_names = [
@@ -240,25 +276,35 @@ class G1StateInput(BaseInput):
         self.logger.info("Estado mock inicializado")
     
     async def _initialize_real_state(self):
-        """Inicializa estado real do robô."""
-        # Aqui seria a inicialização do hardware real do G1
-        # Por exemplo: conexão com controladores, sensores, etc.
-        self.logger.info("Estado real inicializado (simulado)")
+        """Inicializa estado real do robô (assinatura do rt/lowstate)."""
+        if not self.enable_joint_monitoring or not self.lowstate_config.get("enabled", True):
+            self.logger.info("rt/lowstate desabilitado, articulações simuladas")
+            return
+        
+        from ...connectors.g1_lowstate import LowStateSubscriber
+        
+        subscriber = LowStateSubscriber(self.lowstate_config, self.joint_names)
+        if await subscriber.start():
+            self.lowstate = subscriber
+            self.logger.info(f"Estado real via {subscriber.topic} ({subscriber.source})")
+        else:
+            self.logger.warning("rt/lowstate indisponível, articulações simuladas")
     
     async def _initialize_joints(self):
         """Inicializa monitoramento de articulações."""
         try:
-            for joint_name in self.joint_names:
-                self.joints[joint_name] = JointState(
-                    name=joint_name,
-                    position=0.0,
-                    velocity=0.0,
-                    effort=0.0,
-                    temperature=25.0,
-                    status="normal"
-                )
+            self.joint_telemetry = TelemetryStore(
+                self.joint_names, JOINT_FIELDS, self.telemetry_history_size, initial={"temperature": 25.0}
+            )
+            # Fase da simulação por articulação (calculada uma vez)
+            self._joint_phase = np.array([hash(name) % 100 for name in self.joint_names], dtype=np.float64)
+            self.alert_engine.add_group(AlertGroup(
+                "joint", self.joint_names, self.joint_rules, JOINT_FIELDS,
+                raise_after=self.alert_debounce, clear_after=self.alert_debounce,
+                message="Articulação {item}: {level}"
+            ))
             
-            self.logger.info(f"Monitoramento de {len(self.joints)} articulações inicializado")
+            self.logger.info(f"Monitoramento de {len(self.joint_telemetry)} articulações inicializado")
             
         except Exception as e:
             self.logger.error(f"Erro na inicialização de articulações: {e}")
@@ -266,17 +312,13 @@ class G1StateInput(BaseInput):
     async def _initialize_motors(self):
         """Inicializa monitoramento de motores."""
         try:
-            for motor_name in self.motor_names:
-                self.motors[motor_name] = MotorState(
-                    name=motor_name,
-                    current=0.0,
-                    voltage=24.0,
-                    temperature=25.0,
-                    rpm=0.0,
-                    status="normal"
-                )
+            self.motor_telemetry = TelemetryStore(
+                self.motor_names, MOTOR_FIELDS, self.telemetry_history_size,
+                initial={"voltage": 24.0, "temperature": 25.0}
+            )
+            self._motor_phase = np.array([hash(name) % 100 for name in self.motor_names], dtype=np.float64)
             
-            self.logger.info(f"Monitoramento de {len(self.motors)} motores inicializado")
+            self.logger.info(f"Monitoramento de {len(self.motor_telemetry)} motores inicializado")
             
         except Exception as e:
             self.logger.error(f"Erro na inicialização de motores: {e}")
@@ -358,7 +400,8 @@ class G1StateInput(BaseInput):
                 metadata={
                     "uptime": self.uptime,
                     "mode": self.current_mode.value,
-                    "alerts_count": len(alerts)
+                    "alerts_count": len(self.alert_engine.active()),
+                    "alert_transitions": len(alerts)
                 }
             )
             
@@ -415,10 +458,6 @@ class G1StateInput(BaseInput):
                 "temperature": self.thermal.cpu_temperature if self.thermal else 0.0
             })
             
-            # Mantém histórico limitado
-            if len(self.state_history) > 1000:
-                self.state_history.pop(0)
-            
         except Exception as e:
             self.logger.error(f"Erro na atualização de estado: {e}")
     
@@ -446,50 +485,71 @@ class G1StateInput(BaseInput):
     async def _update_joints(self):
         """Atualiza estado das articulações."""
         try:
+            if not self.joint_telemetry:
+                return
+            
+            if self.lowstate:
+                self._update_joints_from_lowstate()
+                return
+            
             current_time = time.time()
+            phase = current_time + self._joint_phase
+            
+            # Simula movimento das articulações (todas de uma vez)
+            self.joint_telemetry.update(
+                current_time,
+                position=np.sin(phase) * 0.5,
+                velocity=np.cos(phase) * 0.1,
+                effort=np.abs(np.sin(current_time * 2 + self._joint_phase)) * 30.0,
+                temperature=25.0 + np.abs(np.sin(current_time * 0.5 + self._joint_phase)) * 15.0
+            )
             
-            for joint_name, joint in self.joints.items():
-                # Simula movimento das articulações
-                base_position = math.sin(current_time + hash(joint_name) % 100) * 0.5
-                joint.position = base_position
-                joint.velocity = math.cos(current_time + hash(joint_name) % 100) * 0.1
-                joint.effort = abs(math.sin(current_time * 2 + hash(joint_name) % 100)) * 30.0
-                joint.temperature = 25.0 + abs(math.sin(current_time * 0.5 + hash(joint_name) % 100)) * 15.0
-                
-                # Atualiza status baseado em thresholds
-                if joint.temperature > self.temperature_critical:
-                    joint.status = "error"
-                elif joint.temperature > self.temperature_warning:
-                    joint.status = "warning"
-                elif joint.effort > self.joint_effort_critical:
-                    joint.status = "error"
-                elif joint.effort > self.joint_effort_warning:
-                    joint.status = "warning"
-                else:
-                    joint.status = "normal"
+            # Status pelo threshold mais severo (temperatura ou esforço)
+            self.joint_telemetry.evaluate(self.joint_rules)
+            self._joint_alert_values = self.joint_telemetry.values
             
         except Exception as e:
             self.logger.error(f"Erro na atualização de articulações: {e}")
     
+    def _update_joints_from_lowstate(self):
+        """Consome a janela agregada do rt/lowstate desde o último ciclo."""
+        window = self.lowstate.drain_window()
+        if window is None:
+            if self.lowstate_window is not None:
+                self.logger.warning("rt/lowstate sem amostras no último ciclo")
+            self.lowstate_window = None
+            return
+        
+        self.lowstate_window = window
+        self.joint_telemetry.update(window.ended_at, values=window.mean)
+        
+        # Thresholds sobre os picos da janela (a média esconderia um pico de torque)
+        peak = window.max.copy()
+        effort = JOINT_FIELDS.index("effort")
+        peak[effort] = np.maximum(np.abs(window.min[effort]), np.abs(window.max[effort]))
+        self.joint_telemetry.evaluate(self.joint_rules, values=peak)
+        self._joint_alert_values = peak
+    
     async def _update_motors(self):
         """Atualiza estado dos motores."""
         try:
+            if not self.motor_telemetry:
+                return
+            
             current_time = time.time()
+            phase = self._motor_phase
+            
+            # Simula estado dos motores
+            self.motor_telemetry.update(
+                current_time,
+                current=2.0 + np.abs(np.sin(current_time + phase)) * 3.0,
+                voltage=24.0 + np.sin(current_time * 0.1 + phase) * 2.0,
+                temperature=30.0 + np.abs(np.sin(current_time * 0.3 + phase)) * 20.0,
+                rpm=np.abs(np.sin(current_time * 2 + phase)) * 100.0
+            )
             
-            for motor_name, motor in self.motors.items():
-                # Simula estado dos motores
-                motor.current = 2.0 + abs(math.sin(current_time + hash(motor_name) % 100)) * 3.0
-                motor.voltage = 24.0 + (math.sin(current_time * 0.1 + hash(motor_name) % 100)) * 2.0
-                motor.temperature = 30.0 + abs(math.sin(current_time * 0.3 + hash(motor_name) % 100)) * 20.0
-                motor.rpm = abs(math.sin(current_time * 2 + hash(motor_name) % 100)) * 100.0
-                
-                # Atualiza status baseado em temperatura
-                if motor.temperature > self.temperature_critical:
-                    motor.status = "error"
-                elif motor.temperature > self.temperature_warning:
-                    motor.status = "warning"
-                else:
-                    motor.status = "normal"
+            # Atualiza status baseado em temperatura
+            self.motor_telemetry.evaluate(self.motor_rules)
             
         except Exception as e:
             self.logger.error(f"Erro na atualização de motores: {e}")
@@ -609,17 +669,20 @@ class G1StateInput(BaseInput):
             self.logger.error(f"Erro no cálculo de métricas: {e}")
     
     async def _check_alerts(self) -> List[Dict[str, Any]]:
-        """Verifica alertas do sistema."""
-        alerts = []
+        """
+        Verifica alertas do sistema.
+        
+        Returns:
+            Apenas as transições de nível deste ciclo (alertas novos ou resolvidos)
+        """
+        transitions = []
         
         try:
+            now = time.time()
+            
             # Verifica bateria
-            if self.battery and self.battery.status in [BatteryStatus.LOW, BatteryStatus.CRITICAL]:
-                alerts.append({
-                    "type": "battery",
-                    "level": "warning" if self.battery.status == BatteryStatus.LOW else "critical",
-                    "message": f"Bateria {self.battery.status.value}: {self.battery.level:.1%}"
-                })
+            if self.battery:
+                transitions.append(self.alert_engine.evaluate("battery", self.battery.level, now))
             
             # Verifica temperatura
             if self.thermal:
@@ -628,58 +691,23 @@ class G1StateInput(BaseInput):
                     self.thermal.motor_temperature,
                     self.thermal.battery_temperature
                 )
-                
-                if max_temp > self.temperature_critical:
-                    alerts.append({
-                        "type": "thermal",
-                        "level": "critical",
-                        "message": f"Temperatura crítica: {max_temp:.1f}°C"
-                    })
-                elif max_temp > self.temperature_warning:
-                    alerts.append({
-                        "type": "thermal",
-                        "level": "warning",
-                        "message": f"Temperatura alta: {max_temp:.1f}°C"
-                    })
+                transitions.append(self.alert_engine.evaluate("thermal", max_temp, now))
             
             # Verifica segurança
-            if self.safety and self.safety.status != SafetyStatus.SAFE:
-                alerts.append({
-                    "type": "safety",
-                    "level": self.safety.status.value,
-                    "message": f"Status de segurança: {self.safety.status.value}"
-                })
-            
-            # Verifica articulações
-            for joint_name, joint in self.joints.items():
-                if joint.status == "error":
-                    alerts.append({
-                        "type": "joint",
-                        "level": "critical",
-                        "message": f"Articulação {joint_name} em erro"
-                    })
-                elif joint.status == "warning":
-                    alerts.append({
-                        "type": "joint",
-                        "level": "warning",
-                        "message": f"Articulação {joint_name} com aviso"
-                    })
-            
-            # Adiciona alertas ao histórico
-            for alert in alerts:
-                self.alert_history.append({
-                    "timestamp": datetime.now(),
-                    **alert
-                })
-            
-            # Mantém histórico limitado
-            if len(self.alert_history) > 100:
-                self.alert_history.pop(0)
+            if self.safety:
+                transitions.append(self.alert_engine.set_level(
+                    "safety", SAFETY_ALERT_LEVELS[self.safety.status],
+                    f"Status de segurança: {self.safety.status.value}", now
+                ))
+            
+            # Verifica articulações (todas de uma vez, com histerese)
+            if self._joint_alert_values is not None:
+                transitions.extend(self.alert_engine.evaluate_group("joint", self._joint_alert_values, now))
             
         except Exception as e:
             self.logger.error(f"Erro na verificação de alertas: {e}")
         
-        return alerts
+        return [transition.to_dict() for transition in transitions if transition]
     
     def _prepare_state_data(self) -> Dict[str, Any]:
         """Prepara dados de estado para saída."""
@@ -689,31 +717,20 @@ class G1StateInput(BaseInput):
             "timestamp": datetime.now().isoformat()
         }
         
+        # Alertas ativos (o histórico de transições fica em alert_history)
+        active_alerts = self.alert_engine.active()
+        if active_alerts:
+            state_data["alerts"] = active_alerts
+        
         # Adiciona dados de articulações
-        if self.enable_joint_monitoring:
-            state_data["joints"] = {
-                name: {
-                    "position": joint.position,
-                    "velocity": joint.velocity,
-                    "effort": joint.effort,
-                    "temperature": joint.temperature,
-                    "status": joint.status
-                }
-                for name, joint in self.joints.items()
-            }
+        if self.enable_joint_monitoring and self.joint_telemetry:
+            state_data["joints"] = self.joint_telemetry.snapshot().to_dict()
+            if self.lowstate_window is not None:
+                state_data["joints_window"] = self.lowstate_window.summary()
         
         # Adiciona dados de motores
-        if self.enable_motor_monitoring:
-            state_data["motors"] = {
-                name: {
-                    "current": motor.current,
-                    "voltage": motor.voltage,
-                    "temperature": motor.temperature,
-                    "rpm": motor.rpm,
-                    "status": motor.status
-                }
-                for name, motor in self.motors.items()
-            }
+        if self.enable_motor_monitoring and self.motor_telemetry:
+            state_data["motors"] = self.motor_telemetry.snapshot().to_dict()
         
         # Adiciona dados de bateria
         if self.enable_battery_monitoring and self.battery:
@@ -749,6 +766,24 @@ class G1StateInput(BaseInput):
         
         return state_data
     
+    def get_joint_state(self, name: str) -> Optional[JointState]:
+        """Estado de uma articulação, montado sob demanda a partir da telemetria."""
+        if not self.joint_telemetry or name not in self.joint_telemetry.index:
+            return None
+        index = self.joint_telemetry.index[name]
+        position, velocity, effort, temperature = self.joint_telemetry.values[:, index].tolist()
+        status = STATUS_NAMES[self.joint_telemetry.status[index]]
+        return JointState(name, position, velocity, effort, temperature, status)
+    
+    def get_motor_state(self, name: str) -> Optional[MotorState]:
+        """Estado de um motor, montado sob demanda a partir da telemetria."""
+        if not self.motor_telemetry or name not in self.motor_telemetry.index:
+            return None
+        index = self.motor_telemetry.index[name]
+        current, voltage, temperature, rpm = self.motor_telemetry.values[:, index].tolist()
+        status = STATUS_NAMES[self.motor_telemetry.status[index]]
+        return MotorState(name, current, voltage, temperature, rpm, status)
+    
     def _calculate_confidence(self) -> float:
         """Calcula confiança baseada na qualidade dos dados."""
         confidence = 0.8  # Confiança base
@@ -763,8 +798,8 @@ class G1StateInput(BaseInput):
         if self.thermal and self.thermal.cooling_status == "passive":
             confidence += 0.05
         
-        # Reduz confiança se há muitos alertas
-        if len(self.alert_history) > 10:
+        # Reduz confiança se há alertas ativos
+        if self.alert_engine.active():
             confidence -= 0.1
         
         return min(confidence, 1.0)
@@ -774,6 +809,9 @@ class G1StateInput(BaseInput):
         try:
             self.logger.info("Parando G1State...")
             
+            if self.lowstate:
+                await self.lowstate.stop()
+            
             # Salva estado final
             await self._save_state()
             
@@ -797,12 +835,15 @@ class G1StateInput(BaseInput):
         status.update({
             "robot_mode": self.current_mode.value,
             "uptime": self.uptime,
-            "joints_count": len(self.joints),
-            "motors_count": len(self.motors),
+            "joints_count": len(self.joint_telemetry) if self.joint_telemetry else 0,
+            "motors_count": len(self.motor_telemetry) if self.motor_telemetry else 0,
+            "joint_telemetry": self.joint_telemetry.get_stats() if self.joint_telemetry else None,
+            "lowstate": self.lowstate.get_status() if self.lowstate else None,
             "battery_level": self.battery.level if self.battery else 0.0,
             "battery_status": self.battery.status.value if self.battery else "unknown",
             "safety_status": self.safety.status.value if self.safety else "unknown",
-            "alerts_count": len(self.alert_history),
+            "alerts_count": len(self.alert_engine.active()),
+            "alerts": self.alert_engine.get_stats(),
             "mock_mode": self.mock_mode
         })
         
@@ -825,12 +866,12 @@ class G1StateInput(BaseInput):
             issues.append(f"Status de segurança: {self.safety.status.value}")
         
         # Verifica articulações com erro
-        error_joints = [name for name, joint in self.joints.items() if joint.status == "error"]
+        error_joints = self.joint_telemetry.snapshot().names_with_status(STATUS_ERROR) if self.joint_telemetry else []
         if error_joints:
             issues.append(f"Articulações com erro: {', '.join(error_joints)}")
         
         # Verifica motores com erro
-        error_motors = [name for name, motor in self.motors.items() if motor.status == "error"]
+        error_motors = self.motor_telemetry.snapshot().names_with_status(STATUS_ERROR) if self.motor_telemetry else []
         if error_motors:
             issues.append(f"Motores com erro: {', '.join(error_motors)}")
         
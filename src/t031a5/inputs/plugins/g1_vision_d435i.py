@@ -38,6 +38,7 @@ except ImportError:
     logging.warning("face_recognition não disponível. Reconhecimento facial em modo mock.")
 
 from ..base import BaseInput, InputData
+from ...security.proximity import DepthRegion
 
 
 @dataclass
@@ -85,6 +86,8 @@ class G1VisionInput(BaseInput):
         self.enable_object_detection = config.get("enable_object_detection", True)
         self.enable_depth = config.get("enable_depth", True)
         self.depth_range = config.get("depth_range", [0.1, 10.0])  # metros
+        # Estatísticas sobre a imagem decimada, em buffer reutilizado entre frames
+        self._depth_region = DepthRegion("frame", stride=config.get("depth_stats_stride", 2))
         
         # Estado interno
         self.pipeline = None
@@ -163,7 +166,7 @@ class G1VisionInput(BaseInput):
                 self.logger.warning("VisionCaptureConnector não inicializado")
                 return None
             
-            # Capturar frame com método testado
+            # Último frame da thread de captura (ou captura direta, se ela não estiver rodando)
             frame_data = await self.vision_capture.capture_frame_realsense()
             
             if not frame_data:
@@ -328,20 +331,22 @@ class G1VisionInput(BaseInput):
         return faces
     
     def _calculate_depth_stats(self, depth_image: np.ndarray) -> Dict[str, float]:
-        """Calcula estatísticas da imagem de profundidade."""
+        """Calcula estatísticas da imagem de profundidade (decimada, sem cópia por frame)."""
         try:
-            # Remove zeros (pixels inválidos)
-            valid_depths = depth_image[depth_image > 0] * 0.001  # mm para metros
+            # Zeros (pixels inválidos) ficam fora das estatísticas
+            region = self._depth_region
+            valid = region.sample(depth_image)
             
-            if len(valid_depths) == 0:
+            if valid == 0:
                 return {}
             
+            min_raw, median_raw, max_raw = region.quantiles(valid, (0.0, 0.5, 1.0)).tolist()
             return {
-                "min_distance": float(np.min(valid_depths)),
-                "max_distance": float(np.max(valid_depths)),
-                "mean_distance": float(np.mean(valid_depths)),
-                "median_distance": float(np.median(valid_depths)),
-                "valid_pixels_percentage": float(len(valid_depths) / depth_image.size * 100)
+                "min_distance": min_raw * 0.001,  # mm para metros
+                "max_distance": max_raw * 0.001,
+                "mean_distance": region.valid_sum(valid) / valid * 0.001,
+                "median_distance": median_raw * 0.001,
+                "valid_pixels_percentage": valid / region.size * 100
             }
             
         except Exception as e:
@@ -438,6 +443,9 @@ class G1VisionInput(BaseInput):
             True se o início foi bem-sucedido
         """
         try:
+            # Profundidade na taxa da câmera, independente de quando _get_data é chamado
+            if self.vision_capture and not self.mock_mode:
+                self.vision_capture.start_capture_loop()
             self.logger.info("G1Vision iniciado")
             return True
             
@@ -453,6 +461,8 @@ class G1VisionInput(BaseInput):
             True se a parada foi bem-sucedida
         """
         try:
+            if self.vision_capture:
+                await asyncio.to_thread(self.vision_capture.stop_capture_loop)
             if self.pipeline and not self.mock_mode:
                 self.pipeline.stop()
                 self.pipeline = None
@@ -0,0 +1,190 @@
+"""
+Telemetria de articulações e motores em estrutura de arrays (NumPy).
+
+Cada grandeza (posição, velocidade, esforço, temperatura...) é uma linha de
+uma matriz pré-alocada ``(campos, articulações)``; uma atualização é uma
+cópia de arrays, os thresholds são avaliados de uma vez para todas as
+articulações e o histórico é um buffer circular de tamanho fixo. Dimensionado
+para as 29+ articulações do G1 a 500 Hz sem alocação por amostra.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Articulações do G1 (29 DoF) na ordem de ``motor_state`` do rt/lowstate
+G1_JOINT_NAMES = (
+    "left_hip_pitch", "left_hip_roll", "left_hip_yaw", "left_knee",
+    "left_ankle_pitch", "left_ankle_roll",
+    "right_hip_pitch", "right_hip_roll", "right_hip_yaw", "right_knee",
+    "right_ankle_pitch", "right_ankle_roll",
+    "waist_yaw", "waist_roll", "waist_pitch",
+    "left_shoulder_pitch", "left_shoulder_roll", "left_shoulder_yaw", "left_elbow",
+    "left_wrist_roll", "left_wrist_pitch", "left_wrist_yaw",
+    "right_shoulder_pitch", "right_shoulder_roll", "right_shoulder_yaw", "right_elbow",
+    "right_wrist_roll", "right_wrist_pitch", "right_wrist_yaw",
+)
+
+JOINT_FIELDS = ("position", "velocity", "effort", "temperature")
+MOTOR_FIELDS = ("current", "voltage", "temperature", "rpm")
+
+# Códigos de status (int8), em ordem de severidade
+STATUS_NORMAL = 0
+STATUS_WARNING = 1
+STATUS_ERROR = 2
+STATUS_NAMES = ("normal", "warning", "error")
+
+
+@dataclass(frozen=True)
+class ThresholdRule:
+    """Limite de um campo: acima de ``warning`` é aviso, acima de ``critical`` é erro."""
+    field: str
+    warning: float
+    critical: float
+    hysteresis: float = 0.0  # usada pelos alertas (AlertGroup) para voltar ao nível inferior
+
+
+@dataclass(frozen=True)
+class TelemetrySnapshot:
+    """Cópia imutável do estado atual (uma cópia de array, sem objetos por articulação)."""
+    timestamp: float
+    names: Tuple[str, ...]
+    fields: Tuple[str, ...]
+    values: np.ndarray   # (campos, nomes), somente leitura
+    status: np.ndarray   # (nomes,), somente leitura
+
+    def field(self, name: str) -> np.ndarray:
+        return self.values[self.fields.index(name)]
+
+    def count(self, level: int) -> int:
+        return int(np.count_nonzero(self.status == level))
+
+    def names_with_status(self, level: int) -> List[str]:
+        return [self.names[i] for i in np.flatnonzero(self.status == level)]
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Formato por nome usado em ``_prepare_state_data``."""
+        rows = self.values.T.tolist()
+        return {
+            name: {**dict(zip(self.fields, row)), "status": STATUS_NAMES[code]}
+            for name, row, code in zip(self.names, rows, self.status.tolist())
+        }
+
+
+class TelemetryStore:
+    """
+    Armazena um conjunto de grandezas por articulação/motor.
+
+    ``values`` é a matriz corrente ``(campos, nomes)``; ``update`` grava
+    nela e no buffer circular, ``evaluate`` classifica todos os nomes com
+    operações vetorizadas. Não é thread-safe: quem escreve de outra thread
+    deve publicar snapshots (ver ``snapshot``).
+    """
+
+    def __init__(self, names: Sequence[str], fields: Sequence[str], history_size: int = 1000,
+                 initial: Optional[Dict[str, float]] = None):
+        self.names = tuple(names)
+        self.fields = tuple(fields)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self._field_index = {field: i for i, field in enumerate(self.fields)}
+
+        self.values = np.zeros((len(self.fields), len(self.names)), dtype=np.float64)
+        for field, value in (initial or {}).items():
+            self.values[self._field_index[field]] = value
+        self.status = np.zeros(len(self.names), dtype=np.int8)
+        self.timestamp = 0.0
+
+        # Histórico circular pré-alocado
+        self.history_size = history_size
+        self._history = np.zeros((history_size, len(self.fields), len(self.names)), dtype=np.float32)
+        self._history_time = np.zeros(history_size, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+
+        # Métricas
+        self.updates = 0
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def field(self, name: str) -> np.ndarray:
+        """View (sem cópia) da linha de um campo."""
+        return self.values[self._field_index[name]]
+
+    def update(self, timestamp: Optional[float] = None, values: Optional[np.ndarray] = None,
+               **fields: Iterable[float]):
+        """
+        Grava uma amostra.
+
+        Args:
+            timestamp: Instante (time.time()); padrão agora
+            values: Matriz completa ``(campos, nomes)``
+            **fields: Ou campos avulsos, ex. ``position=array``
+        """
+        if values is not None:
+            self.values[...] = values
+        for field, row in fields.items():
+            self.values[self._field_index[field]] = row
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+        self._history[self._head] = self.values
+        self._history_time[self._head] = self.timestamp
+        self._head = (self._head + 1) % self.history_size
+        self._count = min(self._count + 1, self.history_size)
+        self.updates += 1
+
+    def evaluate(self, rules: Sequence[ThresholdRule], values: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Status de cada nome pela regra mais severa violada.
+
+        Args:
+            rules: Limites por campo
+            values: Matriz a classificar (ex.: máximos de uma janela); padrão ``values``
+        """
+        values = self.values if values is None else values
+        status = np.zeros(len(self.names), dtype=np.int8)
+        for rule in rules:
+            row = values[self._field_index[rule.field]]
+            np.maximum(status, np.where(row > rule.critical, STATUS_ERROR,
+                                        np.where(row > rule.warning, STATUS_WARNING, STATUS_NORMAL)),
+                       out=status, casting="unsafe")
+        self.status = status
+        return status
+
+    def snapshot(self) -> TelemetrySnapshot:
+        values = self.values.copy()
+        status = self.status.copy()
+        values.flags.writeable = False
+        status.flags.writeable = False
+        return TelemetrySnapshot(self.timestamp, self.names, self.fields, values, status)
+
+    def history(self, last: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Amostras mais recentes em ordem cronológica.
+
+        Returns:
+            (timestamps, valores ``(amostras, campos, nomes)``); cópia só
+            quando o intervalo pedido dá a volta no buffer
+        """
+        count = self._count if last is None else min(last, self._count)
+        start = (self._head - count) % self.history_size
+        if start + count <= self.history_size:
+            return self._history_time[start:start + count], self._history[start:start + count]
+        order = (np.arange(count) + start) % self.history_size
+        return self._history_time[order], self._history[order]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "names": len(self.names),
+            "fields": list(self.fields),
+            "updates": self.updates,
+            "history_samples": self._count,
+            "history_size": self.history_size,
+            "warnings": int(np.count_nonzero(self.status == STATUS_WARNING)),
+            "errors": int(np.count_nonzero(self.status == STATUS_ERROR))
+        }
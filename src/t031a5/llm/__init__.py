@@ -6,8 +6,18 @@ Integração com diferentes provedores de LLM para processamento de linguagem na
 
 from .provider import LLMProvider
 from .providers.mock_provider import MockLLMProvider
+from .structured_output import (
+    StreamingActionParser,
+    build_action_schema,
+    normalize_action,
+    parse_actions,
+)
 
 __all__ = [
     "LLMProvider",
     "MockLLMProvider",
+    "StreamingActionParser",
+    "build_action_schema",
+    "normalize_action",
+    "parse_actions",
 ]
@@ -7,11 +7,13 @@ Gerencia diferentes provedores de LLM e fornece interface unificada.
 import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
 from ..fuser.base import FusedData
+from ..logging.tracing import get_tracer
+from .structured_output import schema_instructions
 
 logger = logging.getLogger(__name__)
 
@@ -189,6 +191,59 @@ class BaseLLMProvider(ABC):
         """
         pass
     
+    async def stream(self, fused_data: FusedData, system_prompt: str,
+                     response_schema: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """
+        Processa dados fundidos entregando o texto em pedaços.
+        
+        Args:
+            fused_data: Dados fundidos dos inputs
+            system_prompt: Prompt do sistema
+            response_schema: Schema JSON da saída estruturada (opcional)
+            
+        Yields:
+            Pedaços do texto gerado
+        """
+        if not self.is_initialized or not self.enabled:
+            logger.debug(f"{self.name} indisponível para streaming")
+            return
+        
+        metadata = {}
+        if response_schema:
+            # Instruções no prompt valem para todo provedor; os que suportam
+            # schema nativo também recebem o schema via metadata
+            system_prompt = f"{system_prompt}\n\n{schema_instructions(response_schema)}"
+            metadata["response_schema"] = response_schema
+        
+        request = LLMRequest(
+            fused_data=fused_data,
+            system_prompt=system_prompt,
+            model=self.model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            timeout=self.timeout,
+            metadata=metadata
+        )
+        
+        try:
+            async for chunk in self._stream(request):
+                if chunk:
+                    yield chunk
+        except asyncio.TimeoutError:
+            logger.error(f"Timeout no streaming com {self.name}")
+        except Exception as e:
+            logger.error(f"Erro no streaming com {self.name}: {e}")
+    
+    async def _stream(self, request: LLMRequest) -> AsyncIterator[str]:
+        """
+        Streaming específico do provedor.
+        
+        Padrão para provedores sem streaming: a resposta inteira em um pedaço.
+        """
+        response = await self._process(request)
+        if response and response.content:
+            yield response.content
+    
     async def stop(self) -> bool:
         """
         Para o provedor.
@@ -438,6 +493,39 @@ class LLMProvider:
             logger.error(f"Erro no processamento LLM: {e}")
             return None
     
+    async def stream(self, fused_data: FusedData, system_prompt: str,
+                     response_schema: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """
+        Processa dados fundidos com streaming.
+        
+        Se o provedor principal não entregar nada, recorre ao ``process``
+        (com fallback) e entrega a resposta inteira.
+        
+        Marca ``llm.first_token`` no tracing ao receber o primeiro pedaço
+        (ConversationEngine e saída estruturada do cortex).
+        
+        Yields:
+            Pedaços do texto gerado
+        """
+        if not self.provider:
+            logger.error("LLM Provider não foi inicializado")
+            return
+        
+        received = False
+        async for chunk in self.provider.stream(fused_data, system_prompt, response_schema):
+            if not received:
+                get_tracer().mark("llm.first_token", provider=self.provider_type)
+            received = True
+            yield chunk
+        
+        if not received:
+            logger.info("Streaming sem resposta, usando processamento completo")
+            if response_schema:
+                system_prompt = f"{system_prompt}\n\n{schema_instructions(response_schema)}"
+            response = await self.process(fused_data, system_prompt)
+            if response and response.content:
+                yield response.content
+    
     async def stop(self) -> bool:
         """
         Para o LLM Provider.
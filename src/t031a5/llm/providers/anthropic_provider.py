@@ -7,7 +7,7 @@ Integração com Claude via Anthropic API.
 import asyncio
 import logging
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from datetime import datetime
 
 from ..provider import LLMRequest, LLMResponse, BaseLLMProvider
@@ -266,6 +266,35 @@ class AnthropicProvider(BaseLLMProvider):
             logger.error(f"Erro na requisição Anthropic: {e}")
             return None
     
+    async def _stream(self, request: LLMRequest) -> AsyncIterator[str]:
+        """
+        Streaming via Messages API.
+        
+        O formato estruturado vem das instruções do schema no prompt.
+        """
+        if not await self._check_rate_limit():
+            logger.warning("Rate limit atingido, aguardando...")
+            await asyncio.sleep(60)
+        
+        params = {
+            "model": self.model,
+            "messages": self._prepare_messages(request),
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "stream": True
+        }
+        
+        logger.debug(f"Streaming Anthropic: {self.model}")
+        stream = await asyncio.wait_for(
+            self.client.messages.create(**params),
+            timeout=self.timeout
+        )
+        self._update_metrics()
+        
+        async for event in stream:
+            if event.type == "content_block_delta" and getattr(event.delta, "type", None) == "text_delta":
+                yield event.delta.text
+    
     def _prepare_messages(self, request: LLMRequest) -> List[Dict[str, Any]]:
         """
         Prepara as mensagens para a API Anthropic.
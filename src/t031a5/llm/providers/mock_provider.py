@@ -5,11 +5,13 @@ Usado para testes e desenvolvimento quando provedores reais não estão disponí
 """
 
 import asyncio
+import json
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 from datetime import datetime
 
 from ..provider import BaseLLMProvider, LLMRequest, LLMResponse
+from ..structured_output import schema_action_names
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +32,8 @@ class MockLLMProvider(BaseLLMProvider):
         self.response_delay = config.get("response_delay", 0.1)
         self.response_template = config.get("response_template", "Olá! Sou o G1 e estou funcionando corretamente.")
         self.error_rate = config.get("error_rate", 0.0)  # 0.0 = sem erros
+        self.stream_chunk_size = config.get("stream_chunk_size", 8)  # caracteres por pedaço
+        self.stream_chunk_delay = config.get("stream_chunk_delay", 0.01)
         
         logger.debug(f"MockLLMProvider configurado com delay: {self.response_delay}s")
     
@@ -93,6 +97,36 @@ class MockLLMProvider(BaseLLMProvider):
             logger.error(f"Erro no processamento do MockLLMProvider: {e}")
             return None
     
+    async def _stream(self, request: LLMRequest) -> AsyncIterator[str]:
+        """
+        Streaming simulado em pedaços de ``stream_chunk_size`` caracteres.
+        
+        Com ``response_schema``, gera o JSON de actions usando as actions do schema.
+        """
+        await asyncio.sleep(self.response_delay)
+        
+        text = self._generate_response(request)
+        schema = request.metadata.get("response_schema")
+        if schema:
+            text = json.dumps({"actions": self._generate_actions(text, schema_action_names(schema))},
+                              ensure_ascii=False)
+        
+        for start in range(0, len(text), self.stream_chunk_size):
+            yield text[start:start + self.stream_chunk_size]
+            if self.stream_chunk_delay:
+                await asyncio.sleep(self.stream_chunk_delay)
+    
+    def _generate_actions(self, text: str, action_names: list) -> list:
+        """Actions de exemplo: fala, gesto de saudação e emoção feliz."""
+        actions = []
+        if "speak" in action_names:
+            actions.append({"action": "speak", "args": {"text": text}})
+        if "gesture" in action_names:
+            actions.append({"action": "gesture", "args": {"pattern": "greeting"}})
+        if "emotion" in action_names:
+            actions.append({"action": "emotion", "args": {"emotion": "happy"}})
+        return actions
+    
     def _generate_response(self, request: LLMRequest) -> str:
         """
         Gera uma resposta baseada nos dados fundidos.
@@ -5,9 +5,10 @@ Integração com servidor Ollama local para modelos LLM.
 """
 
 import asyncio
+import json
 import logging
 import httpx
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 from datetime import datetime
 
 from ..provider import BaseLLMProvider, LLMRequest, LLMResponse
@@ -146,6 +147,43 @@ class OllamaProvider(BaseLLMProvider):
             logger.error(f"Erro no processamento do OllamaProvider: {e}")
             return None
     
+    async def _stream(self, request: LLMRequest) -> AsyncIterator[str]:
+        """
+        Streaming via /api/generate (NDJSON).
+        
+        Com ``response_schema`` no metadata, o schema vai no campo ``format``
+        e o Ollama restringe a geração a JSON válido.
+        """
+        if not self.client:
+            logger.error("OllamaProvider não foi inicializado")
+            return
+        
+        payload = {
+            "model": self.model,
+            "prompt": self._prepare_prompt(request),
+            "stream": True,
+            "options": {
+                "temperature": request.temperature,
+                "num_predict": request.max_tokens
+            }
+        }
+        schema = request.metadata.get("response_schema")
+        if schema:
+            payload["format"] = schema
+        
+        async with self.client.stream("POST", "/api/generate", json=payload) as response:
+            if response.status_code != 200:
+                logger.error(f"Erro no streaming Ollama: HTTP {response.status_code}")
+                return
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                if data.get("response"):
+                    yield data["response"]
+                if data.get("done"):
+                    break
+    
     def _prepare_prompt(self, request: LLMRequest) -> str:
         """
         Prepara o prompt para o Ollama.
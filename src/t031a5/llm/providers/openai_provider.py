@@ -7,7 +7,7 @@ Integração com GPT-4o e GPT-4o-mini via OpenAI API.
 import asyncio
 import logging
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -277,6 +277,46 @@ class OpenAIProvider(BaseLLMProvider):
             logger.error(f"Erro na requisição OpenAI: {e}")
             return None
     
+    async def _stream(self, request: LLMRequest) -> AsyncIterator[str]:
+        """
+        Streaming via Chat Completions.
+        
+        Com ``response_schema`` no metadata, pede saída JSON validada pelo
+        schema (``response_format`` json_schema).
+        """
+        if not await self._check_rate_limit():
+            logger.warning("Rate limit atingido, aguardando...")
+            await asyncio.sleep(60)
+        
+        params = {
+            "model": self.model,
+            "messages": self._prepare_messages(request),
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "stream": True
+        }
+        
+        schema = request.metadata.get("response_schema")
+        if schema:
+            params["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "robot_actions", "schema": schema}
+            }
+        
+        logger.debug(f"Streaming OpenAI: {self.model}")
+        stream = await asyncio.wait_for(
+            self.client.chat.completions.create(**params),
+            timeout=self.timeout
+        )
+        self._update_metrics()
+        
+        async for event in stream:
+            if not event.choices:
+                continue
+            content = event.choices[0].delta.content
+            if content:
+                yield content
+    
     def _prepare_messages(self, request: LLMRequest) -> List[Dict[str, Any]]:
         """
         Prepara as mensagens para a API OpenAI.
@@ -0,0 +1,297 @@
+"""
+Saída estruturada do LLM para o sistema t031a5.
+
+Gera o schema JSON das actions a partir dos plugins registrados e da
+``G1MovementLibrary`` e faz o parse incremental da resposta: cada action
+do array ``actions`` é entregue assim que o seu objeto fecha, sem esperar
+o fim do stream.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMOTIONS = ["neutral", "happy", "sad", "excited", "calm", "thinking", "surprised", "angry"]
+MOVE_TYPES = ["walk", "turn", "stop", "posture"]
+MOVE_DIRECTIONS = ["forward", "backward", "left", "right"]
+POSTURES = ["standing", "sitting", "kneeling", "crouching"]
+AUDIO_ACTIONS = ["play", "pause", "stop", "volume", "sound"]
+
+
+def _arguments_schema(connector: str, emotions: List[str], library) -> Optional[Dict[str, Any]]:
+    """Schema dos argumentos aceitos pelo parser de cada connector."""
+    if connector == "g1_speech":
+        return {
+            "type": "object",
+            "properties": {"text": {"type": "string", "description": "Fala em português"}},
+            "required": ["text"]
+        }
+
+    if connector == "g1_emotion":
+        return {
+            "type": "object",
+            "properties": {"emotion": {"type": "string", "enum": emotions}},
+            "required": ["emotion"]
+        }
+
+    if connector == "g1_arms":
+        gestures = sorted(
+            movement.name for movement_id, movement in library.get_all_arm_movements().items()
+            if library.is_available(movement_id) and not movement.is_relax
+        )
+        return {
+            "type": "object",
+            "properties": {
+                "pattern": {"type": "string", "enum": sorted(library.MOVEMENT_PATTERNS)},
+                "sequence": {"type": "array", "items": {"type": "string", "enum": gestures}, "maxItems": 4}
+            },
+            "description": "Use 'pattern' para sequências prontas ou 'sequence' com até 4 gestos"
+        }
+
+    if connector == "g1_movement":
+        return {
+            "type": "object",
+            "properties": {
+                "type": {"type": "string", "enum": MOVE_TYPES},
+                "direction": {"type": "string", "enum": MOVE_DIRECTIONS},
+                "distance": {"type": "number", "minimum": 0, "maximum": 2.0},
+                "angle": {"type": "number", "minimum": -180, "maximum": 180},
+                "posture": {"type": "string", "enum": POSTURES}
+            },
+            "required": ["type"]
+        }
+
+    if connector == "g1_audio":
+        return {
+            "type": "object",
+            "properties": {
+                "action": {"type": "string", "enum": AUDIO_ACTIONS},
+                "sound": {"type": "string"},
+                "volume": {"type": "number", "minimum": 0, "maximum": 1}
+            },
+            "required": ["action"]
+        }
+
+    return None
+
+
+def build_action_schema(action_connectors: Dict[str, str], emotions: Optional[Iterable[str]] = None,
+                        library=None) -> Dict[str, Any]:
+    """
+    Gera o schema JSON da resposta estruturada.
+
+    Args:
+        action_connectors: Nome da action registrada → connector (ex.: {"gesture": "g1_arms"})
+        emotions: Emoções aceitas pela action de emoção
+        library: Biblioteca de movimentos (padrão: G1MovementLibrary)
+
+    Returns:
+        Schema de ``{"actions": [{"action": <nome>, "args": {...}}, ...]}``
+    """
+    if library is None:
+        from ..actions.g1_movement_mapping import G1MovementLibrary
+        library = G1MovementLibrary
+    emotions = sorted(emotions) if emotions else DEFAULT_EMOTIONS
+
+    variants = []
+    for name, connector in action_connectors.items():
+        args_schema = _arguments_schema(connector, emotions, library)
+        if args_schema is None:
+            logger.debug(f"Action {name} ({connector}) sem schema estruturado")
+            continue
+        variants.append({
+            "type": "object",
+            "properties": {"action": {"type": "string", "enum": [name]}, "args": args_schema},
+            "required": ["action", "args"]
+        })
+
+    return {
+        "type": "object",
+        "properties": {"actions": {"type": "array", "items": {"anyOf": variants}}},
+        "required": ["actions"]
+    }
+
+
+def schema_action_names(schema: Dict[str, Any]) -> List[str]:
+    """Nomes das actions declaradas no schema (na ordem de registro)."""
+    variants = schema.get("properties", {}).get("actions", {}).get("items", {}).get("anyOf", [])
+    return [variant["properties"]["action"]["enum"][0] for variant in variants]
+
+
+def schema_instructions(schema: Dict[str, Any]) -> str:
+    """Instruções de formato para provedores sem suporte nativo a schema."""
+    return (
+        "FORMATO DA RESPOSTA: responda somente com um objeto JSON {\"actions\": [...]}, sem texto fora dele. "
+        "Cada item é {\"action\": <nome>, \"args\": {...}}; coloque a fala (speak) primeiro e "
+        "acrescente gestos, emoção ou movimento quando fizer sentido.\n"
+        f"Schema: {json.dumps(schema, ensure_ascii=False, separators=(',', ':'))}"
+    )
+
+
+def normalize_action(item: Any) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Normaliza um item do array ``actions``.
+
+    Aceita ``{"action", "args"}`` e o formato de tool call ``{"name", "arguments"}``
+    (com ``arguments`` como objeto ou string JSON).
+    """
+    if not isinstance(item, dict):
+        return None
+    name = item.get("action", item.get("name"))
+    args = item.get("args", item.get("arguments", {}))
+    if isinstance(args, str):
+        try:
+            args = json.loads(args)
+        except ValueError:
+            return None
+    if not isinstance(name, str) or not isinstance(args, dict):
+        return None
+    return name, args
+
+
+class StreamingActionParser:
+    """
+    Parser incremental do array ``actions``.
+
+    Acompanha chaves, colchetes e strings caractere a caractere; guarda só o
+    texto do item em aberto e o decodifica quando o objeto fecha. Texto fora
+    do JSON (prosa, cercas ```json) é ignorado.
+    """
+
+    def __init__(self, max_item_chars: int = 8192):
+        self.max_item_chars = max_item_chars
+
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._key_chars: List[str] = []
+        self._last_key: Optional[str] = None
+        self._item_depth: Optional[int] = None
+        self._item: Optional[List[str]] = None
+        self._found_array = False
+
+        # Métricas
+        self.chars_seen = 0
+        self.actions_parsed = 0
+        self.parse_errors = 0
+
+    @property
+    def found_json(self) -> bool:
+        """Indica se o array de actions foi encontrado."""
+        return self._found_array
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Consome um pedaço do stream.
+
+        Returns:
+            Itens de action completados neste pedaço
+        """
+        completed = []
+        self.chars_seen += len(chunk)
+
+        for char in chunk:
+            if self._item is not None:
+                self._item.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._stack == ["{"]:
+                        self._last_key = "".join(self._key_chars)
+                elif self._stack == ["{"]:
+                    self._key_chars.append(char)
+                continue
+
+            if not self._stack and char not in "{[":
+                continue  # prosa antes/depois do JSON
+
+            if char == '"':
+                self._in_string = True
+                self._key_chars = []
+            elif char in "{[":
+                self._open(char)
+            elif char in "}]":
+                item = self._close(char)
+                if item is not None:
+                    completed.append(item)
+
+            if self._item is not None and len(self._item) > self.max_item_chars:
+                logger.warning("Item de action excedeu o tamanho máximo, descartado")
+                self.parse_errors += 1
+                self._item = None
+
+        return completed
+
+    def _open(self, char: str):
+        depth = len(self._stack)
+        if char == "[" and self._item_depth is None:
+            # Array de actions: na raiz ou como valor de "actions" no objeto raiz
+            if depth == 0 or (self._stack == ["{"] and self._last_key == "actions"):
+                self._stack.append(char)
+                self._item_depth = len(self._stack)
+                self._found_array = True
+                return
+        if char == "{" and self._item is None and self._item_depth == depth and self._stack[-1] == "[":
+            self._item = [char]
+        self._stack.append(char)
+
+    def _close(self, char: str) -> Optional[Dict[str, Any]]:
+        if not self._stack:
+            return None
+        opened = self._stack.pop()
+        if (opened == "{") != (char == "}"):
+            # JSON malformado: recomeça a partir do próximo objeto/array de topo
+            self.parse_errors += 1
+            self.reset()
+            return None
+
+        if len(self._stack) == self._item_depth and self._item is not None:
+            text = "".join(self._item)
+            self._item = None
+            try:
+                item = json.loads(text)
+            except ValueError:
+                self.parse_errors += 1
+                logger.debug(f"Item de action inválido: {text[:80]}")
+                return None
+            self.actions_parsed += 1
+            return item
+
+        if self._item_depth is not None and len(self._stack) < self._item_depth:
+            self._item_depth = None  # array de actions encerrado
+        return None
+
+    def reset(self):
+        """Descarta o estado parcial (ex.: nova resposta)."""
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._key_chars = []
+        self._last_key = None
+        self._item_depth = None
+        self._item = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "chars_seen": self.chars_seen,
+            "actions_parsed": self.actions_parsed,
+            "parse_errors": self.parse_errors
+        }
+
+
+def parse_actions(text: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """Parse de uma resposta completa (sem streaming)."""
+    parser = StreamingActionParser()
+    actions = []
+    for item in parser.feed(text):
+        normalized = normalize_action(item)
+        if normalized:
+            actions.append(normalized)
+    return actions
@@ -4,14 +4,35 @@ Sistema de logging estruturado para t031a5.
 Inclui logging avançado com métricas, performance e monitoramento.
 """
 
-from .structured_logger import StructuredLogger, LogLevel, LogContext
+from .structured_logger import StructuredLogger, StructuredJsonFormatter, LogLevel, LogContext
+from .log_pipeline import BatchingQueueHandler, LogPipeline, RotatingBatchFile, get_log_pipeline
+from .histogram import HdrHistogram, WindowedHistogram
 from .metrics_collector import MetricsCollector
 from .performance_monitor import PerformanceMonitor
+from .system_sampler import SystemSample, SystemSampler, get_system_sampler
+from .tracing import Span, Tracer, get_tracer
+from .profiler import LoopStall, SamplingProfiler, get_sampling_profiler
 
 __all__ = [
     "StructuredLogger",
     "LogLevel", 
     "LogContext",
+    "StructuredJsonFormatter",
+    "BatchingQueueHandler",
+    "LogPipeline",
+    "RotatingBatchFile",
+    "get_log_pipeline",
     "MetricsCollector",
+    "HdrHistogram",
+    "WindowedHistogram",
     "PerformanceMonitor",
+    "SystemSample",
+    "SystemSampler",
+    "get_system_sampler",
+    "Span",
+    "Tracer",
+    "get_tracer",
+    "LoopStall",
+    "SamplingProfiler",
+    "get_sampling_profiler",
 ]
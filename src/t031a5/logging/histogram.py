@@ -0,0 +1,243 @@
+"""
+Histogramas de latência de memória fixa (estilo HDR) para o sistema t031a5.
+
+Os valores são contados em microssegundos em baldes log-lineares: cada
+potência de 2 é dividida em ``2 * 10^digits`` sub-baldes, o que mantém o
+erro relativo abaixo de ``10^-digits`` em toda a faixa. Registrar é O(1)
+(índice por aritmética de bits + um incremento); percentis saem de uma soma
+cumulativa sobre alguns milhares de baldes, independente de quantas amostras
+foram registradas.
+
+Histogramas com o mesmo layout são somáveis: ``WindowedHistogram`` guarda
+um anel de janelas de tempo e junta as últimas N sob demanda. O snapshot
+binário guarda só os baldes não vazios (comprimido).
+"""
+
+import math
+import struct
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_SNAPSHOT_MAGIC = b"T5H1"
+# magic, digits, highest (µs), count, min (µs), max (µs), soma (µs), baldes não vazios
+_SNAPSHOT_HEADER = struct.Struct("<4sBQQQQdI")
+
+
+class HdrHistogram:
+    """Histograma log-linear de valores inteiros em microssegundos."""
+
+    def __init__(self, highest_seconds: float = 60.0, significant_digits: int = 2, dtype=np.int64):
+        """
+        Args:
+            highest_seconds: Maior valor distinguível (acima disso satura)
+            significant_digits: Dígitos significativos preservados (1 a 3)
+            dtype: Tipo dos contadores (int32 basta para janelas curtas)
+        """
+        if not 1 <= significant_digits <= 3:
+            raise ValueError("significant_digits deve estar entre 1 e 3")
+        self.significant_digits = significant_digits
+        self.highest = max(2, int(highest_seconds * 1e6))
+
+        sub_bucket_count = 1 << math.ceil(math.log2(2 * 10 ** significant_digits))
+        self._half_magnitude = sub_bucket_count.bit_length() - 2
+        self._half_count = sub_bucket_count >> 1
+        self._mask = sub_bucket_count - 1
+        self.counts = np.zeros(self._index(self.highest) + 1, dtype=dtype)
+
+        self.count = 0
+        self.total = 0.0
+        self.min = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        bucket = (value | self._mask).bit_length() - self._half_magnitude - 1
+        return ((bucket + 1) << self._half_magnitude) + (value >> bucket) - self._half_count
+
+    def _value_at(self, index: int) -> int:
+        """Menor valor do balde ``index``."""
+        bucket = (index >> self._half_magnitude) - 1
+        sub_bucket = (index & (self._half_count - 1)) + self._half_count
+        if bucket < 0:
+            sub_bucket -= self._half_count
+            bucket = 0
+        return sub_bucket << bucket
+
+    def same_layout(self, other: "HdrHistogram") -> bool:
+        return self.counts.shape == other.counts.shape and self.significant_digits == other.significant_digits
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.counts.nbytes
+
+    def _clamp(self, seconds: float) -> int:
+        value = int(seconds * 1e6)
+        if value < 0:
+            return 0
+        return value if value <= self.highest else self.highest
+
+    def record(self, seconds: float):
+        """Registra uma duração (O(1))."""
+        value = self._clamp(seconds)
+        self._add(self._index(value), value)
+
+    def _add(self, index: int, value: int):
+        self.counts[index] += 1
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: "HdrHistogram") -> "HdrHistogram":
+        """Soma ``other`` neste histograma (mesmo layout)."""
+        if not self.same_layout(other):
+            raise ValueError("Histogramas com layouts diferentes não podem ser somados")
+        if other.count == 0:
+            return self
+        self.counts += other.counts
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        return self
+
+    def reset(self):
+        self.counts.fill(0)
+        self.count = 0
+        self.total = 0.0
+        self.min = 0
+        self.max = 0
+
+    def percentiles(self, percentiles: Sequence[float] = (50, 95, 99)) -> List[float]:
+        """
+        Valores (segundos) nos percentis pedidos.
+
+        Cada valor é o limite superior do balde, preso ao máximo observado.
+        """
+        if self.count == 0:
+            return [0.0] * len(percentiles)
+        cumulative = np.cumsum(self.counts)
+        ranks = [max(1, math.ceil(p / 100.0 * self.count)) for p in percentiles]
+        indexes = np.searchsorted(cumulative, ranks).tolist()
+        values = []
+        for index in indexes:
+            upper = self._value_at(index + 1) - 1 if index + 1 < len(self.counts) else self.highest
+            values.append(min(max(upper, self.min), self.max) / 1e6)
+        return values
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count / 1e6 if self.count else 0.0
+
+    def summary(self, percentiles: Sequence[float] = (50, 95, 99)) -> Dict[str, Any]:
+        """Contagem, média, extremos e percentis (em segundos)."""
+        summary = {
+            "count": self.count,
+            "avg_time": self.mean,
+            "min_time": self.min / 1e6,
+            "max_time": self.max / 1e6
+        }
+        for p, value in zip(percentiles, self.percentiles(percentiles)):
+            summary[f"p{p:g}"] = value
+        return summary
+
+    def to_bytes(self) -> bytes:
+        """Snapshot binário: cabeçalho + baldes não vazios (índice, contagem), comprimido."""
+        nonzero = np.flatnonzero(self.counts)
+        header = _SNAPSHOT_HEADER.pack(
+            _SNAPSHOT_MAGIC, self.significant_digits, self.highest, self.count,
+            self.min, self.max, self.total, len(nonzero)
+        )
+        body = nonzero.astype("<u4").tobytes() + self.counts[nonzero].astype("<u8").tobytes()
+        return zlib.compress(header + body)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HdrHistogram":
+        """Reconstrói um histograma de ``to_bytes``."""
+        raw = zlib.decompress(data)
+        magic, digits, highest, count, min_value, max_value, total, entries = \
+            _SNAPSHOT_HEADER.unpack_from(raw)
+        if magic != _SNAPSHOT_MAGIC:
+            raise ValueError("Snapshot de histograma inválido")
+        histogram = cls(highest / 1e6, digits)
+        offset = _SNAPSHOT_HEADER.size
+        indexes = np.frombuffer(raw, dtype="<u4", count=entries, offset=offset)
+        counts = np.frombuffer(raw, dtype="<u8", count=entries, offset=offset + 4 * entries)
+        histogram.counts[indexes] = counts
+        histogram.count, histogram.min, histogram.max, histogram.total = count, min_value, max_value, total
+        return histogram
+
+
+class WindowedHistogram:
+    """
+    Anel de histogramas por janela de tempo mais um acumulado.
+
+    ``snapshot(seconds)`` soma as janelas que cobrem os últimos ``seconds``;
+    a memória é ``(windows + 1)`` vetores de contadores, fixa.
+    """
+
+    def __init__(self, window_seconds: float = 300.0, windows: int = 12, highest_seconds: float = 60.0,
+                 significant_digits: int = 2):
+        self.window_seconds = window_seconds
+        self._windows = [HdrHistogram(highest_seconds, significant_digits, dtype=np.int32)
+                         for _ in range(max(1, windows))]
+        self.cumulative = HdrHistogram(highest_seconds, significant_digits)
+        self._head = 0
+        self._window_start = time.monotonic()
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.cumulative.memory_bytes + sum(window.memory_bytes for window in self._windows)
+
+    @property
+    def span_seconds(self) -> float:
+        return self.window_seconds * len(self._windows)
+
+    def _rotate(self, now: float):
+        elapsed = int((now - self._window_start) / self.window_seconds)
+        if elapsed <= 0:
+            return
+        for _ in range(min(elapsed, len(self._windows))):
+            self._head = (self._head + 1) % len(self._windows)
+            self._windows[self._head].reset()
+        self._window_start += elapsed * self.window_seconds
+
+    def record(self, seconds: float, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        if now - self._window_start >= self.window_seconds:
+            self._rotate(now)
+        # Mesmo layout: índice calculado uma vez para a janela e o acumulado
+        cumulative = self.cumulative
+        value = cumulative._clamp(seconds)
+        index = cumulative._index(value)
+        cumulative._add(index, value)
+        self._windows[self._head]._add(index, value)
+
+    def snapshot(self, seconds: Optional[float] = None, now: Optional[float] = None) -> HdrHistogram:
+        """
+        Histograma das janelas que cobrem os últimos ``seconds`` (None: acumulado).
+
+        A janela corrente conta inteira, então o período efetivo é
+        arredondado para cima em múltiplos de ``window_seconds``.
+        """
+        if seconds is None:
+            return self.cumulative
+        self._rotate(time.monotonic() if now is None else now)
+        count = min(len(self._windows), max(1, math.ceil(seconds / self.window_seconds)))
+        merged = HdrHistogram(self.cumulative.highest / 1e6, self.cumulative.significant_digits)
+        for offset in range(count):
+            merged.merge(self._windows[(self._head - offset) % len(self._windows)])
+        return merged
+
+    def windows(self, now: Optional[float] = None) -> List[Tuple[float, HdrHistogram]]:
+        """(início em time.monotonic, histograma) das janelas, da mais antiga para a atual."""
+        self._rotate(time.monotonic() if now is None else now)
+        size = len(self._windows)
+        return [
+            (self._window_start - age * self.window_seconds, self._windows[(self._head - age) % size])
+            for age in range(size - 1, -1, -1)
+        ]
@@ -0,0 +1,296 @@
+"""
+Pipeline assíncrono de logs para o sistema t031a5.
+
+Quem loga só junta mensagem e argumentos (como o ``QueueHandler`` da
+stdlib) e enfileira o ``LogRecord``; uma thread escritora aplica o formato
+(data, nível, JSON) em lote, grava o arquivo com rotação por tamanho numa
+única escrita por lote e repassa os registros aos handlers que antes
+ficavam no logger (console, Rich). Um registro que falha é reportado por
+``handleError`` sem derrubar o resto do lote. A fila é limitada: sob
+pressão, registros abaixo de ``block_level`` são descartados e contados,
+em vez de travar o event loop.
+"""
+
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+_STOP = object()
+
+
+class BatchingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que só resolve a mensagem na thread de quem loga.
+
+    Como na stdlib, ``getMessage()`` é aplicado aqui sobre uma cópia do
+    registro: argumentos mutáveis alterados depois da chamada não mudam (nem
+    quebram) o log. Exceções viram texto enquanto o traceback existe; o
+    formato completo fica para a escritora.
+    """
+
+    def __init__(self, log_queue: queue.Queue, block_level: int = logging.ERROR, block_timeout: float = 0.05):
+        super().__init__(log_queue)
+        self.block_level = block_level
+        self.block_timeout = block_timeout
+        self.enqueued = 0
+        self.dropped = 0
+        self.dropped_by_level: Dict[str, int] = {}
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Cópia: outros handlers do mesmo registro (propagação) veem o original
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if record.levelno >= self.block_level:
+                # Erros esperam um pouco por espaço antes de serem descartados
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+            self.dropped_by_level[record.levelname] = self.dropped_by_level.get(record.levelname, 0) + 1
+
+
+class RotatingBatchFile:
+    """Arquivo de log com escrita por lote e rotação por tamanho (``.1`` … ``.N``)."""
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                 encoding: str = "utf-8"):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.encoding = encoding
+        self.rotations = 0
+        self.open()
+
+    def open(self):
+        """(Re)abre o arquivo em modo append."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._stream = open(self.path, "a", encoding=self.encoding)
+        self._size = self._stream.tell()
+
+    @property
+    def closed(self) -> bool:
+        return self._stream.closed
+
+    def write(self, lines: List[str]):
+        text = "\n".join(lines) + "\n"
+        size = len(text.encode(self.encoding))
+        if self.max_bytes and self._size and self._size + size > self.max_bytes:
+            self._rotate()
+        self._stream.write(text)
+        self._stream.flush()
+        self._size += size
+
+    def _rotate(self):
+        self._stream.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = Path(f"{self.path}.{index}")
+                if source.exists():
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self._stream = open(self.path, "w", encoding=self.encoding)
+        self._size = 0
+        self.rotations += 1
+
+    def close(self):
+        self._stream.close()
+
+
+class LogPipeline:
+    """
+    Fila limitada + thread escritora com lotes.
+
+    ``install`` troca os handlers de um logger pelo ``QueueHandler``; os
+    handlers removidos passam a ser chamados pela escritora.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, handlers: Optional[List[logging.Handler]] = None):
+        """
+        Args:
+            config: queue_size, batch_size, flush_interval, file, max_bytes,
+                    backup_count, format, block_level
+            handlers: Handlers chamados pela escritora (ex.: console)
+        """
+        config = config or {}
+        self.batch_size = config.get("batch_size", 256)
+        self.flush_interval = config.get("flush_interval", 0.2)
+        self.queue: queue.Queue = queue.Queue(maxsize=config.get("queue_size", 10000))
+        block_level = logging.getLevelName(str(config.get("block_level", "ERROR")).upper())
+        self.handler = BatchingQueueHandler(self.queue, block_level if isinstance(block_level, int) else logging.ERROR)
+        self.handlers: List[logging.Handler] = list(handlers or [])
+
+        self.formatter = logging.Formatter(config.get("format", "%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+        self.file: Optional[RotatingBatchFile] = None
+        if config.get("file"):
+            self.file = RotatingBatchFile(
+                config["file"], config.get("max_bytes", 10 * 1024 * 1024), config.get("backup_count", 5)
+            )
+
+        self._installed: List[logging.Logger] = []
+        self._thread: Optional[threading.Thread] = None
+
+        # Métricas
+        self.written = 0
+        self.batches = 0
+        self.max_batch = 0
+        self.max_depth = 0
+        self.write_errors = 0
+        self.total_write_time = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def install(self, logger: Optional[logging.Logger] = None) -> logging.Logger:
+        """Passa ``logger`` (padrão: raiz) a logar pela fila."""
+        logger = logger or logging.getLogger()
+        for handler in logger.handlers[:]:
+            if handler is self.handler:
+                continue
+            logger.removeHandler(handler)
+            self.handlers.append(handler)
+        if self.handler not in logger.handlers:
+            logger.addHandler(self.handler)
+        self._installed.append(logger)
+        return logger
+
+    def start(self) -> bool:
+        """Inicia a thread escritora."""
+        if self.is_running:
+            return True
+        if self.file and self.file.closed:
+            self.file.open()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: float = 2.0):
+        """Esvazia a fila, para a escritora e devolve os handlers aos loggers."""
+        if self._thread:
+            try:
+                self.queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+            self._thread = None
+        for logger in self._installed:
+            logger.removeHandler(self.handler)
+            for handler in self.handlers:
+                logger.addHandler(handler)
+        self._installed.clear()
+        if self.file:
+            self.file.close()
+
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            if record is _STOP:
+                break
+            batch = [record]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            # Junta o que já está na fila (ou chega até flush_interval) num lote só
+            while len(batch) < self.batch_size:
+                try:
+                    remaining = deadline - time.monotonic()
+                    record = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stop = True
+                    break
+                batch.append(record)
+            self._write(batch)
+            if stop:
+                break
+
+    def _write(self, batch: List[logging.LogRecord]):
+        start = time.perf_counter()
+        self.max_depth = max(self.max_depth, self.queue.qsize() + len(batch))
+
+        # Formata um a um: um registro com problema não leva o lote junto
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                self._failed(self.handler, record)
+        written = 0
+        if self.file and lines:
+            try:
+                self.file.write(lines)
+                written = len(lines)
+            except Exception:
+                self._failed(self.handler, batch[0])
+
+        failed = 0
+        for record in batch:
+            ok = True
+            for handler in self.handlers:
+                if record.levelno >= handler.level:
+                    try:
+                        handler.handle(record)
+                    except Exception:
+                        ok = False
+                        self._failed(handler, record)
+            failed += not ok
+
+        # Com arquivo conta o que foi gravado; sem arquivo, o que os handlers aceitaram
+        self.written += written if self.file else len(batch) - failed
+        self.batches += 1
+        self.max_batch = max(self.max_batch, len(batch))
+        self.total_write_time += time.perf_counter() - start
+
+    def _failed(self, handler: logging.Handler, record: logging.LogRecord):
+        self.write_errors += 1
+        handler.handleError(record)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores de fila, lotes e descartes."""
+        return {
+            "running": self.is_running,
+            "enqueued": self.handler.enqueued,
+            "written": self.written,
+            "dropped": self.handler.dropped,
+            "dropped_by_level": dict(self.handler.dropped_by_level),
+            "queue_depth": self.queue.qsize(),
+            "max_depth": self.max_depth,
+            "batches": self.batches,
+            "avg_batch": round(self.written / self.batches, 1) if self.batches else 0.0,
+            "max_batch": self.max_batch,
+            "avg_batch_ms": round(self.total_write_time / self.batches * 1000, 3) if self.batches else 0.0,
+            "rotations": self.file.rotations if self.file else 0,
+            "write_errors": self.write_errors
+        }
+
+
+_log_pipeline: Optional[LogPipeline] = None
+
+
+def get_log_pipeline(config: Optional[Dict[str, Any]] = None) -> LogPipeline:
+    """
+    Retorna o pipeline de logs do processo.
+
+    A configuração só é aplicada na primeira chamada.
+    """
+    global _log_pipeline
+    if _log_pipeline is None:
+        _log_pipeline = LogPipeline(config)
+    return _log_pipeline
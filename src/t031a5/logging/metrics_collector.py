@@ -2,29 +2,44 @@
 Coletor de métricas para o sistema t031a5.
 
 Coleta e gerencia métricas de performance, uso de recursos e eventos.
+Latências por operação ficam em histogramas de memória fixa (ver
+``histogram.py``), não em listas de amostras.
 """
 
 import time
 from collections import defaultdict, deque
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 
+from .histogram import HdrHistogram, WindowedHistogram
 from .structured_logger import StructuredLogger, LogContext
 
 
 class MetricsCollector:
     """Coletor de métricas avançado."""
     
-    def __init__(self, logger: Optional[StructuredLogger] = None):
+    def __init__(self, logger: Optional[StructuredLogger] = None, config: Optional[Dict[str, Any]] = None):
         """
         Inicializa o coletor de métricas.
         
         Args:
             logger: Logger estruturado (opcional)
+            config: Histogramas de latência: window_seconds, windows,
+                    highest_seconds, significant_digits, max_operations
         """
         self.logger = logger or StructuredLogger("metrics")
         self.start_time = datetime.now()
         
+        config = config or {}
+        self.histogram_config = {
+            "window_seconds": config.get("window_seconds", 300.0),  # 12 janelas de 5 min = 1h
+            "windows": config.get("windows", 12),
+            "highest_seconds": config.get("highest_seconds", 60.0),
+            "significant_digits": config.get("significant_digits", 2)
+        }
+        self.max_operations = config.get("max_operations", 256)
+        self.dropped_operations = 0
+        
         # Métricas em tempo real
         self.current_metrics = {
             "system": {
@@ -46,10 +61,12 @@ class MetricsCollector:
         # Histórico de métricas (últimas 24 horas)
         self.history = {
             "performance": deque(maxlen=8640),  # 24h * 10s
-            "system": deque(maxlen=8640),
-            "components": defaultdict(lambda: deque(maxlen=8640))
+            "system": deque(maxlen=8640)
         }
         
+        # Latência por operação: memória fixa, independente do número de amostras
+        self.latency: Dict[str, WindowedHistogram] = {}
+        
         # Timers ativos
         self.active_timers = {}
         
@@ -125,29 +142,64 @@ class MetricsCollector:
             operation: Nome da operação
             duration: Duração em segundos
         """
-        # Atualiza métricas atuais
-        if "performance" not in self.current_metrics["components"][operation]:
+        histogram = self.latency.get(operation)
+        if histogram is None:
+            if len(self.latency) >= self.max_operations:
+                # Nomes de operação dinâmicos não podem crescer a memória sem limite
+                if self.dropped_operations == 0:
+                    self.logger.warning(f"Limite de {self.max_operations} operações com latência atingido")
+                self.dropped_operations += 1
+                return
+            histogram = self.latency[operation] = WindowedHistogram(**self.histogram_config)
+        histogram.record(duration)
+    
+    def _refresh_component_performance(self):
+        """Métricas atuais por componente a partir dos acumulados (resolução de 1µs)."""
+        for operation, histogram in self.latency.items():
+            cumulative = histogram.cumulative
             self.current_metrics["components"][operation]["performance"] = {
-                "count": 0,
-                "total_time": 0.0,
-                "avg_time": 0.0,
-                "min_time": float('inf'),
-                "max_time": 0.0
+                "count": cumulative.count,
+                "total_time": cumulative.total / 1e6,
+                "avg_time": cumulative.mean,
+                "min_time": cumulative.min / 1e6,
+                "max_time": cumulative.max / 1e6
             }
+    
+    def get_latency_histogram(self, operation: str, window_seconds: Optional[float] = None) -> Optional[HdrHistogram]:
+        """
+        Histograma de latência de uma operação.
+        
+        Args:
+            operation: Nome da operação
+            window_seconds: Últimos N segundos (arredondado para janelas inteiras);
+                            None para o acumulado desde o início
+            
+        Returns:
+            Histograma (somável com ``merge``) ou None se a operação não existe
+        """
+        histogram = self.latency.get(operation)
+        return histogram.snapshot(window_seconds) if histogram else None
+    
+    def get_latency_percentiles(self, operation: str, percentiles: Sequence[float] = (50, 95, 99),
+                                window_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Contagem, média, extremos e percentis (segundos) de uma operação.
         
-        perf = self.current_metrics["components"][operation]["performance"]
-        perf["count"] += 1
-        perf["total_time"] += duration
-        perf["avg_time"] = perf["total_time"] / perf["count"]
-        perf["min_time"] = min(perf["min_time"], duration)
-        perf["max_time"] = max(perf["max_time"], duration)
+        Returns:
+            Resumo ou None se a operação não existe
+        """
+        histogram = self.get_latency_histogram(operation, window_seconds)
+        return histogram.summary(percentiles) if histogram else None
+    
+    def get_latency_snapshot(self, operation: str, window_seconds: Optional[float] = None) -> Optional[bytes]:
+        """
+        Snapshot binário compacto (``HdrHistogram.from_bytes`` reconstrói).
         
-        # Adiciona ao histórico
-        self.history["components"][operation].append({
-            "timestamp": datetime.now(),
-            "duration": duration,
-            "avg_time": perf["avg_time"]
-        })
+        Returns:
+            Bytes do snapshot ou None se a operação não existe
+        """
+        histogram = self.get_latency_histogram(operation, window_seconds)
+        return histogram.to_bytes() if histogram else None
     
     def increment_counter(self, name: str, value: int = 1):
         """
@@ -239,10 +291,12 @@ class MetricsCollector:
     
     def get_current_metrics(self) -> Dict[str, Any]:
         """Retorna métricas atuais."""
+        self._refresh_component_performance()
         return self.current_metrics.copy()
     
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Retorna resumo das métricas."""
+        self._refresh_component_performance()
         summary = {
             "uptime": self.current_metrics["system"]["uptime"],
             "total_loops": self.current_metrics["performance"]["total_loops"],
@@ -251,7 +305,9 @@ class MetricsCollector:
             "total_events": len(self.current_metrics["events"]),
             "active_timers": len(self.active_timers),
             "counters": dict(self.counters),
-            "gauges": self.gauges.copy()
+            "gauges": self.gauges.copy(),
+            "latency_memory_bytes": sum(histogram.memory_bytes for histogram in self.latency.values()),
+            "dropped_operations": self.dropped_operations
         }
         
         # Resumo por componente
@@ -259,11 +315,15 @@ class MetricsCollector:
         for component, metrics in self.current_metrics["components"].items():
             if "performance" in metrics:
                 perf = metrics["performance"]
+                p50, p95, p99 = self.latency[component].cumulative.percentiles((50, 95, 99))
                 component_summary[component] = {
                     "operations": perf["count"],
                     "avg_time": perf["avg_time"],
                     "min_time": perf["min_time"],
-                    "max_time": perf["max_time"]
+                    "max_time": perf["max_time"],
+                    "p50": p50,
+                    "p95": p95,
+                    "p99": p99
                 }
         
         summary["components"] = component_summary
@@ -277,25 +337,22 @@ class MetricsCollector:
             hours: Número de horas para retornar
             
         Returns:
-            Histórico de métricas
+            Histórico de métricas; para componentes, o resumo de latência do
+            período (limitado às janelas mantidas, ver ``histogram_config``)
         """
         cutoff_time = datetime.now() - timedelta(hours=hours)
         
         history = {}
         for metric_type, data in self.history.items():
-            if isinstance(data, deque):
-                history[metric_type] = [
-                    item for item in data 
-                    if item["timestamp"] > cutoff_time
-                ]
-            else:
-                # Para componentes
-                history[metric_type] = {}
-                for component, component_data in data.items():
-                    history[metric_type][component] = [
-                        item for item in component_data
-                        if item["timestamp"] > cutoff_time
-                    ]
+            history[metric_type] = [
+                item for item in data 
+                if item["timestamp"] > cutoff_time
+            ]
+        
+        history["components"] = {
+            component: histogram.snapshot(hours * 3600).summary()
+            for component, histogram in self.latency.items()
+        }
         
         return history
     
@@ -341,9 +398,10 @@ class MetricsCollector:
         
         self.history = {
             "performance": deque(maxlen=8640),
-            "system": deque(maxlen=8640),
-            "components": defaultdict(lambda: deque(maxlen=8640))
+            "system": deque(maxlen=8640)
         }
+        self.latency.clear()
+        self.dropped_operations = 0
         
         self.active_timers.clear()
         self.counters.clear()
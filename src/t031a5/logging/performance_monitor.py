@@ -1,16 +1,17 @@
 """
 Monitor de performance para o sistema t031a5.
 
-Monitora performance do sistema, recursos e alertas.
+Monitora performance do sistema, recursos e alertas. As leituras de CPU,
+memória, disco, GPU e temperatura vêm da última amostra do SystemSampler
+(thread em background), então nenhuma verificação bloqueia.
 """
 
-import psutil
-import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
 from .structured_logger import StructuredLogger, LogContext
 from .metrics_collector import MetricsCollector
+from .system_sampler import SystemSample, SystemSampler, get_system_sampler
 
 
 class PerformanceMonitor:
@@ -19,7 +20,8 @@ class PerformanceMonitor:
     def __init__(
         self,
         logger: Optional[StructuredLogger] = None,
-        metrics_collector: Optional[MetricsCollector] = None
+        metrics_collector: Optional[MetricsCollector] = None,
+        sampler: Optional[SystemSampler] = None
     ):
         """
         Inicializa o monitor de performance.
@@ -27,9 +29,11 @@ class PerformanceMonitor:
         Args:
             logger: Logger estruturado (opcional)
             metrics_collector: Coletor de métricas (opcional)
+            sampler: Amostrador do sistema (padrão: o do processo)
         """
         self.logger = logger or StructuredLogger("performance")
         self.metrics_collector = metrics_collector or MetricsCollector(self.logger)
+        self.sampler = sampler or get_system_sampler()
         
         # Configurações de alerta
         self.alert_thresholds = {
@@ -37,7 +41,9 @@ class PerformanceMonitor:
             "memory_usage": 85.0,   # Memória > 85%
             "disk_usage": 90.0,     # Disco > 90%
             "loop_time": 0.1,       # Loop > 100ms
-            "error_rate": 5.0       # Taxa de erro > 5%
+            "error_rate": 5.0,      # Taxa de erro > 5%
+            "gpu_usage": 95.0,      # GPU da Jetson > 95%
+            "temperature": 85.0     # Zona térmica mais quente > 85°C
         }
         
         # Histórico de alertas
@@ -57,37 +63,35 @@ class PerformanceMonitor:
             "disk_usage": 0.0,
             "loop_time": 0.0
         }
+        # Baseline = média das primeiras amostras, acumulada durante as verificações
+        self.baseline_samples = 10
+        self._baseline_count = 0
         
         # Contador de checks
         self.check_count = 0
     
     def start_monitoring(self):
-        """Inicia o monitoramento."""
+        """Inicia o monitoramento (sem esperar baseline)."""
         self.logger.info("Iniciando monitoramento de performance")
-        self._establish_baseline()
+        self.sampler.start()
     
-    def _establish_baseline(self):
-        """Estabelece métricas de baseline."""
-        self.logger.info("Estabelecendo baseline de performance...")
-        
-        # Coleta métricas por 10 segundos para estabelecer baseline
-        cpu_readings = []
-        memory_readings = []
-        disk_readings = []
-        
-        for _ in range(10):
-            cpu_readings.append(psutil.cpu_percent(interval=1))
-            memory_readings.append(psutil.virtual_memory().percent)
-            disk_readings.append(psutil.disk_usage('/').percent)
-            time.sleep(1)
-        
-        self.baseline_metrics["cpu_usage"] = sum(cpu_readings) / len(cpu_readings)
-        self.baseline_metrics["memory_usage"] = sum(memory_readings) / len(memory_readings)
-        self.baseline_metrics["disk_usage"] = sum(disk_readings) / len(disk_readings)
-        
-        self.logger.info(f"Baseline estabelecido: CPU={self.baseline_metrics['cpu_usage']:.1f}%, "
-                        f"Memória={self.baseline_metrics['memory_usage']:.1f}%, "
-                        f"Disco={self.baseline_metrics['disk_usage']:.1f}%")
+    def stop_monitoring(self):
+        """Para a amostragem em background."""
+        self.sampler.stop()
+    
+    def _update_baseline(self, sample: SystemSample):
+        """Acumula a média das primeiras amostras como baseline."""
+        if self._baseline_count >= self.baseline_samples:
+            return
+        self._baseline_count += 1
+        for key, value in (("cpu_usage", sample.cpu_percent), ("memory_usage", sample.memory_percent),
+                           ("disk_usage", sample.disk_percent)):
+            self.baseline_metrics[key] += (value - self.baseline_metrics[key]) / self._baseline_count
+        
+        if self._baseline_count == self.baseline_samples:
+            self.logger.info(f"Baseline estabelecido: CPU={self.baseline_metrics['cpu_usage']:.1f}%, "
+                            f"Memória={self.baseline_metrics['memory_usage']:.1f}%, "
+                            f"Disco={self.baseline_metrics['disk_usage']:.1f}%")
     
     def check_system_health(self) -> Dict[str, Any]:
         """
@@ -99,10 +103,14 @@ class PerformanceMonitor:
         self.check_count += 1
         current_time = datetime.now()
         
-        # Coleta métricas atuais
-        cpu_usage = psutil.cpu_percent(interval=0.1)
-        memory_usage = psutil.virtual_memory().percent
-        disk_usage = psutil.disk_usage('/').percent
+        # Última amostra em cache; sem a thread, lê agora (diferença desde a última leitura, sem bloquear)
+        sample = self.sampler.latest if self.sampler.is_running else None
+        if sample is None:
+            sample = self.sampler.sample_now()
+        cpu_usage = sample.cpu_percent
+        memory_usage = sample.memory_percent
+        disk_usage = sample.disk_percent
+        self._update_baseline(sample)
         
         # Atualiza métricas
         self.metrics_collector.update_system_metrics(cpu_usage, memory_usage, disk_usage)
@@ -147,6 +155,29 @@ class PerformanceMonitor:
             alerts.append(alert)
             issues.append(f"Disk usage high: {disk_usage:.1f}%")
         
+        # GPU (Jetson)
+        if sample.gpu_percent is not None and sample.gpu_percent > self.alert_thresholds["gpu_usage"]:
+            alerts.append({
+                "type": "high_gpu_usage",
+                "severity": "warning",
+                "value": sample.gpu_percent,
+                "threshold": self.alert_thresholds["gpu_usage"],
+                "timestamp": current_time
+            })
+            issues.append(f"GPU usage high: {sample.gpu_percent:.1f}%")
+        
+        # Temperatura (zona mais quente)
+        max_temperature = sample.max_temperature
+        if max_temperature is not None and max_temperature > self.alert_thresholds["temperature"]:
+            alerts.append({
+                "type": "high_temperature",
+                "severity": "warning" if max_temperature < 95 else "critical",
+                "value": max_temperature,
+                "threshold": self.alert_thresholds["temperature"],
+                "timestamp": current_time
+            })
+            issues.append(f"Temperature high: {max_temperature:.1f}°C")
+        
         # Adiciona alertas ao histórico
         self.alerts.extend(alerts)
         
@@ -197,7 +228,11 @@ class PerformanceMonitor:
             "metrics": {
                 "cpu_usage": cpu_usage,
                 "memory_usage": memory_usage,
-                "disk_usage": disk_usage
+                "disk_usage": disk_usage,
+                "gpu_usage": sample.gpu_percent,
+                "max_temperature": max_temperature,
+                "process_cpu_usage": sample.process_cpu_percent,
+                "sample_age": max(0.0, current_time.timestamp() - sample.timestamp)
             }
         }
     
@@ -289,7 +324,8 @@ class PerformanceMonitor:
             "baseline": self.baseline_metrics,
             "thresholds": self.alert_thresholds,
             "recent_alerts": self.alerts[-10:] if self.alerts else [],
-            "metrics": self.metrics_collector.get_current_metrics()
+            "metrics": self.metrics_collector.get_current_metrics(),
+            "sampler": self.sampler.get_status()
         }
     
     def get_performance_report(self, hours: int = 1) -> Dict[str, Any]:
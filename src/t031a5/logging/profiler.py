@@ -0,0 +1,502 @@
+"""
+Profiler por amostragem para o sistema t031a5 em execução.
+
+Uma thread própria lê ``sys._current_frames()`` em intervalo fixo e conta as
+pilhas de todas as threads (event loop, executores, SDK) no formato
+"collapsed stack" (``thread;raiz;...;folha N``), que ``flamegraph.pl``,
+speedscope e similares leem direto. A amostragem é ligada e desligada em
+execução (WebSim, sinal, ``start_profiling``/``stop_profiling``); desligada,
+a thread só vigia o event loop.
+
+A thread só lê as pilhas quando pega o GIL, e quem solta o GIL sem ser
+forçado o faz em pontos de espera (``select`` do loop); trechos de Python
+mais curtos que o ``switch interval`` (5 ms) quase não aparecem. Enquanto
+amostra, o intervalo cai para ``switch_interval`` (1 ms) e volta ao parar.
+
+Travadas do loop: um callback barato reagenda a si mesmo no loop e marca a
+hora de cada execução. Se a marca atrasa além de ``stall_threshold_ms``, a
+thread lê a pilha do loop naquele instante e registra a task (ou callback)
+em execução e a linha onde o loop está parado — sem o custo do modo debug
+do asyncio.
+"""
+
+import asyncio
+import logging
+import re
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+_WORKER_SUFFIX = re.compile(r"_\d+$")
+_LOOP_THREAD = "event-loop"
+
+
+def _code_of(*paths: str) -> set:
+    """Code objects de funções onde uma thread só espera (amostras ociosas)."""
+    codes = set()
+    for path in paths:
+        module_name, _, attr_path = path.partition(":")
+        target: Any = sys.modules.get(module_name)
+        for attr in attr_path.split("."):
+            target = getattr(target, attr, None)
+        code = getattr(target, "__code__", None)
+        if code is not None:
+            codes.add(code)
+    return codes
+
+
+@dataclass
+class LoopStall:
+    """Uma travada do event loop."""
+
+    started_at: float
+    duration_ms: float
+    culprit: str
+    location: str
+    stack: List[str] = field(default_factory=list)
+    ended: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["duration_ms"] = round(self.duration_ms, 1)
+        return data
+
+
+class SamplingProfiler:
+    """
+    Amostrador de pilhas + detector de travadas do event loop.
+
+    Uma pilha é a tupla dos ``id`` dos code objects (os objetos ficam
+    guardados em ``_codes``, então o id não é reaproveitado); os rótulos só
+    são montados na exportação.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            config: enabled, interval, max_depth, max_stacks, include_idle,
+                    switch_interval, stall_threshold_ms, beat_interval,
+                    stall_history, output_dir, signal, duration
+        """
+        config = config or {}
+        self.enabled = config.get("enabled", True)
+        self.interval = config.get("interval", 0.01)
+        self.max_depth = config.get("max_depth", 64)
+        self.max_stacks = config.get("max_stacks", 20000)
+        self.include_idle = config.get("include_idle", False)
+        self.switch_interval = config.get("switch_interval", 0.001)
+        self._saved_switch_interval: Optional[float] = None
+        self.stall_threshold = config.get("stall_threshold_ms", 200.0) / 1000
+        self.beat_interval = config.get("beat_interval", 0.02)
+        self.output_dir = config.get("output_dir")
+        self.signal_name = config.get("signal", "SIGUSR2")
+        self.default_duration = config.get("duration")
+
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, Tuple[int, ...]], int] = {}
+        self._codes: Dict[int, Any] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._names_refreshed = 0.0
+        self._idle_codes = _code_of(
+            "selectors:EpollSelector.select", "selectors:PollSelector.select",
+            "selectors:KqueueSelector.select", "selectors:SelectSelector.select",
+            "threading:Condition.wait", "threading:Thread._wait_for_tstate_lock",
+            "concurrent.futures.thread:_worker"
+        )
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_ident: Optional[int] = None
+        self._beat_handle: Optional[asyncio.TimerHandle] = None
+        self._last_beat: Optional[float] = None
+        self._stall: Optional[LoopStall] = None
+        self._stall_origin = 0.0
+        self.stalls: Deque[LoopStall] = deque(maxlen=config.get("stall_history", 50))
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.profiling = False
+        self._profile_started = 0.0
+        self._profile_until: Optional[float] = None
+
+        # Métricas
+        self.samples = 0
+        self.idle_samples = 0
+        self.truncated = 0
+        self.total_sample_time = 0.0
+        self.max_sample_time = 0.0
+        self.profiled_time = 0.0
+        self.stall_count = 0
+        self.max_stall_ms = 0.0
+        self.last_export: Optional[Path] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # ------------------------------------------------------------------ loop
+
+    def attach_loop(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Vigia ``loop`` (padrão: o loop em execução); chamar de dentro dele.
+
+        Também instala o sinal configurado (``SIGUSR2``) para ligar/desligar
+        a amostragem, quando a plataforma permite.
+        """
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_ident = threading.get_ident()
+        self._last_beat = time.monotonic()
+        if self._beat_handle is None:
+            self._beat_handle = self._loop.call_later(self.beat_interval, self._beat)
+
+        signum = getattr(signal, str(self.signal_name or ""), None)
+        if signum is not None:
+            try:
+                # Exportar escreve arquivo: fora do loop
+                self._loop.add_signal_handler(signum, lambda: self._loop.run_in_executor(None, self.toggle))
+                logger.info(f"🔬 Profiler: {self.signal_name} liga/desliga a amostragem")
+            except (NotImplementedError, RuntimeError, ValueError) as e:
+                logger.debug(f"Sinal {self.signal_name} indisponível para o profiler: {e}")
+
+    def detach_loop(self):
+        """Para de vigiar o loop; chamar de dentro dele."""
+        if self._beat_handle is not None:
+            self._beat_handle.cancel()
+            self._beat_handle = None
+        signum = getattr(signal, str(self.signal_name or ""), None)
+        if self._loop is not None and signum is not None:
+            try:
+                self._loop.remove_signal_handler(signum)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+        self._loop = None
+        self._loop_ident = None
+        self._last_beat = None
+
+    def _beat(self):
+        if self._loop is None:
+            return
+        self._last_beat = time.monotonic()
+        self._beat_handle = self._loop.call_later(self.beat_interval, self._beat)
+
+    # ------------------------------------------------------------ controle
+
+    def start(self) -> bool:
+        """Inicia a thread (vigia o loop; amostra só com ``start_profiling``)."""
+        if not self.enabled:
+            return False
+        if self.is_running:
+            return True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        logger.info(f"🔬 Profiler iniciado (travadas > {self.stall_threshold * 1000:.0f}ms, "
+                    f"amostragem a cada {self.interval * 1000:g}ms quando ligada)")
+        return True
+
+    def stop(self, timeout: float = 1.0):
+        """Para a thread (exporta o perfil em andamento, se houver)."""
+        if self.profiling:
+            self.stop_profiling()
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def start_profiling(self, duration: Optional[float] = None, reset: bool = True) -> bool:
+        """Liga a amostragem; ``duration`` (s) desliga e exporta sozinho."""
+        if not self.enabled:
+            return False
+        if not self.is_running:
+            self.start()
+        with self._lock:
+            if reset:
+                self._counts.clear()
+                self.samples = 0
+                self.idle_samples = 0
+                self.truncated = 0
+                self.total_sample_time = 0.0
+                self.max_sample_time = 0.0
+                self.profiled_time = 0.0
+            duration = duration if duration is not None else self.default_duration
+            self._profile_until = time.monotonic() + duration if duration else None
+            self._profile_started = time.monotonic()
+            if self.switch_interval and self._saved_switch_interval is None:
+                self._saved_switch_interval = sys.getswitchinterval()
+                sys.setswitchinterval(self.switch_interval)
+            self.profiling = True
+        logger.info("🔬 Amostragem ligada" + (f" por {duration:g}s" if duration else ""))
+        return True
+
+    def stop_profiling(self, export: bool = True) -> Optional[Path]:
+        """Desliga a amostragem e exporta em ``output_dir`` (se configurado)."""
+        with self._lock:
+            if not self.profiling:
+                return None
+            self.profiling = False
+            self._profile_until = None
+            self.profiled_time += time.monotonic() - self._profile_started
+            if self._saved_switch_interval is not None:
+                sys.setswitchinterval(self._saved_switch_interval)
+                self._saved_switch_interval = None
+        logger.info(f"🔬 Amostragem desligada: {self.samples} amostras, "
+                    f"overhead {self._overhead_pct():.2f}%")
+        if export and self.output_dir:
+            return self.export()
+        return None
+
+    def toggle(self) -> bool:
+        """Alterna a amostragem; retorna se ficou ligada."""
+        if self.profiling:
+            self.stop_profiling()
+            return False
+        return self.start_profiling()
+
+    # --------------------------------------------------------------- thread
+
+    def _run(self):
+        origin = time.monotonic()
+        elapsed = 0.0
+        while True:
+            # Ligada: passo da amostragem; desligada: só o necessário para as travadas
+            step = self.interval if self.profiling else min(self.beat_interval, self.stall_threshold / 4)
+            elapsed += step
+            delay = origin + elapsed - time.monotonic()
+            if delay > 0:
+                if self._stop_event.wait(delay):
+                    break
+            else:
+                # Atrasou (GIL ocupado): pula os ciclos perdidos
+                elapsed += int(-delay / step) * step
+                if self._stop_event.is_set():
+                    break
+            try:
+                now = time.monotonic()
+                if self._last_beat is not None:
+                    self._check_stall(now)
+                if self.profiling:
+                    if self._profile_until is not None and now >= self._profile_until:
+                        self.stop_profiling()
+                    else:
+                        self._sample()
+            except Exception as e:
+                logger.error(f"Erro no profiler: {e}")
+
+    def _refresh_thread_names(self, now: float):
+        names = {}
+        for thread in threading.enumerate():
+            # Workers do mesmo pool viram uma linha só no flamegraph
+            names[thread.ident] = _WORKER_SUFFIX.sub("", thread.name)
+        if self._loop_ident is not None:
+            names[self._loop_ident] = _LOOP_THREAD
+        self._thread_names = names
+        self._names_refreshed = now
+
+    def _sample(self):
+        start = time.perf_counter()
+        if start - self._names_refreshed > 1.0:
+            self._refresh_thread_names(start)
+        own = threading.get_ident()
+        names = self._thread_names
+        codes = self._codes
+        idle = self._idle_codes
+        max_depth = self.max_depth
+        with self._lock:
+            counts = self._counts
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if not self.include_idle and frame.f_code in idle:
+                    self.idle_samples += 1
+                    continue
+                stack = []
+                depth = 0
+                while frame is not None and depth < max_depth:
+                    code = frame.f_code
+                    key = id(code)
+                    if key not in codes:
+                        codes[key] = code
+                    stack.append(key)
+                    frame = frame.f_back
+                    depth += 1
+                key = (names.get(ident, f"thread-{ident}"), tuple(stack))
+                count = counts.get(key)
+                if count is not None:
+                    counts[key] = count + 1
+                elif len(counts) < self.max_stacks:
+                    counts[key] = 1
+                else:
+                    self.truncated += 1
+            self.samples += 1
+        elapsed = time.perf_counter() - start
+        self.total_sample_time += elapsed
+        if elapsed > self.max_sample_time:
+            self.max_sample_time = elapsed
+
+    def _check_stall(self, now: float):
+        last = self._last_beat
+        lag = now - last - self.beat_interval
+        stall = self._stall
+        if lag <= self.stall_threshold:
+            if stall is not None and last > self._stall_origin:
+                # Voltou a bater: duração real até a batida que encerrou a travada
+                stall.duration_ms = max(stall.duration_ms, (last - self._stall_origin - self.beat_interval) * 1000)
+                stall.ended = True
+                self.max_stall_ms = max(self.max_stall_ms, stall.duration_ms)
+                self._stall = None
+                logger.warning(f"🐢 Event loop travou {stall.duration_ms:.0f}ms em {stall.culprit} "
+                               f"({stall.location})")
+            return
+        if stall is None:
+            stall = self._capture_stall(lag)
+            self._stall = stall
+            self._stall_origin = last
+            self.stall_count += 1
+            self.stalls.append(stall)
+            logger.warning(f"🐢 Event loop travado há {lag * 1000:.0f}ms em {stall.culprit} ({stall.location})")
+        else:
+            stall.duration_ms = lag * 1000
+
+    def _capture_stall(self, lag: float) -> LoopStall:
+        """Pilha do loop e task/callback em execução no momento da travada."""
+        frame = sys._current_frames().get(self._loop_ident) if self._loop_ident else None
+        stack = []
+        location = None
+        handle_run = getattr(asyncio.events.Handle._run, "__code__", None)
+        callback = None
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            where = f"{Path(code.co_filename).name}:{frame.f_lineno} em {code.co_name}"
+            stack.append(where)
+            # Primeira linha do projeto a partir da folha; senão, a própria folha
+            if location is None and "t031a5" in code.co_filename:
+                location = where
+            if code is handle_run and callback is None:
+                handle = frame.f_locals.get("self")
+                callback = getattr(handle, "_callback", None)
+            frame = frame.f_back
+        if location is None:
+            location = stack[0] if stack else "?"
+
+        culprit = "?"
+        task = None
+        if self._loop is not None:
+            try:
+                task = asyncio.current_task(self._loop)
+            except RuntimeError:
+                task = None
+        if task is not None:
+            coro = task.get_coro()
+            culprit = f"task {task.get_name()} ({getattr(coro, '__qualname__', coro)})"
+        elif callback is not None:
+            culprit = f"callback {getattr(callback, '__qualname__', repr(callback))}"
+        return LoopStall(time.time() - lag, lag * 1000, culprit, location, stack[:20])
+
+    # ------------------------------------------------------------- exportação
+
+    @staticmethod
+    def _label(code) -> str:
+        name = getattr(code, "co_qualname", code.co_name)
+        return f"{name} ({Path(code.co_filename).name}:{code.co_firstlineno})".replace(";", ",")
+
+    def _snapshot(self) -> List[Tuple[Tuple[str, Tuple[int, ...]], int]]:
+        with self._lock:
+            return list(self._counts.items())
+
+    def collapsed(self) -> str:
+        """Pilhas no formato collapsed (``thread;raiz;...;folha contagem``)."""
+        labels: Dict[int, str] = {}
+        lines = []
+        for (thread, stack), count in sorted(self._snapshot(), key=lambda item: -item[1]):
+            frames = []
+            for key in reversed(stack):
+                label = labels.get(key)
+                if label is None:
+                    label = labels[key] = self._label(self._codes[key])
+                frames.append(label)
+            lines.append(f"{';'.join([thread] + frames)} {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def top_functions(self, limit: int = 15) -> List[Dict[str, Any]]:
+        """Funções com mais amostras próprias (folha) e inclusivas."""
+        own: Dict[int, int] = {}
+        inclusive: Dict[int, int] = {}
+        total = 0
+        for (_, stack), count in self._snapshot():
+            total += count
+            if stack:
+                own[stack[0]] = own.get(stack[0], 0) + count
+            for key in set(stack):
+                inclusive[key] = inclusive.get(key, 0) + count
+        ranked = sorted(own.items(), key=lambda item: -item[1])[:limit]
+        return [
+            {
+                "function": self._label(self._codes[key]),
+                "self_pct": round(count / total * 100, 2),
+                "total_pct": round(inclusive[key] / total * 100, 2)
+            }
+            for key, count in ranked
+        ]
+
+    def export(self, directory: Optional[Union[str, Path]] = None) -> Optional[Path]:
+        """Grava ``profile_<data>.collapsed`` em ``directory`` (padrão: ``output_dir``)."""
+        directory = directory or self.output_dir
+        if not directory:
+            return None
+        path = Path(directory) / f"profile_{time.strftime('%Y%m%d_%H%M%S')}.collapsed"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(self.collapsed(), encoding="utf-8")
+            self.last_export = path
+            logger.info(f"🔬 Perfil exportado: {path}")
+            return path
+        except Exception as e:
+            logger.error(f"Erro ao exportar perfil para {path}: {e}")
+            return None
+
+    def _overhead_pct(self) -> float:
+        wall = self.profiled_time + (time.monotonic() - self._profile_started if self.profiling else 0.0)
+        return self.total_sample_time / wall * 100 if wall > 0 else 0.0
+
+    def get_status(self) -> Dict[str, Any]:
+        """Estado, custo da amostragem e travadas recentes."""
+        return {
+            "enabled": self.enabled,
+            "running": self.is_running,
+            "profiling": self.profiling,
+            "loop_attached": self._loop is not None,
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "idle_samples": self.idle_samples,
+            "stacks": len(self._counts),
+            "truncated": self.truncated,
+            "avg_sample_us": round(self.total_sample_time / self.samples * 1e6, 1) if self.samples else 0.0,
+            "max_sample_us": round(self.max_sample_time * 1e6, 1),
+            "overhead_pct": round(self._overhead_pct(), 3),
+            "stall_threshold_ms": self.stall_threshold * 1000,
+            "stall_count": self.stall_count,
+            "max_stall_ms": round(self.max_stall_ms, 1),
+            "stalls": [stall.to_dict() for stall in list(self.stalls)[-5:]],
+            "last_export": str(self.last_export) if self.last_export else None
+        }
+
+
+_sampling_profiler: Optional[SamplingProfiler] = None
+
+
+def get_sampling_profiler(config: Optional[Dict[str, Any]] = None) -> SamplingProfiler:
+    """
+    Retorna o profiler do processo.
+
+    A configuração só é aplicada na primeira chamada.
+    """
+    global _sampling_profiler
+    if _sampling_profiler is None:
+        _sampling_profiler = SamplingProfiler(config)
+    return _sampling_profiler
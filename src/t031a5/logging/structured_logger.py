@@ -16,6 +16,8 @@ from rich.console import Console
 from rich.logging import RichHandler
 from rich.table import Table
 
+from .log_pipeline import LogPipeline
+
 
 class LogLevel(Enum):
     """Níveis de log disponíveis."""
@@ -51,6 +53,34 @@ class LogContext:
         }
 
 
+class StructuredJsonFormatter(logging.Formatter):
+    """
+    Serializa o registro em JSON só quando ele é escrito.
+    
+    Campos extras e o contexto chegam no registro (``structured_fields`` e
+    ``structured_context``); com o pipeline assíncrono o ``json.dumps`` roda
+    na thread escritora.
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        log_data = {
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "logger": record.name,
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            **getattr(record, "structured_fields", {})
+        }
+        context = getattr(record, "structured_context", None)
+        if context:
+            log_data["context"] = context.to_dict()
+        if record.exc_text:
+            log_data["exception"] = record.exc_text
+        return json.dumps(log_data, ensure_ascii=False, default=str)
+
+
+_LEVEL_NUMBERS = {level: getattr(logging, level.value) for level in LogLevel}
+
+
 class StructuredLogger:
     """Logger estruturado avançado."""
     
@@ -60,7 +90,9 @@ class StructuredLogger:
         log_file: Optional[Path] = None,
         console_output: bool = True,
         json_output: bool = False,
-        level: LogLevel = LogLevel.INFO
+        level: LogLevel = LogLevel.INFO,
+        async_output: bool = False,
+        pipeline_config: Optional[Dict[str, Any]] = None
     ):
         """
         Inicializa o logger estruturado.
@@ -71,12 +103,19 @@ class StructuredLogger:
             console_output: Se deve sair no console
             json_output: Se deve usar formato JSON
             level: Nível de log
+            async_output: Formata e escreve numa thread (LogPipeline), com
+                          o arquivo em lotes e rotação por tamanho
+            pipeline_config: Configuração do LogPipeline (queue_size,
+                             batch_size, flush_interval, max_bytes, backup_count)
         """
         self.name = name
         self.log_file = log_file
         self.console_output = console_output
         self.json_output = json_output
         self.level = level
+        self.async_output = async_output
+        self.pipeline_config = pipeline_config or {}
+        self.pipeline: Optional[LogPipeline] = None
         
         # Configura logger base
         self.logger = logging.getLogger(name)
@@ -118,6 +157,18 @@ class StructuredLogger:
             
             self.logger.addHandler(console_handler)
         
+        if self.async_output:
+            # Console passa a ser chamado pela escritora; o arquivo é escrito em lotes
+            self.pipeline = LogPipeline(
+                {**self.pipeline_config, "file": self.log_file}, handlers=self.logger.handlers[:]
+            )
+            self.pipeline.formatter = formatter
+            for handler in self.logger.handlers[:]:
+                self.logger.removeHandler(handler)
+            self.logger.addHandler(self.pipeline.handler)
+            self.pipeline.start()
+            return
+        
         # Handler de arquivo
         if self.log_file:
             self.log_file.parent.mkdir(parents=True, exist_ok=True)
@@ -128,7 +179,7 @@ class StructuredLogger:
     def _create_formatter(self):
         """Cria o formatador apropriado."""
         if self.json_output:
-            return logging.Formatter("%(message)s")
+            return StructuredJsonFormatter()
         else:
             return logging.Formatter(
                 "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -142,35 +193,22 @@ class StructuredLogger:
         **kwargs
     ):
         """Log com contexto estruturado."""
-        start_time = time.time()
-        
-        # Prepara dados do log
-        log_data = {
-            "level": level.value,
-            "message": message,
-            "logger": self.name,
-            "timestamp": datetime.now().isoformat(),
-            **kwargs
-        }
-        
-        # Adiciona contexto se disponível
-        if context:
-            log_data["context"] = context.to_dict()
+        levelno = _LEVEL_NUMBERS[level]
+        # Nível desligado: nada de contexto, dict ou formatação
+        if not self.logger.isEnabledFor(levelno):
+            return
+        start_time = time.perf_counter()
         
-        # Formata mensagem
         if self.json_output:
-            formatted_message = json.dumps(log_data, ensure_ascii=False)
+            # JSON montado pelo StructuredJsonFormatter, na hora de escrever
+            self.logger.log(levelno, message, extra={"structured_fields": kwargs, "structured_context": context})
         else:
             # Formato legível
             context_str = f" [{context.component}:{context.operation}]" if context else ""
-            formatted_message = f"{message}{context_str}"
-        
-        # Log
-        log_method = getattr(self.logger, level.value.lower())
-        log_method(formatted_message)
+            self.logger.log(levelno, f"{message}{context_str}")
         
         # Atualiza métricas
-        self._update_metrics(level, context, time.time() - start_time)
+        self._update_metrics(level, context, time.perf_counter() - start_time)
     
     def _update_metrics(self, level: LogLevel, context: Optional[LogContext], log_time: float):
         """Atualiza métricas de logging."""
@@ -239,7 +277,16 @@ class StructuredLogger:
     
     def get_metrics(self) -> Dict[str, Any]:
         """Retorna métricas do logger."""
-        return self.metrics.copy()
+        metrics = self.metrics.copy()
+        if self.pipeline:
+            metrics["pipeline"] = self.pipeline.get_stats()
+        return metrics
+    
+    def close(self):
+        """Esvazia o pipeline assíncrono (se houver) e devolve os handlers."""
+        if self.pipeline:
+            self.pipeline.stop()
+            self.pipeline = None
     
     def print_metrics_table(self):
         """Imprime métricas em formato de tabela."""
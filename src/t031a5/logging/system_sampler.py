@@ -0,0 +1,367 @@
+"""
+Amostragem de saúde do sistema em background para o t031a5.
+
+Uma thread lê contadores cumulativos (tempos de CPU do sistema, por núcleo,
+do processo, de cada thread e dos filhos; bytes de disco) a cada
+``interval`` e calcula as taxas pela diferença entre duas leituras, em vez
+de bloquear com ``psutil.cpu_percent(interval=...)``. Na Jetson também lê a
+carga da GPU e as zonas térmicas direto do sysfs.
+
+Quem consulta recebe a última amostra em cache (``latest``) sem esperar.
+"""
+
+import glob
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# Carga da GPU em ‰ (Nano/TX2/Xavier e Orin); devfreq cobre variantes de nome
+GPU_LOAD_PATHS = (
+    "/sys/devices/gpu.0/load",
+    "/sys/devices/platform/gpu.0/load",
+    "/sys/devices/platform/17000000.ga10b/load",
+    "/sys/devices/platform/bus@0/17000000.gpu/load",
+)
+GPU_LOAD_GLOB = "/sys/class/devfreq/*/device/load"
+THERMAL_GLOB = "/sys/class/thermal/thermal_zone*"
+
+
+@dataclass(frozen=True)
+class SystemSample:
+    """Uma amostra de saúde do sistema (taxas do intervalo anterior)."""
+    timestamp: float
+    interval: float                                   # segundos desde a amostra anterior
+    cpu_percent: float
+    cpu_per_core: List[float]
+    memory_percent: float
+    memory_available_mb: float
+    disk_percent: float
+    disk_read_bps: float
+    disk_write_bps: float
+    process_cpu_percent: float                        # 100% = um núcleo inteiro
+    process_rss_mb: float
+    threads: List[Dict[str, Any]] = field(default_factory=list)     # maiores consumidores
+    children: List[Dict[str, Any]] = field(default_factory=list)
+    gpu_percent: Optional[float] = None
+    temperatures: Dict[str, float] = field(default_factory=dict)   # °C por zona térmica
+
+    @property
+    def max_temperature(self) -> Optional[float]:
+        return max(self.temperatures.values()) if self.temperatures else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "interval": round(self.interval, 3),
+            "cpu_percent": round(self.cpu_percent, 1),
+            "cpu_per_core": [round(value, 1) for value in self.cpu_per_core],
+            "memory_percent": round(self.memory_percent, 1),
+            "memory_available_mb": round(self.memory_available_mb, 1),
+            "disk_percent": round(self.disk_percent, 1),
+            "disk_read_bps": round(self.disk_read_bps),
+            "disk_write_bps": round(self.disk_write_bps),
+            "process": {
+                "cpu_percent": round(self.process_cpu_percent, 1),
+                "rss_mb": round(self.process_rss_mb, 1),
+                "threads": self.threads,
+                "children": self.children
+            },
+            "gpu_percent": None if self.gpu_percent is None else round(self.gpu_percent, 1),
+            "temperatures": {zone: round(value, 1) for zone, value in self.temperatures.items()},
+            "max_temperature": self.max_temperature
+        }
+
+
+def _busy_and_total(times) -> Tuple[float, float]:
+    # guest já está contado em user no Linux (mesma correção do psutil.cpu_percent)
+    total = sum(times) - getattr(times, "guest", 0.0) - getattr(times, "guest_nice", 0.0)
+    idle = times.idle + getattr(times, "iowait", 0.0)
+    return total - idle, total
+
+
+def _delta_percent(previous: Tuple[float, float], current: Tuple[float, float]) -> float:
+    busy = current[0] - previous[0]
+    total = current[1] - previous[1]
+    return max(0.0, min(100.0, busy / total * 100)) if total > 0 else 0.0
+
+
+def _read_number(path: str) -> Optional[float]:
+    try:
+        with open(path, "r") as f:
+            return float(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+class SystemSampler:
+    """
+    Thread que mantém a última amostra de saúde do sistema.
+
+    Os contadores são lidos uma vez na criação, então a primeira
+    ``sample_now`` já tem um intervalo de referência e nunca bloqueia.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            config: interval, disk_path, top_threads, top_children,
+                    gpu_load_path, thermal_zones (lista de tipos; vazio = todas)
+        """
+        config = config or {}
+        self.interval = config.get("interval", 1.0)
+        self.disk_path = config.get("disk_path", "/")
+        self.top_threads = config.get("top_threads", 5)
+        self.top_children = config.get("top_children", 5)
+
+        self._process = psutil.Process()
+        self._gpu_load_path = config.get("gpu_load_path") or self._find_gpu_load()
+        self._thermal_zones = self._find_thermal_zones(config.get("thermal_zones", []))
+
+        self.latest: Optional[SystemSample] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # Métricas
+        self.samples = 0
+        self.errors = 0
+        self.total_sample_time = 0.0
+
+        self._prime()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @staticmethod
+    def _find_gpu_load() -> Optional[str]:
+        for path in GPU_LOAD_PATHS:
+            if os.path.exists(path):
+                return path
+        candidates = sorted(glob.glob(GPU_LOAD_GLOB))
+        return candidates[0] if candidates else None
+
+    @staticmethod
+    def _find_thermal_zones(wanted: List[str]) -> Dict[str, str]:
+        zones = {}
+        for zone in sorted(glob.glob(THERMAL_GLOB)):
+            try:
+                with open(os.path.join(zone, "type"), "r") as f:
+                    name = f.read().strip()
+            except OSError:
+                continue
+            if not wanted or name in wanted:
+                zones[name] = os.path.join(zone, "temp")
+        return zones
+
+    def _prime(self):
+        """Primeira leitura dos contadores (referência para as diferenças)."""
+        self._last_time = time.monotonic()
+        self._last_cpu = _busy_and_total(psutil.cpu_times())
+        self._last_cores = [_busy_and_total(times) for times in psutil.cpu_times(percpu=True)]
+        self._last_disk = self._disk_counters()
+        self._last_process = self._process_cpu_time(self._process)
+        self._last_threads = self._thread_times()
+        self._last_children: Dict[int, float] = {}
+
+    def _disk_counters(self) -> Optional[Tuple[int, int]]:
+        try:
+            counters = psutil.disk_io_counters()
+        except Exception:
+            return None
+        return (counters.read_bytes, counters.write_bytes) if counters else None
+
+    @staticmethod
+    def _process_cpu_time(process: psutil.Process) -> float:
+        times = process.cpu_times()
+        return times.user + times.system
+
+    def _thread_times(self) -> Dict[int, float]:
+        try:
+            return {thread.id: thread.user_time + thread.system_time for thread in self._process.threads()}
+        except (psutil.AccessDenied, psutil.NoSuchProcess):
+            return {}
+
+    def _thread_names(self) -> Dict[int, str]:
+        """Nomes das threads Python (o comm do Linux não reflete ``Thread.name``)."""
+        return {thread.native_id: thread.name for thread in threading.enumerate()
+                if getattr(thread, "native_id", None) is not None}
+
+    def _comm(self, tid: int) -> str:
+        try:
+            with open(f"/proc/{self._process.pid}/task/{tid}/comm", "r") as f:
+                return f.read().strip()
+        except OSError:
+            return str(tid)
+
+    def sample_now(self) -> SystemSample:
+        """Lê os contadores agora, atualiza ``latest`` e devolve a amostra (não bloqueia)."""
+        start = time.perf_counter()
+        with self._lock:
+            now = time.monotonic()
+            elapsed = max(now - self._last_time, 1e-6)
+
+            cpu = _busy_and_total(psutil.cpu_times())
+            cpu_percent = _delta_percent(self._last_cpu, cpu)
+            cores = [_busy_and_total(times) for times in psutil.cpu_times(percpu=True)]
+            per_core = [_delta_percent(previous, current) for previous, current in zip(self._last_cores, cores)]
+
+            memory = psutil.virtual_memory()
+            disk_percent = psutil.disk_usage(self.disk_path).percent
+            disk = self._disk_counters()
+            read_bps = write_bps = 0.0
+            if disk and self._last_disk:
+                read_bps = (disk[0] - self._last_disk[0]) / elapsed
+                write_bps = (disk[1] - self._last_disk[1]) / elapsed
+
+            process_time = self._process_cpu_time(self._process)
+            process_percent = (process_time - self._last_process) / elapsed * 100
+            threads_now = self._thread_times()
+            threads = self._top_threads(threads_now, elapsed)
+            children, children_now = self._children(elapsed)
+
+            sample = SystemSample(
+                timestamp=time.time(),
+                interval=elapsed,
+                cpu_percent=cpu_percent,
+                cpu_per_core=per_core,
+                memory_percent=memory.percent,
+                memory_available_mb=memory.available / 1048576,
+                disk_percent=disk_percent,
+                disk_read_bps=read_bps,
+                disk_write_bps=write_bps,
+                process_cpu_percent=process_percent,
+                process_rss_mb=self._process.memory_info().rss / 1048576,
+                threads=threads,
+                children=children,
+                gpu_percent=self._gpu_percent(),
+                temperatures=self._temperatures()
+            )
+
+            self._last_time, self._last_cpu, self._last_cores = now, cpu, cores
+            self._last_disk, self._last_process = disk, process_time
+            self._last_threads, self._last_children = threads_now, children_now
+            self.latest = sample
+
+        self.samples += 1
+        self.total_sample_time += time.perf_counter() - start
+        return sample
+
+    def _top_threads(self, threads_now: Dict[int, float], elapsed: float) -> List[Dict[str, Any]]:
+        deltas = sorted(
+            ((tid, cpu_time - self._last_threads.get(tid, cpu_time)) for tid, cpu_time in threads_now.items()),
+            key=lambda item: item[1], reverse=True
+        )[:self.top_threads]
+        names = self._thread_names()
+        return [
+            {"tid": tid, "name": names.get(tid) or self._comm(tid), "cpu_percent": round(delta / elapsed * 100, 1)}
+            for tid, delta in deltas
+        ]
+
+    def _children(self, elapsed: float) -> Tuple[List[Dict[str, Any]], Dict[int, float]]:
+        """CPU por processo filho (ex.: players de áudio, conversores)."""
+        times: Dict[int, float] = {}
+        usage = []
+        try:
+            children = self._process.children(recursive=True)
+        except (psutil.AccessDenied, psutil.NoSuchProcess):
+            return [], {}
+        for child in children:
+            try:
+                cpu_time = self._process_cpu_time(child)
+                name = child.name()
+            except (psutil.AccessDenied, psutil.NoSuchProcess):
+                continue
+            times[child.pid] = cpu_time
+            previous = self._last_children.get(child.pid)
+            if previous is not None:
+                usage.append({"pid": child.pid, "name": name,
+                              "cpu_percent": round((cpu_time - previous) / elapsed * 100, 1)})
+        usage.sort(key=lambda item: item["cpu_percent"], reverse=True)
+        return usage[:self.top_children], times
+
+    def _gpu_percent(self) -> Optional[float]:
+        if not self._gpu_load_path:
+            return None
+        load = _read_number(self._gpu_load_path)
+        return None if load is None else load / 10.0
+
+    def _temperatures(self) -> Dict[str, float]:
+        temperatures = {}
+        for name, path in self._thermal_zones.items():
+            value = _read_number(path)
+            if value is not None:
+                temperatures[name] = value / 1000.0
+        return temperatures
+
+    def start(self) -> bool:
+        """Inicia a thread de amostragem."""
+        if self.is_running:
+            return True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="system-sampler", daemon=True)
+        self._thread.start()
+        logger.info(f"📈 Amostragem do sistema iniciada (a cada {self.interval:.1f}s, "
+                    f"GPU: {'sim' if self._gpu_load_path else 'não'}, {len(self._thermal_zones)} zonas térmicas)")
+        return True
+
+    def stop(self, timeout: float = 1.0):
+        """Para a thread (bloqueia até ``timeout``)."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        origin = time.monotonic()
+        tick = 0
+        while True:
+            tick += 1
+            delay = origin + tick * self.interval - time.monotonic()
+            if delay > 0:
+                if self._stop_event.wait(delay):
+                    break
+            else:
+                tick += int(-delay / self.interval)
+                if self._stop_event.is_set():
+                    break
+            try:
+                self.sample_now()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Erro na amostragem do sistema: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Estado da thread, custo médio e última amostra."""
+        return {
+            "running": self.is_running,
+            "interval": self.interval,
+            "samples": self.samples,
+            "errors": self.errors,
+            "avg_sample_ms": round(self.total_sample_time / self.samples * 1000, 2) if self.samples else 0.0,
+            "gpu_load_path": self._gpu_load_path,
+            "thermal_zones": list(self._thermal_zones),
+            "latest": self.latest.to_dict() if self.latest else None
+        }
+
+
+_system_sampler: Optional[SystemSampler] = None
+
+
+def get_system_sampler(config: Optional[Dict[str, Any]] = None) -> SystemSampler:
+    """
+    Retorna o amostrador do processo.
+
+    A configuração só é aplicada na primeira chamada.
+    """
+    global _system_sampler
+    if _system_sampler is None:
+        _system_sampler = SystemSampler(config)
+    return _system_sampler
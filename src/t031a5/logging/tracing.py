@@ -0,0 +1,438 @@
+"""
+Tracing de turnos de conversa para o sistema t031a5.
+
+Cada turno (inputs → fusão → prompt → LLM → TTS → reprodução → actions)
+vira um trace com spans por estágio. Os spans terminados vão para um buffer
+circular de tamanho fixo e a duração de cada estágio alimenta um anel
+pré-alocado, de onde saem p50/p95/p99 no ``get_status``.
+
+O span corrente fica num ``ContextVar``: tasks criadas dentro de um span
+herdam o pai. Entre estágios que trocam itens por filas (pipeline), o span
+do turno viaja junto com o item e é reativado com ``activate``.
+
+Marcos instantâneos (``mark``: primeiro token do LLM, primeiro áudio do TTS,
+início da reprodução) medem o tempo desde o início do span pai.
+
+O buffer pode ser exportado no formato Chrome trace (chrome://tracing,
+Perfetto) ou OTLP/JSON do OpenTelemetry.
+"""
+
+import contextvars
+import itertools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("t031a5_current_span", default=None)
+_INHERIT = object()
+
+
+class Span:
+    """Span em andamento; só entra no buffer ao terminar (``end``)."""
+
+    __slots__ = ("tracer", "trace_id", "span_id", "parent_id", "name", "kind",
+                 "start_ns", "end_ns", "attrs")
+
+    def __init__(self, tracer: "Tracer", trace_id: int, span_id: int, parent_id: Optional[int],
+                 name: str, start_ns: int, attrs: Dict[str, Any], kind: str = "span"):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = start_ns
+        self.end_ns: Optional[int] = None
+        self.attrs = attrs
+
+    def __bool__(self) -> bool:
+        return True
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return None if self.end_ns is None else (self.end_ns - self.start_ns) / 1e6
+
+    def set(self, key: str, value: Any):
+        self.attrs[key] = value
+
+    def end(self, end_ns: Optional[int] = None, **attrs):
+        """Termina o span (chamadas repetidas são ignoradas)."""
+        if self.end_ns is not None:
+            return
+        if attrs:
+            self.attrs.update(attrs)
+        self.end_ns = time.perf_counter_ns() if end_ns is None else end_ns
+        self.tracer._finish(self, self.end_ns - self.start_ns)
+
+
+class _NullSpan:
+    """Span inerte devolvido com o tracing desligado."""
+
+    __slots__ = ()
+    duration_ms = None
+
+    def __bool__(self) -> bool:
+        return False
+
+    def set(self, key: str, value: Any):
+        pass
+
+    def end(self, end_ns: Optional[int] = None, **attrs):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+AnySpan = Union[Span, _NullSpan]
+
+
+class _SpanScope:
+    """Bloco ``with`` de um span: ativa no contexto e termina ao sair."""
+
+    __slots__ = ("span", "token")
+
+    def __init__(self, span: Span):
+        self.span = span
+        self.token = None
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _current_span.reset(self.token)
+        if exc_type is not None:
+            self.span.set("error", exc_type.__name__)
+        self.span.end()
+        return False
+
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return NULL_SPAN
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _StageStats:
+    """Durações recentes de um estágio num anel float32."""
+
+    __slots__ = ("count", "max_ms", "_samples", "_head")
+
+    def __init__(self, samples: int):
+        self.count = 0
+        self.max_ms = 0.0
+        self._samples = np.zeros(samples, dtype=np.float32)
+        self._head = 0
+
+    def add(self, duration_ms: float):
+        self._samples[self._head] = duration_ms
+        self._head = (self._head + 1) % len(self._samples)
+        self.count += 1
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+
+    def summary(self) -> Dict[str, Any]:
+        window = self._samples[:min(self.count, len(self._samples))]
+        p50, p95, p99 = np.percentile(window, (50, 95, 99)).tolist()
+        return {
+            "count": self.count,
+            "p50_ms": round(p50, 2),
+            "p95_ms": round(p95, 2),
+            "p99_ms": round(p99, 2),
+            "max_ms": round(self.max_ms, 2)
+        }
+
+
+class Tracer:
+    """
+    Tracer de baixo custo com buffer circular de spans.
+
+    Abrir e fechar um span custa dois ``perf_counter_ns``, um objeto com
+    ``__slots__`` e um ``append`` no deque; nada é serializado até a
+    exportação.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            config: enabled, capacity (spans no buffer), samples (durações por
+                    estágio para os percentis), export_dir, service_name
+        """
+        config = config or {}
+        self.enabled = config.get("enabled", True)
+        self.capacity = config.get("capacity", 4096)
+        self.samples = config.get("samples", 512)
+        self.export_dir = config.get("export_dir")
+        self.service_name = config.get("service_name", "t031a5")
+
+        self._spans: Deque[Span] = deque(maxlen=self.capacity)
+        self._stages: Dict[str, _StageStats] = {}
+        self._lock = threading.Lock()
+        self._span_ids = itertools.count(random.getrandbits(48) or 1)
+        # perf_counter_ns não tem época: o offset converte para Unix na exportação
+        self._epoch_offset_ns = time.time_ns() - time.perf_counter_ns()
+
+        # Métricas
+        self.traces_started = 0
+        self.spans_finished = 0
+
+    # ------------------------------------------------------------------ spans
+
+    def current(self) -> Optional[Span]:
+        """Span ativo no contexto atual."""
+        return _current_span.get()
+
+    def start_span(self, name: str, parent: Any = _INHERIT, start_ns: Optional[int] = None,
+                   **attrs) -> AnySpan:
+        """
+        Abre um span sem ativá-lo.
+
+        Sem pai (nem explícito nem no contexto) o span inicia um trace novo.
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        if parent is _INHERIT:
+            parent = _current_span.get()
+        if parent:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            trace_id, parent_id = random.getrandbits(128) or 1, None
+            self.traces_started += 1
+        return Span(self, trace_id, next(self._span_ids), parent_id, name,
+                    time.perf_counter_ns() if start_ns is None else start_ns, attrs)
+
+    @contextmanager
+    def activate(self, span: Optional[AnySpan]) -> Iterator[Optional[AnySpan]]:
+        """Torna ``span`` o pai dos spans abertos neste contexto (sem terminá-lo)."""
+        if not span:
+            yield span
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.reset(token)
+
+    def span(self, name: str, **attrs) -> Union[_SpanScope, _NullScope]:
+        """Span filho do span corrente, ativo e terminado ao sair do bloco ``with``."""
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _SpanScope(self.start_span(name, **attrs))
+
+    def mark(self, name: str, **attrs):
+        """
+        Marco instantâneo sob o span corrente.
+
+        A latência registrada para o estágio é o tempo desde o início do pai;
+        fora de um span o marco é ignorado.
+        """
+        parent = _current_span.get()
+        if not parent or not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        mark = Span(self, parent.trace_id, next(self._span_ids), parent.span_id, name, now, attrs, kind="mark")
+        mark.end_ns = now
+        self._finish(mark, now - parent.start_ns)
+
+    def wrap(self, func: Callable) -> Callable:
+        """
+        Corrotina que roda sob o span corrente de agora.
+
+        Para executores disparados de outro contexto (ex.: o agendador de
+        atuadores inicia jobs da fila no callback de outro job).
+        """
+        span = _current_span.get()
+        if not span:
+            return func
+
+        async def run(*args, **kwargs):
+            token = _current_span.set(span)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _current_span.reset(token)
+
+        return run
+
+    def _finish(self, span: Span, duration_ns: int):
+        with self._lock:
+            self._spans.append(span)
+            self.spans_finished += 1
+            stats = self._stages.get(span.name)
+            if stats is None:
+                stats = self._stages[span.name] = _StageStats(self.samples)
+            stats.add(duration_ns / 1e6)
+
+    def clear(self):
+        """Esvazia o buffer e as estatísticas."""
+        with self._lock:
+            self._spans.clear()
+            self._stages.clear()
+
+    # ------------------------------------------------------------------ exportação
+
+    def _snapshot(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Eventos no formato Chrome trace (uma trilha por turno)."""
+        pid = os.getpid()
+        lanes: Dict[int, int] = {}
+        events = []
+        for span in self._snapshot():
+            tid = lanes.setdefault(span.trace_id, len(lanes) + 1)
+            event = {
+                "name": span.name,
+                "cat": span.name.split(".", 1)[0],
+                "ts": (span.start_ns + self._epoch_offset_ns) / 1000,
+                "pid": pid,
+                "tid": tid,
+                "args": dict(span.attrs, trace_id=f"{span.trace_id:032x}", span_id=f"{span.span_id:016x}")
+            }
+            if span.kind == "mark":
+                event.update(ph="i", s="t")
+            else:
+                event.update(ph="X", dur=(span.end_ns - span.start_ns) / 1000)
+            events.append(event)
+        events.sort(key=lambda event: event["ts"])
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_otlp_json(self) -> Dict[str, Any]:
+        """Spans no formato OTLP/JSON; marcos viram eventos do span pai."""
+        spans = self._snapshot()
+        by_id: Dict[int, Dict[str, Any]] = {}
+        otlp_spans = []
+        for span in spans:
+            if span.kind == "mark":
+                continue
+            record = {
+                "traceId": f"{span.trace_id:032x}",
+                "spanId": f"{span.span_id:016x}",
+                "name": span.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(span.start_ns + self._epoch_offset_ns),
+                "endTimeUnixNano": str(span.end_ns + self._epoch_offset_ns),
+                "attributes": _otlp_attributes(span.attrs),
+                "events": []
+            }
+            if span.parent_id is not None:
+                record["parentSpanId"] = f"{span.parent_id:016x}"
+            if "error" in span.attrs:
+                record["status"] = {"code": 2, "message": str(span.attrs["error"])}
+            by_id[span.span_id] = record
+            otlp_spans.append(record)
+
+        for mark in spans:
+            if mark.kind != "mark" or mark.parent_id not in by_id:
+                continue  # pai ainda aberto ou já fora do buffer
+            by_id[mark.parent_id]["events"].append({
+                "timeUnixNano": str(mark.start_ns + self._epoch_offset_ns),
+                "name": mark.name,
+                "attributes": _otlp_attributes(mark.attrs)
+            })
+
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": otlp_spans}]
+            }]
+        }
+
+    def export_chrome_trace(self, path: Union[str, Path]) -> Optional[Path]:
+        """Grava o buffer como Chrome trace JSON."""
+        return self._write(path, self.to_chrome_trace())
+
+    def export_otlp_json(self, path: Union[str, Path]) -> Optional[Path]:
+        """Grava o buffer como OTLP/JSON (ExportTraceServiceRequest)."""
+        return self._write(path, self.to_otlp_json())
+
+    def export(self, directory: Optional[Union[str, Path]] = None) -> List[Path]:
+        """Exporta nos dois formatos em ``directory`` (padrão: ``export_dir``)."""
+        directory = directory or self.export_dir
+        if not directory or not self._spans:
+            return []
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        paths = [
+            self.export_chrome_trace(Path(directory) / f"trace_{stamp}.json"),
+            self.export_otlp_json(Path(directory) / f"trace_{stamp}.otlp.json")
+        ]
+        return [path for path in paths if path]
+
+    def _write(self, path: Union[str, Path], payload: Dict[str, Any]) -> Optional[Path]:
+        try:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, default=str)
+            logger.info(f"🧵 Trace exportado: {path}")
+            return path
+        except Exception as e:
+            logger.error(f"Erro ao exportar trace para {path}: {e}")
+            return None
+
+    # ------------------------------------------------------------------ status
+
+    def get_stage_stats(self) -> Dict[str, Dict[str, Any]]:
+        """p50/p95/p99 por estágio (spans e marcos)."""
+        with self._lock:
+            stages = list(self._stages.items())
+        return {name: stats.summary() for name, stats in sorted(stages)}
+
+    def get_status(self) -> Dict[str, Any]:
+        """Ocupação do buffer e percentis por estágio."""
+        return {
+            "enabled": self.enabled,
+            "traces": self.traces_started,
+            "spans": self.spans_finished,
+            "buffered": len(self._spans),
+            "capacity": self.capacity,
+            "stages": self.get_stage_stats()
+        }
+
+
+def _otlp_attributes(attrs: Dict[str, Any]) -> List[Dict[str, Any]]:
+    result = []
+    for key, value in attrs.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        result.append({"key": key, "value": typed})
+    return result
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer(config: Optional[Dict[str, Any]] = None) -> Tracer:
+    """
+    Retorna o tracer do processo.
+
+    A configuração só é aplicada na primeira chamada.
+    """
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(config)
+    return _tracer
@@ -0,0 +1,19 @@
+"""
+Navegação local do G1.
+
+Grade de ocupação a partir da profundidade da D435i, planejamento A* e
+replanejamento conforme novos frames chegam.
+"""
+
+from .occupancy_grid import CameraModel, OccupancyGrid
+from .planner import GridPlanner, PlanResult, simplify_path
+from .navigator import LocalNavigator
+
+__all__ = [
+    "CameraModel",
+    "OccupancyGrid",
+    "GridPlanner",
+    "PlanResult",
+    "simplify_path",
+    "LocalNavigator",
+]
@@ -0,0 +1,240 @@
+"""
+Navegador local para o sistema t031a5.
+
+Junta a grade de ocupação e o planejador A*: recebe frames de profundidade
+e a pose do robô, planeja até o alvo e sinaliza replanejamento quando a
+rota atual passa a cruzar um obstáculo recém-observado.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .occupancy_grid import CameraModel, OccupancyGrid
+from .planner import GridPlanner, PlanResult
+
+logger = logging.getLogger(__name__)
+
+Point = Tuple[float, float]
+
+
+class LocalNavigator:
+    """Navegação local: grade rolante + A* + replanejamento."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Inicializa o navegador.
+
+        Args:
+            config: resolution, size_m, robot_radius, camera {...}, max_range,
+                    goal_search_radius, max_expansions
+        """
+        config = config or {}
+        camera_config = config.get("camera", {})
+        camera = CameraModel(**{
+            key: (math.radians(value) if key == "pitch" else value)
+            for key, value in camera_config.items()
+            if key in CameraModel.__dataclass_fields__
+        })
+
+        self.grid = OccupancyGrid(
+            resolution=config.get("resolution", 0.05),
+            size_m=config.get("size_m", 8.0),
+            camera=camera,
+            min_range=config.get("min_range", 0.2),
+            max_range=config.get("max_range", 4.0),
+            min_obstacle_height=config.get("min_obstacle_height", 0.08),
+            max_obstacle_height=config.get("max_obstacle_height", 1.8),
+            pixel_stride=config.get("pixel_stride", 4),
+        )
+        self.planner = GridPlanner(max_expansions=config.get("max_expansions", 200000))
+        self.robot_radius = config.get("robot_radius", 0.3)
+        self.goal_search_radius = config.get("goal_search_radius", 0.5)
+
+        # Estado
+        self.pose: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+        self.goal: Optional[Point] = None
+        self.path: List[Point] = []
+        self._path_cells: List[Tuple[int, int]] = []
+        self._path_origin = tuple(self.grid.origin_cell)
+        self.needs_replan = False
+
+        # Métricas
+        self.plans = 0
+        self.plan_failures = 0
+        self.replans_triggered = 0
+        self.plan_times_ms: Deque[float] = deque(maxlen=100)
+        self.depth_times_ms: Deque[float] = deque(maxlen=100)
+
+    def update_pose(self, x: float, y: float, theta: float):
+        """Atualiza a pose do robô (odometria)."""
+        self.pose = (x, y, theta)
+
+    def on_depth_frame(self, depth_image: np.ndarray, pose: Optional[Tuple[float, float, float]] = None):
+        """
+        Integra um frame de profundidade e verifica a rota atual.
+
+        Args:
+            depth_image: Imagem z16 da D435i
+            pose: Pose no instante do frame (padrão: última pose conhecida)
+        """
+        start = time.perf_counter()
+        self.grid.integrate_depth(depth_image, pose or self.pose)
+        self.depth_times_ms.append((time.perf_counter() - start) * 1000)
+
+        if self.goal is not None and self._path_cells and self.path_blocked():
+            if not self.needs_replan:
+                self.replans_triggered += 1
+                logger.info("🧭 Obstáculo na rota atual: replanejamento necessário")
+            self.needs_replan = True
+
+    def plan(self, goal: Point, start: Optional[Point] = None) -> List[Point]:
+        """
+        Planeja da posição atual até o alvo.
+
+        Alvos fora da grade são projetados na borda (a rota é refeita à
+        medida que a grade acompanha o robô).
+
+        Returns:
+            Waypoints em coordenadas do mundo (vazio se não houver rota)
+        """
+        start = self._begin(goal, start)
+        return self._finish(goal, self.grid, self._search(self.grid, goal, start))
+
+    async def plan_async(self, goal: Point, start: Optional[Point] = None) -> List[Point]:
+        """
+        Planeja em thread para não bloquear o loop asyncio.
+
+        A grade é recentrada e copiada aqui, no loop, e a thread só lê a
+        cópia: on_depth_frame continua integrando frames na grade original
+        durante a busca.
+        """
+        start = self._begin(goal, start)
+        snapshot = self.grid.snapshot()
+        outcome = await asyncio.to_thread(self._search, snapshot, goal, start)
+        return self._finish(goal, snapshot, outcome)
+
+    def _begin(self, goal: Point, start: Optional[Point]) -> Point:
+        start = start or (self.pose[0], self.pose[1])
+        self.goal = goal
+        self.grid.recenter(*start)
+        return start
+
+    def _search(self, grid: OccupancyGrid, goal: Point,
+                start: Point) -> Tuple[Optional[Tuple[int, int]], Optional[PlanResult]]:
+        """Inflação e A* sobre ``grid`` (só leitura, não toca o estado do navegador)."""
+        blocked = grid.inflated(self.robot_radius)
+        start_cell = self._clamp_cell(*grid.world_to_cell(*start))
+        goal_cell = self._reachable_goal(blocked, self._project_goal(grid, start, goal))
+        if goal_cell is None:
+            return None, None
+        return goal_cell, self.planner.plan(blocked, start_cell, goal_cell)
+
+    def _finish(self, goal: Point, grid: OccupancyGrid,
+                outcome: Tuple[Optional[Tuple[int, int]], Optional[PlanResult]]) -> List[Point]:
+        """Registra o resultado e adota a rota (células relativas à origem de ``grid``)."""
+        goal_cell, result = outcome
+        self.plans += 1
+        if goal_cell is None:
+            self.plan_failures += 1
+            logger.warning(f"🧭 Alvo {goal} bloqueado")
+            self._set_path([], [], grid)
+            return []
+
+        self.plan_times_ms.append(result.plan_time_ms)
+        if not result.success:
+            self.plan_failures += 1
+            logger.warning(f"🧭 Sem rota até {goal} ({result.reason}, {result.expanded} nós)")
+            self._set_path([], [], grid)
+            return []
+
+        waypoints = [grid.cell_to_world(r, c) for r, c in result.waypoints[1:]]
+        # O último waypoint é o alvo real quando ele está dentro da grade
+        if waypoints and grid.in_bounds(*grid.world_to_cell(*goal)):
+            waypoints[-1] = goal
+        self._set_path(waypoints, result.cells, grid)
+
+        logger.debug(f"🧭 Rota com {len(waypoints)} waypoints em {result.plan_time_ms:.1f}ms "
+                     f"({result.expanded} nós)")
+        return waypoints
+
+    def path_blocked(self) -> bool:
+        """Verifica se a rota atual cruza células ocupadas."""
+        if not self._path_cells:
+            return False
+        shift_col = int(self.grid.origin_cell[0]) - self._path_origin[0]
+        shift_row = int(self.grid.origin_cell[1]) - self._path_origin[1]
+        occupied = self.grid.occupied()
+        # Checa a rota com meio raio de folga (a inflação completa fica para o replanejamento)
+        margin = max(0, int(self.robot_radius / 2 / self.grid.resolution))
+        for row, col in self._path_cells[1:]:
+            r, c = row - shift_row, col - shift_col
+            r0, r1 = max(0, r - margin), min(self.grid.cells, r + margin + 1)
+            c0, c1 = max(0, c - margin), min(self.grid.cells, c + margin + 1)
+            if r0 < r1 and c0 < c1 and occupied[r0:r1, c0:c1].any():
+                return True
+        return False
+
+    def clear_goal(self):
+        self.goal = None
+        self._set_path([], [], self.grid)
+
+    def _set_path(self, waypoints: List[Point], cells: List[Tuple[int, int]], grid: OccupancyGrid):
+        self.path = waypoints
+        self._path_cells = cells
+        # Origem da grade em que as células foram planejadas (path_blocked compensa o deslocamento)
+        self._path_origin = (int(grid.origin_cell[0]), int(grid.origin_cell[1]))
+        self.needs_replan = False
+
+    def _clamp_cell(self, row: int, col: int) -> Tuple[int, int]:
+        last = self.grid.cells - 1
+        return min(max(row, 0), last), min(max(col, 0), last)
+
+    def _project_goal(self, grid: OccupancyGrid, start: Point, goal: Point) -> Tuple[int, int]:
+        """Célula do alvo ou, se fora da grade, o ponto da borda na direção do alvo."""
+        row, col = grid.world_to_cell(*goal)
+        if grid.in_bounds(row, col):
+            return row, col
+
+        # Encolhe o segmento start→goal até caber na grade (com uma célula de margem)
+        half = (self.grid.cells // 2 - 1) * self.grid.resolution
+        dx, dy = goal[0] - start[0], goal[1] - start[1]
+        scale = min(1.0, half / max(abs(dx), abs(dy), 1e-9))
+        return self._clamp_cell(*grid.world_to_cell(start[0] + dx * scale, start[1] + dy * scale))
+
+    def _reachable_goal(self, blocked: np.ndarray, cell: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Célula livre mais próxima do alvo dentro do raio de busca."""
+        row, col = cell
+        if not blocked[row, col]:
+            return cell
+        radius = int(math.ceil(self.goal_search_radius / self.grid.resolution))
+        r0, r1 = max(0, row - radius), min(self.grid.cells, row + radius + 1)
+        c0, c1 = max(0, col - radius), min(self.grid.cells, col + radius + 1)
+        free_rows, free_cols = np.nonzero(~blocked[r0:r1, c0:c1])
+        if free_rows.size == 0:
+            return None
+        distances = (free_rows + r0 - row) ** 2 + (free_cols + c0 - col) ** 2
+        best = int(np.argmin(distances))
+        return int(free_rows[best] + r0), int(free_cols[best] + c0)
+
+    def get_status(self) -> Dict[str, Any]:
+        plan_times = sorted(self.plan_times_ms)
+        return {
+            "goal": self.goal,
+            "waypoints": len(self.path),
+            "needs_replan": self.needs_replan,
+            "plans": self.plans,
+            "plan_failures": self.plan_failures,
+            "replans_triggered": self.replans_triggered,
+            "avg_plan_ms": round(sum(plan_times) / len(plan_times), 2) if plan_times else 0.0,
+            "p95_plan_ms": round(plan_times[int(len(plan_times) * 0.95)], 2) if plan_times else 0.0,
+            "avg_depth_integration_ms": (
+                round(sum(self.depth_times_ms) / len(self.depth_times_ms), 2) if self.depth_times_ms else 0.0
+            ),
+            "grid": self.grid.get_stats()
+        }
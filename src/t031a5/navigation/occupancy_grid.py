@@ -0,0 +1,265 @@
+"""
+Grade de ocupação local para o sistema t031a5.
+
+Projeta frames de profundidade da D435i no plano do chão e acumula
+evidência em uma grade 2D centrada no robô. A grade "rola" junto com o
+robô: ao se deslocar, as células que saem de um lado são descartadas e as
+que entram do outro começam desconhecidas.
+
+Toda a projeção é vetorizada em NumPy (sem laço por pixel).
+"""
+
+import copy
+import logging
+import math
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CameraModel:
+    """Intrínsecos e montagem da câmera de profundidade."""
+    fx: float = 385.0             # D435i depth 640x480
+    fy: float = 385.0
+    cx: float = 320.0
+    cy: float = 240.0
+    depth_scale: float = 0.001    # z16 em mm
+    height: float = 1.2           # altura da câmera em relação ao chão (m)
+    pitch: float = math.radians(20.0)  # inclinação para baixo (rad)
+    forward_offset: float = 0.05  # distância da câmera à frente do centro do robô (m)
+
+
+class OccupancyGrid:
+    """Grade de ocupação rolante em log-odds."""
+
+    def __init__(self, resolution: float = 0.05, size_m: float = 8.0,
+                 camera: Optional[CameraModel] = None,
+                 min_range: float = 0.2, max_range: float = 4.0,
+                 min_obstacle_height: float = 0.08, max_obstacle_height: float = 1.8,
+                 pixel_stride: int = 4):
+        """
+        Inicializa a grade.
+
+        Args:
+            resolution: Tamanho da célula (m)
+            size_m: Largura/altura da grade (m), centrada no robô
+            camera: Modelo da câmera
+            min_range / max_range: Faixa de profundidade confiável (m)
+            min_obstacle_height / max_obstacle_height: Faixa de altura considerada obstáculo (m)
+            pixel_stride: Subamostragem da imagem de profundidade
+        """
+        self.resolution = resolution
+        self.cells = int(round(size_m / resolution))
+        self.camera = camera or CameraModel()
+        self.min_range = min_range
+        self.max_range = max_range
+        self.min_obstacle_height = min_obstacle_height
+        self.max_obstacle_height = max_obstacle_height
+        self.pixel_stride = max(1, pixel_stride)
+
+        # Log-odds por célula (0 = desconhecido)
+        self.log_odds = np.zeros((self.cells, self.cells), dtype=np.float32)
+        self.hit = 0.85
+        self.miss = -0.4
+        self.clamp = 4.0
+        self.occupied_threshold = 0.6
+
+        # Canto inferior esquerdo da grade em coordenadas do mundo, alinhado à resolução
+        self.origin_cell = np.array([-self.cells // 2, -self.cells // 2], dtype=np.int64)
+
+        self._rays: Optional[np.ndarray] = None  # direções pré-calculadas por pixel
+        self._rays_shape: Optional[Tuple[int, int]] = None
+
+        # Métricas
+        self.frames_integrated = 0
+        self.points_integrated = 0
+
+    # ------------------------------------------------------------------ coordenadas
+
+    @property
+    def origin(self) -> Tuple[float, float]:
+        """Canto da grade no mundo (m)."""
+        return (float(self.origin_cell[0] * self.resolution), float(self.origin_cell[1] * self.resolution))
+
+    def world_to_cell(self, x: float, y: float) -> Tuple[int, int]:
+        """Converte coordenada do mundo em (linha, coluna) da grade (linha = y, coluna = x)."""
+        col = int(math.floor(x / self.resolution)) - int(self.origin_cell[0])
+        row = int(math.floor(y / self.resolution)) - int(self.origin_cell[1])
+        return row, col
+
+    def cell_to_world(self, row: int, col: int) -> Tuple[float, float]:
+        """Centro da célula em coordenadas do mundo."""
+        return ((col + int(self.origin_cell[0]) + 0.5) * self.resolution,
+                (row + int(self.origin_cell[1]) + 0.5) * self.resolution)
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        return 0 <= row < self.cells and 0 <= col < self.cells
+
+    def recenter(self, x: float, y: float):
+        """
+        Rola a grade para manter (x, y) no centro.
+
+        Só desloca quando o robô se afasta mais de um quarto da grade,
+        evitando cópias a cada passo.
+        """
+        center_col = int(math.floor(x / self.resolution)) - self.cells // 2
+        center_row = int(math.floor(y / self.resolution)) - self.cells // 2
+        shift_col = center_col - int(self.origin_cell[0])
+        shift_row = center_row - int(self.origin_cell[1])
+        if max(abs(shift_col), abs(shift_row)) < self.cells // 4:
+            return
+
+        if abs(shift_col) >= self.cells or abs(shift_row) >= self.cells:
+            self.log_odds.fill(0.0)
+        else:
+            self.log_odds = np.roll(self.log_odds, (-shift_row, -shift_col), axis=(0, 1))
+            # Células que entraram pela borda são desconhecidas
+            if shift_row > 0:
+                self.log_odds[-shift_row:, :] = 0.0
+            elif shift_row < 0:
+                self.log_odds[:-shift_row, :] = 0.0
+            if shift_col > 0:
+                self.log_odds[:, -shift_col:] = 0.0
+            elif shift_col < 0:
+                self.log_odds[:, :-shift_col] = 0.0
+
+        self.origin_cell += (shift_col, shift_row)
+
+    # ------------------------------------------------------------------ integração
+
+    def _pixel_rays(self, height: int, width: int) -> np.ndarray:
+        """Direções normalizadas (x/z, y/z) dos pixels subamostrados (cache por resolução)."""
+        if self._rays is None or self._rays_shape != (height, width):
+            cam = self.camera
+            v, u = np.mgrid[0:height:self.pixel_stride, 0:width:self.pixel_stride]
+            self._rays = np.stack([(u - cam.cx) / cam.fx, (v - cam.cy) / cam.fy]).astype(np.float32)
+            self._rays_shape = (height, width)
+        return self._rays
+
+    def integrate_depth(self, depth_image: np.ndarray, pose: Tuple[float, float, float]) -> int:
+        """
+        Integra um frame de profundidade.
+
+        Args:
+            depth_image: Imagem z16 (H x W)
+            pose: (x, y, theta) do robô no mundo (m, m, rad)
+
+        Returns:
+            Número de pontos válidos integrados
+        """
+        x, y, theta = pose
+        self.recenter(x, y)
+
+        cam = self.camera
+        height, width = depth_image.shape[:2]
+        rays = self._pixel_rays(height, width)
+        z = depth_image[::self.pixel_stride, ::self.pixel_stride].astype(np.float32) * cam.depth_scale
+
+        valid = (z > self.min_range) & (z < self.max_range)
+        if not np.any(valid):
+            return 0
+        z = z[valid]
+        x_cam = rays[0][valid] * z      # direita
+        y_cam = rays[1][valid] * z      # para baixo
+
+        # Câmera inclinada para baixo: frente horizontal e altura em relação ao chão
+        cos_p, sin_p = math.cos(cam.pitch), math.sin(cam.pitch)
+        forward = z * cos_p - y_cam * sin_p + cam.forward_offset
+        height_above = cam.height - (z * sin_p + y_cam * cos_p)
+        left = -x_cam
+
+        # Corpo do robô → mundo
+        cos_t, sin_t = math.cos(theta), math.sin(theta)
+        world_x = x + forward * cos_t - left * sin_t
+        world_y = y + forward * sin_t + left * cos_t
+
+        cols = np.floor(world_x / self.resolution).astype(np.int64) - self.origin_cell[0]
+        rows = np.floor(world_y / self.resolution).astype(np.int64) - self.origin_cell[1]
+        inside = (rows >= 0) & (rows < self.cells) & (cols >= 0) & (cols < self.cells)
+        flat = rows[inside] * self.cells + cols[inside]
+        height_above = height_above[inside]
+
+        obstacle = (height_above > self.min_obstacle_height) & (height_above < self.max_obstacle_height)
+        ground = np.abs(height_above) <= self.min_obstacle_height
+
+        # Um voto por célula por frame (bincount evita laços e contagens repetidas)
+        size = self.cells * self.cells
+        hits = np.bincount(flat[obstacle], minlength=size) > 0
+        free = (np.bincount(flat[ground], minlength=size) > 0) & ~hits
+
+        grid = self.log_odds.reshape(-1)
+        grid[hits] += self.hit
+        grid[free] += self.miss
+        np.clip(grid, -self.clamp, self.clamp, out=grid)
+
+        self.frames_integrated += 1
+        self.points_integrated += int(flat.size)
+        return int(flat.size)
+
+    def mark_obstacle(self, x: float, y: float, radius: float = 0.0):
+        """Marca obstáculo manualmente (ex.: detecção externa)."""
+        row, col = self.world_to_cell(x, y)
+        r = int(math.ceil(radius / self.resolution))
+        row0, row1 = max(0, row - r), min(self.cells, row + r + 1)
+        col0, col1 = max(0, col - r), min(self.cells, col + r + 1)
+        if row0 < row1 and col0 < col1:
+            self.log_odds[row0:row1, col0:col1] = self.clamp
+
+    def clear(self):
+        self.log_odds.fill(0.0)
+
+    def snapshot(self) -> "OccupancyGrid":
+        """
+        Cópia independente do estado (log-odds e origem) para consulta em outra thread.
+
+        A integração de frames continua na grade original sem afetar a cópia.
+        """
+        grid = copy.copy(self)
+        grid.log_odds = self.log_odds.copy()
+        grid.origin_cell = self.origin_cell.copy()
+        return grid
+
+    # ------------------------------------------------------------------ consulta
+
+    def occupied(self) -> np.ndarray:
+        """Máscara booleana de células ocupadas."""
+        threshold = math.log(self.occupied_threshold / (1.0 - self.occupied_threshold))
+        return self.log_odds > threshold
+
+    def inflated(self, radius: float) -> np.ndarray:
+        """
+        Ocupação dilatada pelo raio do robô (espaço de configuração).
+
+        Dilatação por disco feita com OR de fatias deslocadas; o custo é
+        proporcional ao número de offsets do disco vezes o tamanho da grade.
+        """
+        occupied = self.occupied()
+        r = int(math.ceil(radius / self.resolution))
+        if r <= 0 or not occupied.any():
+            return occupied
+
+        n = self.cells
+        padded = np.zeros((n + 2 * r, n + 2 * r), dtype=bool)
+        padded[r:r + n, r:r + n] = occupied
+        result = np.zeros_like(occupied)
+        for dr in range(-r, r + 1):
+            span = int(math.floor(math.sqrt(r * r - dr * dr)))
+            for dc in range(-span, span + 1):
+                result |= padded[r + dr:r + dr + n, r + dc:r + dc + n]
+        return result
+
+    def get_stats(self):
+        occupied = self.occupied()
+        return {
+            "cells": self.cells,
+            "resolution": self.resolution,
+            "origin": self.origin,
+            "occupied_cells": int(occupied.sum()),
+            "known_cells": int(np.count_nonzero(self.log_odds)),
+            "frames_integrated": self.frames_integrated,
+            "points_integrated": self.points_integrated
+        }
@@ -0,0 +1,163 @@
+"""
+Planejador A* em grade para o sistema t031a5.
+
+A* 8-conectado com heurística octil sobre a grade inflada (espaço de
+configuração), sem cortar quinas de obstáculos. O caminho denso é
+simplificado por linha de visada, virando poucos waypoints para a
+camada de locomoção.
+
+A grade é convertida uma vez em bytearray plano: o laço do A* trabalha só
+com inteiros e listas, que é o mais rápido em CPython.
+"""
+
+import heapq
+import math
+import time
+from dataclasses import dataclass, field
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+SQRT2 = math.sqrt(2.0)
+
+
+@dataclass
+class PlanResult:
+    """Resultado de um planejamento."""
+    cells: List[Tuple[int, int]]                 # caminho denso (linha, coluna)
+    waypoints: List[Tuple[int, int]]             # caminho simplificado (linha, coluna)
+    cost: float
+    expanded: int
+    plan_time_ms: float
+    success: bool = True
+    reason: str = ""
+    metadata: dict = field(default_factory=dict)
+
+
+class GridPlanner:
+    """A* sobre uma máscara booleana de células bloqueadas."""
+
+    def __init__(self, max_expansions: int = 200000):
+        self.max_expansions = max_expansions
+
+    def plan(self, blocked: np.ndarray, start: Tuple[int, int], goal: Tuple[int, int]) -> PlanResult:
+        """
+        Planeja de start a goal (linha, coluna).
+
+        A célula inicial é sempre considerada livre (o robô já está nela).
+        """
+        t0 = time.perf_counter()
+        rows, cols = blocked.shape
+        grid = bytearray(blocked.astype(np.uint8).tobytes())
+
+        s = start[0] * cols + start[1]
+        g = goal[0] * cols + goal[1]
+        grid[s] = 0
+        if grid[g]:
+            return PlanResult([], [], math.inf, 0, (time.perf_counter() - t0) * 1000, False, "goal_blocked")
+
+        flat_path, cost, expanded = self._astar(grid, rows, cols, s, g)
+        if flat_path is None:
+            return PlanResult([], [], math.inf, expanded, (time.perf_counter() - t0) * 1000, False, "no_path")
+
+        cells = [divmod(index, cols) for index in flat_path]
+        waypoints = simplify_path(cells, grid, cols)
+        return PlanResult(cells, waypoints, cost, expanded, (time.perf_counter() - t0) * 1000)
+
+    def _astar(self, grid: bytearray, rows: int, cols: int, start: int, goal: int):
+        goal_r, goal_c = divmod(goal, cols)
+        size = rows * cols
+        inf = math.inf
+        g_cost = [inf] * size
+        parent = [-1] * size
+        closed = bytearray(size)
+
+        # (dr, dc, custo)
+        moves = ((-1, 0, 1.0), (1, 0, 1.0), (0, -1, 1.0), (0, 1, 1.0),
+                 (-1, -1, SQRT2), (-1, 1, SQRT2), (1, -1, SQRT2), (1, 1, SQRT2))
+
+        def heuristic(r: int, c: int) -> float:
+            dr = abs(r - goal_r)
+            dc = abs(c - goal_c)
+            return (dr + dc) + (SQRT2 - 2.0) * (dr if dr < dc else dc)
+
+        g_cost[start] = 0.0
+        sr, sc = divmod(start, cols)
+        heap = [(heuristic(sr, sc), 0.0, start)]
+        expanded = 0
+        push, pop = heapq.heappush, heapq.heappop
+
+        while heap:
+            _, g, current = pop(heap)
+            if closed[current]:
+                continue
+            if current == goal:
+                path = [current]
+                while parent[current] != -1:
+                    current = parent[current]
+                    path.append(current)
+                path.reverse()
+                return path, g, expanded
+
+            closed[current] = 1
+            expanded += 1
+            if expanded > self.max_expansions:
+                break
+
+            r, c = divmod(current, cols)
+            for dr, dc, step in moves:
+                nr = r + dr
+                nc = c + dc
+                if nr < 0 or nr >= rows or nc < 0 or nc >= cols:
+                    continue
+                neighbor = nr * cols + nc
+                if grid[neighbor] or closed[neighbor]:
+                    continue
+                # Diagonal não corta quina de obstáculo
+                if dr and dc and (grid[r * cols + nc] or grid[nr * cols + c]):
+                    continue
+                new_g = g + step
+                if new_g < g_cost[neighbor]:
+                    g_cost[neighbor] = new_g
+                    parent[neighbor] = current
+                    push(heap, (new_g + heuristic(nr, nc), new_g, neighbor))
+
+        return None, inf, expanded
+
+
+def line_of_sight(grid: Sequence[int], cols: int, a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+    """Verifica se o segmento a→b (Bresenham) só passa por células livres."""
+    r0, c0 = a
+    r1, c1 = b
+    dr = abs(r1 - r0)
+    dc = abs(c1 - c0)
+    step_r = 1 if r1 > r0 else -1
+    step_c = 1 if c1 > c0 else -1
+    error = dc - dr
+    r, c = r0, c0
+    while True:
+        if grid[r * cols + c]:
+            return False
+        if r == r1 and c == c1:
+            return True
+        e2 = 2 * error
+        if e2 > -dr:
+            error -= dr
+            c += step_c
+        if e2 < dc:
+            error += dc
+            r += step_r
+
+
+def simplify_path(cells: List[Tuple[int, int]], grid: Sequence[int], cols: int) -> List[Tuple[int, int]]:
+    """Remove waypoints intermediários mantendo linha de visada livre."""
+    if len(cells) <= 2:
+        return list(cells)
+    waypoints = [cells[0]]
+    anchor = 0
+    for index in range(2, len(cells)):
+        if not line_of_sight(grid, cols, cells[anchor], cells[index]):
+            anchor = index - 1
+            waypoints.append(cells[anchor])
+    waypoints.append(cells[-1])
+    return waypoints
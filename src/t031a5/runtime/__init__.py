@@ -6,15 +6,29 @@ Contém as classes principais para execução do sistema:
 - ConfigManager: Gerenciamento de configurações
 - InputOrchestrator: Coordenação de inputs
 - ActionOrchestrator: Execução de ações
+- ConversationPipeline: Estágios percepção/deliberação/atuação
+- TimerWheel: Agendamento de eventos com relógio monotônico
+- ActionScheduler: Arbitragem de atuadores com prioridade e preempção
 """
 
 from .cortex import CortexRuntime
 from .config import ConfigManager
 from .orchestrators import InputOrchestrator, ActionOrchestrator
+from .pipeline import ConversationPipeline, PreemptionPolicy
+from .timer_wheel import TimerWheel, TimerHandle
+from .action_scheduler import ActionScheduler, Actuator, ActuatorPolicy, get_action_scheduler
 
 __all__ = [
     "CortexRuntime",
     "ConfigManager", 
     "InputOrchestrator",
     "ActionOrchestrator",
+    "ConversationPipeline",
+    "PreemptionPolicy",
+    "TimerWheel",
+    "TimerHandle",
+    "ActionScheduler",
+    "Actuator",
+    "ActuatorPolicy",
+    "get_action_scheduler",
 ]
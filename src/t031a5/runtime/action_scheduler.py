@@ -0,0 +1,379 @@
+"""
+Agendador de ações por atuador para o sistema t031a5.
+
+Modela os atuadores do G1 (braços, pernas, LEDs, alto-falante, cabeça)
+como recursos exclusivos. Cada requisição ocupa os atuadores do seu
+plugin: atuadores independentes rodam em paralelo e requisições que
+disputam o mesmo atuador seguem a política da requisição:
+
+- queue: espera na fila (maior prioridade primeiro, FIFO no empate)
+- preempt: interrompe quem ocupa o atuador se tiver prioridade menor ou igual
+- coalesce: substitui a requisição pendente do mesmo plugin (só a mais nova importa)
+- drop: descarta se o atuador estiver ocupado
+
+Comandos de emergência (prioridade >= emergency_priority ou metadata
+"safety") não passam por fila nenhuma: executam na hora, cancelam quem
+ocupa seus atuadores e descartam o que estava esperando por eles. Depois
+ocupam os atuadores até terminar: o que chegar nesse meio tempo espera
+atrás deles (ou é descartado, conforme a política), sem interrompê-los.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional
+
+from ..actions.base import ActionRequest, ActionResult
+
+logger = logging.getLogger(__name__)
+
+Executor = Callable[[str, ActionRequest], Awaitable[ActionResult]]
+
+
+class Actuator(Enum):
+    """Atuadores do G1 tratados como recursos exclusivos."""
+    ARMS = "arms"
+    LEGS = "legs"
+    LEDS = "leds"
+    SPEAKER = "speaker"
+    HEAD = "head"
+
+
+class ActuatorPolicy(Enum):
+    """Política quando o atuador já está ocupado."""
+    QUEUE = "queue"
+    PREEMPT = "preempt"
+    COALESCE = "coalesce"
+    DROP = "drop"
+
+
+# Atuadores por plugin ("plugin.action_name" tem precedência sobre "plugin").
+# Sons curtos do G1Audio mixam com a fala e não ocupam o alto-falante.
+DEFAULT_ACTUATORS: Dict[str, List[str]] = {
+    "speak": ["speaker"],
+    "gesture": ["arms"],
+    "emotion": ["leds"],
+    "move": ["legs"],
+    "move.look_at": ["head"],
+    "G1Audio": [],
+}
+
+DEFAULT_POLICIES: Dict[str, str] = {
+    "speak": "queue",
+    "gesture": "queue",
+    "emotion": "coalesce",
+    "move": "preempt",
+}
+
+
+@dataclass(eq=False)
+class ScheduledJob:
+    """Requisição agendada (identidade própria: dois pedidos iguais são jobs distintos)."""
+    plugin: str
+    request: ActionRequest
+    executor: Executor
+    actuators: FrozenSet[Actuator]
+    policy: ActuatorPolicy
+    priority: int
+    seq: int
+    future: asyncio.Future
+    submitted_at: float = field(default_factory=time.monotonic)
+    task: Optional[asyncio.Task] = None
+
+    @property
+    def coalesce_key(self):
+        return (self.plugin, self.request.action_name, self.actuators)
+
+
+class ActionScheduler:
+    """Arbitra o acesso dos plugins de ação aos atuadores."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Inicializa o agendador.
+
+        Args:
+            config: actuators {plugin: [atuadores]}, policies {plugin: política},
+                    emergency_priority
+        """
+        config = config or {}
+        self.actuator_map: Dict[str, FrozenSet[Actuator]] = {}
+        for plugin, names in {**DEFAULT_ACTUATORS, **config.get("actuators", {})}.items():
+            self.actuator_map[plugin] = frozenset(Actuator(name) for name in names)
+        self.policies: Dict[str, ActuatorPolicy] = {
+            plugin: ActuatorPolicy(policy)
+            for plugin, policy in {**DEFAULT_POLICIES, **config.get("policies", {})}.items()
+        }
+        self.default_policy = ActuatorPolicy(config.get("default_policy", "queue"))
+        self.emergency_priority = config.get("emergency_priority", 10)
+
+        # Estado
+        self._holders: Dict[Actuator, ScheduledJob] = {}
+        self._waiting: List[ScheduledJob] = []
+        self._emergency_jobs: set = set()  # ScheduledJob de emergência em execução
+        self._seq = itertools.count()
+
+        # Métricas
+        self.submitted = 0
+        self.completed = 0
+        self.queued = 0
+        self.preempted = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.emergencies = 0
+        self.max_wait_ms = 0.0
+        self.total_wait_ms = 0.0
+        self.started = 0
+
+    # ------------------------------------------------------------------ API
+
+    def actuators_for(self, plugin: str, request: ActionRequest) -> FrozenSet[Actuator]:
+        """Atuadores ocupados pela requisição (metadata "actuators" tem precedência)."""
+        override = request.metadata.get("actuators") if request.metadata else None
+        if override is not None:
+            return frozenset(Actuator(name) for name in override)
+        specific = self.actuator_map.get(f"{plugin}.{request.action_name}")
+        if specific is not None:
+            return specific
+        return self.actuator_map.get(plugin, frozenset())
+
+    def is_emergency(self, request: ActionRequest) -> bool:
+        return request.priority >= self.emergency_priority or bool(
+            request.metadata and request.metadata.get("safety")
+        )
+
+    async def submit(self, plugin: str, request: ActionRequest, executor: Executor) -> ActionResult:
+        """
+        Agenda e aguarda a execução de uma requisição.
+
+        Se quem aguarda for cancelado (ex.: barge-in), a requisição sai da
+        fila ou é interrompida.
+        """
+        self.submitted += 1
+        actuators = self.actuators_for(plugin, request)
+
+        if self.is_emergency(request):
+            return await self._run_emergency(plugin, request, actuators, executor)
+
+        policy_name = request.metadata.get("preemption") if request.metadata else None
+        policy = ActuatorPolicy(policy_name) if policy_name else self.policies.get(plugin, self.default_policy)
+
+        job = ScheduledJob(
+            plugin=plugin, request=request, executor=executor, actuators=actuators, policy=policy,
+            priority=request.priority, seq=next(self._seq),
+            future=asyncio.get_running_loop().create_future()
+        )
+
+        if not actuators:
+            # Não disputa atuador: executa direto
+            self._start(job)
+        else:
+            self._admit(job)
+
+        try:
+            return await job.future
+        except asyncio.CancelledError:
+            self._abandon(job)
+            raise
+
+    async def cancel_all(self, reason: str = "cancelled"):
+        """Cancela tudo que está em execução ou esperando."""
+        for job in list(self._waiting):
+            self._resolve(job, self._rejected(job, reason))
+        self._waiting.clear()
+        running = set(self._holders.values()) - self._emergency_jobs
+        for job in running:
+            if job.task and not job.task.done():
+                job.task.cancel()
+        if running:
+            await asyncio.wait([job.task for job in running if job.task], timeout=1.0)
+
+    # ------------------------------------------------------------------ admissão
+
+    def _admit(self, job: ScheduledJob):
+        conflicts = self._conflicting_holders(job)
+        blocked = bool(conflicts) or self._reserved_by_waiting(job)
+
+        if not blocked:
+            self._start(job)
+            return
+
+        if job.policy == ActuatorPolicy.DROP:
+            self.dropped += 1
+            logger.debug(f"Requisição {job.plugin}.{job.request.action_name} descartada (atuador ocupado)")
+            self._resolve(job, self._rejected(job, "busy"))
+            return
+
+        if job.policy == ActuatorPolicy.PREEMPT and all(h.priority <= job.priority for h in conflicts):
+            # Quem espera com prioridade menor também perde a vez
+            for waiting in [w for w in self._waiting if w.actuators & job.actuators and w.priority <= job.priority]:
+                self._waiting.remove(waiting)
+                self.preempted += 1
+                self._resolve(waiting, self._rejected(waiting, "preempted"))
+            for holder in conflicts:
+                self._preempt(holder, by=job)
+            if not self._conflicting_holders(job) and not self._reserved_by_waiting(job):
+                self._start(job)
+                return
+
+        if job.policy == ActuatorPolicy.COALESCE:
+            for waiting in [w for w in self._waiting if w.coalesce_key == job.coalesce_key]:
+                self._waiting.remove(waiting)
+                self.coalesced += 1
+                self._resolve(waiting, self._rejected(waiting, "coalesced", success=True))
+
+        self._waiting.append(job)
+        self._waiting.sort(key=lambda w: (-w.priority, w.seq))
+        self.queued += 1
+
+    def _conflicting_holders(self, job: ScheduledJob) -> List[ScheduledJob]:
+        holders = {self._holders[a] for a in job.actuators if a in self._holders}
+        return [h for h in holders if h is not job]
+
+    def _reserved_by_waiting(self, job: ScheduledJob) -> bool:
+        """Há alguém com prioridade maior ou igual esperando pelos mesmos atuadores."""
+        return any(w.actuators & job.actuators and w.priority >= job.priority for w in self._waiting)
+
+    def _start(self, job: ScheduledJob):
+        for actuator in job.actuators:
+            self._holders[actuator] = job
+        wait_ms = (time.monotonic() - job.submitted_at) * 1000
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self.started += 1
+        job.task = asyncio.create_task(job.executor(job.plugin, job.request))
+        job.task.add_done_callback(lambda task, job=job: self._on_done(job, task))
+
+    def _on_done(self, job: ScheduledJob, task: asyncio.Task):
+        self._emergency_jobs.discard(job)
+        for actuator in job.actuators:
+            if self._holders.get(actuator) is job:
+                del self._holders[actuator]
+                # Outra emergência ainda rodando no mesmo atuador continua dona dele
+                for other in self._emergency_jobs:
+                    if actuator in other.actuators:
+                        self._holders[actuator] = other
+                        break
+
+        if task.cancelled():
+            self._resolve(job, self._rejected(job, "preempted"))
+        elif task.exception() is not None:
+            self._resolve(job, self._rejected(job, str(task.exception())))
+        else:
+            self.completed += 1
+            self._resolve(job, task.result())
+
+        self._pump()
+
+    def _pump(self):
+        """Inicia, em ordem de prioridade, quem espera e já tem todos os atuadores livres."""
+        reserved = set()
+        for job in list(self._waiting):
+            if job.actuators & reserved:
+                continue
+            if any(a in self._holders for a in job.actuators):
+                reserved |= job.actuators
+                continue
+            self._waiting.remove(job)
+            self._start(job)
+
+    def _preempt(self, holder: ScheduledJob, by: ScheduledJob):
+        self.preempted += 1
+        logger.info(f"⏭️ {holder.plugin}.{holder.request.action_name} interrompido por "
+                    f"{by.plugin}.{by.request.action_name}")
+        for actuator in holder.actuators:
+            if self._holders.get(actuator) is holder:
+                del self._holders[actuator]
+        if holder.task and not holder.task.done():
+            holder.task.cancel()
+
+    def _abandon(self, job: ScheduledJob):
+        """Quem aguardava desistiu: tira da fila ou interrompe a execução."""
+        if job in self._waiting:
+            self._waiting.remove(job)
+            self._pump()
+        elif job.task and not job.task.done():
+            job.task.cancel()
+
+    # ------------------------------------------------------------------ emergência
+
+    async def _run_emergency(self, plugin: str, request: ActionRequest,
+                             actuators: FrozenSet[Actuator], executor: Executor) -> ActionResult:
+        self.emergencies += 1
+        logger.warning(f"🚨 Emergência {plugin}.{request.action_name}: ignorando filas")
+
+        for waiting in [w for w in self._waiting if w.actuators & actuators]:
+            self._waiting.remove(waiting)
+            self.preempted += 1
+            self._resolve(waiting, self._rejected(waiting, "emergency"))
+
+        # Executa imediatamente e ocupa os atuadores até terminar; a prioridade
+        # mínima de emergência impede que um pedido comum a interrompa
+        job = ScheduledJob(
+            plugin=plugin, request=request, executor=executor, actuators=actuators,
+            policy=ActuatorPolicy.PREEMPT, priority=max(request.priority, self.emergency_priority),
+            seq=next(self._seq), future=asyncio.get_running_loop().create_future()
+        )
+        for holder in {self._holders[a] for a in actuators if a in self._holders}:
+            # Emergências não se interrompem entre si
+            if holder not in self._emergency_jobs:
+                self._preempt(holder, by=job)
+        self._emergency_jobs.add(job)
+        self._start(job)
+        try:
+            return await job.future
+        except asyncio.CancelledError:
+            self._abandon(job)
+            raise
+
+    # ------------------------------------------------------------------ resultados
+
+    @staticmethod
+    def _resolve(job: ScheduledJob, result: ActionResult):
+        if not job.future.done():
+            job.future.set_result(result)
+
+    @staticmethod
+    def _rejected(job: ScheduledJob, reason: str, success: bool = False) -> ActionResult:
+        return ActionResult(
+            action_type=job.request.action_type,
+            action_name=job.request.action_name,
+            timestamp=datetime.now(),
+            success=success,
+            data={"scheduler": reason},
+            error_message=None if success else reason
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna ocupação dos atuadores e métricas."""
+        return {
+            "busy": {
+                actuator.value: f"{job.plugin}.{job.request.action_name}"
+                for actuator, job in self._holders.items()
+            },
+            "waiting": len(self._waiting),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "queued": self.queued,
+            "preempted": self.preempted,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "emergencies": self.emergencies,
+            "avg_wait_ms": round(self.total_wait_ms / self.started, 2) if self.started else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 2)
+        }
+
+
+_default_scheduler: Optional[ActionScheduler] = None
+
+
+def get_action_scheduler(config: Optional[Dict[str, Any]] = None) -> ActionScheduler:
+    """Retorna o agendador compartilhado do processo (a primeira configuração vale)."""
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = ActionScheduler(config)
+    return _default_scheduler
@@ -15,6 +15,16 @@ from .orchestrators import InputOrchestrator, ActionOrchestrator
 from ..fuser import BaseFuser
 from ..llm import LLMProvider
 from ..conversation import ConversationEngine
+from ..connectors.command_executor import get_command_executor
+from ..connectors.g1_session import get_g1_session
+from ..connectors.led_writer import get_led_writer
+from .pipeline import ConversationPipeline
+from .action_scheduler import get_action_scheduler
+from ..security.proximity import get_proximity_monitor
+from ..security.watchdog import get_safety_watchdog
+from ..logging.tracing import get_tracer
+from ..logging.log_pipeline import get_log_pipeline
+from ..logging.profiler import get_sampling_profiler
 
 logger = logging.getLogger(__name__)
 
@@ -38,8 +48,15 @@ class CortexRuntime:
         self.fuser: Optional[BaseFuser] = None
         self.llm_provider: Optional[LLMProvider] = None
         self.conversation_engine: Optional[ConversationEngine] = None
+        self.structured_output = False
+        self.pipeline: Optional[ConversationPipeline] = None
         self.g1_controller = None
         self.websim = None
+        self.watchdog = None
+        self.tracer = None
+        self.log_pipeline = None
+        self.profiler = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
         
         # Estado do runtime
         self.is_running = False
@@ -89,6 +106,10 @@ class CortexRuntime:
         """Inicializa todos os componentes do sistema."""
         logger.info("Inicializando componentes...")
         
+        # Tracing por turno (antes dos componentes que abrem spans)
+        self.tracer = get_tracer(self.config_manager.get_raw_config().get("tracing", {}))
+        self.profiler = get_sampling_profiler(self.config_manager.get_raw_config().get("profiler", {}))
+        
         # Inicializa fuser
         fuser_config = self.config_manager.get_fuser_config()
         fuser_type = fuser_config.get("type", "priority")
@@ -105,6 +126,19 @@ class CortexRuntime:
         # Inicializa LLM provider
         llm_config = self.config_manager.get_llm_config()
         self.llm_provider = LLMProvider(llm_config)
+        # Saída estruturada: JSON de actions no schema dos plugins, em streaming
+        self.structured_output = llm_config.get("structured_output", {}).get("enabled", False)
+        
+        # Agendador de atuadores compartilhado (engine e ActionOrchestrator)
+        self.action_scheduler = get_action_scheduler(
+            self.config_manager.get_raw_config().get("action_scheduler", {})
+        )
+        # Etapa única de saída dos LEDs (emoção, fala e emergência)
+        get_led_writer(self.config_manager.get_raw_config().get("leds", {}))
+        # Watchdog em thread própria: para a locomoção se o event loop travar
+        self.watchdog = get_safety_watchdog(self.config_manager.get_raw_config().get("safety_watchdog", {}))
+        # Proximidade pela D435i (antes das actions: o streaming de locomoção consulta o veto)
+        get_proximity_monitor(self.config_manager.get_raw_config().get("proximity", {}))
         
         # Inicializa orchestrators
         self.input_orchestrator = InputOrchestrator(
@@ -128,6 +162,9 @@ class CortexRuntime:
         await self.input_orchestrator.start()
         await self.action_orchestrator.start()
         
+        # Liga a profundidade da D435i à navegação local
+        self._connect_navigation_depth()
+        
         # Inicializa G1Controller se configurado
         await self._initialize_g1_controller()
         
@@ -137,6 +174,9 @@ class CortexRuntime:
         # Inicializa ConversationEngine se configurado
         await self._initialize_conversation_engine()
         
+        # Inicializa pipeline de estágios se configurado
+        self._initialize_pipeline()
+        
         logger.info("Componentes inicializados com sucesso")
         return True
     
@@ -151,6 +191,25 @@ class CortexRuntime:
         log_level = getattr(logging, logging_config.get("level", "INFO").upper())
         logging.getLogger().setLevel(log_level)
         
+        # Formato do log
+        if logging_config.get("log_format", "detailed") == "detailed":
+            log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        else:
+            log_format = '%(levelname)s - %(message)s'
+        
+        # Pipeline assíncrono: quem loga só enfileira; arquivo em lotes com rotação
+        pipeline_config = logging_config.get("pipeline", {})
+        if pipeline_config.get("enabled", False):
+            self.log_pipeline = get_log_pipeline({
+                **pipeline_config,
+                "file": logging_config.get("file"),
+                "format": log_format
+            })
+            self.log_pipeline.install()
+            self.log_pipeline.start()
+            logger.info("📝 Pipeline de logs assíncrono ativo")
+            return
+        
         # Configura arquivo de log
         log_file = logging_config.get("file")
         if log_file:
@@ -161,16 +220,7 @@ class CortexRuntime:
             file_handler = logging.FileHandler(log_path)
             file_handler.setLevel(log_level)
             
-            # Formato do log
-            log_format = logging_config.get("log_format", "detailed")
-            if log_format == "detailed":
-                formatter = logging.Formatter(
-                    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-                )
-            else:
-                formatter = logging.Formatter('%(levelname)s - %(message)s')
-            
-            file_handler.setFormatter(formatter)
+            file_handler.setFormatter(logging.Formatter(log_format))
             logging.getLogger().addHandler(file_handler)
     
     async def _initialize_g1_controller(self):
@@ -274,6 +324,59 @@ class CortexRuntime:
         except Exception as e:
             logger.error(f"Erro na inicialização do ConversationEngine: {e}")
     
+    def _connect_navigation_depth(self):
+        """Registra a proximidade e as actions de movimento como consumidoras dos frames de profundidade."""
+        try:
+            captures = [
+                getattr(input_instance, "vision_capture", None)
+                for input_instance in self.input_orchestrator.inputs.values()
+            ]
+            captures = [capture for capture in captures if capture is not None]
+            consumers = [
+                action for action in self.action_orchestrator.actions.values()
+                if hasattr(action, "on_depth_frame")
+            ]
+            
+            proximity = get_proximity_monitor()
+            for capture in captures:
+                # Proximidade na thread de captura (taxa da câmera, mesmo com o loop ocupado)
+                capture.add_depth_listener(proximity.on_depth_frame, on_loop=False)
+                proximity.attach_source()
+                # A grade de ocupação não é thread-safe: recebe o frame no event loop
+                for action in consumers:
+                    capture.add_depth_listener(action.on_depth_frame)
+            
+            if not captures:
+                logger.warning("🚧 Sem câmera de profundidade: veto de proximidade "
+                               + ("vetando todo avanço (require_depth)" if proximity.require_depth
+                                  else "inativo"))
+            if captures and consumers:
+                logger.info(f"🧭 Profundidade conectada à navegação ({len(consumers)} consumidor(es))")
+                
+        except Exception as e:
+            logger.error(f"Erro ao conectar profundidade à navegação: {e}")
+    
+    def _initialize_pipeline(self):
+        """Inicializa o pipeline percepção/deliberação/atuação se configurado."""
+        raw_config = self.config_manager.get_raw_config()
+        pipeline_config = raw_config.get("pipeline", {})
+        
+        if not pipeline_config.get("enabled", False):
+            logger.info("Pipeline não configurado ou desabilitado")
+            return
+        
+        if not self.conversation_engine:
+            logger.warning("Pipeline requer ConversationEngine - usando loop sequencial")
+            return
+        
+        self.pipeline = ConversationPipeline(
+            pipeline_config,
+            self.input_orchestrator,
+            self.conversation_engine,
+            hertz=self.config.hertz
+        )
+        logger.info("Pipeline de estágios configurado")
+    
     async def start(self):
         """Inicia o loop principal do sistema."""
         if not self.config:
@@ -282,8 +385,14 @@ class CortexRuntime:
         logger.info("Iniciando loop principal do sistema...")
         self.is_running = True
         self.start_time = time.time()
+        self._start_heartbeat()
+        self._start_profiler()
         
         try:
+            # Modo pipeline: percepção, deliberação e atuação em estágios concorrentes
+            if self.pipeline:
+                await self.pipeline.run(lambda: self.is_running)
+            
             # Loop principal
             while self.is_running:
                 loop_start = time.time()
@@ -314,8 +423,35 @@ class CortexRuntime:
         finally:
             await self.stop()
     
+    def _start_heartbeat(self):
+        """Inicia o watchdog e a task que prova ao watchdog que o event loop responde."""
+        if not self.watchdog or not self.watchdog.start():
+            return
+        period = self.config_manager.get_raw_config().get("safety_watchdog", {}).get("heartbeat_period", 0.1)
+        self.watchdog.register("cortex", deadline=period * 5, period=period)
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop(period), name="cortex-heartbeat")
+    
+    def _start_profiler(self):
+        """Vigia travadas do event loop; a amostragem liga por WebSim, sinal ou config."""
+        if not self.profiler or not self.profiler.start():
+            return
+        self.profiler.attach_loop()
+        if self.config_manager.get_raw_config().get("profiler", {}).get("profile_on_start", False):
+            self.profiler.start_profiling()
+    
+    async def _heartbeat_loop(self, period: float):
+        # Task própria em vez de um beat por iteração: uma iteração pode aguardar o
+        # LLM por segundos sem bloquear o loop, o que não deve disparar o watchdog
+        while True:
+            self.watchdog.beat("cortex")
+            await asyncio.sleep(period)
+    
     async def _run_loop(self):
         """Executa uma iteração do loop principal."""
+        # O turno só é registrado se houver inputs (span terminado vai para o buffer)
+        turn = self.tracer.start_span("turn", parent=None, loop=self.loop_count)
+        capture = self.tracer.start_span("input.capture", parent=turn)
+        
         # Coleta inputs com timeout para evitar travamento
         try:
             inputs_data = await asyncio.wait_for(
@@ -329,6 +465,15 @@ class CortexRuntime:
         if not inputs_data:
             return
         
+        capture.end(inputs=len(inputs_data))
+        with self.tracer.activate(turn):
+            try:
+                await self._respond(inputs_data)
+            finally:
+                turn.end()
+    
+    async def _respond(self, inputs_data: List[Any]):
+        """Gera e executa a resposta aos inputs coletados."""
         logger.info(f"🎤 {len(inputs_data)} inputs processados - gerando resposta...")
         
         # Se ConversationEngine está ativo, usa o ciclo de conversação
@@ -341,26 +486,45 @@ class CortexRuntime:
             if conversation_response:
                 logger.info(f"🎭 Executando resposta: {conversation_response.text[:30]}...")
                 # Executa resposta multimodal coordenada
-                await self.conversation_engine.execute_response(conversation_response)
+                if self.conversation_engine.enable_barge_in:
+                    # Em background: o loop continua ouvindo e a voz do usuário interrompe a fala
+                    self.conversation_engine.start_response(conversation_response)
+                else:
+                    await self.conversation_engine.execute_response(conversation_response)
         else:
             # Usa o fluxo tradicional (sem conversação integrada)
             # Fusão de inputs
-            fused_data = await self.fuser.fuse(inputs_data)
+            with self.tracer.span("fusion"):
+                fused_data = await self.fuser.fuse(inputs_data)
             
             if not fused_data:
                 return
             
+            if self.structured_output:
+                # Actions despachadas à medida que o JSON chega do LLM
+                with self.tracer.span("llm", streaming=True):
+                    await self.action_orchestrator.execute_action_stream(
+                        self.llm_provider.stream(
+                            fused_data,
+                            self.config.system_prompt_base,
+                            self.action_orchestrator.get_response_schema()
+                        )
+                    )
+                return
+            
             # Processamento com LLM
-            llm_response = await self.llm_provider.process(
-                fused_data,
-                self.config.system_prompt_base
-            )
+            with self.tracer.span("llm"):
+                llm_response = await self.llm_provider.process(
+                    fused_data,
+                    self.config.system_prompt_base
+                )
             
             if not llm_response:
                 return
             
             # Execução de actions
-            await self.action_orchestrator.execute_actions(llm_response)
+            with self.tracer.span("actions"):
+                await self.action_orchestrator.execute_actions(llm_response)
     
     def _update_metrics(self, loop_time: float):
         """Atualiza métricas do sistema."""
@@ -378,6 +542,10 @@ class CortexRuntime:
         logger.info("Parando sistema...")
         self.is_running = False
         
+        # Para pipeline antes dos componentes que ele usa
+        if self.pipeline:
+            await self.pipeline.stop()
+        
         # Para componentes
         if self.input_orchestrator:
             await self.input_orchestrator.stop()
@@ -403,6 +571,28 @@ class CortexRuntime:
         if self.websim:
             await self.websim.stop()
         
+        # Watchdog para depois da locomoção (parada intencional não é falha)
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        if self.watchdog:
+            self.watchdog.unregister("cortex")
+            await asyncio.to_thread(self.watchdog.stop)
+        
+        # Profiler: exporta a amostragem em andamento
+        if self.profiler:
+            self.profiler.detach_loop()
+            await asyncio.to_thread(self.profiler.stop)
+        
+        # Spans do buffer em Chrome trace e OTLP/JSON, se configurado
+        if self.tracer and self.tracer.export_dir:
+            await asyncio.to_thread(self.tracer.export)
+        
+        # Encerra sessão DDS e threads de comandos do SDK (depois do cleanup dos conectores)
+        await get_led_writer().stop()
+        await get_g1_session().close()
+        get_command_executor().shutdown()
+        
         # Log de estatísticas
         if self.start_time:
             total_time = time.time() - self.start_time
@@ -414,6 +604,11 @@ class CortexRuntime:
             logger.info(f"  - Erros: {self.metrics['errors']}")
         
         logger.info("Sistema parado")
+        
+        # Por último: esvazia a fila de logs e devolve os handlers originais
+        if self.log_pipeline:
+            await asyncio.to_thread(self.log_pipeline.stop)
+            self.log_pipeline = None
     
     async def get_status(self) -> Dict[str, Any]:
         """
@@ -467,6 +662,20 @@ class CortexRuntime:
         else:
             status["conversation_engine"] = None
         
+        # Adiciona métricas do pipeline se ativo
+        status["pipeline"] = self.pipeline.get_status() if self.pipeline else None
+        
+        # Latência dos RPCs do SDK por comando
+        status["robot_commands"] = get_command_executor().get_stats()
+        status["g1_session"] = get_g1_session().get_status()
+        status["action_scheduler"] = get_action_scheduler().get_stats()
+        status["leds"] = get_led_writer().get_status()
+        status["safety_watchdog"] = self.watchdog.get_status() if self.watchdog else None
+        status["proximity"] = get_proximity_monitor().get_status()
+        status["tracing"] = self.tracer.get_status() if self.tracer else None
+        status["profiler"] = self.profiler.get_status() if self.profiler else None
+        status["log_pipeline"] = self.log_pipeline.get_stats() if self.log_pipeline else None
+        
         return status
     
     async def reload_config(self):
@@ -6,12 +6,16 @@ Coordenação de inputs e execução de actions do sistema G1.
 
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, AsyncIterator, Dict, List, Optional, Type, Union
 from datetime import datetime
 
 from ..inputs.base import BaseInput, InputData
 from ..actions.base import BaseAction, ActionRequest, ActionResult
 from ..runtime.config import ConfigManager
+from ..llm.provider import LLMResponse
+from ..llm.structured_output import StreamingActionParser, build_action_schema, normalize_action
+from .action_scheduler import get_action_scheduler
+from ..connectors.led_writer import LedLayer, get_led_writer
 
 logger = logging.getLogger(__name__)
 
@@ -260,12 +264,12 @@ class InputOrchestrator:
                     data = await input_instance.get_data()
                     if data:
                         inputs_data.append(data)
-                        logger.debug(f"Dados coletados de {input_type}")
+                        logger.debug("Dados coletados de %s", input_type)
                 except Exception as e:
                     logger.error(f"Erro ao coletar dados de {input_type}: {e}")
             
             if inputs_data:
-                logger.debug(f"Coletados dados de {len(inputs_data)} inputs")
+                logger.debug("Coletados dados de %d inputs", len(inputs_data))
             
             return inputs_data
             
@@ -335,6 +339,17 @@ class ActionOrchestrator:
         self.is_initialized = False
         self.is_running = False
         
+        # Saída estruturada: connector de cada action e schema gerado sob demanda
+        self.action_connectors: Dict[str, str] = {}
+        self.emotions: List[str] = []
+        self._response_schema: Optional[Dict[str, Any]] = None
+        self.structured_stats = {
+            "structured_actions": 0,
+            "invalid_actions": 0,
+            "keyword_fallbacks": 0,
+            "last_first_dispatch_ms": None
+        }
+        
         logger.debug(f"ActionOrchestrator configurado com {len(actions_config)} actions")
     
     async def initialize(self) -> bool:
@@ -392,6 +407,10 @@ class ActionOrchestrator:
             success = await action_instance.initialize()
             if success:
                 self.actions[action_name] = action_instance
+                self.action_connectors[action_name] = connector
+                if connector == "g1_emotion":
+                    self.emotions = list(action_config.get("config", {}).get("emotion_mapping", {}))
+                self._response_schema = None
                 logger.info(f"Action {action_name} inicializada com sucesso")
                 return True
             else:
@@ -527,6 +546,9 @@ class ActionOrchestrator:
             
             logger.info("Iniciando ActionOrchestrator...")
             
+            # Retomada após parada de emergência libera a cor de alerta
+            get_led_writer().clear(LedLayer.EMERGENCY)
+            
             # Inicia cada action
             for action_name, action_instance in self.actions.items():
                 success = await action_instance.start()
@@ -563,12 +585,19 @@ class ActionOrchestrator:
             logger.error(f"Erro ao parar ActionOrchestrator: {e}")
             return False
     
-    async def execute_actions(self, llm_response: str) -> List[ActionResult]:
+    def get_response_schema(self) -> Dict[str, Any]:
+        """Schema JSON da saída estruturada para as actions registradas."""
+        if self._response_schema is None:
+            self._response_schema = build_action_schema(self.action_connectors, self.emotions)
+        return self._response_schema
+    
+    async def execute_actions(self, llm_response: Union[str, LLMResponse]) -> List[ActionResult]:
         """
         Executa actions baseado na resposta do LLM.
         
         Args:
-            llm_response: Resposta do LLM
+            llm_response: Resposta do LLM (texto ou LLMResponse); JSON
+                estruturado é preferido, com palavras-chave como fallback
             
         Returns:
             Lista de resultados das actions
@@ -578,33 +607,132 @@ class ActionOrchestrator:
                 logger.debug("ActionOrchestrator não está rodando")
                 return []
             
-            # Parse da resposta do LLM para extrair actions
-            actions_to_execute = self._parse_llm_response(llm_response)
-            
-            results = []
-            
-            # Executa cada action
-            for action_request in actions_to_execute:
-                try:
-                    action_name = action_request.action_name
-                    if action_name in self.actions:
-                        result = await self.actions[action_name].execute(action_request)
-                        results.append(result)
-                        logger.debug(f"Action {action_name} executada")
-                    else:
-                        logger.warning(f"Action {action_name} não encontrada")
-                except Exception as e:
-                    logger.error(f"Erro ao executar action {action_request.action_name}: {e}")
+            text = llm_response.content if isinstance(llm_response, LLMResponse) else llm_response
+            if not text:
+                return []
             
-            if results:
-                logger.debug(f"Executadas {len(results)} actions")
+            parser = StreamingActionParser()
+            actions_to_execute = self._structured_requests(parser.feed(text))
+            if not parser.found_json:
+                # Parse da resposta do LLM para extrair actions
+                self.structured_stats["keyword_fallbacks"] += 1
+                actions_to_execute = self._parse_llm_response(text)
             
-            return results
+            pending = [self._submit(r) for r in actions_to_execute]
+            return await self._collect(actions_to_execute, [p for p in pending if p is not None])
             
         except Exception as e:
             logger.error(f"Erro na execução de actions: {e}")
             return []
     
+    async def execute_action_stream(self, chunks: AsyncIterator[str]) -> List[ActionResult]:
+        """
+        Executa actions conforme a resposta estruturada chega em streaming.
+        
+        Cada action é enviada ao agendador assim que o seu objeto JSON fecha,
+        enquanto o restante da resposta ainda está sendo gerado.
+        
+        Args:
+            chunks: Pedaços de texto do LLM (``LLMProvider.stream``)
+            
+        Returns:
+            Lista de resultados das actions
+        """
+        if not self.is_running:
+            logger.debug("ActionOrchestrator não está rodando")
+            return []
+        
+        parser = StreamingActionParser()
+        started = asyncio.get_running_loop().time()
+        text_parts: List[str] = []
+        requests: List[ActionRequest] = []
+        pending: List[asyncio.Future] = []
+        
+        try:
+            async for chunk in chunks:
+                text_parts.append(chunk)
+                for action_request in self._structured_requests(parser.feed(chunk)):
+                    task = self._submit(action_request)
+                    if task is None:
+                        continue
+                    if not pending:
+                        elapsed = (asyncio.get_running_loop().time() - started) * 1000
+                        self.structured_stats["last_first_dispatch_ms"] = round(elapsed, 1)
+                        logger.debug("⚡ Primeira action despachada em %.0fms", elapsed)
+                    requests.append(action_request)
+                    pending.append(task)
+            
+            if not parser.found_json:
+                # Modelo respondeu em texto livre
+                self.structured_stats["keyword_fallbacks"] += 1
+                for action_request in self._parse_llm_response("".join(text_parts)):
+                    task = self._submit(action_request)
+                    if task is not None:
+                        requests.append(action_request)
+                        pending.append(task)
+        
+        except asyncio.CancelledError:
+            for task in pending:
+                task.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Erro no streaming de actions: {e}")
+        
+        return await self._collect(requests, pending)
+    
+    def _structured_requests(self, items: List[Any]) -> List[ActionRequest]:
+        """Converte itens do JSON estruturado em requisições de action."""
+        requests = []
+        for item in items:
+            normalized = normalize_action(item)
+            if normalized is None or normalized[0] not in self.actions:
+                self.structured_stats["invalid_actions"] += 1
+                logger.warning(f"Action estruturada inválida: {str(item)[:80]}")
+                continue
+            action_name, args = normalized
+            self.structured_stats["structured_actions"] += 1
+            requests.append(ActionRequest(
+                action_type=self.action_connectors.get(action_name, action_name),
+                action_name=action_name,
+                timestamp=datetime.now(),
+                data=args,
+                metadata={"source": "structured_output"}
+            ))
+        return requests
+    
+    def _submit(self, action_request: ActionRequest) -> Optional[asyncio.Future]:
+        """Envia a action ao agendador (atuadores independentes rodam em paralelo)."""
+        action_name = action_request.action_name
+        if action_name not in self.actions:
+            logger.warning(f"Action {action_name} não encontrada")
+            return None
+        return asyncio.ensure_future(
+            get_action_scheduler().submit(action_name, action_request, self._execute_single)
+        )
+    
+    async def _collect(self, requests: List[ActionRequest], pending: List[asyncio.Future]) -> List[ActionResult]:
+        """Aguarda as actions enviadas e junta os resultados."""
+        submitted = [r for r in requests if r.action_name in self.actions]
+        outcomes = await asyncio.gather(*pending, return_exceptions=True)
+        
+        results = []
+        for action_request, result in zip(submitted, outcomes):
+            if isinstance(result, BaseException):
+                logger.error(f"Erro ao executar action {action_request.action_name}: {result}")
+            else:
+                results.append(result)
+        
+        if results:
+            logger.debug("Executadas %d actions", len(results))
+        
+        return results
+    
+    async def _execute_single(self, action_name: str, action_request: ActionRequest) -> ActionResult:
+        """Executa uma action (chamado pelo agendador quando os atuadores estão livres)."""
+        result = await self.actions[action_name].execute(action_request)
+        logger.debug("Action %s executada", action_name)
+        return result
+    
     def _parse_llm_response(self, llm_response: str) -> List[ActionRequest]:
         """
         Parse da resposta do LLM para extrair actions.
@@ -648,6 +776,12 @@ class ActionOrchestrator:
         try:
             logger.warning("Parada de emergência do ActionOrchestrator")
             
+            # Nada que estava na fila dos atuadores deve rodar depois da parada
+            await get_action_scheduler().cancel_all(reason="emergency_stop")
+            
+            # Vermelho na camada de emergência: sobrepõe emoção e fala até a retomada
+            get_led_writer().set_color(255, 0, 0, layer=LedLayer.EMERGENCY, source="emergency_stop")
+            
             # Para de emergência cada action
             for action_name, action_instance in self.actions.items():
                 await action_instance.emergency_stop()
@@ -671,6 +805,7 @@ class ActionOrchestrator:
             "initialized": self.is_initialized,
             "running": self.is_running,
             "total_actions": len(self.actions),
+            "structured_output": self.structured_stats.copy(),
             "actions": {}
         }
         
@@ -0,0 +1,397 @@
+"""
+Pipeline conversacional do sistema t031a5.
+
+Divide o ciclo do CortexRuntime em três estágios sobrepostos, ligados por
+filas limitadas:
+
+- Percepção: coleta inputs na frequência do runtime
+- Deliberação: ConversationEngine (intent router / LLM / planejamento)
+- Atuação: execução da resposta multimodal (fala, gestos, LEDs)
+
+O robô continua percebendo e planejando enquanto age. A política de
+preempção define o que acontece quando uma nova resposta fica pronta com
+outra ainda em execução.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from ..inputs.base import InputData
+from ..logging.tracing import NULL_SPAN, get_tracer
+
+logger = logging.getLogger(__name__)
+
+
+class PreemptionPolicy(Enum):
+    """Política para respostas novas enquanto outra está em execução."""
+    QUEUE = "queue"                    # Aguarda a resposta atual terminar
+    PREEMPT = "preempt"                # Qualquer resposta nova interrompe a atual
+    VOICE_PREEMPTS = "voice_preempts"  # Só respostas à voz do usuário interrompem
+    DROP = "drop"                      # Descarta respostas novas enquanto age
+
+
+@dataclass
+class PerceptionItem:
+    """Snapshot de inputs produzido pelo estágio de percepção."""
+    inputs: Dict[str, InputData]
+    has_voice: bool
+    perceived_at: float = field(default_factory=time.monotonic)
+    span: Any = NULL_SPAN              # span do turno, reativado nos estágios seguintes
+
+
+@dataclass
+class ResponseItem:
+    """Resposta planejada aguardando atuação."""
+    response: Any
+    has_voice: bool
+    perceived_at: float
+    planned_at: float = field(default_factory=time.monotonic)
+    span: Any = NULL_SPAN
+
+
+@dataclass
+class StageMetrics:
+    """Métricas de ocupação de um estágio."""
+    name: str
+    started_at: float = field(default_factory=time.monotonic)
+    busy_time: float = 0.0
+    busy_since: Optional[float] = None
+    items_processed: int = 0
+    errors: int = 0
+
+    def begin(self):
+        self.busy_since = time.monotonic()
+
+    def end(self):
+        if self.busy_since is not None:
+            self.busy_time += time.monotonic() - self.busy_since
+            self.busy_since = None
+        self.items_processed += 1
+
+    @property
+    def occupancy(self) -> float:
+        """Fração do tempo em que o estágio esteve ocupado."""
+        now = time.monotonic()
+        busy = self.busy_time + (now - self.busy_since if self.busy_since is not None else 0.0)
+        elapsed = now - self.started_at
+        return busy / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "occupancy": round(self.occupancy, 3),
+            "busy": self.busy_since is not None,
+            "items_processed": self.items_processed,
+            "errors": self.errors
+        }
+
+
+class StageQueue:
+    """
+    Fila limitada entre estágios.
+
+    Quando cheia, descarta o item mais antigo que não esteja protegido
+    (ex.: snapshots com voz do usuário nunca são descartados antes dos demais).
+    """
+
+    def __init__(self, name: str, maxsize: int, protect: Optional[Callable[[Any], bool]] = None):
+        self.name = name
+        self.maxsize = max(1, maxsize)
+        self.protect = protect
+        self._items: Deque[Any] = deque()
+        self._not_empty = asyncio.Event()
+
+        # Métricas
+        self.max_depth = 0
+        self.total_put = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put_nowait(self, item: Any) -> Optional[Any]:
+        """
+        Enfileira sem bloquear.
+
+        Returns:
+            Item descartado para abrir espaço, se houver
+        """
+        evicted = None
+        if len(self._items) >= self.maxsize:
+            evicted = self._evict()
+
+        self._items.append(item)
+        self.total_put += 1
+        self.max_depth = max(self.max_depth, len(self._items))
+        self._not_empty.set()
+        return evicted
+
+    async def get(self) -> Any:
+        """Retira o próximo item (aguarda se vazia)."""
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+        item = self._items.popleft()
+        if not self._items:
+            self._not_empty.clear()
+        return item
+
+    def clear(self) -> int:
+        """Esvazia a fila e retorna quantos itens foram descartados."""
+        count = len(self._items)
+        self._items.clear()
+        self._not_empty.clear()
+        self.dropped += count
+        return count
+
+    def _evict(self) -> Any:
+        victim = None
+        if self.protect:
+            victim = next((item for item in self._items if not self.protect(item)), None)
+        if victim is None:
+            victim = self._items[0]
+        self._items.remove(victim)
+        self.dropped += 1
+        logger.debug("Fila %s cheia: item descartado", self.name)
+        return victim
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "depth": len(self._items),
+            "max_depth": self.max_depth,
+            "maxsize": self.maxsize,
+            "total_put": self.total_put,
+            "dropped": self.dropped
+        }
+
+
+class ConversationPipeline:
+    """Executa percepção, deliberação e atuação como estágios concorrentes."""
+
+    def __init__(self, config: Dict[str, Any], input_orchestrator, conversation_engine, hertz: float = 10.0):
+        """
+        Inicializa o pipeline.
+
+        Args:
+            config: Configuração do pipeline
+            input_orchestrator: Orquestrador de inputs
+            conversation_engine: Engine de conversação
+            hertz: Frequência do estágio de percepção
+        """
+        self.config = config
+        self.input_orchestrator = input_orchestrator
+        self.conversation_engine = conversation_engine
+        self.hertz = hertz
+        # A política de preempção abaixo substitui o barge-in próprio da engine
+        conversation_engine.preemption_managed_externally = True
+
+        # Configurações
+        self.input_timeout = config.get("input_timeout", 5.0)
+        self.max_response_age = config.get("max_response_age", 10.0)
+        try:
+            self.preemption_policy = PreemptionPolicy(config.get("preemption_policy", "voice_preempts"))
+        except ValueError:
+            logger.warning(f"Política de preempção inválida: {config.get('preemption_policy')}, usando voice_preempts")
+            self.preemption_policy = PreemptionPolicy.VOICE_PREEMPTS
+
+        # Filas entre estágios
+        self.perception_queue = StageQueue(
+            "perception", config.get("perception_queue_size", 4), protect=lambda item: item.has_voice
+        )
+        self.actuation_queue = StageQueue("actuation", config.get("actuation_queue_size", 2))
+
+        # Métricas
+        self.stages = {
+            "perception": StageMetrics("perception"),
+            "deliberation": StageMetrics("deliberation"),
+            "actuation": StageMetrics("actuation"),
+        }
+        self.preemptions = 0
+        self.responses_dropped = 0
+        self.perceptions_coalesced = 0
+        self.turn_latencies: Deque[float] = deque(maxlen=100)
+
+        self.tracer = get_tracer()
+        self.is_running = False
+        self._tasks: List[asyncio.Task] = []
+
+    async def run(self, keep_running: Callable[[], bool]):
+        """
+        Executa os estágios até keep_running() retornar False.
+
+        Args:
+            keep_running: Função consultada pelo supervisor a cada ciclo
+        """
+        self.is_running = True
+        for metrics in self.stages.values():
+            metrics.started_at = time.monotonic()
+
+        self._tasks = [
+            asyncio.create_task(self._perception_stage(), name="pipeline-perception"),
+            asyncio.create_task(self._deliberation_stage(), name="pipeline-deliberation"),
+            asyncio.create_task(self._actuation_stage(), name="pipeline-actuation"),
+        ]
+        logger.info(f"🔀 Pipeline iniciado (política: {self.preemption_policy.value})")
+
+        try:
+            while keep_running() and self.is_running:
+                for task in self._tasks:
+                    if task.done() and not task.cancelled() and task.exception():
+                        raise task.exception()
+                await asyncio.sleep(1.0 / self.hertz)
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        """Para todos os estágios."""
+        self.is_running = False
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _perception_stage(self):
+        """Coleta inputs continuamente, inclusive enquanto o robô age."""
+        metrics = self.stages["perception"]
+        interval = 1.0 / self.hertz
+
+        while self.is_running:
+            loop_start = time.monotonic()
+            metrics.begin()
+            # O turno atravessa as filas junto com o item; só é registrado se houver inputs
+            turn = self.tracer.start_span("turn", parent=None)
+            capture = self.tracer.start_span("input.capture", parent=turn)
+            try:
+                inputs_data = await asyncio.wait_for(
+                    self.input_orchestrator.collect_inputs(),
+                    timeout=self.input_timeout
+                )
+                if inputs_data:
+                    capture.end(inputs=len(inputs_data))
+                    inputs = {data.input_type: data for data in inputs_data}
+                    self.perception_queue.put_nowait(PerceptionItem(inputs, self.conversation_engine.detect_user_speech(inputs), span=turn))
+            except asyncio.TimeoutError:
+                logger.warning("Timeout na coleta de inputs (pipeline)")
+                metrics.errors += 1
+            except Exception as e:
+                logger.error(f"Erro no estágio de percepção: {e}")
+                metrics.errors += 1
+            finally:
+                metrics.end()
+
+            elapsed = time.monotonic() - loop_start
+            if elapsed < interval:
+                await asyncio.sleep(interval - elapsed)
+
+    async def _deliberation_stage(self):
+        """Gera e planeja respostas a partir dos snapshots de percepção."""
+        metrics = self.stages["deliberation"]
+
+        while self.is_running:
+            item: PerceptionItem = await self.perception_queue.get()
+
+            # Snapshot sem voz já superado por um mais recente não precisa de LLM
+            if not item.has_voice and len(self.perception_queue) > 0:
+                self.perceptions_coalesced += 1
+                item.span.end(outcome="coalesced")
+                continue
+
+            metrics.begin()
+            try:
+                # Voz interrompe a fala já, sem esperar o LLM da nova resposta
+                if item.has_voice and self.conversation_engine.is_responding and \
+                        self.preemption_policy in (PreemptionPolicy.PREEMPT, PreemptionPolicy.VOICE_PREEMPTS):
+                    await self._preempt()
+                with self.tracer.activate(item.span):
+                    response = await self.conversation_engine.process_conversation_cycle(item.inputs)
+                if response:
+                    await self._submit_response(
+                        ResponseItem(response, item.has_voice, item.perceived_at, span=item.span)
+                    )
+                else:
+                    item.span.end(outcome="no_response")
+            except Exception as e:
+                logger.error(f"Erro no estágio de deliberação: {e}")
+                metrics.errors += 1
+            finally:
+                metrics.end()
+
+    async def _submit_response(self, item: ResponseItem):
+        """Aplica a política de preempção e envia a resposta para atuação."""
+        busy = self.conversation_engine.is_responding or len(self.actuation_queue) > 0
+
+        if busy:
+            policy = self.preemption_policy
+            if policy == PreemptionPolicy.DROP:
+                self.responses_dropped += 1
+                item.span.end(outcome="dropped")
+                logger.info("🔀 Resposta descartada: robô ainda está respondendo")
+                return
+
+            if policy == PreemptionPolicy.PREEMPT or \
+                    (policy == PreemptionPolicy.VOICE_PREEMPTS and item.has_voice):
+                await self._preempt()
+
+        if self.actuation_queue.put_nowait(item) is not None:
+            self.responses_dropped += 1
+
+    async def _preempt(self):
+        """Descarta respostas na fila e interrompe a que está em execução."""
+        self.responses_dropped += self.actuation_queue.clear()
+        await self.conversation_engine.handle_barge_in()
+        self.preemptions += 1
+        logger.info("🔀 Nova resposta interrompe a atual")
+
+    async def _actuation_stage(self):
+        """Executa respostas uma de cada vez."""
+        metrics = self.stages["actuation"]
+
+        while self.is_running:
+            item: ResponseItem = await self.actuation_queue.get()
+
+            age = time.monotonic() - item.perceived_at
+            if age > self.max_response_age:
+                self.responses_dropped += 1
+                item.span.end(outcome="stale")
+                logger.info(f"🔀 Resposta descartada por estar velha ({age:.1f}s)")
+                continue
+
+            self.turn_latencies.append((time.monotonic() - item.perceived_at) * 1000)
+            metrics.begin()
+            try:
+                # A task da resposta herda o span do turno
+                with self.tracer.activate(item.span):
+                    task = self.conversation_engine.start_response(item.response)
+                # Preempção cancela a task; asyncio.wait não propaga o cancelamento
+                await asyncio.wait([task])
+                item.span.end(outcome="preempted" if task.cancelled() else "executed")
+            except Exception as e:
+                logger.error(f"Erro no estágio de atuação: {e}")
+                metrics.errors += 1
+            finally:
+                metrics.end()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Retorna ocupação dos estágios e profundidade das filas."""
+        return {
+            "running": self.is_running,
+            "preemption_policy": self.preemption_policy.value,
+            "stages": {name: metrics.to_dict() for name, metrics in self.stages.items()},
+            "queues": {
+                "perception": self.perception_queue.to_dict(),
+                "actuation": self.actuation_queue.to_dict()
+            },
+            "preemptions": self.preemptions,
+            "responses_dropped": self.responses_dropped,
+            "perceptions_coalesced": self.perceptions_coalesced,
+            "avg_turn_latency_ms": (
+                sum(self.turn_latencies) / len(self.turn_latencies) if self.turn_latencies else 0.0
+            )
+        }
+
@@ -0,0 +1,181 @@
+"""
+Timer wheel para agendamento de eventos do sistema t031a5.
+
+Roda de tempo com hash (hashed timing wheel) sobre o relógio monotônico:
+agendar e cancelar são O(1) e cada tick só visita os timers do slot atual.
+Os ticks são calculados a partir do instante inicial, então atrasos de um
+tick não se acumulam nos seguintes.
+"""
+
+import asyncio
+import inspect
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TimerHandle:
+    """Timer agendado na roda."""
+    deadline: float
+    callback: Callable[..., Any]
+    args: tuple = ()
+    rounds: int = 0
+    cancelled: bool = False
+    fired: bool = False
+
+    def cancel(self):
+        """Cancela o timer (se ainda não disparou)."""
+        self.cancelled = True
+
+
+@dataclass
+class TimerWheelStats:
+    """Estatísticas de pontualidade da roda."""
+    scheduled: int = 0
+    fired: int = 0
+    cancelled: int = 0
+    lateness_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+
+class TimerWheel:
+    """Roda de tempo assíncrona baseada em relógio monotônico."""
+
+    def __init__(self, tick: float = 0.02, slots: int = 256):
+        """
+        Inicializa a roda.
+
+        Args:
+            tick: Resolução em segundos
+            slots: Número de slots (horizonte de uma volta = tick * slots)
+        """
+        self.tick = tick
+        self.slots: List[List[TimerHandle]] = [[] for _ in range(slots)]
+        self.stats = TimerWheelStats()
+
+        self._origin = time.monotonic()
+        self._current_tick = 0
+        self._pending = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.is_running = False
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args) -> TimerHandle:
+        """
+        Agenda callback para daqui a delay segundos.
+
+        Corrotinas são disparadas como tasks; o retorno não é aguardado.
+        """
+        now = time.monotonic()
+        if self._pending == 0:
+            # Roda ociosa: reancora a origem para não "recuperar" ticks perdidos
+            self._origin = now
+            self._current_tick = 0
+
+        deadline = now + max(0.0, delay)
+        target_tick = max(self._current_tick + 1, math.ceil((deadline - self._origin) / self.tick))
+        ticks_ahead = target_tick - self._current_tick
+
+        handle = TimerHandle(deadline=deadline, callback=callback, args=args,
+                             rounds=(ticks_ahead - 1) // len(self.slots))
+        self.slots[target_tick % len(self.slots)].append(handle)
+
+        self._pending += 1
+        self.stats.scheduled += 1
+        if self._wakeup:
+            self._wakeup.set()
+        return handle
+
+    def cancel(self, handle: TimerHandle):
+        """Cancela um timer."""
+        if not handle.cancelled and not handle.fired:
+            handle.cancel()
+
+    async def start(self):
+        """Inicia o loop da roda."""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="timer-wheel")
+
+    async def stop(self):
+        """Para o loop e descarta timers pendentes."""
+        self.is_running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for slot in self.slots:
+            for handle in slot:
+                handle.cancel()
+            slot.clear()
+        self._pending = 0
+
+    async def _run(self):
+        """Avança a roda tick a tick."""
+        while self.is_running:
+            if self._pending == 0:
+                # Nada agendado: dorme até o próximo schedule()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            next_tick = self._current_tick + 1
+            delay = self._origin + next_tick * self.tick - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            self._current_tick = next_tick
+            self._fire_slot(self.slots[next_tick % len(self.slots)])
+
+    def _fire_slot(self, slot: List[TimerHandle]):
+        """Dispara os timers vencidos do slot."""
+        if not slot:
+            return
+
+        now = time.monotonic()
+        remaining = []
+        for handle in slot:
+            if handle.cancelled:
+                self._pending -= 1
+                self.stats.cancelled += 1
+                continue
+            if handle.rounds > 0:
+                handle.rounds -= 1
+                remaining.append(handle)
+                continue
+
+            handle.fired = True
+            self._pending -= 1
+            self.stats.fired += 1
+            self.stats.lateness_ms.append(max(0.0, now - handle.deadline) * 1000)
+            try:
+                result = handle.callback(*handle.args)
+                if inspect.isawaitable(result):
+                    asyncio.ensure_future(result)
+            except Exception as e:
+                logger.error(f"Erro em callback do timer wheel: {e}")
+
+        slot[:] = remaining
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas de pontualidade."""
+        lateness = sorted(self.stats.lateness_ms)
+        return {
+            "tick_ms": self.tick * 1000,
+            "pending": self._pending,
+            "scheduled": self.stats.scheduled,
+            "fired": self.stats.fired,
+            "cancelled": self.stats.cancelled,
+            "avg_lateness_ms": sum(lateness) / len(lateness) if lateness else 0.0,
+            "p95_lateness_ms": lateness[int(len(lateness) * 0.95)] if lateness else 0.0
+        }
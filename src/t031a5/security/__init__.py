@@ -3,11 +3,27 @@ Sistema de Segurança para t031a5
 """
 
 from .safety_manager import SafetyManager, SafetyLevel, SafetyRule, SafetyEvent, SafetyConfig
+from .alert_engine import AlertEngine, AlertGroup, AlertLevel, AlertRule, AlertTransition, WindowedCounter
+from .proximity import DepthRegion, ProximityMonitor, ProximityReading, get_proximity_monitor
+from .watchdog import SafetyWatchdog, WatchdogTrip, get_safety_watchdog
 
 __all__ = [
     "SafetyManager",
     "SafetyLevel", 
     "SafetyRule",
     "SafetyEvent",
-    "SafetyConfig"
+    "SafetyConfig",
+    "AlertEngine",
+    "AlertGroup",
+    "AlertLevel",
+    "AlertRule",
+    "AlertTransition",
+    "WindowedCounter",
+    "DepthRegion",
+    "ProximityMonitor",
+    "ProximityReading",
+    "get_proximity_monitor",
+    "SafetyWatchdog",
+    "WatchdogTrip",
+    "get_safety_watchdog"
 ]
\ No newline at end of file
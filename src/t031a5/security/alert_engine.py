@@ -0,0 +1,348 @@
+"""
+Motor de alertas compartilhado (G1StateInput e SafetyManager).
+
+As regras de limite são compiladas uma vez (limiares de entrada e de saída
+já com sinal e histerese) e cada chave guarda seu nível atual: só
+transições de nível são emitidas, depois de o novo nível se manter por
+``raise_after``/``clear_after`` segundos (debounce). Um balde de tokens
+limita quantas transições chegam ao log e ao loop de conversa durante uma
+tempestade de alertas; escaladas para CRITICAL nunca são suprimidas.
+
+``WindowedCounter`` conta eventos numa janela deslizante em baldes de
+tempo, com custo O(1) por consulta.
+"""
+
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..inputs.telemetry import ThresholdRule
+
+logger = logging.getLogger(__name__)
+
+
+class AlertLevel(IntEnum):
+    """Níveis de alerta (ordem de severidade)."""
+    NORMAL = 0
+    WARNING = 1
+    CRITICAL = 2
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """Regra de limite para um valor escalar."""
+    key: str
+    warning: Optional[float] = None
+    critical: Optional[float] = None
+    below: bool = False          # dispara abaixo do limite (ex.: bateria)
+    hysteresis: float = 0.0      # margem para voltar ao nível inferior
+    raise_after: float = 0.0     # segundos no novo nível antes de subir
+    clear_after: float = 0.0     # segundos no novo nível antes de baixar
+    message: str = "{key}: {value:.2f}"
+
+
+@dataclass(frozen=True)
+class AlertTransition:
+    """Mudança de nível de uma chave."""
+    key: str
+    previous: AlertLevel
+    level: AlertLevel
+    timestamp: float
+    message: str
+    value: Optional[float] = None
+
+    @property
+    def raised(self) -> bool:
+        return self.level > self.previous
+
+    @property
+    def category(self) -> str:
+        return self.key.split(":", 1)[0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.category,
+            "key": self.key,
+            "level": self.level.name.lower(),
+            "previous": self.previous.name.lower(),
+            "message": self.message,
+            "value": self.value,
+            "timestamp": self.timestamp
+        }
+
+
+class _CompiledRule:
+    """Limiares com sinal: ``valor * sinal > limiar`` vale para acima e abaixo."""
+
+    __slots__ = ("rule", "sign", "enter", "exit")
+
+    def __init__(self, rule: AlertRule):
+        self.rule = rule
+        self.sign = -1.0 if rule.below else 1.0
+        self.enter = [
+            math.inf,
+            self.sign * rule.warning if rule.warning is not None else math.inf,
+            self.sign * rule.critical if rule.critical is not None else math.inf,
+        ]
+        self.exit = [threshold - rule.hysteresis for threshold in self.enter]
+
+    def classify(self, value: float, current: int) -> int:
+        signed = self.sign * value
+        up = AlertLevel.CRITICAL if signed > self.enter[2] else AlertLevel.WARNING if signed > self.enter[1] else 0
+        hold = AlertLevel.CRITICAL if signed > self.exit[2] else AlertLevel.WARNING if signed > self.exit[1] else 0
+        # Sobe pelo limiar de entrada; só desce abaixo do limiar de saída
+        return max(up, min(hold, current))
+
+
+class _KeyState:
+    __slots__ = ("level", "pending", "pending_since", "since", "value")
+
+    def __init__(self):
+        self.level = AlertLevel.NORMAL
+        self.pending = AlertLevel.NORMAL
+        self.pending_since = 0.0
+        self.since = 0.0
+        self.value: Optional[float] = None
+
+
+class AlertGroup:
+    """
+    Alertas de muitos itens de uma vez (ex.: uma chave por articulação).
+
+    Os níveis, com histerese, são calculados com operações vetorizadas sobre
+    a matriz ``(campos, itens)``; só os itens que mudaram geram transição.
+    """
+
+    def __init__(self, name: str, items: Sequence[str], rules: Sequence[ThresholdRule],
+                 fields: Sequence[str], raise_after: float = 0.0, clear_after: float = 0.0,
+                 message: str = "{item} {level}"):
+        self.name = name
+        self.items = tuple(items)
+        self.raise_after = raise_after
+        self.clear_after = clear_after
+        self.message = message
+        self._rules = [(fields.index(rule.field), rule) for rule in rules]
+
+        count = len(self.items)
+        self.levels = np.zeros(count, dtype=np.int8)
+        self._pending = np.zeros(count, dtype=np.int8)
+        self._pending_since = np.zeros(count, dtype=np.float64)
+
+    def classify(self, values: np.ndarray) -> np.ndarray:
+        """Nível com histerese de cada item (sem debounce)."""
+        target = np.zeros(len(self.items), dtype=np.int8)
+        for field_index, rule in self._rules:
+            row = values[field_index]
+            up = np.where(row > rule.critical, 2, np.where(row > rule.warning, 1, 0))
+            margin = rule.hysteresis
+            hold = np.where(row > rule.critical - margin, 2, np.where(row > rule.warning - margin, 1, 0))
+            np.maximum(target, np.maximum(up, np.minimum(hold, self.levels)), out=target, casting="unsafe")
+        return target
+
+    def update(self, values: np.ndarray, now: float) -> List[AlertTransition]:
+        target = self.classify(values)
+        changed = target != self.levels
+        # Novo candidato: reinicia o debounce; sem mudança: descarta o candidato
+        restart = changed & (target != self._pending)
+        self._pending_since[restart] = now
+        self._pending[:] = np.where(changed, target, self.levels)
+
+        held = now - self._pending_since
+        wait = np.where(target > self.levels, self.raise_after, self.clear_after)
+        fire = np.flatnonzero(changed & (held >= wait))
+
+        transitions = []
+        for index in fire:
+            previous, level = AlertLevel(int(self.levels[index])), AlertLevel(int(target[index]))
+            self.levels[index] = target[index]
+            item = self.items[index]
+            transitions.append(AlertTransition(
+                f"{self.name}:{item}", previous, level, now,
+                self.message.format(item=item, level=level.name.lower())
+            ))
+        return transitions
+
+
+class WindowedCounter:
+    """Contagem de eventos numa janela deslizante, em baldes de ``bucket_s``."""
+
+    def __init__(self, window_s: float = 60.0, bucket_s: float = 1.0):
+        self.window_s = window_s
+        self.bucket_s = bucket_s
+        self._counts = [0] * max(1, math.ceil(window_s / bucket_s))
+        self._current: Optional[int] = None
+        self._total = 0
+
+    def _advance(self, bucket: int):
+        if self._current is None:
+            self._current = bucket
+            return
+        steps = min(bucket - self._current, len(self._counts))
+        for offset in range(1, steps + 1):
+            index = (self._current + offset) % len(self._counts)
+            self._total -= self._counts[index]
+            self._counts[index] = 0
+        self._current = max(self._current, bucket)
+
+    def add(self, now: Optional[float] = None, amount: int = 1):
+        bucket = int((time.time() if now is None else now) // self.bucket_s)
+        self._advance(bucket)
+        self._counts[self._current % len(self._counts)] += amount
+        self._total += amount
+
+    def total(self, now: Optional[float] = None) -> int:
+        self._advance(int((time.time() if now is None else now) // self.bucket_s))
+        return self._total
+
+
+class RateLimiter:
+    """Balde de tokens (``rate`` por segundo, até ``burst``)."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+
+class AlertEngine:
+    """Avalia regras e emite só transições de nível, com limite de taxa."""
+
+    def __init__(self, rules: Sequence[AlertRule] = (), name: str = "alerts",
+                 max_rate: float = 5.0, burst: int = 10, history_size: int = 100,
+                 summary_interval: float = 10.0, log_transitions: bool = True):
+        self.name = name
+        self.log_transitions = log_transitions
+        self._rules: Dict[str, _CompiledRule] = {}
+        self._states: Dict[str, _KeyState] = {}
+        self._groups: Dict[str, AlertGroup] = {}
+        self._limiter = RateLimiter(max_rate, burst)
+        self.history = deque(maxlen=history_size)
+        self.summary_interval = summary_interval
+        self._last_summary = 0.0
+        self._suppressed_since_summary = 0
+
+        # Métricas
+        self.evaluations = 0
+        self.transitions = 0
+        self.suppressed = 0
+
+        for rule in rules:
+            self.add_rule(rule)
+
+    def add_rule(self, rule: AlertRule):
+        self._rules[rule.key] = _CompiledRule(rule)
+
+    def add_group(self, group: AlertGroup) -> AlertGroup:
+        self._groups[group.name] = group
+        return group
+
+    def evaluate(self, key: str, value: float, now: Optional[float] = None) -> Optional[AlertTransition]:
+        """Aplica a regra ``key`` a um valor; retorna a transição, se houver."""
+        compiled = self._rules[key]
+        state = self._states.setdefault(key, _KeyState())
+        state.value = value
+        target = compiled.classify(value, state.level)
+        message = compiled.rule.message.format(key=key, value=value)
+        return self._step(key, state, AlertLevel(target), now, compiled.rule.raise_after,
+                          compiled.rule.clear_after, message, value)
+
+    def set_level(self, key: str, level: AlertLevel, message: str = "", now: Optional[float] = None,
+                  raise_after: float = 0.0, clear_after: float = 0.0) -> Optional[AlertTransition]:
+        """Nível já classificado por quem chama (ex.: status de segurança)."""
+        state = self._states.setdefault(key, _KeyState())
+        return self._step(key, state, AlertLevel(level), now, raise_after, clear_after, message, None)
+
+    def evaluate_group(self, name: str, values: np.ndarray, now: Optional[float] = None) -> List[AlertTransition]:
+        now = time.time() if now is None else now
+        self.evaluations += 1
+        return [t for t in self._groups[name].update(values, now) if self._emit(t)]
+
+    def _step(self, key: str, state: _KeyState, target: AlertLevel, now: Optional[float],
+              raise_after: float, clear_after: float, message: str,
+              value: Optional[float]) -> Optional[AlertTransition]:
+        self.evaluations += 1
+        now = time.time() if now is None else now
+        if target == state.level:
+            state.pending = state.level
+            return None
+        if target != state.pending:
+            state.pending = target
+            state.pending_since = now
+        wait = raise_after if target > state.level else clear_after
+        if now - state.pending_since < wait:
+            return None
+
+        transition = AlertTransition(key, state.level, target, now, message, value)
+        state.level = target
+        state.since = now
+        return transition if self._emit(transition) else None
+
+    def _emit(self, transition: AlertTransition) -> bool:
+        """Registra a transição; False se foi suprimida pelo limite de taxa."""
+        self.transitions += 1
+        allowed = self._limiter.allow() or (transition.raised and transition.level == AlertLevel.CRITICAL)
+        if not allowed:
+            self.suppressed += 1
+            self._suppressed_since_summary += 1
+            self._log_summary()
+            return False
+
+        self.history.append(transition)
+        if self.log_transitions:
+            if transition.raised:
+                logger.warning(f"🚨 [{self.name}] {transition.message} ({transition.level.name.lower()})")
+            else:
+                logger.info(f"✅ [{self.name}] {transition.key} voltou a {transition.level.name.lower()}")
+        self._log_summary()
+        return True
+
+    def _log_summary(self):
+        now = time.monotonic()
+        if self._suppressed_since_summary and now - self._last_summary >= self.summary_interval:
+            logger.warning(f"⚠️ [{self.name}] {self._suppressed_since_summary} transições de alerta "
+                           f"suprimidas (tempestade de alertas)")
+            self._suppressed_since_summary = 0
+            self._last_summary = now
+
+    def level(self, key: str) -> AlertLevel:
+        if ":" in key:
+            name, item = key.split(":", 1)
+            group = self._groups.get(name)
+            if group and item in group.items:
+                return AlertLevel(int(group.levels[group.items.index(item)]))
+        state = self._states.get(key)
+        return state.level if state else AlertLevel.NORMAL
+
+    def active(self) -> Dict[str, str]:
+        """Chaves fora do nível normal."""
+        active = {key: state.level.name.lower() for key, state in self._states.items() if state.level}
+        for name, group in self._groups.items():
+            for index in np.flatnonzero(group.levels):
+                active[f"{name}:{group.items[index]}"] = AlertLevel(int(group.levels[index])).name.lower()
+        return active
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "rules": len(self._rules),
+            "groups": {name: len(group.items) for name, group in self._groups.items()},
+            "active": len(self.active()),
+            "evaluations": self.evaluations,
+            "transitions": self.transitions,
+            "suppressed": self.suppressed
+        }
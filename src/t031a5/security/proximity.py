@@ -0,0 +1,297 @@
+"""
+Segurança de proximidade pela profundidade da D435i.
+
+A cada frame z16, regiões (ROIs) voltadas para a frente do robô são
+decimadas e copiadas para buffers pré-alocados; pixels inválidos (zero ou
+abaixo do alcance mínimo) viram o maior valor representável e a distância
+da região é um percentil baixo obtido com ``partition`` no próprio buffer,
+robusto a pixels de ruído, sem a máscara/cópia por frame de ``np.median``.
+
+O ``ProximityMonitor`` do processo é alimentado na taxa da câmera (ouvinte
+da thread de captura do VisionCaptureConnector) e consultado pelo streaming
+de locomoção e pelo SafetyManager para vetar deslocamento à frente abaixo de
+``min_distance_meters``.
+
+A falha é fechada: uma região com poucos pixels válidos (lente tapada,
+obstáculo colado abaixo do alcance mínimo, frame todo zero) conta como
+obstáculo a 0 m, e com uma câmera ligada (``attach_source``) e sem frames
+recentes o avanço também é vetado. Sem nenhuma câmera (simulação, modo
+mock) não há o que vigiar, a não ser com ``require_depth``.
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .alert_engine import AlertEngine, AlertLevel, AlertRule
+
+logger = logging.getLogger(__name__)
+
+_INVALID = np.iinfo(np.uint16).max
+
+
+class DepthRegion:
+    """
+    Região decimada de uma imagem z16 com buffers reutilizados entre frames.
+
+    ``bounds`` são frações da imagem (x_min, x_max, y_min, y_max); os
+    buffers são (re)alocados só quando a resolução muda.
+    """
+
+    def __init__(self, name: str, bounds: Sequence[float] = (0.0, 1.0, 0.0, 1.0), stride: int = 4):
+        self.name = name
+        self.bounds = tuple(bounds)
+        self.stride = max(1, int(stride))
+        self._shape: Optional[Tuple[int, int]] = None
+        self._slices: Tuple[slice, slice] = (slice(None), slice(None))
+        self._buffer = np.empty(0, dtype=np.uint16)
+        self._mask = np.empty(0, dtype=bool)
+
+    @property
+    def size(self) -> int:
+        return self._buffer.size
+
+    def _prepare(self, shape: Tuple[int, int]):
+        height, width = shape
+        x_min, x_max, y_min, y_max = self.bounds
+        rows = slice(int(y_min * height), max(int(y_min * height) + 1, int(y_max * height)), self.stride)
+        cols = slice(int(x_min * width), max(int(x_min * width) + 1, int(x_max * width)), self.stride)
+        sampled = (len(range(*rows.indices(height))), len(range(*cols.indices(width))))
+        self._slices = (rows, cols)
+        self._buffer = np.empty(sampled, dtype=np.uint16)
+        self._mask = np.empty(sampled, dtype=bool)
+        self._shape = shape
+
+    def sample(self, depth_image: np.ndarray, min_raw: int = 1) -> int:
+        """
+        Copia a região decimada para o buffer; inválidos viram o máximo.
+
+        Returns:
+            Número de pixels válidos (>= ``min_raw``)
+        """
+        shape = depth_image.shape[:2]
+        if shape != self._shape:
+            self._prepare(shape)
+        np.copyto(self._buffer, depth_image[self._slices], casting="unsafe")
+        np.less(self._buffer, min_raw, out=self._mask)
+        np.copyto(self._buffer, _INVALID, where=self._mask)
+        return self._buffer.size - int(np.count_nonzero(self._mask))
+
+    def quantiles(self, valid: int, fractions: Sequence[float]) -> np.ndarray:
+        """
+        Valores brutos nos quantis pedidos entre os ``valid`` pixels válidos.
+
+        Reordena o buffer no lugar (os inválidos, no máximo, ficam no fim).
+        """
+        flat = self._buffer.reshape(-1)
+        kth = [int(fraction * (valid - 1)) for fraction in fractions]
+        flat.partition(sorted(set(kth)))
+        return flat[kth]
+
+    def valid_sum(self, valid: int) -> float:
+        """Soma dos válidos (o total menos os inválidos, que valem o máximo)."""
+        return float(self._buffer.sum(dtype=np.uint64)) - float(self._buffer.size - valid) * _INVALID
+
+
+@dataclass(frozen=True)
+class ProximityReading:
+    """Distâncias robustas por região em um frame."""
+    timestamp: float
+    distances: Dict[str, Optional[float]]    # metros; inf = livre até o alcance; None = poucos pixels válidos
+    valid_fraction: Dict[str, float]
+    nearest: float                           # 0 se alguma região está cega
+    nearest_region: Optional[str]
+    blind: Tuple[str, ...] = ()              # regiões com poucos pixels válidos
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "distances": {
+                name: (None if d is None else (None if math.isinf(d) else round(d, 3)))
+                for name, d in self.distances.items()
+            },
+            "valid_fraction": {name: round(f, 3) for name, f in self.valid_fraction.items()},
+            "nearest": None if math.isinf(self.nearest) else round(self.nearest, 3),
+            "nearest_region": self.nearest_region,
+            "blind": list(self.blind)
+        }
+
+
+# ROIs padrão para a D435i na cabeça do G1: faixa central à frente e laterais próximas
+DEFAULT_REGIONS = (
+    {"name": "forward", "bounds": (0.30, 0.70, 0.25, 0.90)},
+    {"name": "forward_left", "bounds": (0.05, 0.30, 0.35, 0.90)},
+    {"name": "forward_right", "bounds": (0.70, 0.95, 0.35, 0.90)},
+)
+
+
+class ProximityMonitor:
+    """
+    Distância mínima robusta nas ROIs frontais e veto de avanço.
+
+    O estado de bloqueio usa uma regra do AlertEngine (entra abaixo de
+    ``min_distance_meters``, sai acima dele + ``hysteresis``), para o veto
+    não oscilar na borda.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            config: enabled, min_distance_meters, warning_distance, hysteresis,
+                    regions [{name, bounds}], stride, percentile, depth_scale,
+                    min_range, max_range, min_valid_fraction, blind_is_blocked,
+                    stale_after, veto_when_stale, require_depth
+        """
+        config = config or {}
+        self.enabled = config.get("enabled", True)
+        self.min_distance = config.get("min_distance_meters", 0.5)
+        self.warning_distance = config.get("warning_distance", self.min_distance * 2)
+        self.percentile = config.get("percentile", 2.0)
+        self.depth_scale = config.get("depth_scale", 0.001)  # z16 em mm
+        self.min_range = config.get("min_range", 0.15)        # abaixo disso a D435i só dá ruído
+        self.max_range = config.get("max_range", 4.0)
+        self.min_valid_fraction = config.get("min_valid_fraction", 0.05)
+        self.blind_is_blocked = config.get("blind_is_blocked", True)  # região cega = obstáculo a 0 m
+        self.stale_after = config.get("stale_after", 0.5)
+        self.veto_when_stale = config.get("veto_when_stale", True)
+        # Vetar mesmo sem câmera de profundidade no sistema (robô que não pode andar às cegas)
+        self.require_depth = config.get("require_depth", False)
+        self.sources = 0
+
+        stride = config.get("stride", 4)
+        self.regions = [
+            DepthRegion(region["name"], region.get("bounds", (0.0, 1.0, 0.0, 1.0)), region.get("stride", stride))
+            for region in config.get("regions", DEFAULT_REGIONS)
+        ]
+        self._min_raw = max(1, int(self.min_range / self.depth_scale))
+        self._fractions = (self.percentile / 100.0,)
+
+        self.alerts = AlertEngine([
+            AlertRule("nearest", warning=self.warning_distance, critical=self.min_distance, below=True,
+                      hysteresis=config.get("hysteresis", 0.1), message="Obstáculo à frente a {value:.2f}m"),
+        ], name="Proximity")
+
+        self.reading: Optional[ProximityReading] = None
+        self._last_frame = None
+
+        # Métricas
+        self.frames = 0
+        self.vetoes = 0
+        self.total_update_time = 0.0
+
+    @property
+    def level(self) -> AlertLevel:
+        return self.alerts.level("nearest")
+
+    @property
+    def is_stale(self) -> bool:
+        return self.reading is None or time.time() - self.reading.timestamp > self.stale_after
+
+    def attach_source(self):
+        """Uma câmera de profundidade passou a alimentar o monitor."""
+        self.sources += 1
+
+    def on_depth_frame(self, depth_image: np.ndarray):
+        """Ouvinte de profundidade do VisionCaptureConnector."""
+        if self.enabled:
+            self.update(depth_image)
+
+    def update(self, depth_image: np.ndarray, timestamp: Optional[float] = None) -> ProximityReading:
+        """
+        Mede as regiões de um frame z16.
+
+        O mesmo array recebido duas vezes (ex.: frame repetido pela captura)
+        é medido uma vez só.
+        """
+        if depth_image is self._last_frame and self.reading is not None:
+            return self.reading
+
+        start = time.perf_counter()
+        timestamp = time.time() if timestamp is None else timestamp
+        distances: Dict[str, Optional[float]] = {}
+        valid_fraction: Dict[str, float] = {}
+        nearest, nearest_region = math.inf, None
+        blind = []
+
+        for region in self.regions:
+            valid = region.sample(depth_image, self._min_raw)
+            fraction = valid / region.size if region.size else 0.0
+            valid_fraction[region.name] = fraction
+            if valid == 0 or fraction < self.min_valid_fraction:
+                distances[region.name] = None
+                blind.append(region.name)
+                continue
+            distance = float(region.quantiles(valid, self._fractions)[0]) * self.depth_scale
+            if distance > self.max_range:
+                distance = math.inf
+            distances[region.name] = distance
+            if distance < nearest:
+                nearest, nearest_region = distance, region.name
+
+        if blind and self.blind_is_blocked:
+            # Sem pixels suficientes não há como provar que a frente está livre
+            nearest, nearest_region = 0.0, blind[0]
+        self.reading = ProximityReading(timestamp, distances, valid_fraction, nearest, nearest_region,
+                                        tuple(blind))
+        self._last_frame = depth_image
+        self.alerts.evaluate("nearest", nearest, timestamp)
+
+        self.frames += 1
+        self.total_update_time += time.perf_counter() - start
+        return self.reading
+
+    def vetoes_forward(self) -> bool:
+        """True se avançar (vx > 0) deve ser vetado agora."""
+        if not self.enabled:
+            return False
+        if self.is_stale:
+            if not self.sources and not self.require_depth:
+                return False  # nenhuma câmera: nada chega, nada para vigiar
+            return self.veto_when_stale
+        return self.level == AlertLevel.CRITICAL
+
+    def check(self, vx: float) -> bool:
+        """
+        Verifica um comando de velocidade (contabiliza o veto).
+
+        Returns:
+            True se o comando é permitido
+        """
+        if vx <= 0 or not self.vetoes_forward():
+            return True
+        self.vetoes += 1
+        return False
+
+    def get_status(self) -> Dict[str, Any]:
+        """Última leitura, nível e custo médio por frame."""
+        return {
+            "enabled": self.enabled,
+            "min_distance": self.min_distance,
+            "level": self.level.name.lower(),
+            "stale": self.is_stale,
+            "sources": self.sources,
+            "require_depth": self.require_depth,
+            "reading": self.reading.to_dict() if self.reading else None,
+            "frames": self.frames,
+            "vetoes": self.vetoes,
+            "avg_update_us": round(self.total_update_time / self.frames * 1e6, 1) if self.frames else 0.0
+        }
+
+
+_proximity_monitor: Optional[ProximityMonitor] = None
+
+
+def get_proximity_monitor(config: Optional[Dict[str, Any]] = None) -> ProximityMonitor:
+    """
+    Retorna o monitor de proximidade do processo.
+
+    A configuração só é aplicada na primeira chamada.
+    """
+    global _proximity_monitor
+    if _proximity_monitor is None:
+        _proximity_monitor = ProximityMonitor(config)
+    return _proximity_monitor
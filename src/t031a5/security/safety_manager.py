@@ -6,11 +6,16 @@ Inclui botão STOP, regras de proteção e monitoramento contínuo
 import asyncio
 import logging
 import time
-from typing import Any, Dict, List, Optional, Callable
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, Callable
 from dataclasses import dataclass
 from enum import Enum
 import json
 
+from .alert_engine import AlertEngine, AlertLevel, AlertRule, RateLimiter, WindowedCounter
+from .proximity import get_proximity_monitor
+
 logger = logging.getLogger(__name__)
 
 
@@ -85,14 +90,42 @@ class SafetyManager:
         self.config = SafetyConfig(**config.get("safety", {}))
         self.name = "SafetyManager"
         
+        # Proximidade pela profundidade (monitor compartilhado com o streaming de locomoção)
+        proximity_config = dict(config.get("proximity", {}))
+        proximity_config.setdefault("min_distance_meters", self.config.min_distance_meters)
+        self.proximity = get_proximity_monitor(proximity_config)
+        
         # Estado do sistema
         self.is_initialized = False
         self.is_monitoring = False
         self.emergency_stop_active = False
         
         # Eventos e histórico
-        self.events: List[SafetyEvent] = []
         self.max_events = config.get("max_safety_events", 1000)
+        self.events: Deque[SafetyEvent] = deque(maxlen=self.max_events)
+        
+        # Contagens em janela deslizante (nível em O(1), sem varrer o histórico)
+        self._level_counts = {
+            SafetyLevel.WARNING: WindowedCounter(60.0),
+            SafetyLevel.DANGER: WindowedCounter(60.0),
+        }
+        self._recent_events = WindowedCounter(300.0, 5.0)
+        
+        # Regras contínuas (timeouts, bateria) geram evento só na transição
+        self.alerts = AlertEngine([
+            AlertRule("operation_time", warning=self.config.max_operation_time),
+            AlertRule("idle_time", warning=self.config.max_idle_time),
+            AlertRule("battery", warning=self.config.battery_warning_level,
+                      critical=self.config.battery_critical_level, below=True, hysteresis=2.0),
+            AlertRule("proximity", warning=self.proximity.warning_distance,
+                      critical=self.proximity.min_distance, below=True, hysteresis=0.1),
+            AlertRule("depth_age", warning=self.proximity.stale_after),
+        ], name=self.name, log_transitions=False)
+        
+        # Tempestade de eventos não chega ao log nem aos callbacks (EMERGENCY sempre passa)
+        self._event_limiter = RateLimiter(config.get("max_safety_event_rate", 2.0),
+                                          config.get("safety_event_burst", 10))
+        self.suppressed_events = 0
         
         # Callbacks
         self.on_safety_event: Optional[Callable] = None
@@ -254,6 +287,17 @@ class SafetyManager:
             if self.emergency_stop_active:
                 return False
             
+            # Obstáculo à frente abaixo da distância mínima: só recuar/girar
+            if self.rules_enabled.get(SafetyRule.PROXIMITY_CHECK) and not self.proximity.check(x):
+                reading = self.proximity.reading
+                await self._create_safety_event(
+                    SafetyRule.PROXIMITY_CHECK,
+                    SafetyLevel.WARNING,
+                    f"Avanço vetado: obstáculo a menos de {self.proximity.min_distance}m",
+                    {"x": x, "reading": reading.to_dict() if reading else None}
+                )
+                return False
+            
             # Verifica velocidade máxima
             if speed > self.config.max_speed:
                 await self._create_safety_event(
@@ -331,25 +375,27 @@ class SafetyManager:
             return False
     
     async def update_battery_level(self, battery_level: float):
-        """Atualiza nível da bateria e verifica segurança."""
+        """
+        Atualiza nível da bateria e verifica segurança.
+
+        O evento sai só ao mudar de faixa, mas a parada de emergência vale
+        enquanto a bateria estiver crítica: se o operador limpar a parada
+        sem a bateria sair da faixa, a próxima leitura a reativa.
+        """
         try:
-            if battery_level <= self.config.battery_critical_level:
+            transition = self.alerts.evaluate("battery", battery_level)
+            if transition and transition.raised:
+                critical = transition.level == AlertLevel.CRITICAL
                 await self._create_safety_event(
                     SafetyRule.BATTERY_LEVEL,
-                    SafetyLevel.EMERGENCY,
-                    f"Bateria crítica: {battery_level}%",
+                    SafetyLevel.EMERGENCY if critical else SafetyLevel.WARNING,
+                    f"Bateria {'crítica' if critical else 'baixa'}: {battery_level}%",
                     {"battery_level": battery_level}
                 )
+            
+            if self.alerts.level("battery") == AlertLevel.CRITICAL and not self.emergency_stop_active:
                 await self.emergency_stop("Bateria crítica")
                 
-            elif battery_level <= self.config.battery_warning_level:
-                await self._create_safety_event(
-                    SafetyRule.BATTERY_LEVEL,
-                    SafetyLevel.WARNING,
-                    f"Bateria baixa: {battery_level}%",
-                    {"battery_level": battery_level}
-                )
-                
         except Exception as e:
             logger.error(f"Erro ao atualizar bateria: {e}")
     
@@ -360,7 +406,7 @@ class SafetyManager:
                 # Verifica timeouts
                 await self._check_timeouts()
                 
-                # Verifica proximidade (placeholder)
+                # Proximidade pela última leitura do monitor (a medição é por frame)
                 await self._check_proximity()
                 
                 # Atualiza nível de segurança
@@ -381,7 +427,8 @@ class SafetyManager:
             
             # Timeout de operação
             operation_time = current_time - self.operation_start_time
-            if operation_time > self.config.max_operation_time:
+            transition = self.alerts.evaluate("operation_time", operation_time, current_time)
+            if transition and transition.raised:
                 await self._create_safety_event(
                     SafetyRule.TIMEOUT_CHECK,
                     SafetyLevel.WARNING,
@@ -391,7 +438,8 @@ class SafetyManager:
             
             # Timeout de inatividade
             idle_time = current_time - self.last_activity_time
-            if idle_time > self.config.max_idle_time:
+            transition = self.alerts.evaluate("idle_time", idle_time, current_time)
+            if transition and transition.raised:
                 await self._create_safety_event(
                     SafetyRule.TIMEOUT_CHECK,
                     SafetyLevel.WARNING,
@@ -403,9 +451,39 @@ class SafetyManager:
             logger.error(f"Erro na verificação de timeouts: {e}")
     
     async def _check_proximity(self):
-        """Verifica proximidade (placeholder - integrar com sensores)."""
-        # TODO: Integrar com sensores de proximidade quando disponíveis
-        pass
+        """
+        Gera eventos a partir da leitura do monitor de proximidade compartilhado.
+
+        O monitor é medido por frame pelo ouvinte de profundidade do cortex;
+        aqui só se lê a última leitura: distância que mudou de faixa e
+        profundidade sem atualização (frames atrasados = proximidade às cegas).
+        """
+        try:
+            reading = self.proximity.reading
+            if not self.rules_enabled.get(SafetyRule.PROXIMITY_CHECK) or reading is None:
+                return
+            transition = self.alerts.evaluate("proximity", reading.nearest, reading.timestamp)
+            if transition and transition.raised:
+                level = SafetyLevel.DANGER if transition.level == AlertLevel.CRITICAL else SafetyLevel.WARNING
+                await self._create_safety_event(
+                    SafetyRule.PROXIMITY_CHECK,
+                    level,
+                    f"Profundidade cega em {reading.nearest_region}" if reading.nearest_region in reading.blind
+                    else f"Obstáculo a {reading.nearest:.2f}m ({reading.nearest_region})",
+                    reading.to_dict()
+                )
+            
+            age = time.time() - reading.timestamp
+            transition = self.alerts.evaluate("depth_age", age)
+            if transition and transition.raised:
+                await self._create_safety_event(
+                    SafetyRule.PROXIMITY_CHECK,
+                    SafetyLevel.WARNING,
+                    f"Profundidade sem atualização há {age:.1f}s",
+                    {"depth_age": age}
+                )
+        except Exception as e:
+            logger.error(f"Erro na verificação de proximidade: {e}")
     
     async def _update_safety_level(self):
         """Atualiza nível geral de segurança."""
@@ -414,12 +492,10 @@ class SafetyManager:
                 self.current_level = SafetyLevel.EMERGENCY
                 return
             
-            # Conta eventos recentes por nível
-            recent_time = time.time() - 60  # Últimos 60 segundos
-            recent_events = [e for e in self.events if e.timestamp > recent_time]
-            
-            danger_events = len([e for e in recent_events if e.level == SafetyLevel.DANGER])
-            warning_events = len([e for e in recent_events if e.level == SafetyLevel.WARNING])
+            # Eventos por nível nos últimos 60 segundos
+            now = time.time()
+            danger_events = self._level_counts[SafetyLevel.DANGER].total(now)
+            warning_events = self._level_counts[SafetyLevel.WARNING].total(now)
             
             if danger_events > 0:
                 self.current_level = SafetyLevel.DANGER
@@ -448,12 +524,18 @@ class SafetyManager:
     async def _handle_safety_event(self, event: SafetyEvent):
         """Processa evento de segurança."""
         try:
-            # Adiciona ao histórico
+            # Adiciona ao histórico (deque limitado) e às contagens da janela
             self.events.append(event)
-            
-            # Limita histórico
-            if len(self.events) > self.max_events:
-                self.events.pop(0)
+            self._recent_events.add(event.timestamp)
+            counter = self._level_counts.get(event.level)
+            if counter:
+                counter.add(event.timestamp)
+            
+            # Tempestade: o evento fica no histórico, mas não inunda log nem callbacks
+            if event.level != SafetyLevel.EMERGENCY and not self._event_limiter.allow():
+                self.suppressed_events += 1
+                event.handled = True
+                return
             
             # Log
             if self.config.log_all_events:
@@ -477,15 +559,16 @@ class SafetyManager:
     
     async def get_status(self) -> Dict[str, Any]:
         """Retorna status do sistema de segurança."""
-        recent_events = [e for e in self.events if e.timestamp > time.time() - 300]  # 5 min
-        
         return {
             "initialized": self.is_initialized,
             "monitoring": self.is_monitoring,
             "emergency_stop": self.emergency_stop_active,
             "current_level": self.current_level.value,
             "total_events": len(self.events),
-            "recent_events": len(recent_events),
+            "recent_events": self._recent_events.total(),  # 5 min
+            "suppressed_events": self.suppressed_events,
+            "alerts": self.alerts.get_stats(),
+            "proximity": self.proximity.get_status(),
             "operation_time": time.time() - self.operation_start_time,
             "idle_time": time.time() - self.last_activity_time,
             "rules_enabled": {rule.value: enabled for rule, enabled in self.rules_enabled.items()}
@@ -493,7 +576,7 @@ class SafetyManager:
     
     async def get_recent_events(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Retorna eventos recentes."""
-        recent = sorted(self.events, key=lambda e: e.timestamp, reverse=True)[:limit]
+        recent = list(islice(reversed(self.events), limit))
         return [
             {
                 "timestamp": e.timestamp,
@@ -0,0 +1,351 @@
+"""
+Watchdog de segurança independente do loop asyncio.
+
+O monitoramento do SafetyManager roda no mesmo event loop que STT, visão e
+LLM; se uma chamada bloqueia o loop, a detecção de parada também para.
+O ``SafetyWatchdog`` roda numa thread própria e recebe heartbeats (ex.: do
+loop do cortex e do streaming de locomoção). Se uma fonte fica sem bater
+além do seu prazo, a própria thread envia ``StopMove`` (ou ``Damp``) por um
+LocoClient exclusivo, sem passar pelo loop nem pelo executor de comandos.
+
+Quem não conseguiu parar o robô pelo caminho normal (ex.: StopMove falhou
+em todas as tentativas) escala com ``request_stop``: a thread do watchdog
+envia a parada pelo seu cliente e repete até o robô responder.
+
+``beat`` é barato (um ``time.monotonic`` e algumas atribuições) e pode ser
+chamado de qualquer thread; o jitter dos intervalos entre batidas fica num
+buffer circular pré-alocado por fonte.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+WATCHDOG_ACTIONS = ("stop_move", "damp")
+_ACTION_METHODS = {"stop_move": "StopMove", "damp": "Damp"}
+
+
+@dataclass
+class WatchdogTrip:
+    """Registro de um disparo do watchdog."""
+    source: str
+    last_beat: float        # time.monotonic() da última batida
+    detected_at: float      # quando a thread percebeu o atraso
+    acted_at: Optional[float] = None  # quando o comando de parada retornou com sucesso
+    action: str = "stop_move"
+    attempts: int = 0
+
+    @property
+    def reaction_ms(self) -> Optional[float]:
+        """Tempo da última batida até a parada confirmada."""
+        return None if self.acted_at is None else (self.acted_at - self.last_beat) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "action": self.action,
+            "attempts": self.attempts,
+            "reaction_ms": None if self.reaction_ms is None else round(self.reaction_ms, 1),
+            "detection_ms": round((self.detected_at - self.last_beat) * 1000, 1)
+        }
+
+
+class _Heartbeat:
+    """Estado de uma fonte: prazo, última batida e intervalos recentes."""
+
+    def __init__(self, name: str, deadline: float, period: Optional[float], samples: int):
+        self.name = name
+        self.deadline = deadline
+        self.period = period
+        self.last: Optional[float] = None
+        self.beats = 0
+        self.misses = 0
+        self.max_interval = 0.0
+        self._intervals = np.zeros(samples, dtype=np.float32)
+        self._head = 0
+
+    def beat(self, now: float):
+        last = self.last
+        self.last = now
+        self.beats += 1
+        if last is None:
+            return
+        interval = now - last
+        self._intervals[self._head] = interval
+        self._head = (self._head + 1) % len(self._intervals)
+        if interval > self.max_interval:
+            self.max_interval = interval
+
+    def get_stats(self) -> Dict[str, Any]:
+        count = min(self.beats - 1, len(self._intervals))
+        stats = {
+            "deadline_ms": self.deadline * 1000,
+            "beats": self.beats,
+            "misses": self.misses,
+            "max_interval_ms": round(self.max_interval * 1000, 2)
+        }
+        if count > 0:
+            intervals = self._intervals[:count] * 1000
+            mean, p99 = float(intervals.mean()), float(np.percentile(intervals, 99))
+            stats.update({
+                "mean_interval_ms": round(mean, 2),
+                "std_interval_ms": round(float(intervals.std()), 2),
+                "p99_interval_ms": round(p99, 2)
+            })
+            if self.period:
+                # Jitter: atraso da batida em relação ao período nominal
+                stats["p99_jitter_ms"] = round(max(0.0, p99 - self.period * 1000), 2)
+                stats["max_jitter_ms"] = round(max(0.0, (self.max_interval - self.period) * 1000), 2)
+        return stats
+
+
+class SafetyWatchdog:
+    """
+    Thread que para a locomoção quando os heartbeats atrasam.
+
+    Cada fonte é registrada com um prazo (``register``) e só passa a ser
+    vigiada após a primeira batida. Um disparo fica travado até a fonte
+    voltar a bater; ``trips`` é incrementado a cada disparo para que quem
+    bate (ex.: o streaming) descubra, ao voltar, que deve zerar o setpoint.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 client_factory: Optional[Callable[[], Any]] = None):
+        """
+        Args:
+            config: enabled, check_interval, action (stop_move|damp),
+                    retry_interval, samples, sources {nome: {deadline, period}}
+            client_factory: Cria o LocoClient exclusivo (padrão: classe do
+                            SDK da sessão G1, após a sessão conectar)
+        """
+        config = config or {}
+        self.enabled = config.get("enabled", True)
+        self.check_interval = config.get("check_interval", 0.01)
+        self.retry_interval = config.get("retry_interval", 1.0)
+        self.samples = config.get("samples", 512)
+        self.action = config.get("action", "stop_move")
+        if self.action not in WATCHDOG_ACTIONS:
+            raise ValueError(f"Ação de watchdog desconhecida: {self.action}")
+        self.source_config: Dict[str, Dict[str, Any]] = config.get("sources", {})
+
+        self._client_factory = client_factory or self._session_client
+        self._client = None
+        self._last_client_attempt = 0.0
+        self._sources: Dict[str, _Heartbeat] = {}
+        self._tripped: Dict[str, WatchdogTrip] = {}
+        self._requests: Dict[str, WatchdogTrip] = {}  # paradas pedidas por request_stop
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # Métricas
+        self.trips = 0
+        self.action_failures = 0
+        self.last_trip: Optional[WatchdogTrip] = None
+        self.max_check_lag_ms = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_tripped(self) -> bool:
+        return bool(self._tripped or self._requests)
+
+    def register(self, source: str, deadline: float = 0.5, period: Optional[float] = None):
+        """
+        Registra (ou reconfigura) uma fonte de heartbeat.
+
+        ``sources`` na configuração tem precedência sobre os valores passados.
+        """
+        overrides = self.source_config.get(source, {})
+        self._sources[source] = _Heartbeat(
+            source, overrides.get("deadline", deadline), overrides.get("period", period), self.samples
+        )
+
+    def unregister(self, source: str):
+        """Deixa de vigiar a fonte (ex.: componente parado de propósito)."""
+        self._sources.pop(source, None)
+        self._tripped.pop(source, None)
+
+    def beat(self, source: str):
+        """Heartbeat de uma fonte registrada (fontes desconhecidas são ignoradas)."""
+        heartbeat = self._sources.get(source)
+        if heartbeat is not None:
+            heartbeat.beat(time.monotonic())
+
+    def request_stop(self, source: str, reason: str = "") -> bool:
+        """
+        Pede que a thread do watchdog pare a locomoção (escalonamento).
+
+        A parada é repetida a cada ``retry_interval`` até ser aceita e conta
+        como disparo (``trips``), para o streaming zerar o setpoint.
+
+        Returns:
+            False se o watchdog não está rodando (ninguém vai atender)
+        """
+        if not self.is_running:
+            logger.critical(f"🚨 Parada de {source} escalada, mas o watchdog não está rodando")
+            return False
+        if source not in self._requests:
+            now = time.monotonic()
+            self._requests[source] = WatchdogTrip(source, now, now, action=self.action)
+            self.trips += 1
+            logger.critical(f"🚨 Watchdog: parada pedida por {source}" + (f" ({reason})" if reason else ""))
+        return True
+
+    def start(self) -> bool:
+        """Inicia a thread do watchdog."""
+        if not self.enabled:
+            return False
+        if self.is_running:
+            return True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="safety-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"🐕 Watchdog de segurança iniciado (verificação a cada {self.check_interval * 1000:.0f}ms, "
+                    f"ação {self.action})")
+        return True
+
+    def stop(self, timeout: float = 1.0):
+        """Para a thread (bloqueia até ``timeout``)."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        origin = time.monotonic()
+        tick = 0
+        while True:
+            tick += 1
+            deadline = origin + tick * self.check_interval
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                if self._stop_event.wait(delay):
+                    break
+            else:
+                # A própria thread atrasou (ex.: GIL ocupado): registra e pula ciclos
+                self.max_check_lag_ms = max(self.max_check_lag_ms, -delay * 1000)
+                tick += int(-delay / self.check_interval)
+                if self._stop_event.is_set():
+                    break
+            try:
+                self._check(time.monotonic())
+            except Exception as e:
+                logger.error(f"Erro no watchdog de segurança: {e}")
+
+    def _check(self, now: float):
+        if self._client is None:
+            self._ensure_client(now)
+
+        for name, heartbeat in list(self._sources.items()):
+            last = heartbeat.last
+            if last is None:
+                continue
+            trip = self._tripped.get(name)
+            if now - last <= heartbeat.deadline:
+                if trip is not None and last > trip.last_beat:
+                    del self._tripped[name]
+                    logger.info(f"✅ Watchdog: heartbeat de {name} restabelecido")
+                continue
+
+            if trip is None:
+                trip = WatchdogTrip(name, last, now, action=self.action)
+                self._tripped[name] = trip
+                heartbeat.misses += 1
+                self.trips += 1
+                self.last_trip = trip
+                logger.critical(f"🚨 Watchdog: {name} sem heartbeat há {(now - last) * 1000:.0f}ms "
+                                f"(prazo {heartbeat.deadline * 1000:.0f}ms)")
+            if trip.acted_at is None and (trip.attempts == 0 or now - trip.detected_at >= trip.attempts
+                                          * self.retry_interval):
+                self._act(trip)
+
+        for name, trip in list(self._requests.items()):
+            if trip.acted_at is not None:
+                del self._requests[name]
+            elif trip.attempts == 0 or now - trip.detected_at >= trip.attempts * self.retry_interval:
+                self.last_trip = trip
+                self._act(trip)
+
+    def _act(self, trip: WatchdogTrip):
+        """Envia a parada pelo cliente exclusivo, direto desta thread."""
+        trip.attempts += 1
+        client = self._client or self._ensure_client(time.monotonic(), force=True)
+        if client is None:
+            self.action_failures += 1
+            logger.error("❌ Watchdog sem LocoClient: não foi possível parar a locomoção")
+            return
+        try:
+            code = getattr(client, _ACTION_METHODS[trip.action])()
+        except Exception as e:
+            code = e
+        if code == 0:
+            trip.acted_at = time.monotonic()
+            logger.critical(f"🛑 Watchdog: {_ACTION_METHODS[trip.action]} enviado "
+                            f"({trip.reaction_ms:.0f}ms após o último heartbeat de {trip.source})")
+        else:
+            self.action_failures += 1
+            logger.error(f"❌ Watchdog: {_ACTION_METHODS[trip.action]} falhou ({code})")
+
+    def _ensure_client(self, now: float, force: bool = False) -> Optional[Any]:
+        if not force and now - self._last_client_attempt < self.retry_interval:
+            return None
+        self._last_client_attempt = now
+        try:
+            self._client = self._client_factory()
+        except Exception as e:
+            logger.debug(f"Watchdog: LocoClient indisponível ({e})")
+            self._client = None
+        return self._client
+
+    @staticmethod
+    def _session_client() -> Optional[Any]:
+        """LocoClient próprio sobre o canal DDS já inicializado pela sessão."""
+        from ..connectors.g1_session import get_g1_session
+
+        session = get_g1_session()
+        if session.sdk is None or not session.is_connected:
+            return None
+        client = session.sdk.loco_client_cls()
+        client.SetTimeout(min(session.timeout, 1.0))
+        client.Init()
+        logger.info("✅ Watchdog: LocoClient exclusivo inicializado")
+        return client
+
+    def get_status(self) -> Dict[str, Any]:
+        """Estado, disparos e jitter por fonte."""
+        return {
+            "enabled": self.enabled,
+            "running": self.is_running,
+            "action": self.action,
+            "client_ready": self._client is not None,
+            "tripped": sorted(self._tripped),
+            "stop_requests": sorted(self._requests),
+            "trips": self.trips,
+            "action_failures": self.action_failures,
+            "last_trip": self.last_trip.to_dict() if self.last_trip else None,
+            "max_check_lag_ms": round(self.max_check_lag_ms, 2),
+            "sources": {name: heartbeat.get_stats() for name, heartbeat in list(self._sources.items())}
+        }
+
+
+_safety_watchdog: Optional[SafetyWatchdog] = None
+
+
+def get_safety_watchdog(config: Optional[Dict[str, Any]] = None) -> SafetyWatchdog:
+    """
+    Retorna o watchdog do processo.
+
+    A configuração só é aplicada na primeira chamada.
+    """
+    global _safety_watchdog
+    if _safety_watchdog is None:
+        _safety_watchdog = SafetyWatchdog(config)
+    return _safety_watchdog
@@ -15,6 +15,8 @@ import aiohttp
 from aiohttp import web, WSMsgType
 import aiofiles
 
+from ..logging.profiler import get_sampling_profiler
+
 logger = logging.getLogger(__name__)
 
 
@@ -140,6 +142,11 @@ class WebSim:
         self.app.router.add_get("/api/history", self._handle_api_history)
         self.app.router.add_post("/api/emergency", self._handle_api_emergency)
         
+        # Profiler por amostragem (ligar/desligar e baixar o perfil)
+        self.app.router.add_get("/api/profiler", self._handle_api_profiler)
+        self.app.router.add_post("/api/profiler", self._handle_api_profiler_control)
+        self.app.router.add_get("/api/profiler/collapsed", self._handle_api_profiler_collapsed)
+        
         # WebSocket
         self.app.router.add_get("/ws", self._handle_websocket)
     
@@ -885,6 +892,52 @@ class WebSim:
             logger.error(f"Erro na API de emergência: {e}")
             return web.json_response({"error": str(e)}, status=500)
     
+    async def _handle_api_profiler(self, request):
+        """Handler para estado do profiler (travadas e funções mais amostradas)."""
+        try:
+            profiler = get_sampling_profiler()
+            status = profiler.get_status()
+            status["top"] = profiler.top_functions(int(request.query.get('limit', 15)))
+            return web.json_response(status)
+        except Exception as e:
+            logger.error(f"Erro na API do profiler: {e}")
+            return web.json_response({"error": str(e)}, status=500)
+    
+    async def _handle_api_profiler_control(self, request):
+        """Handler para ligar/desligar a amostragem (action: start|stop|toggle)."""
+        try:
+            data = await request.json() if request.can_read_body else {}
+            action = data.get('action', 'toggle')
+            profiler = get_sampling_profiler()
+            
+            if action == 'start':
+                profiler.start_profiling(data.get('duration'))
+            elif action == 'stop':
+                # Exportar grava arquivo: fora do loop
+                await asyncio.to_thread(profiler.stop_profiling)
+            elif action == 'toggle':
+                await asyncio.to_thread(profiler.toggle)
+            else:
+                return web.json_response({"error": f"Ação desconhecida: {action}"}, status=400)
+            
+            return web.json_response(profiler.get_status())
+            
+        except Exception as e:
+            logger.error(f"Erro ao controlar profiler: {e}")
+            return web.json_response({"error": str(e)}, status=500)
+    
+    async def _handle_api_profiler_collapsed(self, request):
+        """Handler para baixar as pilhas no formato collapsed (flamegraph)."""
+        try:
+            text = await asyncio.to_thread(get_sampling_profiler().collapsed)
+            return web.Response(
+                text=text, content_type='text/plain',
+                headers={"Content-Disposition": 'attachment; filename="profile.collapsed"'}
+            )
+        except Exception as e:
+            logger.error(f"Erro ao exportar perfil: {e}")
+            return web.json_response({"error": str(e)}, status=500)
+    
     async def _handle_websocket(self, request):
         """Handler para WebSocket."""
         ws = web.WebSocketResponse()